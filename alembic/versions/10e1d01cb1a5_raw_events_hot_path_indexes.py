@@ -0,0 +1,31 @@
+"""raw_events hot path indexes
+
+Revision ID: 10e1d01cb1a5
+Revises: d4be20c7bfb0
+Create Date: 2026-10-16 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "10e1d01cb1a5"
+down_revision: Union[str, Sequence[str], None] = "d4be20c7bfb0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_raw_events_business_occurred_source",
+        "raw_events",
+        ["business_id", "occurred_at", "source_event_id"],
+        unique=False,
+    )
+    # NOTE: txn_categorizations (business_id, source_event_id) is already covered
+    # by uq_txncat_business_sourceevent; no extra index needed for the join.
+
+
+def downgrade() -> None:
+    op.drop_index("ix_raw_events_business_occurred_source", table_name="raw_events")
@@ -0,0 +1,40 @@
+"""add categorization_stats
+
+Revision ID: 15e338d0021b
+Revises: 203c5483b52b
+Create Date: 2026-10-16 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "15e338d0021b"
+down_revision: Union[str, Sequence[str], None] = "203c5483b52b"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "categorization_stats",
+        sa.Column("business_id", sa.String(length=36), nullable=False),
+        sa.Column("total_events", sa.Integer(), nullable=False),
+        sa.Column("posted", sa.Integer(), nullable=False),
+        sa.Column("uncategorized", sa.Integer(), nullable=False),
+        sa.Column("suggestion_coverage", sa.Integer(), nullable=False),
+        sa.Column("brain_coverage", sa.Integer(), nullable=False),
+        sa.Column("coverage_stale", sa.Boolean(), nullable=False),
+        sa.Column("rules_version", sa.Integer(), nullable=False),
+        sa.Column("mapping_version", sa.Integer(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("reconciled_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["business_id"], ["businesses.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("business_id"),
+    )
+    # Rows are built lazily on the first metrics read.
+
+
+def downgrade() -> None:
+    op.drop_table("categorization_stats")
@@ -0,0 +1,31 @@
+"""add businesses coa_version / mapping_version / seed_fingerprint
+
+Revision ID: 203c5483b52b
+Revises: 20fe9cd055e4
+Create Date: 2026-10-16 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "203c5483b52b"
+down_revision: Union[str, Sequence[str], None] = "20fe9cd055e4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # seed_fingerprint starts NULL: every business is fully seeded once on its next read
+    with op.batch_alter_table("businesses") as batch:
+        batch.add_column(sa.Column("coa_version", sa.Integer(), nullable=False, server_default="0"))
+        batch.add_column(sa.Column("mapping_version", sa.Integer(), nullable=False, server_default="0"))
+        batch.add_column(sa.Column("seed_fingerprint", sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("businesses") as batch:
+        batch.drop_column("seed_fingerprint")
+        batch.drop_column("mapping_version")
+        batch.drop_column("coa_version")
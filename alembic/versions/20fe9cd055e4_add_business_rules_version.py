@@ -0,0 +1,26 @@
+"""add businesses.rules_version
+
+Revision ID: 20fe9cd055e4
+Revises: 91bb39a88dae
+Create Date: 2026-10-16 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "20fe9cd055e4"
+down_revision: Union[str, Sequence[str], None] = "91bb39a88dae"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("businesses") as batch:
+        batch.add_column(sa.Column("rules_version", sa.Integer(), nullable=False, server_default="0"))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("businesses") as batch:
+        batch.drop_column("rules_version")
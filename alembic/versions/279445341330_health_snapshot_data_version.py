@@ -0,0 +1,36 @@
+"""add businesses.data_version; health snapshots compare against it
+
+Revision ID: 279445341330
+Revises: d1f2f9cc79b6
+Create Date: 2026-10-16 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "279445341330"
+down_revision: Union[str, Sequence[str], None] = "d1f2f9cc79b6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("businesses") as batch:
+        batch.add_column(sa.Column("data_version", sa.Integer(), nullable=False, server_default="0"))
+    with op.batch_alter_table("business_health_snapshots") as batch:
+        batch.add_column(sa.Column("source_data_version", sa.Integer(), nullable=False, server_default="0"))
+        batch.drop_column("source_updated_at")
+        batch.drop_column("source_event_count")
+    # existing snapshots were stamped with the old watermark: recompute each once
+    op.execute("UPDATE business_health_snapshots SET source_data_version = -1")
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("business_health_snapshots") as batch:
+        batch.add_column(sa.Column("source_event_count", sa.Integer(), nullable=False, server_default="-1"))
+        batch.add_column(sa.Column("source_updated_at", sa.DateTime(), nullable=True))
+        batch.drop_column("source_data_version")
+    with op.batch_alter_table("businesses") as batch:
+        batch.drop_column("data_version")
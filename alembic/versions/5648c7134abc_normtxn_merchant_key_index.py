@@ -0,0 +1,30 @@
+"""normalized_transactions merchant_key index
+
+Revision ID: 5648c7134abc
+Revises: c05bfb734818
+Create Date: 2026-10-16 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "5648c7134abc"
+down_revision: Union[str, Sequence[str], None] = "c05bfb734818"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_normtxn_business_merchant_occurred",
+        "normalized_transactions",
+        ["business_id", "merchant_key", "occurred_at"],
+        unique=False,
+    )
+    # merchant_key is already written at ingest (normalized_txn_service); no backfill needed.
+
+
+def downgrade() -> None:
+    op.drop_index("ix_normtxn_business_merchant_occurred", table_name="normalized_transactions")
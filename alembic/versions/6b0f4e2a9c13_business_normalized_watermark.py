@@ -0,0 +1,38 @@
+"""add businesses.normalized_version / normalized_through
+
+Revision ID: 6b0f4e2a9c13
+Revises: 279445341330
+Create Date: 2026-10-16 22:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "6b0f4e2a9c13"
+down_revision: Union[str, Sequence[str], None] = "279445341330"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("businesses") as batch:
+        batch.add_column(sa.Column("normalized_version", sa.Integer(), nullable=True))
+        batch.add_column(sa.Column("normalized_through", sa.DateTime(), nullable=True))
+    op.create_index(
+        "ix_raw_events_business_created",
+        "raw_events",
+        ["business_id", "created_at"],
+        unique=False,
+    )
+
+    # No backfill: a NULL watermark makes the first ensure_normalized per business
+    # recheck its whole history (scripts/renormalize.py does it ahead of traffic).
+
+
+def downgrade() -> None:
+    op.drop_index("ix_raw_events_business_created", table_name="raw_events")
+    with op.batch_alter_table("businesses") as batch:
+        batch.drop_column("normalized_through")
+        batch.drop_column("normalized_version")
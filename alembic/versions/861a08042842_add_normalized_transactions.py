@@ -0,0 +1,68 @@
+"""add normalized_transactions
+
+Revision ID: 861a08042842
+Revises: 10e1d01cb1a5
+Create Date: 2026-10-16 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "861a08042842"
+down_revision: Union[str, Sequence[str], None] = "10e1d01cb1a5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "normalized_transactions",
+        sa.Column("raw_event_id", sa.String(length=36), nullable=False),
+        sa.Column("business_id", sa.String(length=36), nullable=False),
+        sa.Column("source_event_id", sa.String(length=120), nullable=False),
+        sa.Column("occurred_at", sa.DateTime(), nullable=False),
+        sa.Column("date", sa.Date(), nullable=True),
+        sa.Column("amount", sa.Float(), nullable=True),
+        sa.Column("direction", sa.String(length=10), nullable=True),
+        sa.Column("account", sa.String(length=120), nullable=True),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("category", sa.String(length=80), nullable=True),
+        sa.Column("counterparty_hint", sa.String(length=200), nullable=True),
+        sa.Column("merchant_key", sa.String(length=200), nullable=True),
+        sa.Column("normalizer_version", sa.Integer(), nullable=False),
+        sa.Column("skip_reason", sa.String(length=200), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["raw_event_id"], ["raw_events.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["business_id"], ["businesses.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("raw_event_id"),
+    )
+    op.create_index(
+        "ix_normtxn_business_occurred_source",
+        "normalized_transactions",
+        ["business_id", "occurred_at", "source_event_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_normtxn_business_source_event",
+        "normalized_transactions",
+        ["business_id", "source_event_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_normtxn_business_version",
+        "normalized_transactions",
+        ["business_id", "normalizer_version"],
+        unique=False,
+    )
+    # No backfill here: read paths normalize each business's history lazily
+    # (normalized_txn_service.ensure_normalized); to do it ahead of traffic, and
+    # after a NORMALIZER_VERSION bump, run `python -m backend.app.scripts.renormalize`.
+
+
+def downgrade() -> None:
+    op.drop_index("ix_normtxn_business_version", table_name="normalized_transactions")
+    op.drop_index("ix_normtxn_business_source_event", table_name="normalized_transactions")
+    op.drop_index("ix_normtxn_business_occurred_source", table_name="normalized_transactions")
+    op.drop_table("normalized_transactions")
@@ -0,0 +1,34 @@
+"""add cash_balance_checkpoints
+
+Revision ID: 91bb39a88dae
+Revises: 861a08042842
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "91bb39a88dae"
+down_revision: Union[str, Sequence[str], None] = "861a08042842"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "cash_balance_checkpoints",
+        sa.Column("business_id", sa.String(length=36), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("net_change", sa.Float(), nullable=False),
+        sa.Column("closing_balance", sa.Float(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["business_id"], ["businesses.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("business_id", "day"),
+    )
+    # Existing businesses are rebuilt lazily on first balance read.
+
+
+def downgrade() -> None:
+    op.drop_table("cash_balance_checkpoints")
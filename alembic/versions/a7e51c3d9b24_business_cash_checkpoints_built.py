@@ -0,0 +1,29 @@
+"""add businesses.cash_checkpoints_built
+
+Revision ID: a7e51c3d9b24
+Revises: f3a9d27b5c10
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "a7e51c3d9b24"
+down_revision: Union[str, Sequence[str], None] = "f3a9d27b5c10"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # existing businesses start unbuilt: each rebuilds its checkpoints once on first read
+    with op.batch_alter_table("businesses") as batch:
+        batch.add_column(
+            sa.Column("cash_checkpoints_built", sa.Boolean(), nullable=False, server_default=sa.text("false"))
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("businesses") as batch:
+        batch.drop_column("cash_checkpoints_built")
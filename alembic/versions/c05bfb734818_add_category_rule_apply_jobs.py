@@ -0,0 +1,52 @@
+"""add category_rule_apply_jobs
+
+Revision ID: c05bfb734818
+Revises: 15e338d0021b
+Create Date: 2026-10-16 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "c05bfb734818"
+down_revision: Union[str, Sequence[str], None] = "15e338d0021b"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "category_rule_apply_jobs",
+        sa.Column("id", sa.String(length=36), nullable=False),
+        sa.Column("business_id", sa.String(length=36), nullable=False),
+        sa.Column("rule_id", sa.String(length=36), nullable=False),
+        sa.Column("status", sa.String(length=16), nullable=False),
+        sa.Column("scanned", sa.Integer(), nullable=False),
+        sa.Column("matched", sa.Integer(), nullable=False),
+        sa.Column("updated", sa.Integer(), nullable=False),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("started_at", sa.DateTime(), nullable=True),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["business_id"], ["businesses.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["rule_id"], ["category_rules.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_rule_apply_jobs_business_created",
+        "category_rule_apply_jobs",
+        ["business_id", "created_at"],
+    )
+    op.create_index(
+        op.f("ix_category_rule_apply_jobs_rule_id"),
+        "category_rule_apply_jobs",
+        ["rule_id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_category_rule_apply_jobs_rule_id"), table_name="category_rule_apply_jobs")
+    op.drop_index("ix_rule_apply_jobs_business_created", table_name="category_rule_apply_jobs")
+    op.drop_table("category_rule_apply_jobs")
@@ -0,0 +1,40 @@
+"""add business_health_snapshots
+
+Revision ID: d1f2f9cc79b6
+Revises: 5648c7134abc
+Create Date: 2026-10-16 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "d1f2f9cc79b6"
+down_revision: Union[str, Sequence[str], None] = "5648c7134abc"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "business_health_snapshots",
+        sa.Column("business_id", sa.String(length=36), nullable=False),
+        sa.Column("health_score", sa.Float(), nullable=False),
+        sa.Column("risk", sa.String(length=16), nullable=False),
+        sa.Column("highlights", sa.JSON(), nullable=False),
+        sa.Column("source_event_count", sa.Integer(), nullable=False),
+        sa.Column("source_updated_at", sa.DateTime(), nullable=True),
+        sa.Column("pipeline_version", sa.Integer(), nullable=False),
+        sa.Column("computed_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["business_id"], ["businesses.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("business_id"),
+    )
+    op.create_index("ix_health_snapshots_score", "business_health_snapshots", ["health_score"], unique=False)
+    # Rows are filled by the refresh worker (scripts/refresh_health_snapshots.py)
+    # or by the dashboard's background refresh of stale cards.
+
+
+def downgrade() -> None:
+    op.drop_index("ix_health_snapshots_score", table_name="business_health_snapshots")
+    op.drop_table("business_health_snapshots")
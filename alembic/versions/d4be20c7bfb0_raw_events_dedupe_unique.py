@@ -0,0 +1,43 @@
+"""raw_events dedupe unique key
+
+Revision ID: d4be20c7bfb0
+Revises: 7c1b1d9c0a31, 3b7f9b12e4c7
+Create Date: 2026-10-16 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "d4be20c7bfb0"
+down_revision: Union[str, Sequence[str], None] = ("7c1b1d9c0a31", "3b7f9b12e4c7")
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Drop historical duplicates (keep one row per dedupe key) so the
+    # unique constraint can be created. Ingest already SELECT-checked this key,
+    # so this is normally a no-op.
+    op.execute(
+        sa.text(
+            """
+            DELETE FROM raw_events
+            WHERE id NOT IN (
+                SELECT MIN(id) FROM raw_events
+                GROUP BY business_id, source, source_event_id
+            )
+            """
+        )
+    )
+    with op.batch_alter_table("raw_events") as batch_op:
+        batch_op.create_unique_constraint(
+            "uq_raw_events_business_source_event",
+            ["business_id", "source", "source_event_id"],
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("raw_events") as batch_op:
+        batch_op.drop_constraint("uq_raw_events_business_source_event", type_="unique")
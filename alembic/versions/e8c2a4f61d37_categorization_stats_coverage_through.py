@@ -0,0 +1,30 @@
+"""add categorization_stats.coverage_through
+
+Revision ID: e8c2a4f61d37
+Revises: 6b0f4e2a9c13
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "e8c2a4f61d37"
+down_revision: Union[str, Sequence[str], None] = "6b0f4e2a9c13"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("categorization_stats") as batch:
+        batch.add_column(sa.Column("coverage_through", sa.DateTime(), nullable=True))
+
+    # existing rows have no watermark yet: recompute their coverage on next read
+    stats = sa.table("categorization_stats", sa.column("coverage_stale", sa.Boolean()))
+    op.execute(stats.update().values(coverage_stale=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("categorization_stats") as batch:
+        batch.drop_column("coverage_through")
@@ -0,0 +1,40 @@
+"""add category_rule_apply_jobs.updated_at
+
+Revision ID: f3a9d27b5c10
+Revises: e8c2a4f61d37
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "f3a9d27b5c10"
+down_revision: Union[str, Sequence[str], None] = "e8c2a4f61d37"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("category_rule_apply_jobs") as batch:
+        batch.add_column(sa.Column("updated_at", sa.DateTime(), nullable=True))
+
+    jobs = sa.table(
+        "category_rule_apply_jobs",
+        sa.column("updated_at", sa.DateTime()),
+        sa.column("created_at", sa.DateTime()),
+        sa.column("started_at", sa.DateTime()),
+        sa.column("finished_at", sa.DateTime()),
+    )
+    op.execute(
+        jobs.update().values(updated_at=sa.func.coalesce(jobs.c.finished_at, jobs.c.started_at, jobs.c.created_at))
+    )
+
+    with op.batch_alter_table("category_rule_apply_jobs") as batch:
+        batch.alter_column("updated_at", existing_type=sa.DateTime(), nullable=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("category_rule_apply_jobs") as batch:
+        batch.drop_column("updated_at")
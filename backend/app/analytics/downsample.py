@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Literal, Optional, Sequence
+
+Granularity = Literal["day", "week", "month"]
+
+# point = {"occurred_at": datetime, "balance": float, "min_balance": float, "max_balance": float}
+Point = Dict[str, Any]
+
+
+def _bucket_start(d: date, granularity: Granularity) -> date:
+    if granularity == "week":
+        return d - timedelta(days=d.weekday())  # ISO week, Monday start
+    if granularity == "month":
+        return d.replace(day=1)
+    return d
+
+
+def bucket_points(
+    points: Iterable[Point],
+    granularity: Granularity,
+    *,
+    make_ts: Callable[[date], datetime],
+) -> Iterator[Point]:
+    """
+    Streaming bucketing of a time-ordered balance series.
+
+    Each bucket yields one point stamped at the bucket start: the closing balance
+    (last point in the bucket) plus min/max over the points in the bucket.
+    Holds one bucket in memory at a time.
+    """
+    current_key: Optional[date] = None
+    close = lo = hi = 0.0
+
+    for p in points:
+        key = _bucket_start(p["occurred_at"].date(), granularity)
+        p_lo = p.get("min_balance", p["balance"])
+        p_hi = p.get("max_balance", p["balance"])
+        if key != current_key:
+            if current_key is not None:
+                yield {"occurred_at": make_ts(current_key), "balance": close, "min_balance": lo, "max_balance": hi}
+            current_key = key
+            lo, hi = p_lo, p_hi
+        else:
+            lo = min(lo, p_lo)
+            hi = max(hi, p_hi)
+        close = p["balance"]
+
+    if current_key is not None:
+        yield {"occurred_at": make_ts(current_key), "balance": close, "min_balance": lo, "max_balance": hi}
+
+
+def lttb(points: Iterable[Point], max_points: int, *, n: Optional[int] = None) -> List[Point]:
+    """
+    Largest-Triangle-Three-Buckets downsampling (Steinarsson, 2013) on
+    (occurred_at, balance). Keeps the first and last points; every other output
+    point is the one forming the largest triangle with the previously kept point
+    and the average of the next bucket. Single pass, O(n).
+
+    Streams `points` when their count `n` is given (or `points` is a
+    sequence): only the bucket being chosen from and the next one are held, so
+    memory is O(n / max_points + max_points) rather than O(n). An iterator
+    without `n` is read into a list first. If the iterator runs past `n`, the
+    extra points are read and the true last point is kept.
+
+    Raises ValueError if max_points < 3 (both endpoints plus one bucket), or
+    if the iterator ends before `n` points.
+    """
+    if max_points < 3:
+        raise ValueError(f"lttb: max_points must be >= 3, got {max_points}")
+    if n is None:
+        if not isinstance(points, Sequence):
+            points = list(points)
+        n = len(points)
+    it = iter(points)
+    if max_points >= n:
+        return list(it)
+
+    def _x(p: Point) -> float:
+        return p["occurred_at"].timestamp()
+
+    # buf holds points[buf_start : buf_start + len(buf)]
+    buf: List[Point] = []
+    buf_start = 1
+
+    def _read_to(end: int) -> None:
+        while buf_start + len(buf) < end:
+            p = next(it, None)
+            if p is None:
+                raise ValueError(f"lttb: expected {n} points, got {buf_start + len(buf)}")
+            buf.append(p)
+
+    first = next(it, None)
+    if first is None:
+        raise ValueError(f"lttb: expected {n} points, got 0")
+    out: List[Point] = [first]
+    every = (n - 2) / (max_points - 2)
+    ax, ay = _x(first), first["balance"]
+
+    for i in range(max_points - 2):
+        # current bucket [start, end); the next bucket's average is the "third" vertex
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        nxt_end = min(int((i + 2) * every) + 1, n)
+        del buf[: start - buf_start]  # the previous bucket, before reading the next
+        buf_start = start
+        _read_to(nxt_end)
+
+        nxt = buf[end - buf_start : nxt_end - buf_start]
+        if not nxt:
+            _read_to(n)
+            nxt = buf[-1:]
+        avg_x = sum(_x(p) for p in nxt) / len(nxt)
+        avg_y = sum(p["balance"] for p in nxt) / len(nxt)
+
+        best_area = -1.0
+        best = buf[0]
+        for p in buf[: end - buf_start]:
+            area = abs((ax - avg_x) * (p["balance"] - ay) - (ax - _x(p)) * (avg_y - ay))
+            if area > best_area:
+                best_area = area
+                best = p
+
+        out.append(best)
+        ax, ay = _x(best), best["balance"]
+
+    _read_to(n)
+    last = buf[-1]
+    for last in it:  # a stream longer than n: keep its real endpoint
+        pass
+    out.append(last)
+    return out
@@ -10,14 +10,19 @@ from sqlalchemy.orm import Session
 from backend.app.db import get_db
 from backend.app.models import Business, Organization
 from backend.app.models import (
-    RawEvent, Account, Category, CategoryRule,
+    RawEvent, NormalizedTxn, CashBalanceCheckpoint, CategorizationStats, Account, Category, CategoryRule,
     TxnCategorization, BusinessCategoryMap,
     BusinessIntegrationProfile,
 )
 from backend.app.norma.categorize_brain import brain
+from backend.app.norma.merchant import merchant_key_cache_info
+from backend.app.norma import rule_matcher
+from backend.app.norma.rule_matcher import bump_rules_version
+from backend.app.norma.suggestion_cache import suggestion_cache_info
+from backend.app.services import health_pipeline_service, normalized_txn_service
 
 # ✅ if you want seeding guaranteed before rules
-from backend.app.services.category_seed import seed_coa_and_categories_and_mappings
+from backend.app.services.category_seed import bump_coa_version, seed_coa_and_categories_and_mappings
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
@@ -34,16 +39,43 @@ def wipe_business_data(business_id: str, db: Session = Depends(get_db)):
 
     db.execute(delete(TxnCategorization).where(TxnCategorization.business_id == business_id))
     db.execute(delete(CategoryRule).where(CategoryRule.business_id == business_id))
+    bump_rules_version(db, business_id)
     db.execute(delete(BusinessCategoryMap).where(BusinessCategoryMap.business_id == business_id))
     db.execute(delete(Category).where(Category.business_id == business_id))
     db.execute(delete(Account).where(Account.business_id == business_id))
+    bump_coa_version(db, business_id)
+    db.execute(delete(CashBalanceCheckpoint).where(CashBalanceCheckpoint.business_id == business_id))
+    db.execute(delete(CategorizationStats).where(CategorizationStats.business_id == business_id))
+    db.execute(delete(NormalizedTxn).where(NormalizedTxn.business_id == business_id))
     db.execute(delete(RawEvent).where(RawEvent.business_id == business_id))
+    normalized_txn_service.bump_data_version(db, business_id)
     db.execute(delete(BusinessIntegrationProfile).where(BusinessIntegrationProfile.business_id == business_id))
 
     db.commit()
     return {"status": "ok", "wiped_business_id": business_id}
 
 
+@router.post("/business/{business_id}/seed/repair")
+def repair_business_seed(business_id: str, db: Session = Depends(get_db)):
+    """
+    Force a full COA/category/mapping seed, ignoring the seeded-state fingerprint
+    (e.g. after rows were edited directly in the DB).
+    """
+    biz = db.get(Business, business_id)
+    if not biz:
+        raise HTTPException(status_code=404, detail="business not found")
+
+    seed_coa_and_categories_and_mappings(db, business_id, force=True)
+    db.refresh(biz)
+    return {
+        "status": "ok",
+        "business_id": business_id,
+        "coa_version": biz.coa_version,
+        "mapping_version": biz.mapping_version,
+        "seed_fingerprint": biz.seed_fingerprint,
+    }
+
+
 @router.delete("/business/{business_id}")
 def delete_business(business_id: str, db: Session = Depends(get_db)):
     biz = db.get(Business, business_id)
@@ -66,6 +98,20 @@ def delete_organization(org_id: str, db: Session = Depends(get_db)):
     return {"status": "ok", "deleted_org_id": org_id}
 
 
+@router.get("/caches")
+def cache_stats():
+    """
+    In-process cache counters for this worker (hit rates, sizes).
+    """
+    return {
+        "suggestions": suggestion_cache_info(),
+        "merchant_key": merchant_key_cache_info(),
+        "health_pipeline": health_pipeline_service.cache_info(),
+        "rule_matcher": rule_matcher.cache_info(),
+        "brain": brain.cache_info(),
+    }
+
+
 # -------------------------
 # ✅ NEW: Bulk Rules (teach vendors fast)
 # -------------------------
@@ -141,6 +187,7 @@ def bulk_upsert_rules(business_id: str, req: BulkRulesRequest, db: Session = Dep
             )
             added += 1
 
+    bump_rules_version(db, business_id)
     db.commit()
     return {"status": "ok", "added": added, "updated": updated, "skipped": skipped}
 
@@ -220,5 +267,6 @@ def bulk_upsert_rules_by_name(business_id: str, req: BulkRulesByNameRequest, db:
             )
             added += 1
 
+    bump_rules_version(db, business_id)
     db.commit()
     return {"status": "ok", "added": added, "updated": updated, "skipped": skipped}
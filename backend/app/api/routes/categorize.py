@@ -3,7 +3,7 @@ from __future__ import annotations
 from datetime import datetime
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, Query
 from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 
@@ -141,10 +141,38 @@ class CategoryRulePreviewOut(BaseModel):
     samples: List[CategoryRulePreviewSample]
 
 
-class CategoryRuleApplyOut(BaseModel):
+class CategoryRulePreviewAllRule(BaseModel):
     rule_id: str
+    category_id: str
+    contains_text: str
+    priority: int
+    matched: int  # events this rule wins
+    candidates: int  # events whose text/filters it matches, won or not
+    shadowed: bool  # matches events but never wins
+    shadowed_by: List[str]  # rules that won its candidates, most frequent first
+    samples: List[CategoryRulePreviewSample]
+
+
+class CategoryRulePreviewAllOut(BaseModel):
+    business_id: str
+    scanned: int
+    matched: int
+    rules: List[CategoryRulePreviewAllRule]
+    shadowed_rule_ids: List[str]
+
+
+class CategoryRuleApplyJobOut(BaseModel):
+    job_id: str
+    business_id: str
+    rule_id: str
+    status: str  # queued/running/succeeded/failed
+    scanned: int
     matched: int
     updated: int
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
 
 
 @router.post("/business/{business_id}/label_vendor")
@@ -153,8 +181,17 @@ def label_vendor(business_id: str, req: LabelVendorIn, db: Session = Depends(get
 
 
 @router.get("/business/{business_id}/brain/vendors", response_model=List[BrainVendorOut])
-def list_brain_vendors(business_id: str, db: Session = Depends(get_db)):
-    return [BrainVendorOut(**item) for item in categorize_service.list_brain_vendors(db, business_id)]
+def list_brain_vendors(
+    business_id: str,
+    q: Optional[str] = Query(None, description="Canonical name prefix (case-insensitive)"),
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db),
+):
+    return [
+        BrainVendorOut(**item)
+        for item in categorize_service.list_brain_vendors(db, business_id, q=q, limit=limit, offset=offset)
+    ]
 
 
 @router.get("/business/{business_id}/brain/vendor", response_model=BrainVendorOut)
@@ -238,6 +275,17 @@ def delete_category_rule(
     return categorize_service.delete_category_rule(db, business_id, rule_id)
 
 
+@router.get("/{business_id}/rules/preview_all", response_model=CategoryRulePreviewAllOut)
+def preview_all_category_rules(
+    business_id: str,
+    sample_limit: int = Query(3, ge=0, le=20),
+    db: Session = Depends(get_db),
+):
+    return CategoryRulePreviewAllOut(
+        **categorize_service.preview_all_category_rules(db, business_id, sample_limit=sample_limit)
+    )
+
+
 @router.get("/{business_id}/rules/{rule_id}/preview", response_model=CategoryRulePreviewOut)
 def preview_category_rule(
     business_id: str,
@@ -249,13 +297,26 @@ def preview_category_rule(
     )
 
 
-@router.post("/{business_id}/rules/{rule_id}/apply", response_model=CategoryRuleApplyOut)
+@router.post("/{business_id}/rules/{rule_id}/apply", response_model=CategoryRuleApplyJobOut, status_code=202)
 def apply_category_rule(
     business_id: str,
     rule_id: str,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+):
+    # full-history apply runs as a background job; poll apply_jobs/{job_id}
+    job = categorize_service.start_rule_apply_job(db, business_id, rule_id)
+    background_tasks.add_task(categorize_service.run_rule_apply_job, job["job_id"])
+    return CategoryRuleApplyJobOut(**job)
+
+
+@router.get("/{business_id}/rules/apply_jobs/{job_id}", response_model=CategoryRuleApplyJobOut)
+def get_category_rule_apply_job(
+    business_id: str,
+    job_id: str,
     db: Session = Depends(get_db),
 ):
-    return CategoryRuleApplyOut(**categorize_service.apply_category_rule(db, business_id, rule_id))
+    return CategoryRuleApplyJobOut(**categorize_service.get_rule_apply_job(db, business_id, job_id))
 
 
 @router.post("/business/{business_id}/categorize")
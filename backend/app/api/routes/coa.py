@@ -11,6 +11,7 @@ from sqlalchemy.orm import Session
 
 from backend.app.db import get_db
 from backend.app.models import Business, Account
+from backend.app.services.category_seed import bump_coa_version
 import uuid
 
 router = APIRouter(prefix="/coa", tags=["coa"])
@@ -100,6 +101,7 @@ def create_account(business_id: str, req: AccountCreateIn, db: Session = Depends
         created_at=utcnow(),
     )
     db.add(a)
+    bump_coa_version(db, business_id)
     db.commit()
     db.refresh(a)
     return a
@@ -130,6 +132,7 @@ def update_account(business_id: str, account_id: str, req: AccountUpdateIn, db:
         setattr(a, k, v)
 
     db.add(a)
+    bump_coa_version(db, business_id)
     db.commit()
     db.refresh(a)
     return a
@@ -144,5 +147,6 @@ def deactivate_account(business_id: str, account_id: str, db: Session = Depends(
 
     a.active = False
     db.add(a)
+    bump_coa_version(db, business_id)
     db.commit()
     return {"status": "ok", "account_id": account_id, "active": False}
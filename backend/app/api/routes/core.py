@@ -1,10 +1,10 @@
 from __future__ import annotations
 
 from datetime import date, datetime, timezone
-from typing import Literal, Optional
+from typing import List, Literal, Optional
 
 from fastapi import APIRouter, Depends, HTTPException
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
@@ -14,6 +14,8 @@ from backend.app.models import Account, Business, Organization, RawEvent
 from backend.app.norma.categorize_brain import brain
 from backend.app.norma.merchant import merchant_key
 from backend.app.models import BusinessIntegrationProfile
+from backend.app.services import categorization_stats_service, normalized_txn_service, raw_event_service
+from backend.app.services.category_seed import bump_coa_version
 
 router = APIRouter()
 
@@ -45,6 +47,17 @@ class RawEventIn(BaseModel):
     payload: dict
 
 
+class RawEventBatchIn(BaseModel):
+    events: List[RawEventIn] = Field(..., max_length=20000)
+
+
+class RawEventBatchOut(BaseModel):
+    status: str
+    received: int
+    inserted: int
+    duplicates: int
+
+
 class LabelRequest(BaseModel):
     description: str
     canonical_name: str
@@ -146,6 +159,7 @@ def apply_coa_template(business_id: str, req: ApplyTemplateRequest, db: Session
         db.add(Account(business_id=business_id, **a))
         created += 1
 
+    bump_coa_version(db, business_id)
     db.commit()
     return {"status": "ok", "created": created}
 
@@ -199,11 +213,34 @@ def ingest_raw_event(req: RawEventIn, db: Session = Depends(get_db)):
         payload=req.payload,
     )
     db.add(ev)
+    db.flush()
+    normalized_txn_service.write_normalized_rows(
+        db,
+        [
+            {
+                "id": ev.id,
+                "business_id": ev.business_id,
+                "source_event_id": ev.source_event_id,
+                "occurred_at": ev.occurred_at,
+                "payload": ev.payload,
+            }
+        ],
+        replace=False,
+    )
+    categorization_stats_service.record_ingested(db, ev.business_id, [ev.source_event_id])
     db.commit()
     db.refresh(ev)
     return {"status": "ok", "raw_event_id": ev.id}
 
 
+@router.post("/raw_events/batch", response_model=RawEventBatchOut)
+def ingest_raw_events_batch(req: RawEventBatchIn, db: Session = Depends(get_db)):
+    """
+    Bulk ingest for bursty feeds: one set-based dedupe insert + one commit.
+    """
+    return raw_event_service.insert_raw_events(db, req.events)
+
+
 # ----------------------------
 # Brain Labeling
 # ----------------------------
@@ -3,7 +3,7 @@ Demo API router (DB-backed).
 
 Responsibility
 - Provide stable demo endpoints for the frontend:
-  - /dashboard cards
+  - /dashboard cards (business_health_snapshots, refreshed out of band)
   - /health/{business_id} full detail (facts + signals + score + ledger preview)
   - /transactions/{business_id} (with drilldown filters)
   - /analytics/monthly-trends/{business_id}
@@ -11,33 +11,36 @@ Responsibility
 Design notes
 - Keep the pipeline deterministic:
     events -> txns -> ledger -> facts -> signals -> score
+  (services/health_pipeline_service; cached until the business's data changes)
 - Avoid identity bugs:
   - ALWAYS use RawEvent.source_event_id as source_event_id
 """
 
 from __future__ import annotations
 
-from dataclasses import asdict
 from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, List, Literal, Optional, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
 from pydantic import BaseModel, Field
 from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
 from backend.app.analytics.monthly_trends import build_monthly_trends_payload
-from backend.app.clarity.scoring import compute_business_score
-from backend.app.clarity.signals import compute_signals
 from backend.app.db import get_db
-from backend.app.models import Business, CategoryRule, RawEvent, TxnCategorization
-from backend.app.norma.category_engine import suggest_category
-from backend.app.norma.facts import compute_facts, facts_to_dict
-from backend.app.norma.from_events import raw_event_to_txn
-from backend.app.norma.ledger import build_cash_ledger
+from backend.app.models import Business, CategoryRule, NormalizedTxn, TxnCategorization
+from backend.app.norma.category_engine import suggest_categories
+from backend.app.norma.categorization_context import CategorizationContext
 from backend.app.norma.merchant import merchant_key
 from backend.app.norma.categorize_brain import brain
-from backend.app.services import categorize_service, health_signal_service
+from backend.app.services import (
+    categorize_service,
+    health_pipeline_service,
+    health_signal_service,
+    health_snapshot_service,
+    normalized_txn_service,
+)
+from backend.app.services.category_seed import seed_coa_and_categories_and_mappings
 from backend.app.clarity.health_v1 import build_health_v1_signals
 
 router = APIRouter(prefix="/demo", tags=["demo"])
@@ -160,65 +163,23 @@ def _load_event_txn_pairs_from_db(
     biz_db_id: str,  # Business.id (UUID string)
     limit_events: int = 2000,
     chronological: bool = True,
-) -> Tuple[List[Tuple[RawEvent, Any]], Optional[datetime]]:
+) -> Tuple[List[Tuple[NormalizedTxn, Any]], Optional[datetime]]:
     """
-    Returns [(RawEvent, NormalizedTransaction), ...] and newest occurred_at (if any).
+    Returns [(NormalizedTxn, NormalizedTransaction), ...] and newest occurred_at (if any).
+
+    Reads the materialized normalized_transactions rows (no payload parsing).
 
     IMPORTANT:
     - The NormalizedTransaction.source_event_id MUST be RawEvent.source_event_id
       so it lines up with TxnCategorization joins.
     """
-    events = (
-        db.execute(
-            select(RawEvent)
-            .where(RawEvent.business_id == biz_db_id)
-            .order_by(RawEvent.occurred_at.desc())
-            .limit(limit_events)
-        )
-        .scalars()
-        .all()
+    return normalized_txn_service.load_event_txn_pairs(
+        db,
+        biz_db_id,
+        limit_events=limit_events,
+        chronological=chronological,
     )
 
-    pairs: List[Tuple[RawEvent, Any]] = []
-    iterable = reversed(events) if chronological else events
-
-    for e in iterable:
-        try:
-            txn = raw_event_to_txn(
-                e.payload,
-                e.occurred_at,
-                source_event_id=e.source_event_id,  # ✅ stable vendor/dedupe key
-            )
-            pairs.append((e, txn))
-        except Exception:
-            # keep current behavior: skip normalization failures
-            continue
-
-    last_event_occurred_at = events[0].occurred_at if events else None
-    return pairs, last_event_occurred_at
-
-
-def _compute_health_from_txns(txns: List[Any]):
-    """
-    Deterministic pipeline: txns -> ledger -> facts -> signals -> score.
-    """
-    ledger = build_cash_ledger(txns, opening_balance=0.0)
-
-    facts_obj = compute_facts(txns, ledger)
-    facts_json = facts_to_dict(facts_obj)
-
-    scoring_input = {
-        "current_cash": facts_json["current_cash"],
-        "monthly_inflow_outflow": facts_json["monthly_inflow_outflow"],
-        "totals_by_category": facts_json["totals_by_category"],
-    }
-
-    signals = compute_signals(facts_obj)               # List[Signal dataclass]
-    signals_dicts = [asdict(s) for s in signals]       # score expects dict-ish inputs
-    breakdown = compute_business_score(scoring_input, signals_dicts)
-
-    return facts_obj, facts_json, scoring_input, signals, signals_dicts, breakdown, ledger
-
 
 def _resolve_demo_date_range(txns: List[Any], ledger: List[Any]) -> Tuple[Optional[str], Optional[str]]:
     dates: List[Any] = []
@@ -238,7 +199,7 @@ def _resolve_demo_date_range(txns: List[Any], ledger: List[Any]) -> Tuple[Option
     return start_at.isoformat(), end_at.isoformat()
 
 
-def _attach_signal_refs(signals_dicts: List[dict], pairs: List[Tuple[RawEvent, Any]]) -> List[dict]:
+def _attach_signal_refs(signals_dicts: List[dict], txns: List[Any]) -> List[dict]:
     """
     Attach evidence_refs for drilldowns (MVP).
 
@@ -247,9 +208,9 @@ def _attach_signal_refs(signals_dicts: List[dict], pairs: List[Tuple[RawEvent, A
 
     evidence_refs use source_event_id = RawEvent.source_event_id (stable join key).
     """
-    spend_pairs = [(e, t) for (e, t) in pairs if float(getattr(t, "amount", 0.0)) < 0]
-    spend_pairs.sort(key=lambda et: abs(float(et[1].amount)), reverse=True)
-    top_spend_source_ids = [e.source_event_id for (e, _t) in spend_pairs[:12]]
+    spend = [t for t in txns if float(getattr(t, "amount", 0.0)) < 0]
+    spend.sort(key=lambda t: abs(float(t.amount)), reverse=True)
+    top_spend_source_ids = [t.source_event_id for t in spend[:12]]
 
     out: List[dict] = []
     for d in signals_dicts:
@@ -384,9 +345,9 @@ def _build_dashboard_signals(signals: List[Any], facts_json: Dict[str, Any]) ->
 
 
 def _filter_pairs_for_window(
-    pairs: List[Tuple[RawEvent, Any]],
+    pairs: List[Tuple[NormalizedTxn, Any]],
     window_days: int,
-) -> List[Tuple[RawEvent, Any]]:
+) -> List[Tuple[NormalizedTxn, Any]]:
     if not pairs:
         return []
     anchor = max(e.occurred_at for e, _t in pairs)
@@ -394,11 +355,11 @@ def _filter_pairs_for_window(
     return [(e, t) for e, t in pairs if start <= e.occurred_at <= anchor]
 
 
-def _sort_pairs_deterministic(pairs: List[Tuple[RawEvent, Any]]) -> List[Tuple[RawEvent, Any]]:
+def _sort_pairs_deterministic(pairs: List[Tuple[NormalizedTxn, Any]]) -> List[Tuple[NormalizedTxn, Any]]:
     return sorted(pairs, key=lambda pair: (pair[0].occurred_at, pair[0].source_event_id))
 
 
-def _build_drilldown_rows(pairs: List[Tuple[RawEvent, Any]]) -> List[DrilldownRowOut]:
+def _build_drilldown_rows(pairs: List[Tuple[NormalizedTxn, Any]]) -> List[DrilldownRowOut]:
     rows: List[DrilldownRowOut] = []
     for e, t in pairs:
         rows.append(
@@ -412,7 +373,7 @@ def _build_drilldown_rows(pairs: List[Tuple[RawEvent, Any]]) -> List[DrilldownRo
                 account=t.account,
                 category=t.category,
                 counterparty_hint=t.counterparty_hint,
-                merchant_key=merchant_key(t.description),
+                merchant_key=e.merchant_key if e.merchant_key is not None else merchant_key(t.description),
             )
         )
     return rows
@@ -434,35 +395,13 @@ def demo_monthly_trends_by_business(
     db: Session = Depends(get_db),
 ):
     biz = _require_business(db, business_id)
-
-    pairs, _last = _load_event_txn_pairs_from_db(
-        db=db,
-        biz_db_id=biz.id,
-        limit_events=4000,
-        chronological=True,
-    )
-    txns = [t for _e, t in pairs]
-
-    # compute facts_json
-    _facts_obj, facts_json, _scoring_input, _signals, _signals_dicts, _breakdown, ledger = _compute_health_from_txns(txns)
-
-    # build full ledger rows for cash_end
-    ledger_rows = [
-        {
-            "occurred_at": r.occurred_at.isoformat(),
-            "date": r.date.isoformat(),
-            "amount": float(r.amount),
-            "balance": float(r.balance),
-            "source_event_id": r.source_event_id,
-        }
-        for r in ledger
-    ]
+    pipeline = health_pipeline_service.get_health_pipeline(db, biz.id, limit_events=4000)
 
     payload = build_monthly_trends_payload(
-        facts_json=facts_json,
+        facts_json=pipeline.facts_json,
         lookback_months=lookback_months,
         k=k,
-        ledger_rows=ledger_rows,
+        ledger_rows=pipeline.ledger_rows,
     )
 
     return {
@@ -474,34 +413,25 @@ def demo_monthly_trends_by_business(
 
 
 @router.get("/dashboard")
-def demo_dashboard(db: Session = Depends(get_db)):
+def demo_dashboard(
+    background_tasks: BackgroundTasks,
+    sort: health_snapshot_service.SortKey = Query("created_at"),
+    order: health_snapshot_service.SortOrder = Query("desc"),
+    limit: int = Query(100, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db),
+):
     """
-    DB-backed list of businesses (each card computed from raw_events).
+    Paginated business cards from business_health_snapshots (one query).
+    Stale or missing cards are flagged and refreshed in the background.
     """
-    biz_rows = db.execute(select(Business).order_by(Business.created_at.desc())).scalars().all()
-
-    cards = []
-    for biz in biz_rows:
-        pairs, _last = _load_event_txn_pairs_from_db(
-            db=db,
-            biz_db_id=biz.id,
-            limit_events=1000,
-            chronological=True,
-        )
-        txns = [t for _e, t in pairs]
-        _facts_obj, _facts_json, _scoring_input, signals, _signals_dicts, breakdown, _ledger = _compute_health_from_txns(txns)
+    page = health_snapshot_service.list_dashboard_cards(db, sort=sort, order=order, limit=limit, offset=offset)
 
-        cards.append(
-            {
-                "business_id": str(biz.id),
-                "name": biz.name,
-                "risk": breakdown.risk,
-                "health_score": breakdown.overall,
-                "highlights": [s.title for s in signals[:3]],
-            }
-        )
+    stale_ids = health_snapshot_service.claim_refresh(c["business_id"] for c in page["cards"] if c["stale"])
+    if stale_ids:
+        background_tasks.add_task(health_snapshot_service.run_refresh, stale_ids)
 
-    return {"cards": cards}
+    return page
 
 
 @router.get("/dashboard/{business_id}", response_model=DashboardPayloadOut)
@@ -512,32 +442,15 @@ def demo_dashboard_by_business(
     db: Session = Depends(get_db),
 ):
     biz = _require_business(db, business_id)
-    pairs, last_event_occurred_at = _load_event_txn_pairs_from_db(
-        db=db,
-        biz_db_id=biz.id,
-        limit_events=4000,
-        chronological=True,
-    )
-    txns = [t for _e, t in pairs]
-
-    _facts_obj, facts_json, _scoring_input, signals, _signals_dicts, _breakdown, ledger = _compute_health_from_txns(txns)
-    start_at, end_at = _resolve_demo_date_range(txns, ledger)
-    ledger_rows = [
-        {
-            "occurred_at": r.occurred_at.isoformat(),
-            "date": r.date.isoformat(),
-            "amount": float(r.amount),
-            "balance": float(r.balance),
-            "source_event_id": r.source_event_id,
-        }
-        for r in ledger
-    ]
+    pipeline = health_pipeline_service.get_health_pipeline(db, biz.id, limit_events=4000)
+    last_event_occurred_at = pipeline.last_event_occurred_at
+    start_at, end_at = _resolve_demo_date_range(pipeline.txns, pipeline.ledger)
 
     trends_payload = build_monthly_trends_payload(
-        facts_json=facts_json,
+        facts_json=pipeline.facts_json,
         lookback_months=lookback_months,
         k=k,
-        ledger_rows=ledger_rows,
+        ledger_rows=pipeline.ledger_rows,
     )
 
     return DashboardPayloadOut(
@@ -551,8 +464,8 @@ def demo_dashboard_by_business(
             start_at=start_at,
             end_at=end_at,
         ),
-        kpis=_dashboard_kpis(facts_json),
-        signals=_build_dashboard_signals(signals, facts_json),
+        kpis=_dashboard_kpis(pipeline.facts_json),
+        signals=_build_dashboard_signals(pipeline.signals, pipeline.facts_json),
         trends=DashboardTrendsOut(**trends_payload),
     )
 
@@ -561,31 +474,18 @@ def demo_dashboard_by_business(
 def demo_health_by_business(business_id: str, db: Session = Depends(get_db)):
     biz = _require_business(db, business_id)
 
-    pairs, last_event_occurred_at = _load_event_txn_pairs_from_db(
-        db=db,
-        biz_db_id=biz.id,
-        limit_events=2000,
-        chronological=True,
+    pipeline = health_pipeline_service.get_health_pipeline(db, biz.id, limit_events=2000)
+    last_event_occurred_at = pipeline.last_event_occurred_at
+    facts_json, signals, breakdown = pipeline.facts_json, pipeline.signals, pipeline.breakdown
+    start_at, end_at = _resolve_demo_date_range(pipeline.txns, pipeline.ledger)
+    sig_out = _attach_signal_refs(pipeline.signals_dicts, pipeline.txns)
+
+    seed_coa_and_categories_and_mappings(db, biz.id)
+    ctx = CategorizationContext.load(db, biz.id)
+    categorization_metrics = categorize_service.categorization_metrics(db, biz.id, ctx=ctx)
+    uncategorized_txns = categorize_service.list_txns_to_categorize(
+        db, biz.id, limit=120, only_uncategorized=True, ctx=ctx
     )
-    txns = [t for _e, t in pairs]
-
-    _facts_obj, facts_json, scoring_input, signals, signals_dicts, breakdown, ledger = _compute_health_from_txns(txns)
-    start_at, end_at = _resolve_demo_date_range(txns, ledger)
-    sig_out = _attach_signal_refs(signals_dicts, pairs)
-
-    ledger_rows = [
-        {
-            "occurred_at": r.occurred_at.isoformat(),
-            "date": r.date.isoformat(),
-            "amount": float(r.amount),
-            "balance": float(r.balance),
-            "source_event_id": r.source_event_id,
-        }
-        for r in ledger
-    ]
-
-    categorization_metrics = categorize_service.categorization_metrics(db, biz.id)
-    uncategorized_txns = categorize_service.list_txns_to_categorize(db, biz.id, limit=120, only_uncategorized=True)
     fix_suggestions = _build_fix_suggestions(uncategorized_txns, limit=4)
     fix_examples = _build_uncategorized_examples(uncategorized_txns, limit=4)
     rule_count = db.execute(
@@ -597,12 +497,13 @@ def demo_health_by_business(business_id: str, db: Session = Depends(get_db)):
 
     health_signals = build_health_v1_signals(
         facts_json=facts_json,
-        ledger_rows=ledger_rows,
-        txns=txns,
+        ledger_rows=pipeline.ledger_rows,
+        txns=pipeline.txns,
         updated_at=None if not last_event_occurred_at else last_event_occurred_at.isoformat(),
         categorization_metrics=categorization_metrics,
         rule_count=int(rule_count or 0),
         is_known_vendor=_is_known_vendor,
+        merchant_keys=pipeline.merchant_keys,
     )
     for signal in health_signals:
         if signal.get("id") in {"high_uncategorized_rate", "rule_coverage_low", "new_unknown_vendors"}:
@@ -635,7 +536,7 @@ def demo_health_by_business(business_id: str, db: Session = Depends(get_db)):
         "highlights": [s.title for s in signals[:3]],
         "signals": sig_out,
         "health_signals": health_signals,
-        "facts": scoring_input,
+        "facts": pipeline.scoring_input,
         "facts_full": facts_json,  # ✅ fixed
         "ledger_preview": facts_json.get("last_10_ledger_rows", []),
     }
@@ -684,17 +585,21 @@ def demo_drilldown_vendor(
 ):
     biz = _require_business(db, business_id)
     vendor_key = merchant_key(vendor)
-    pairs, _last = _load_event_txn_pairs_from_db(
-        db=db,
-        biz_db_id=biz.id,
-        limit_events=4000,
-        chronological=True,
+    # merchant -> events via the persisted merchant_key index; window anchored
+    # on the business's newest event (same as _filter_pairs_for_window)
+    normalized_txn_service.ensure_normalized(db, biz.id)
+    anchor = normalized_txn_service.latest_occurred_at(db, biz.id)
+    rows = (
+        normalized_txn_service.merchant_rows(
+            db,
+            biz.id,
+            vendor_key,
+            occurred_from=anchor - timedelta(days=window_days - 1),
+        )
+        if anchor and vendor_key
+        else []
     )
-    window_pairs = _filter_pairs_for_window(pairs, window_days)
-    filtered = [
-        (e, t) for e, t in window_pairs if merchant_key(t.description) == vendor_key
-    ]
-    sorted_pairs = _sort_pairs_deterministic(filtered)
+    sorted_pairs = [(r, normalized_txn_service.row_to_txn(r)) for r in rows]
     total = len(sorted_pairs)
     paged = sorted_pairs[offset : offset + limit]
     return DrilldownResponseOut(
@@ -766,16 +671,24 @@ def demo_transactions_by_business(
         .all()
     )
     categorization_map = {row.source_event_id: row for row in categorization_rows}
+    ctx = CategorizationContext.load(db, biz.id)
+
+    picked = [
+        (e, t)
+        for e, t in newest_first
+        if not (id_set and e.source_event_id not in id_set)
+        and not (category and t.category != category)
+        and not (direction and t.direction != direction)
+    ][:limit]
+    needs_suggestion = [
+        t
+        for e, t in picked
+        if e.source_event_id not in categorization_map and (t.category or "").strip().lower() == "uncategorized"
+    ]
+    suggested_by_id = {s.source_event_id: s for s in suggest_categories(ctx, needs_suggestion)}
 
     items: List[dict] = []
-    for e, t in newest_first:
-        if id_set and e.source_event_id not in id_set:
-            continue
-        if category and t.category != category:
-            continue
-        if direction and t.direction != direction:
-            continue
-
+    for e, t in picked:
         suggestion_source: Optional[str] = None
         confidence: Optional[float] = None
         reason: Optional[str] = None
@@ -785,9 +698,8 @@ def demo_transactions_by_business(
             suggestion_source = manual.source
             confidence = manual.confidence
             reason = manual.note
-        elif (t.category or "").strip().lower() == "uncategorized":
-            suggested = suggest_category(db, t, business_id=biz.id)
-            cat_obj = getattr(suggested, "categorization", None)
+        elif e.source_event_id in suggested_by_id:
+            cat_obj = getattr(suggested_by_id[e.source_event_id], "categorization", None)
             if cat_obj:
                 candidate = (cat_obj.category or "").strip().lower()
                 if candidate and candidate != "uncategorized":
@@ -797,7 +709,7 @@ def demo_transactions_by_business(
 
         items.append(
             {
-                "id": f"txn_{e.id}",                   # DB row id (internal)
+                "id": f"txn_{e.raw_event_id}",         # DB row id (internal)
                 "source_event_id": e.source_event_id,  # ✅ stable public id
                 "occurred_at": e.occurred_at.isoformat(),
                 "date": t.date.isoformat(),
@@ -807,16 +719,13 @@ def demo_transactions_by_business(
                 "account": t.account,
                 "category": t.category,
                 "counterparty_hint": t.counterparty_hint,
-                "merchant_key": merchant_key(t.description),
+                "merchant_key": e.merchant_key if e.merchant_key is not None else merchant_key(t.description),
                 "suggestion_source": suggestion_source,
                 "confidence": confidence,
                 "reason": reason,
             }
         )
 
-        if len(items) >= limit:
-            break
-
     return {
         "business_id": str(biz.id),
         "name": biz.name,
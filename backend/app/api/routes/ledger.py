@@ -72,6 +72,18 @@ class BalanceSheetV1Out(BaseModel):
 class CashPointOut(BaseModel):
     occurred_at: datetime
     balance: float
+    # set when the series is bucketed (granularity=...): min/max daily close in the bucket
+    min_balance: Optional[float] = None
+    max_balance: Optional[float] = None
+
+
+class LedgerBundleOut(BaseModel):
+    start_date: date
+    end_date: date
+    lines: List[LedgerLineOut]
+    income_statement: IncomeStatementOut
+    cash_flow: CashFlowOut
+    balance_sheet: BalanceSheetV1Out
 
 
 # -------------------------
@@ -116,9 +128,13 @@ def cash_series(
     start_date: Optional[date] = Query(None),
     end_date: Optional[date] = Query(None),
     starting_cash: float = Query(0.0),
+    granularity: Optional[Literal["day", "week", "month"]] = Query(None),
+    max_points: Optional[int] = Query(None, ge=3, le=5000, description="LTTB downsample to at most N points"),
     db: Session = Depends(get_db),
 ):
-    return ledger_service.cash_series(db, business_id, start_date, end_date, starting_cash)
+    return ledger_service.cash_series(
+        db, business_id, start_date, end_date, starting_cash, granularity=granularity, max_points=max_points
+    )
 
 
 @router.get("/business/{business_id}/balance_sheet_v1", response_model=BalanceSheetV1Out)
@@ -129,3 +145,16 @@ def balance_sheet_v1(
     db: Session = Depends(get_db),
 ):
     return ledger_service.balance_sheet_v1(db, business_id, as_of, starting_cash)
+
+
+@router.get("/business/{business_id}/bundle", response_model=LedgerBundleOut)
+def ledger_bundle(
+    business_id: str,
+    start_date: date = Query(..., description="Inclusive start date (YYYY-MM-DD)"),
+    end_date: date = Query(..., description="Inclusive end date (YYYY-MM-DD)"),
+    limit: int = Query(2000, ge=1, le=2000),
+    starting_cash: float = Query(0.0),
+    db: Session = Depends(get_db),
+):
+    # Ledger page: lines + income statement + cash flow + balance sheet (as of end_date) in one scan.
+    return ledger_service.ledger_bundle(db, business_id, start_date, end_date, limit, starting_cash)
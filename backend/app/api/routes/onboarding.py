@@ -218,7 +218,7 @@ def bootstrap_business(req: BootstrapBusinessIn, db: Session = Depends(get_db)):
         db.flush()
 
         # 2) Seed COA + categories + mappings (canonical)
-        seed_coa_and_categories_and_mappings(db, biz.id)
+        seed_coa_and_categories_and_mappings(db, biz.id, force=True)
 
         # 3) Create Integration Profile w/ story
         story = default_story()
@@ -351,7 +351,7 @@ def apply_coa_template(business_id: str, req: ApplyCoaIn, db: Session = Depends(
 
     # IMPORTANT: re-run canonical seeder so categories + mappings stay aligned
     db.flush()
-    seed_coa_and_categories_and_mappings(db, business_id)
+    seed_coa_and_categories_and_mappings(db, business_id, force=True)
 
     db.commit()
     return ApplyCoaOut(business_id=business_id, template=req.template, created=created, skipped=skipped)
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from dataclasses import asdict, dataclass
 from datetime import date, timedelta
-from typing import Any, Callable, Dict, Iterable, List, Literal, Optional, Sequence, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Literal, Mapping, Optional, Sequence, Tuple
 import calendar
 
 from backend.app.analytics.monthly_trends import build_monthly_trends_payload
@@ -87,6 +87,28 @@ def _safe_float(value: Any) -> float:
         return 0.0
 
 
+KeyOf = Callable[[NormalizedTransaction], str]
+
+
+def _description_key(t: NormalizedTransaction) -> str:
+    return merchant_key(t.description)
+
+
+def _merchant_key_of(persisted: Optional[Mapping[str, Optional[str]]]) -> KeyOf:
+    """
+    merchant_key for a txn: the key persisted at ingest (by source_event_id)
+    when the caller supplies it, else computed from the description.
+    """
+    if not persisted:
+        return _description_key
+
+    def key_of(t: NormalizedTransaction) -> str:
+        mk = persisted.get(t.source_event_id)
+        return mk if mk is not None else merchant_key(t.description)
+
+    return key_of
+
+
 def _pick_examples(
     txns: Iterable[NormalizedTransaction],
     start: date,
@@ -94,6 +116,7 @@ def _pick_examples(
     direction: Optional[str] = None,
     limit: int = 3,
     merchant_keys: Optional[set[str]] = None,
+    key_of: KeyOf = _description_key,
 ) -> List[Dict[str, Any]]:
     filtered = []
     for t in txns:
@@ -101,7 +124,7 @@ def _pick_examples(
             continue
         if direction and t.direction != direction:
             continue
-        mk = merchant_key(t.description)
+        mk = key_of(t)
         if merchant_keys and mk not in merchant_keys:
             continue
         filtered.append((t, mk))
@@ -146,12 +169,12 @@ def _sum_inflow(txns: Iterable[NormalizedTransaction]) -> float:
     return sum(_safe_float(t.amount) for t in txns if t.direction == "inflow")
 
 
-def _vendor_totals(txns: Iterable[NormalizedTransaction]) -> Dict[str, float]:
+def _vendor_totals(txns: Iterable[NormalizedTransaction], key_of: KeyOf = _description_key) -> Dict[str, float]:
     totals: Dict[str, float] = {}
     for t in txns:
         if t.direction != "outflow":
             continue
-        mk = merchant_key(t.description)
+        mk = key_of(t)
         if not mk:
             continue
         totals[mk] = totals.get(mk, 0.0) + _safe_float(t.amount)
@@ -184,7 +207,14 @@ def build_health_v1_signals(
     categorization_metrics: Optional[Dict[str, Any]] = None,
     rule_count: int = 0,
     is_known_vendor: Optional[Callable[[str], bool]] = None,
+    merchant_keys: Optional[Mapping[str, Optional[str]]] = None,
 ) -> List[Dict[str, Any]]:
+    """
+    `merchant_keys` ({source_event_id: NormalizedTxn.merchant_key}) lets the
+    vendor signals reuse the keys persisted at ingest instead of re-deriving
+    them from every description.
+    """
+    key_of = _merchant_key_of(merchant_keys)
     series = _build_monthly_series(facts_json, ledger_rows)
     series_by_month = _series_by_month(series)
     latest_months = _latest_months(series, 2)
@@ -309,7 +339,7 @@ def build_health_v1_signals(
             else "Outflow jumped from a near-zero baseline."
         )
         start, end = _month_range(last_month)
-        expense_examples = _pick_examples(txns, start, end, direction="outflow")
+        expense_examples = _pick_examples(txns, start, end, direction="outflow", key_of=key_of)
         expense_metrics = {
             "last_month_outflow": round(last_outflow, 2),
             "prev_month_outflow": round(prev_outflow, 2),
@@ -366,7 +396,7 @@ def build_health_v1_signals(
             else "Inflow dipped after a low prior baseline."
         )
         start, end = _month_range(last_month)
-        revenue_examples = _pick_examples(txns, start, end, direction="inflow")
+        revenue_examples = _pick_examples(txns, start, end, direction="inflow", key_of=key_of)
         revenue_metrics = {
             "last_month_inflow": round(last_inflow, 2),
             "prev_month_inflow": round(prev_inflow, 2),
@@ -414,7 +444,7 @@ def build_health_v1_signals(
     if anchor:
         start = anchor - timedelta(days=89)
         window_txns = [t for t in txns if start <= t.date <= anchor]
-        vendor_totals = _vendor_totals(window_txns)
+        vendor_totals = _vendor_totals(window_txns, key_of)
         total_outflow = sum(vendor_totals.values())
         if vendor_totals and total_outflow > 0:
             vendor_key, top_total = max(vendor_totals.items(), key=lambda kv: (kv[1], kv[0]))
@@ -435,6 +465,7 @@ def build_health_v1_signals(
                 anchor,
                 direction="outflow",
                 merchant_keys={vendor_key},
+                key_of=key_of,
             )
         else:
             vendor_metrics = {
@@ -483,7 +514,7 @@ def build_health_v1_signals(
     if anchor and is_known_vendor:
         start = anchor - timedelta(days=29)
         window_txns = [t for t in txns if start <= t.date <= anchor]
-        vendor_keys = [merchant_key(t.description) for t in window_txns if t.direction == "outflow"]
+        vendor_keys = [key_of(t) for t in window_txns if t.direction == "outflow"]
         unique_vendors = {k for k in vendor_keys if k}
         unknown_vendors = {k for k in unique_vendors if not is_known_vendor(k)}
         unknown_count = len(unknown_vendors)
@@ -505,6 +536,7 @@ def build_health_v1_signals(
                 anchor,
                 direction="outflow",
                 merchant_keys=unknown_vendors,
+                key_of=key_of,
             )
         else:
             unknown_metrics = {"total_vendors_30d": 0}
@@ -553,7 +585,7 @@ def build_health_v1_signals(
         window_txns = [t for t in txns if start <= t.date <= anchor and t.direction == "outflow"]
         vendor_counts: Dict[str, int] = {}
         for t in window_txns:
-            mk = merchant_key(t.description)
+            mk = key_of(t)
             if not mk:
                 continue
             vendor_counts[mk] = vendor_counts.get(mk, 0) + 1
@@ -575,6 +607,7 @@ def build_health_v1_signals(
                 anchor,
                 direction="outflow",
                 merchant_keys={top_repeat_vendor},
+                key_of=key_of,
             )
 
     signals.append(
@@ -631,7 +664,7 @@ def build_health_v1_signals(
             overdraft_summary = f"Lowest month-end cash was ${min_cash:,.0f}."
         if min_month:
             start, end = _month_range(min_month)
-            overdraft_examples = _pick_examples(txns, start, end, direction="outflow")
+            overdraft_examples = _pick_examples(txns, start, end, direction="outflow", key_of=key_of)
 
     signals.append(
         HealthSignal(
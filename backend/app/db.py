@@ -2,8 +2,10 @@ from __future__ import annotations
 from dotenv import load_dotenv
 
 import os
+from typing import Any, Dict, Iterable, List, Mapping, Sequence
+
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, DeclarativeBase
+from sqlalchemy.orm import Session, sessionmaker, DeclarativeBase
 
 import os
 from sqlalchemy import create_engine
@@ -25,3 +27,76 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def _dialect_insert(db: Session, caller: str):
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        raise NotImplementedError(f"{caller}: unsupported dialect '{dialect}'")
+    return dialect_insert
+
+
+def insert_ignore_conflicts(
+    db: Session,
+    model: Any,
+    rows: Sequence[Dict[str, Any]],
+    conflict_columns: Iterable[str],
+    *,
+    returning: str = "id",
+) -> List[Any]:
+    """
+    Set-based insert that skips rows hitting a unique key:
+      - Postgres: INSERT ... ON CONFLICT (cols) DO NOTHING RETURNING <col>
+      - SQLite:   INSERT ... ON CONFLICT (cols) DO NOTHING RETURNING <col>
+
+    Runs as ONE Core executemany on the session's connection (no ORM unit of
+    work, statement compiled once; SQLAlchemy batches it as insertmanyvalues).
+    Rows must carry every NOT NULL column, including ids/timestamps normally
+    filled by Python defaults.
+    Returns the `returning` column of the rows actually inserted (skipped
+    duplicates return nothing), so callers never rely on executemany rowcount,
+    which psycopg does not report reliably. Does NOT commit.
+    """
+    if not rows:
+        return []
+
+    table = model.__table__
+    stmt = (
+        _dialect_insert(db, "insert_ignore_conflicts")(table)
+        .on_conflict_do_nothing(index_elements=list(conflict_columns))
+        .returning(table.c[returning])
+    )
+    return list(db.connection().execute(stmt, list(rows)).scalars().all())
+
+
+def upsert_add_conflicts(
+    db: Session,
+    model: Any,
+    rows: Sequence[Dict[str, Any]],
+    conflict_columns: Iterable[str],
+    increments: Mapping[str, str],
+    *,
+    replace_columns: Iterable[str] = (),
+) -> None:
+    """
+    Set-based insert that folds rows hitting a unique key into the existing row:
+      INSERT ... ON CONFLICT (cols) DO UPDATE
+        SET col = col + excluded.<increments[col]>, ..., r = excluded.r (replace_columns)
+
+    Atomic on both dialects, so concurrent writers of the same key add up
+    instead of racing on "insert if missing". Same row requirements as
+    insert_ignore_conflicts. Does NOT commit.
+    """
+    if not rows:
+        return
+
+    table = model.__table__
+    stmt = _dialect_insert(db, "upsert_add_conflicts")(table)
+    set_: Dict[str, Any] = {col: table.c[col] + stmt.excluded[src] for col, src in increments.items()}
+    set_.update({col: stmt.excluded[col] for col in replace_columns})
+    stmt = stmt.on_conflict_do_update(index_elements=list(conflict_columns), set_=set_)
+    db.connection().execute(stmt, list(rows))
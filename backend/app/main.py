@@ -1,3 +1,5 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
@@ -12,12 +14,25 @@ from backend.app.seed.run import seed_system_categories
 from backend.app.api.routes.admin import router as admin_router
 from backend.app.api.routes.ledger import router as ledger_router
 from backend.app.api.routes.brief import router as brief_router
+from backend.app.db import SessionLocal
+from backend.app.services.categorize_service import fail_stale_rule_apply_jobs
+
+
 
 
 
+@asynccontextmanager
+async def _lifespan(app: FastAPI):
+    # rule-apply jobs run as BackgroundTasks and die with the process that ran them
+    db = SessionLocal()
+    try:
+        fail_stale_rule_apply_jobs(db)
+    finally:
+        db.close()
+    yield
 
 
-app = FastAPI(title="Clarity Labs API", version="0.1.0")
+app = FastAPI(title="Clarity Labs API", version="0.1.0", lifespan=_lifespan)
 
 # @app.on_event("startup")
 # def _startup_seed():
@@ -1,11 +1,12 @@
 from __future__ import annotations
 
 import uuid
-from datetime import datetime
+from datetime import date, datetime
 from typing import Optional
 
 from sqlalchemy import (
     Boolean,
+    Date,
     DateTime,
     ForeignKey,
     JSON,
@@ -111,6 +112,28 @@ class Business(Base):
     industry: Mapped[Optional[str]] = mapped_column(String(120), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=utcnow, nullable=False)
 
+    # bumped by CategoryRule writes; keys the compiled rule matcher cache (norma/rule_matcher.py)
+    rules_version: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+
+    # seeded-state fingerprint (services/category_seed.py): COA writes bump coa_version, seeding that
+    # changes categories/mappings bumps mapping_version; seed_fingerprint records the pair last seeded
+    coa_version: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    mapping_version: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    seed_fingerprint: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+
+    # bumped by every write/delete of the business's normalized rows (normalized_txn_service.bump_data_version);
+    # health snapshots record the value they were computed from
+    data_version: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+
+    # normalized_transactions sync watermark (normalized_txn_service.ensure_normalized): the NORMALIZER_VERSION
+    # the business was last synced to and the newest raw_events.created_at that sync covered
+    normalized_version: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    normalized_through: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+
+    # set once cash_balance_checkpoints reflect every posted line, cleared by invalidate
+    # (cash_checkpoint_service); keeps a business with no posted lines from rebuilding on each read
+    cash_checkpoints_built: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False, server_default=text("false"))
+
     org = relationship("Organization", back_populates="businesses")
 
     accounts = relationship(
@@ -202,6 +225,14 @@ class RawEvent(Base):
     Immutable vendor event log. This is your replayable truth.
     """
     __tablename__ = "raw_events"
+    __table_args__ = (
+        UniqueConstraint("business_id", "source", "source_event_id", name="uq_raw_events_business_source_event"),
+        # hot read path: WHERE business_id = ? ORDER BY occurred_at DESC[, source_event_id DESC]
+        Index("ix_raw_events_business_occurred_source", "business_id", "occurred_at", "source_event_id"),
+        # newest created_at / count per business: normalized_transactions sync and
+        # health pipeline cache watermarks
+        Index("ix_raw_events_business_created", "business_id", "created_at"),
+    )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=uuid_str)
 
@@ -222,6 +253,142 @@ class RawEvent(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime, default=utcnow, nullable=False)
 
 
+class NormalizedTxn(Base):
+    """
+    Materialized RawEvent -> NormalizedTransaction projection (norma/from_events.py).
+
+    Written at ingest so read paths select typed columns instead of re-parsing
+    payloads. Rows whose normalizer_version != from_events.NORMALIZER_VERSION are
+    stale and get re-normalized lazily (normalized_txn_service.ensure_normalized,
+    keyed by the Business.normalized_* watermark) or by the renormalize script.
+
+    Events the normalizer rejects (e.g. non-cash invoice_issued) keep a row with
+    skip_reason set and NULL typed columns, so they are not retried every request.
+
+    (business_id, merchant_key, occurred_at) is the merchant -> events index used
+    by vendor-scoped reads (bulk apply, vendor drilldown).
+    """
+    __tablename__ = "normalized_transactions"
+    __table_args__ = (
+        Index("ix_normtxn_business_occurred_source", "business_id", "occurred_at", "source_event_id"),
+        Index("ix_normtxn_business_source_event", "business_id", "source_event_id"),
+        Index("ix_normtxn_business_version", "business_id", "normalizer_version"),
+        Index("ix_normtxn_business_merchant_occurred", "business_id", "merchant_key", "occurred_at"),
+    )
+
+    raw_event_id: Mapped[str] = mapped_column(
+        String(36),
+        ForeignKey("raw_events.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    business_id: Mapped[str] = mapped_column(
+        String(36),
+        ForeignKey("businesses.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    source_event_id: Mapped[str] = mapped_column(String(120), nullable=False)
+    occurred_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)  # same value as RawEvent.occurred_at
+
+    date: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
+    amount: Mapped[Optional[float]] = mapped_column(Float, nullable=True)  # absolute; direction carries sign
+    direction: Mapped[Optional[str]] = mapped_column(String(10), nullable=True)
+    account: Mapped[Optional[str]] = mapped_column(String(120), nullable=True)
+    description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    category: Mapped[Optional[str]] = mapped_column(String(80), nullable=True)  # category hint (system_key-ish)
+    counterparty_hint: Mapped[Optional[str]] = mapped_column(String(200), nullable=True)
+    merchant_key: Mapped[Optional[str]] = mapped_column(String(200), nullable=True)
+
+    normalizer_version: Mapped[int] = mapped_column(Integer, nullable=False)
+    skip_reason: Mapped[Optional[str]] = mapped_column(String(200), nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=utcnow, nullable=False)
+
+
+class CashBalanceCheckpoint(Base):
+    """
+    Per-business daily cash checkpoint over posted lines (TxnCategorization ⨝
+    normalized_transactions): net signed change for the day and the cumulative
+    closing balance through that day (excluding any caller-supplied starting cash).
+
+    Only days with posted activity have a row. Maintained incrementally by
+    services/cash_checkpoint_service.py.
+    """
+    __tablename__ = "cash_balance_checkpoints"
+
+    business_id: Mapped[str] = mapped_column(
+        String(36),
+        ForeignKey("businesses.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    net_change: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    closing_balance: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=utcnow)
+
+
+class CategorizationStats(Base):
+    """
+    Per-business categorization counters behind GET /categorize/.../metrics.
+
+    total_events / posted / uncategorized are maintained incrementally on
+    ingest and posting. suggestion_coverage counts the events created up to
+    coverage_through (raw_events.created_at): events ingested since are folded
+    in on the next read, posted ones and the rows a brain label change can
+    reach are adjusted in place, and it is recomputed when rules or mappings
+    change (rules_version / mapping_version watermarks) or coverage_stale is set.
+    Maintained by services/categorization_stats_service.py.
+    """
+    __tablename__ = "categorization_stats"
+
+    business_id: Mapped[str] = mapped_column(
+        String(36),
+        ForeignKey("businesses.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    total_events: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    posted: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    uncategorized: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    suggestion_coverage: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    brain_coverage: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    coverage_stale: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    coverage_through: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    rules_version: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    mapping_version: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    updated_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=utcnow)
+    reconciled_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+
+
+class BusinessHealthSnapshot(Base):
+    """
+    Last computed dashboard card per business (GET /demo/dashboard).
+
+    Written by services/health_snapshot_service.py from the health pipeline.
+    source_data_version is the Business.data_version the snapshot was computed
+    from; the dashboard flags the row stale when the business's data_version
+    has moved since, or when pipeline_version is behind.
+    """
+    __tablename__ = "business_health_snapshots"
+
+    business_id: Mapped[str] = mapped_column(
+        String(36),
+        ForeignKey("businesses.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    health_score: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    risk: Mapped[str] = mapped_column(String(16), nullable=False, default="green")
+    highlights: Mapped[list] = mapped_column(JSON, nullable=False, default=list)
+
+    source_data_version: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    pipeline_version: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    computed_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=utcnow)
+
+    __table_args__ = (
+        Index("ix_health_snapshots_score", "health_score"),
+    )
+
+
 class HealthSignalState(Base):
     __tablename__ = "health_signal_states"
 
@@ -362,6 +529,45 @@ class CategoryRule(Base):
     category = relationship("Category")
 
 
+class CategoryRuleApplyJob(Base):
+    """
+    One background run of a CategoryRule over a business's full history.
+    Progress counters are committed per chunk, so status can be polled while
+    the job runs; updated_at is bumped with them and lets a job whose worker
+    died be told apart from a slow one. Driven by
+    categorize_service.run_rule_apply_job.
+    """
+    __tablename__ = "category_rule_apply_jobs"
+    __table_args__ = (
+        Index("ix_rule_apply_jobs_business_created", "business_id", "created_at"),
+    )
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=uuid_str)
+
+    business_id: Mapped[str] = mapped_column(
+        String(36),
+        ForeignKey("businesses.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    rule_id: Mapped[str] = mapped_column(
+        String(36),
+        ForeignKey("category_rules.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+
+    status: Mapped[str] = mapped_column(String(16), nullable=False, default="queued")  # queued/running/succeeded/failed
+    scanned: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    matched: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    updated: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=utcnow)
+    started_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=utcnow)
+
+
 class TxnCategorization(Base):
     __tablename__ = "txn_categorizations"
     __table_args__ = (
@@ -0,0 +1,64 @@
+"""
+Multi-pattern substring matching (Aho-Corasick), shared by the business rule
+matcher and the global keyword heuristics. Pure Python, no DB imports.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Dict, List, Sequence, Set, Tuple
+
+
+class AhoCorasick:
+    """
+    Minimal Aho-Corasick automaton over str patterns.
+    `search(text)` returns the set of pattern indices occurring in `text`.
+    """
+
+    def __init__(self, patterns: Sequence[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[int, ...]] = [()]
+
+        outs: List[List[int]] = [[]]
+        for idx, pattern in enumerate(patterns):
+            node = 0
+            for ch in pattern:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    outs.append([])
+                node = nxt
+            outs[node].append(idx)
+
+        # BFS: failure links + merged outputs
+        queue: deque[int] = deque()
+        for nxt in self._goto[0].values():
+            queue.append(nxt)
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                cand = self._goto[f].get(ch, 0)
+                self._fail[nxt] = cand if cand != nxt else 0
+                outs[nxt].extend(outs[self._fail[nxt]])
+
+        self._out = [tuple(o) for o in outs]
+
+    def search(self, text: str) -> Set[int]:
+        goto, fail, out = self._goto, self._fail, self._out
+        found: Set[int] = set()
+        node = 0
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                found.update(out[node])
+        return found
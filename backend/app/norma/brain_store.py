@@ -1,21 +1,30 @@
 from __future__ import annotations
 
 import json
-from dataclasses import dataclass, asdict
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter, OrderedDict
+from collections.abc import Mapping
+from contextlib import contextmanager
+from dataclasses import dataclass
 from datetime import datetime, timezone
+from itertools import chain
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
 from uuid import uuid4
 
 
-@dataclass
+@dataclass(frozen=True)
 class Merchant:
     merchant_id: str
     canonical_name: str
     updated_at: str = ""
 
 
-@dataclass
+@dataclass(frozen=True)
 class Alias:
     alias_key: str               # normalized merchant_key
     merchant_id: str
@@ -24,7 +33,7 @@ class Alias:
     updated_at: str = ""
 
 
-@dataclass
+@dataclass(frozen=True)
 class BusinessLabel:
     business_id: str
     merchant_id: str
@@ -34,148 +43,633 @@ class BusinessLabel:
     updated_at: str = ""
 
 
+@dataclass(frozen=True)
+class FuzzyLabelMatch:
+    label: BusinessLabel
+    alias_key: str               # the learned alias that matched
+    similarity: float            # Dice coefficient over character trigrams
+
+
+# fuzzy alias lookup: minimum trigram Dice similarity, and a cap on candidates
+# scored per lookup to bound lookup time
+FUZZY_THRESHOLD = 0.65
+_FUZZY_MAX_CANDIDATES = 64
+
+# per-process read-through caches (the database is the only full copy)
+HOT_ALIAS_CACHE_SIZE = 65_536    # (business_id, alias_key) -> label or None
+FUZZY_CACHE_BUSINESSES = 64      # per-business trigram postings
+
+_ALL = "*"                       # change-feed row meaning "every business"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS merchants (
+    merchant_id TEXT PRIMARY KEY,
+    canonical_name TEXT NOT NULL,
+    updated_at TEXT NOT NULL DEFAULT ''
+);
+CREATE TABLE IF NOT EXISTS aliases (
+    alias_key TEXT PRIMARY KEY,
+    merchant_id TEXT NOT NULL,
+    match_type TEXT NOT NULL DEFAULT 'exact',
+    evidence_count INTEGER NOT NULL DEFAULT 0,
+    updated_at TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS ix_aliases_merchant ON aliases (merchant_id, alias_key);
+CREATE TABLE IF NOT EXISTS labels (
+    business_id TEXT NOT NULL,
+    merchant_id TEXT NOT NULL,
+    system_key TEXT NOT NULL,
+    confidence REAL NOT NULL DEFAULT 0.92,
+    evidence_count INTEGER NOT NULL DEFAULT 1,
+    updated_at TEXT NOT NULL DEFAULT '',
+    name_key TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (business_id, merchant_id)
+);
+CREATE INDEX IF NOT EXISTS ix_labels_merchant ON labels (merchant_id);
+CREATE INDEX IF NOT EXISTS ix_labels_business_name ON labels (business_id, name_key, merchant_id);
+CREATE TABLE IF NOT EXISTS changes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    business_id TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def _trigrams(alias_key: str) -> Set[str]:
+    padded = f" {alias_key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def fuzzy_reach_prefixes(alias_key: str) -> Set[str]:
+    """
+    Two-character prefixes of the merchant keys whose fuzzy lookup can match
+    `alias_key`: fuzzy_lookup_label only considers aliases containing the
+    query's lead trigram (" " + its first two characters).
+    """
+    return {g[1:] for g in _trigrams(alias_key) if g[0] == " "}
+
+
+class _TrigramPostings:
+    """
+    trigram -> alias keys, over the aliases of one business's labeled merchants,
+    stamped with the business version it was built at.
+    """
+    __slots__ = ("version", "postings", "sizes", "labels")
+
+    def __init__(self, version: int) -> None:
+        self.version = version
+        self.postings: Dict[str, Set[str]] = {}
+        self.sizes: Dict[str, int] = {}               # alias key -> trigram count
+        self.labels: Dict[str, BusinessLabel] = {}    # alias key -> label
+
+    def add(self, alias_key: str, label: BusinessLabel) -> None:
+        self.labels[alias_key] = label
+        if alias_key in self.sizes:
+            return
+        grams = _trigrams(alias_key)
+        self.sizes[alias_key] = len(grams)
+        for g in grams:
+            self.postings.setdefault(g, set()).add(alias_key)
+
+
+# ----------------------------
+# Legacy JSON store (brain.json)
+# ----------------------------
+
+def _merchant_from(row: Dict[str, Any]) -> Optional[Merchant]:
+    if not row.get("merchant_id"):
+        return None
+    return Merchant(
+        merchant_id=row["merchant_id"],
+        canonical_name=row.get("canonical_name", ""),
+        updated_at=row.get("updated_at", ""),
+    )
+
+
+def _alias_from(row: Dict[str, Any]) -> Optional[Alias]:
+    if not row.get("alias_key") or not row.get("merchant_id"):
+        return None
+    return Alias(
+        alias_key=row["alias_key"],
+        merchant_id=row["merchant_id"],
+        match_type=row.get("match_type", "exact"),
+        evidence_count=int(row.get("evidence_count", 0) or 0),
+        updated_at=row.get("updated_at", ""),
+    )
+
+
+def _label_from(
+    row: Dict[str, Any],
+    *,
+    business_id: Optional[str] = None,
+    merchant_id: Optional[str] = None,
+) -> Optional[BusinessLabel]:
+    business_id = row.get("business_id", business_id)
+    merchant_id = row.get("merchant_id", merchant_id)
+    if not business_id or not merchant_id:
+        return None
+    return BusinessLabel(
+        business_id=business_id,
+        merchant_id=merchant_id,
+        system_key=(row.get("system_key") or "uncategorized"),
+        confidence=float(row.get("confidence", 0.92) or 0.92),
+        evidence_count=int(row.get("evidence_count", 1) or 1),
+        updated_at=row.get("updated_at", ""),
+    )
+
+
+def _read_legacy(
+    path: Path,
+) -> Tuple[Dict[str, Merchant], Dict[str, Alias], Dict[str, Dict[str, BusinessLabel]]]:
+    """
+    State of a legacy JSON brain, with the old Merchant.default_category
+    migrated to labels["__legacy__"].
+    """
+    merchants: Dict[str, Merchant] = {}
+    aliases: Dict[str, Alias] = {}
+    labels: Dict[str, Dict[str, BusinessLabel]] = {}
+    data: Dict[str, Any] = {}
+    if path.exists():
+        data = json.loads(path.read_text(encoding="utf-8"))
+
+    # Backwards compatible merchant load (ignore old keys like default_category)
+    for m in data.get("merchants", []):
+        merchant = _merchant_from(m)
+        if merchant is not None:
+            merchants[merchant.merchant_id] = merchant
+
+    for a in data.get("aliases", []):
+        alias = _alias_from(a)
+        if alias is not None:
+            aliases[alias.alias_key] = alias
+
+    # New schema labels
+    raw_labels = data.get("labels", {})
+    if isinstance(raw_labels, dict):
+        for biz_id, per_biz in raw_labels.items():
+            if not isinstance(per_biz, dict):
+                continue
+            labels[biz_id] = {}
+            for mid, lbl in per_biz.items():
+                if not isinstance(lbl, dict):
+                    continue
+                labels[biz_id][mid] = _label_from(lbl, business_id=biz_id, merchant_id=mid)
+
+    # One-time migration: old Merchant.default_category -> labels["__legacy__"]
+    legacy_biz = "__legacy__"
+    for m in data.get("merchants", []):
+        mid = m.get("merchant_id")
+        old_default = (m.get("default_category") or "").strip().lower()
+        if not mid or not old_default:
+            continue
+        already = any(mid in d for d in labels.values())
+        if already:
+            continue
+        labels.setdefault(legacy_biz, {})
+        labels[legacy_biz][mid] = BusinessLabel(
+            business_id=legacy_biz,
+            merchant_id=mid,
+            system_key=old_default,
+            confidence=float(m.get("confidence", 0.92) or 0.92),
+            evidence_count=int(m.get("evidence_count", 1) or 1),
+            updated_at=m.get("updated_at", ""),
+        )
+
+    return merchants, aliases, labels
+
+
+# ----------------------------
+# Row mapping
+# ----------------------------
+
+def _merchant_row(row: sqlite3.Row) -> Merchant:
+    return Merchant(merchant_id=row["merchant_id"], canonical_name=row["canonical_name"], updated_at=row["updated_at"])
+
+
+def _alias_row(row: sqlite3.Row) -> Alias:
+    return Alias(
+        alias_key=row["alias_key"],
+        merchant_id=row["merchant_id"],
+        match_type=row["match_type"],
+        evidence_count=row["evidence_count"],
+        updated_at=row["updated_at"],
+    )
+
+
+def _label_row(row: sqlite3.Row) -> BusinessLabel:
+    return BusinessLabel(
+        business_id=row["business_id"],
+        merchant_id=row["merchant_id"],
+        system_key=row["system_key"],
+        confidence=row["confidence"],
+        evidence_count=row["evidence_count"],
+        updated_at=row["updated_at"],
+    )
+
+
+class _TableView(Mapping):
+    """
+    Read-only mapping over one brain table (each access is a query; nothing is
+    held in memory). Assign a dict to the store attribute to replace the table.
+    """
+
+    def __init__(self, count: Callable[[], int], keys: Callable[[], List[str]], get: Callable[[str], Any]):
+        self._count, self._keys, self._get = count, keys, get
+
+    def __getitem__(self, key: str) -> Any:
+        value = self._get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys())
+
+    def __len__(self) -> int:
+        return self._count()
+
+
 class BrainStore:
     """
     Org-wide store of merchants + aliases, with business-scoped labels:
       (business_id, merchant_id) -> system_key
       and lookup path: merchant_key -> alias -> merchant_id -> label per business
-    MVP persistence: JSON file.
+
+    Storage: one SQLite database in WAL mode at `path`, shared by every worker
+    process. Readers never block the writer; the file's pages live once in the
+    OS page cache, so memory stays flat as workers are added. No process holds
+    a full copy: each keeps only bounded read-through caches
+      - hot aliases: (business_id, alias_key) -> label or None, LRU of
+        HOT_ALIAS_CACHE_SIZE entries
+      - fuzzy postings of the FUZZY_CACHE_BUSINESSES most recent businesses
+    Every cached entry is stamped with its business's version.
+
+    Writes: each mutation is one transaction (BEGIN IMMEDIATE: reads the current
+    rows and writes under the database write lock, so concurrent workers never
+    lose an evidence count) and returns fresh immutable rows; cached objects are
+    never edited in place.
+
+    Change detection: every write appends the affected business ids to the
+    `changes` feed. refresh() reads the rows past `generation` (one indexed
+    query) and bumps just those businesses' versions, which invalidates their
+    cache entries; everything else stays warm. Reads refresh at most every
+    `refresh_interval` seconds, writes refresh right after committing.
+
+    save() checkpoints the WAL into the database file and prunes the change
+    feed once `compact_every` commits have accumulated; compact() does it now.
+
+    The database is opened (created, schema applied) on first use, not at
+    construction, so importing the module-level store touches no files;
+    reopen() points the store at another database (tests, tools).
+
+    A legacy JSON brain (brain.json next to `path`) is imported once into an
+    empty database.
     """
-    def __init__(self, path: Path):
-        self.path = path
-        self.merchants: Dict[str, Merchant] = {}
-        self.aliases: Dict[str, Alias] = {}
-        # labels[business_id][merchant_id] = BusinessLabel
-        self.labels: Dict[str, Dict[str, BusinessLabel]] = {}
-        self._load()
+    def __init__(self, path: Path, *, compact_every: int = 5000, refresh_interval: float = 1.0):
+        self.compact_every = compact_every
+        self.refresh_interval = refresh_interval
+        self._local = threading.local()
+        self._lock = threading.Lock()            # caches + versions
+        self._refresh_lock = threading.Lock()
+        self._hot: "OrderedDict[Tuple[str, str], Tuple[int, Optional[BusinessLabel]]]" = OrderedDict()
+        self._fuzzy: "OrderedDict[str, _TrigramPostings]" = OrderedDict()
+        self._hits = self._misses = 0
+        self._merchant_view = _TableView(self._count("merchants"), self._keys("merchants", "merchant_id"), self.get_merchant)
+        self._alias_view = _TableView(self._count("aliases"), self._keys("aliases", "alias_key"), self.get_alias)
+        self._label_view = _TableView(self._count_businesses, self._keys("labels", "business_id"), self._business_labels)
+        self._epoch = 0
+        self._open_lock = threading.Lock()
+        self._path = Path(path)
+        self._opened = False
+        self._reset()
+
+    # ----------------------------
+    # Connections
+    # ----------------------------
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def reopen(self, path: Path) -> Path:
+        """
+        Point the store at the database at `path` (opened on next use) and drop
+        every cached entry; returns the previous path, so a caller can switch
+        back:
+
+            previous = brain.reopen(tmp_path / "brain.db")
+            ...
+            brain.reopen(previous)
+        """
+        with self._open_lock:
+            previous = self._path
+            self._path = Path(path)
+            self._epoch += 1  # every thread reconnects to the new file
+            self._opened = False
+            self._reset()
+        return previous
+
+    @property
+    def legacy_path(self) -> Optional[Path]:
+        legacy = self._path.with_suffix(".json")
+        return None if legacy == self._path else legacy
+
+    def _reset(self) -> None:
+        self._commits = 0
+        self.generation = 0
+        self._versions: Dict[str, int] = {}
+        self._clock = 0
+        self._floor = 0
+        self.clear_cache()
+        self._next_refresh = time.monotonic() + self.refresh_interval
+
+    def _open(self) -> None:
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+        self._import_legacy()
+        self._reset()
+        self.generation = conn.execute("SELECT coalesce(max(seq), 0) FROM changes").fetchone()[0]
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        This thread's connection (one per thread and process: sqlite3
+        connections are not shared across threads or carried over a fork).
+        """
+        local = self._local
+        key = (self._epoch, os.getpid())
+        if getattr(local, "key", None) != key:
+            conn = sqlite3.connect(str(self._path), timeout=30.0, isolation_level=None, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            local.conn, local.key = conn, key
+        return local.conn
+
+    def _conn(self) -> sqlite3.Connection:
+        if not self._opened:
+            with self._open_lock:
+                if not self._opened:
+                    self._open()
+                    self._opened = True
+        return self._connect()
+
+    @contextmanager
+    def _write(self) -> Iterator[sqlite3.Connection]:
+        """
+        One write transaction under the database write lock; on commit the
+        change feed is read back, so this process sees its own write at once.
+        """
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        self._commits += 1
+        self.refresh()
 
     def _now(self) -> str:
         return datetime.now(timezone.utc).isoformat()
 
-    def _load(self) -> None:
-        if not self.path.exists():
-            return
-        data = json.loads(self.path.read_text(encoding="utf-8"))
+    # ----------------------------
+    # Change detection
+    # ----------------------------
 
-        # Backwards compatible merchant load (ignore old keys like default_category)
-        self.merchants = {}
-        for m in data.get("merchants", []):
-            mid = m.get("merchant_id")
-            if not mid:
-                continue
-            self.merchants[mid] = Merchant(
-                merchant_id=mid,
-                canonical_name=m.get("canonical_name", ""),
-                updated_at=m.get("updated_at", ""),
-            )
+    def business_version(self, business_id: str) -> int:
+        """
+        Changes whenever this business's labels (or the aliases of merchants it
+        labeled) change, as of the last refresh; other businesses' writes leave
+        it alone.
+        """
+        return self._versions.get(business_id, self._floor)
 
-        self.aliases = {}
-        for a in data.get("aliases", []):
-            ak = a.get("alias_key")
-            mid = a.get("merchant_id")
-            if not ak or not mid:
-                continue
-            self.aliases[ak] = Alias(
-                alias_key=ak,
-                merchant_id=mid,
-                match_type=a.get("match_type", "exact"),
-                evidence_count=int(a.get("evidence_count", 0) or 0),
-                updated_at=a.get("updated_at", ""),
-            )
+    def _bump(self, business_ids: List[str]) -> None:
+        with self._lock:
+            if _ALL in business_ids:
+                self._clock += 1
+                self._floor = self._clock
+                self._versions.clear()
+                self._hot.clear()
+                self._fuzzy.clear()
+                return
+            for business_id in business_ids:
+                self._clock += 1
+                self._versions[business_id] = self._clock
 
-        # New schema labels
-        self.labels = {}
-        raw_labels = data.get("labels", {})
-        if isinstance(raw_labels, dict):
-            for biz_id, per_biz in raw_labels.items():
-                if not isinstance(per_biz, dict):
-                    continue
-                self.labels[biz_id] = {}
-                for mid, lbl in per_biz.items():
-                    if not isinstance(lbl, dict):
-                        continue
-                    self.labels[biz_id][mid] = BusinessLabel(
-                        business_id=lbl.get("business_id", biz_id),
-                        merchant_id=lbl.get("merchant_id", mid),
-                        system_key=(lbl.get("system_key") or "uncategorized"),
-                        confidence=float(lbl.get("confidence", 0.92) or 0.92),
-                        evidence_count=int(lbl.get("evidence_count", 1) or 1),
-                        updated_at=lbl.get("updated_at", ""),
-                    )
+    def refresh(self) -> bool:
+        """
+        Pick up writes from every process sharing the database; returns True if
+        anything changed. Unchanged costs one indexed query.
+        """
+        with self._refresh_lock:
+            rows = self._conn().execute(
+                "SELECT seq, business_id FROM changes WHERE seq > ? ORDER BY seq", (self.generation,)
+            ).fetchall()
+            if not rows:
+                return False
+            business_ids = [r["business_id"] for r in rows]
+            if rows[0]["seq"] != self.generation + 1:
+                business_ids = [_ALL]  # feed pruned past our position: drop every cached entry
+            self._bump(business_ids)
+            self.generation = rows[-1]["seq"]
+            return True
 
-        # One-time migration: old Merchant.default_category -> labels["__legacy__"]
-        legacy_biz = "__legacy__"
-        changed = False
-        for m in data.get("merchants", []):
-            mid = m.get("merchant_id")
-            old_default = (m.get("default_category") or "").strip().lower()
-            if not mid or not old_default:
-                continue
-            already = any(mid in d for d in self.labels.values())
-            if already:
-                continue
-            self.labels.setdefault(legacy_biz, {})
-            self.labels[legacy_biz][mid] = BusinessLabel(
-                business_id=legacy_biz,
-                merchant_id=mid,
-                system_key=old_default,
-                confidence=float(m.get("confidence", 0.92) or 0.92),
-                evidence_count=int(m.get("evidence_count", 1) or 1),
-                updated_at=m.get("updated_at", ""),
-            )
-            changed = True
+    def _maybe_refresh(self) -> None:
+        now = time.monotonic()
+        if now >= self._next_refresh:
+            self._next_refresh = now + self.refresh_interval
+            self.refresh()
 
-        if changed:
-            self.save()
+    # ----------------------------
+    # Caches
+    # ----------------------------
 
-    def delete_business(self, business_id: str) -> None:
-        if business_id in self.labels:
-            del self.labels[business_id]
-            self.save()
+    def cache_info(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "size": len(self._hot),
+                "maxsize": HOT_ALIAS_CACHE_SIZE,
+                "fuzzy_businesses": len(self._fuzzy),
+                "generation": self.generation,
+            }
 
+    def clear_cache(self) -> None:
+        with self._lock:
+            self._hot.clear()
+            self._fuzzy.clear()
+            self._hits = self._misses = 0
 
-    def save(self) -> None:
-        payload = {
-            "merchants": [asdict(m) for m in self.merchants.values()],
-            "aliases": [asdict(a) for a in self.aliases.values()],
-            "labels": {
-                biz: {mid: asdict(lbl) for mid, lbl in per.items()}
-                for biz, per in self.labels.items()
-            },
-        }
-        self.path.parent.mkdir(parents=True, exist_ok=True)
-        self.path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    # ----------------------------
+    # Persistence
+    # ----------------------------
 
-    def resolve_merchant_id(self, alias_key: str) -> Optional[str]:
-        a = self.aliases.get(alias_key)
-        return a.merchant_id if a else None
+    def _import_legacy(self) -> None:
+        legacy = self.legacy_path
+        if legacy is None or not legacy.exists():
+            return
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            done = conn.execute("SELECT 1 FROM meta WHERE key = 'legacy_imported'").fetchone()
+            if done is None:
+                merchants, aliases, labels = _read_legacy(legacy)
+                self._insert_rows(conn, merchants, aliases, labels)
+                conn.execute("INSERT INTO meta (key, value) VALUES ('legacy_imported', ?)", (str(legacy),))
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
 
-    def get_merchant(self, merchant_id: str) -> Optional[Merchant]:
-        return self.merchants.get(merchant_id)
+    def _insert_rows(
+        self,
+        conn: sqlite3.Connection,
+        merchants: Dict[str, Merchant],
+        aliases: Dict[str, Alias],
+        labels: Dict[str, Dict[str, BusinessLabel]],
+    ) -> None:
+        conn.executemany(
+            "INSERT OR REPLACE INTO merchants (merchant_id, canonical_name, updated_at) VALUES (?, ?, ?)",
+            [(m.merchant_id, m.canonical_name, m.updated_at) for m in merchants.values()],
+        )
+        conn.executemany(
+            "INSERT OR REPLACE INTO aliases (alias_key, merchant_id, match_type, evidence_count, updated_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [(a.alias_key, a.merchant_id, a.match_type, a.evidence_count, a.updated_at) for a in aliases.values()],
+        )
+        def name_key(merchant_id: str) -> str:
+            m = merchants.get(merchant_id)
+            if m is not None:
+                return m.canonical_name.lower()
+            row = conn.execute("SELECT canonical_name FROM merchants WHERE merchant_id = ?", (merchant_id,)).fetchone()
+            return (row[0] if row else "Unknown").lower()
 
-    def _create_merchant(self, canonical_name: str) -> Merchant:
-        now = self._now()
-        m = Merchant(
-            merchant_id=str(uuid4()),
-            canonical_name=canonical_name,
-            updated_at=now,
+        conn.executemany(
+            "INSERT OR REPLACE INTO labels "
+            "(business_id, merchant_id, system_key, confidence, evidence_count, updated_at, name_key) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    lbl.business_id,
+                    lbl.merchant_id,
+                    lbl.system_key,
+                    lbl.confidence,
+                    lbl.evidence_count,
+                    lbl.updated_at,
+                    name_key(lbl.merchant_id),
+                )
+                for per in labels.values()
+                for lbl in per.values()
+            ],
         )
-        self.merchants[m.merchant_id] = m
-        return m
 
-    def _upsert_alias(self, alias_key: str, merchant_id: str) -> None:
-        now = self._now()
-        existing = self.aliases.get(alias_key)
-        if existing:
-            existing.evidence_count += 1
-            existing.updated_at = now
-            return
-        self.aliases[alias_key] = Alias(
-            alias_key=alias_key,
-            merchant_id=merchant_id,
-            evidence_count=1,
-            updated_at=now,
+    def save(self) -> None:
+        """
+        Mutations are durable once they return (each is its own WAL commit).
+        save() is the checkpoint point: after `compact_every` commits it folds
+        the WAL into the database file and prunes the change feed.
+        """
+        if self._commits >= self.compact_every:
+            self.compact()
+
+    def compact(self) -> None:
+        """
+        Checkpoint the WAL into the database (truncating it) and prune the
+        change feed to its last `compact_every` rows; also run by save().
+        """
+        conn = self._conn()
+        conn.execute(
+            "DELETE FROM changes WHERE seq <= (SELECT max(seq) FROM changes) - ?", (self.compact_every,)
         )
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        self._commits = 0
+
+    # ----------------------------
+    # Whole-table views (admin / scripts / tests)
+    # ----------------------------
+
+    def _count(self, table: str) -> Callable[[], int]:
+        return lambda: self._conn().execute(f"SELECT count(*) FROM {table}").fetchone()[0]
+
+    def _keys(self, table: str, column: str) -> Callable[[], List[str]]:
+        return lambda: [r[0] for r in self._conn().execute(f"SELECT DISTINCT {column} FROM {table} ORDER BY {column}")]
+
+    def _count_businesses(self) -> int:
+        return self._conn().execute("SELECT count(DISTINCT business_id) FROM labels").fetchone()[0]
+
+    def _business_labels(self, business_id: str) -> Optional[Dict[str, BusinessLabel]]:
+        rows = self._conn().execute("SELECT * FROM labels WHERE business_id = ?", (business_id,)).fetchall()
+        return {r["merchant_id"]: _label_row(r) for r in rows} or None
+
+    def _replace(
+        self,
+        merchants: Optional[Mapping] = None,
+        aliases: Optional[Mapping] = None,
+        labels: Optional[Mapping] = None,
+    ) -> None:
+        with self._write() as conn:
+            if merchants is not None:
+                conn.execute("DELETE FROM merchants")
+            if aliases is not None:
+                conn.execute("DELETE FROM aliases")
+            if labels is not None:
+                conn.execute("DELETE FROM labels")
+            self._insert_rows(conn, dict(merchants or {}), dict(aliases or {}), {b: dict(p) for b, p in (labels or {}).items()})
+            conn.execute("INSERT INTO changes (business_id) VALUES (?)", (_ALL,))
+
+    @property
+    def merchants(self) -> Mapping:
+        return self._merchant_view
+
+    @merchants.setter
+    def merchants(self, value: Mapping) -> None:
+        if value is not self._merchant_view:
+            self._replace(merchants=dict(value))
+
+    @property
+    def aliases(self) -> Mapping:
+        return self._alias_view
+
+    @aliases.setter
+    def aliases(self, value: Mapping) -> None:
+        if value is not self._alias_view:
+            self._replace(aliases=dict(value))
+
+    @property
+    def labels(self) -> Mapping:
+        return self._label_view
+
+    @labels.setter
+    def labels(self, value: Mapping) -> None:
+        if value is not self._label_view:
+            self._replace(labels={b: dict(p) for b, p in value.items()})
+
+    # ----------------------------
+    # Writes
+    # ----------------------------
+
+    def delete_business(self, business_id: str) -> None:
+        with self._write() as conn:
+            if conn.execute("DELETE FROM labels WHERE business_id = ?", (business_id,)).rowcount:
+                conn.execute("INSERT INTO changes (business_id) VALUES (?)", (business_id,))
+
+    def forget_label(self, business_id: str, merchant_id: str) -> bool:
+        """
+        Drop one business label. Returns False if there was none.
+        """
+        with self._write() as conn:
+            deleted = conn.execute(
+                "DELETE FROM labels WHERE business_id = ? AND merchant_id = ?", (business_id, merchant_id)
+            ).rowcount
+            if deleted:
+                conn.execute("INSERT INTO changes (business_id) VALUES (?)", (business_id,))
+        return bool(deleted)
 
     def apply_label(
         self,
@@ -192,45 +686,241 @@ class BrainStore:
         """
         now = self._now()
         system_key = (system_key or "").strip().lower() or "uncategorized"
+        canonical = (canonical_name or "").strip()
 
-        mid = self.resolve_merchant_id(alias_key)
-        if mid and mid in self.merchants:
-            m = self.merchants[mid]
-            if canonical_name and canonical_name.strip():
-                m.canonical_name = canonical_name.strip()
-            m.updated_at = now
-            self._upsert_alias(alias_key, mid)
-        else:
-            m = self._create_merchant(canonical_name.strip() or "Unknown")
-            self._upsert_alias(alias_key, m.merchant_id)
-            mid = m.merchant_id
-
-        per = self.labels.setdefault(business_id, {})
-        existing = per.get(mid)
-        if existing:
-            existing.system_key = system_key
-            existing.confidence = max(existing.confidence, float(confidence or 0.92))
-            existing.evidence_count += 1
-            existing.updated_at = now
-            return existing
-
-        lbl = BusinessLabel(
-            business_id=business_id,
-            merchant_id=mid,
-            system_key=system_key,
-            confidence=float(confidence or 0.92),
-            evidence_count=1,
-            updated_at=now,
-        )
-        per[mid] = lbl
-        return lbl
+        with self._write() as conn:
+            alias = conn.execute("SELECT merchant_id FROM aliases WHERE alias_key = ?", (alias_key,)).fetchone()
+            merchant = None
+            if alias is not None:
+                merchant = conn.execute(
+                    "SELECT * FROM merchants WHERE merchant_id = ?", (alias["merchant_id"],)
+                ).fetchone()
+
+            if merchant is not None:
+                mid = merchant["merchant_id"]
+                name = merchant["canonical_name"]
+                if canonical and canonical != name:
+                    name = canonical
+                    conn.execute("UPDATE labels SET name_key = ? WHERE merchant_id = ?", (name.lower(), mid))
+                conn.execute(
+                    "UPDATE merchants SET canonical_name = ?, updated_at = ? WHERE merchant_id = ?", (name, now, mid)
+                )
+                conn.execute(
+                    "UPDATE aliases SET evidence_count = evidence_count + 1, updated_at = ? WHERE alias_key = ?",
+                    (now, alias_key),
+                )
+            else:
+                mid = str(uuid4())
+                name = canonical or "Unknown"
+                conn.execute(
+                    "INSERT INTO merchants (merchant_id, canonical_name, updated_at) VALUES (?, ?, ?)", (mid, name, now)
+                )
+                if alias is not None:
+                    # alias left pointing at a missing merchant: re-point it; its
+                    # old merchant's businesses lose the match
+                    conn.execute(
+                        "INSERT INTO changes (business_id) SELECT business_id FROM labels WHERE merchant_id = ?",
+                        (alias["merchant_id"],),
+                    )
+                    conn.execute(
+                        "UPDATE aliases SET merchant_id = ?, evidence_count = evidence_count + 1, updated_at = ? "
+                        "WHERE alias_key = ?",
+                        (mid, now, alias_key),
+                    )
+                else:
+                    conn.execute(
+                        "INSERT INTO aliases (alias_key, merchant_id, evidence_count, updated_at) VALUES (?, ?, 1, ?)",
+                        (alias_key, mid, now),
+                    )
+
+            conn.execute(
+                """
+                INSERT INTO labels (business_id, merchant_id, system_key, confidence, evidence_count, updated_at, name_key)
+                VALUES (?, ?, ?, ?, 1, ?, ?)
+                ON CONFLICT (business_id, merchant_id) DO UPDATE SET
+                    system_key = excluded.system_key,
+                    confidence = max(labels.confidence, excluded.confidence),
+                    evidence_count = labels.evidence_count + 1,
+                    updated_at = excluded.updated_at
+                """,
+                (business_id, mid, system_key, float(confidence or 0.92), now, name.lower()),
+            )
+            conn.execute("INSERT INTO changes (business_id) VALUES (?)", (business_id,))
+            row = conn.execute(
+                "SELECT * FROM labels WHERE business_id = ? AND merchant_id = ?", (business_id, mid)
+            ).fetchone()
+        return _label_row(row)
+
+    # ----------------------------
+    # Reads
+    # ----------------------------
+
+    def resolve_merchant_id(self, alias_key: str) -> Optional[str]:
+        row = self._conn().execute("SELECT merchant_id FROM aliases WHERE alias_key = ?", (alias_key,)).fetchone()
+        return row["merchant_id"] if row else None
+
+    def get_alias(self, alias_key: str) -> Optional[Alias]:
+        row = self._conn().execute("SELECT * FROM aliases WHERE alias_key = ?", (alias_key,)).fetchone()
+        return _alias_row(row) if row else None
+
+    def get_merchant(self, merchant_id: str) -> Optional[Merchant]:
+        row = self._conn().execute("SELECT * FROM merchants WHERE merchant_id = ?", (merchant_id,)).fetchone()
+        return _merchant_row(row) if row else None
+
+    def get_label(self, business_id: str, merchant_id: str) -> Optional[BusinessLabel]:
+        row = self._conn().execute(
+            "SELECT * FROM labels WHERE business_id = ? AND merchant_id = ?", (business_id, merchant_id)
+        ).fetchone()
+        return _label_row(row) if row else None
 
     def lookup_label(self, *, business_id: str, alias_key: str) -> Optional[BusinessLabel]:
-        mid = self.resolve_merchant_id(alias_key)
-        if not mid:
+        """
+        Exact alias match for this business. Hot aliases are served from the
+        in-process LRU (a dict hit); a miss is one indexed join.
+        """
+        if time.monotonic() >= self._next_refresh:
+            self._maybe_refresh()
+        key = (business_id, alias_key)
+        version = self._versions.get(business_id, self._floor)
+        # hit path without the lock: each OrderedDict call is atomic under the
+        # GIL, and entries are immutable (version, label) tuples
+        hit = self._hot.get(key)
+        if hit is not None and hit[0] == version:
+            try:
+                self._hot.move_to_end(key)
+            except KeyError:  # evicted by another thread meanwhile
+                pass
+            self._hits += 1  # approximate under concurrency
+            return hit[1]
+        self._misses += 1
+
+        row = self._conn().execute(
+            "SELECT l.* FROM aliases a JOIN labels l ON l.merchant_id = a.merchant_id AND l.business_id = ? "
+            "WHERE a.alias_key = ?",
+            (business_id, alias_key),
+        ).fetchone()
+        label = _label_row(row) if row else None
+        with self._lock:
+            # stamped with the version read before the query: a write racing
+            # it only makes this entry miss next time
+            self._hot[key] = (version, label)
+            self._hot.move_to_end(key)
+            if len(self._hot) > HOT_ALIAS_CACHE_SIZE:
+                self._hot.popitem(last=False)
+        return label
+
+    def fuzzy_lookup_label(
+        self,
+        *,
+        business_id: str,
+        alias_key: str,
+        threshold: float = FUZZY_THRESHOLD,
+    ) -> Optional[FuzzyLabelMatch]:
+        """
+        Best labeled alias for this business whose character-trigram Dice
+        similarity to `alias_key` is >= threshold ("sysco foods" ~ "sysco food svc")
+        and that starts with the same two characters.
+
+        Candidates come from per-business postings (trigram -> aliases of the
+        merchants this business labeled), so other businesses' aliases cost
+        nothing, and from the query's rarest trigrams only (prefix filter: any
+        alias reaching the threshold shares at least one of them). They are
+        scored most-shared first, at most _FUZZY_MAX_CANDIDATES per lookup.
+        """
+        self._maybe_refresh()
+        if not alias_key:
+            return None
+        index = self._postings_for(business_id)
+        postings = index.postings
+        if not postings:
             return None
-        per = self.labels.get(business_id, {})
-        return per.get(mid)
+
+        query = _trigrams(alias_key)
+        n = len(query)
+        min_size = threshold * n / (2.0 - threshold)
+        max_size = (2.0 - threshold) * n / threshold
+        # bank strings vary at the tail (store numbers, "svc", "inc"), not the
+        # start: "unknown vendor" must not match "known vendor"
+        lead = postings.get(f" {alias_key}"[:3])
+        if not lead:
+            return None
+        ranked = sorted((postings.get(g, ()) for g in query), key=len)
+        prefix = ranked[: n - math.ceil(min_size) + 1]
+        # most shared rare trigrams first, so the cap cuts off the weakest candidates
+        shared = Counter(chain.from_iterable(prefix))
+
+        best: Optional[FuzzyLabelMatch] = None
+        scored = 0
+        for key, _hits in shared.most_common():
+            size = index.sizes[key]
+            if key not in lead or size < min_size or size > max_size:
+                continue
+            scored += 1
+            if scored > _FUZZY_MAX_CANDIDATES:
+                break
+            score = 2.0 * len(query & _trigrams(key)) / (n + size)
+            if score >= threshold and (
+                best is None
+                or score > best.similarity
+                or (score == best.similarity and key < best.alias_key)
+            ):
+                best = FuzzyLabelMatch(label=index.labels[key], alias_key=key, similarity=round(score, 4))
+        return best
+
+    def _postings_for(self, business_id: str) -> _TrigramPostings:
+        version = self._versions.get(business_id, self._floor)
+        with self._lock:
+            index = self._fuzzy.get(business_id)
+            if index is not None and index.version == version:
+                self._fuzzy.move_to_end(business_id)
+                return index
+
+        index = _TrigramPostings(version)
+        rows = self._conn().execute(
+            "SELECT a.alias_key, l.* FROM labels l JOIN aliases a ON a.merchant_id = l.merchant_id "
+            "WHERE l.business_id = ?",
+            (business_id,),
+        )
+        for row in rows:
+            index.add(row["alias_key"], _label_row(row))
+        with self._lock:
+            self._fuzzy[business_id] = index
+            self._fuzzy.move_to_end(business_id)
+            if len(self._fuzzy) > FUZZY_CACHE_BUSINESSES:
+                self._fuzzy.popitem(last=False)
+        return index
 
     def count_learned_merchants(self, business_id: str) -> int:
-        return len(self.labels.get(business_id, {}))
+        return self._conn().execute("SELECT count(*) FROM labels WHERE business_id = ?", (business_id,)).fetchone()[0]
+
+    def count_labels(self) -> int:
+        return self._count("labels")()
+
+    def alias_keys_for(self, merchant_id: str) -> List[str]:
+        rows = self._conn().execute(
+            "SELECT alias_key FROM aliases WHERE merchant_id = ? ORDER BY alias_key", (merchant_id,)
+        )
+        return [r[0] for r in rows]
+
+    def list_vendor_labels(
+        self,
+        business_id: str,
+        *,
+        prefix: Optional[str] = None,
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> List[BusinessLabel]:
+        """
+        The business's labeled vendors (uncategorized labels excluded), ordered by
+        canonical name, optionally narrowed to a case-insensitive name prefix.
+        Range scan on the (business_id, name_key) index: O(log n + page).
+        """
+        p = (prefix or "").strip().lower()
+        rows = self._conn().execute(
+            "SELECT * FROM labels WHERE business_id = ? AND name_key >= ? AND name_key < ? "
+            "AND lower(trim(system_key)) NOT IN ('', 'uncategorized') "
+            "ORDER BY name_key, merchant_id LIMIT ? OFFSET ?",
+            (business_id, p, p + "\U0010ffff", -1 if limit is None else limit, max(0, offset)),
+        )
+        return [_label_row(r) for r in rows]
+
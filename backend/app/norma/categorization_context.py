@@ -0,0 +1,93 @@
+"""
+Request-scoped categorization lookups.
+
+Suggesting and resolving categories used to hit the DB per transaction (rules
+per txn, a BusinessCategoryMap lookup per candidate rule, a Category/Account
+join per suggested system_key). CategorizationContext loads everything once
+per request in a fixed number of queries:
+
+  - compiled active CategoryRules (cached by Business.rules_version)
+  - BusinessCategoryMap rows (system_key <-> category_id)
+  - Category + Account names for the business
+
+Build one with `CategorizationContext.load(db, business_id)` after seeding and
+pass it to suggest_category / the list + metrics services. It is a snapshot:
+load a new one after writing rules, mappings or categories.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from backend.app.models import Account, BusinessCategoryMap, Category
+from backend.app.norma.rule_matcher import CompiledRules, get_compiled_rules
+
+
+def _key(s: Optional[str]) -> str:
+    return (s or "").strip().lower()
+
+
+@dataclass
+class CategorizationContext:
+    business_id: str
+    rules: CompiledRules
+    # BusinessCategoryMap is 1:1 per business (unique on both columns)
+    system_key_by_category_id: Dict[str, str] = field(default_factory=dict)
+    category_id_by_system_key: Dict[str, str] = field(default_factory=dict)
+    # category_id -> resolve_system_key() payload (only categories with an account)
+    categories: Dict[str, Dict[str, str]] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, db: Session, business_id: str) -> "CategorizationContext":
+        rules = get_compiled_rules(db, business_id)
+
+        maps = db.execute(
+            select(BusinessCategoryMap.system_key, BusinessCategoryMap.category_id).where(
+                BusinessCategoryMap.business_id == business_id
+            )
+        ).all()
+        system_key_by_category_id: Dict[str, str] = {}
+        category_id_by_system_key: Dict[str, str] = {}
+        for system_key, category_id in maps:
+            sk = _key(system_key)
+            if sk:
+                system_key_by_category_id[category_id] = sk
+                category_id_by_system_key[sk] = category_id
+
+        rows = db.execute(
+            select(Category.id, Category.name, Account.id, Account.code, Account.name)
+            .join(Account, Account.id == Category.account_id)
+            .where(Category.business_id == business_id)
+        ).all()
+        categories = {
+            cat_id: {
+                "category_id": cat_id,
+                "category_name": cat_name,
+                "account_id": acct_id,
+                "account_code": acct_code or "",
+                "account_name": acct_name or "",
+            }
+            for cat_id, cat_name, acct_id, acct_code, acct_name in rows
+        }
+
+        return cls(
+            business_id=business_id,
+            rules=rules,
+            system_key_by_category_id=system_key_by_category_id,
+            category_id_by_system_key=category_id_by_system_key,
+            categories=categories,
+        )
+
+    def system_key_for_category_id(self, category_id: str) -> Optional[str]:
+        return self.system_key_by_category_id.get(category_id)
+
+    def resolve_system_key(self, system_key: str) -> Optional[Dict[str, str]]:
+        """
+        In-memory equivalent of category_resolver.resolve_system_key.
+        """
+        category_id = self.category_id_by_system_key.get(_key(system_key))
+        return self.categories.get(category_id) if category_id else None
@@ -1,19 +1,125 @@
+"""
+Global (not business-scoped) keyword heuristics.
+
+Two declarative tables, compiled once at import into a single Aho-Corasick
+matcher, so a description is scanned once however many keywords there are:
+  - GLOBAL_RULE_KEYWORDS: categorize_txn's keyword groups (first group wins)
+  - VENDOR_KEYWORDS: the vendor keyword fallback used by the suggestion
+    engine after categorize_txn (first entry wins)
+Matching is plain substring containment on the stripped, lowercased
+description. Table order is precedence: add keywords where they should rank.
+"""
+
 from __future__ import annotations
 
-from dataclasses import replace
-from typing import Optional
+from dataclasses import dataclass, replace
+from typing import List, Optional, Tuple
 
+from backend.app.norma.aho_corasick import AhoCorasick
 from backend.app.norma.normalize import NormalizedTransaction, EnrichedTransaction, Categorization
 
 
+# (system_key, confidence, reason, keywords)
+GLOBAL_RULE_KEYWORDS: Tuple[Tuple[str, float, str, Tuple[str, ...]], ...] = (
+    ("payroll", 0.92, "Matched payroll keyword/merchant in description",
+     ("gusto", "adp", "payroll", "paychex", "intuit payroll")),
+    ("hosting", 0.88, "Matched hosting keyword/merchant in description",
+     ("aws", "amazon web services", "digitalocean", "heroku", "render", "vercel", "netlify")),
+    ("rent", 0.80, "Matched rent/lease keyword in description",
+     ("rent", "lease")),
+)
+
+# (keyword, system_key, confidence, reason)
+VENDOR_KEYWORDS: Tuple[Tuple[str, str, float, str], ...] = (
+    # Utilities / telecom
+    ("comcast", "utilities", 0.78, "Matched vendor keyword 'comcast'"),
+    ("xfinity", "utilities", 0.78, "Matched vendor keyword 'xfinity'"),
+    ("verizon", "utilities", 0.70, "Matched vendor keyword 'verizon'"),
+    ("at&t", "utilities", 0.70, "Matched vendor keyword 'at&t'"),
+    ("t-mobile", "utilities", 0.70, "Matched vendor keyword 't-mobile'"),
+    ("tmobile", "utilities", 0.70, "Matched vendor keyword 'tmobile'"),
+
+    # Software / subscriptions
+    ("adobe", "software", 0.74, "Matched vendor keyword 'adobe'"),
+    ("google workspace", "software", 0.70, "Matched vendor keyword 'google workspace'"),
+    ("microsoft", "software", 0.68, "Matched vendor keyword 'microsoft'"),
+    ("dropbox", "software", 0.70, "Matched vendor keyword 'dropbox'"),
+    ("slack", "software", 0.70, "Matched vendor keyword 'slack'"),
+    ("github", "software", 0.65, "Matched vendor keyword 'github'"),
+    ("zoom", "software", 0.65, "Matched vendor keyword 'zoom'"),
+
+    # Meals
+    ("doordash", "meals", 0.72, "Matched vendor keyword 'doordash'"),
+    ("uber eats", "meals", 0.72, "Matched vendor keyword 'uber eats'"),
+
+    # Travel
+    ("airbnb", "travel", 0.72, "Matched vendor keyword 'airbnb'"),
+    ("delta", "travel", 0.68, "Matched vendor keyword 'delta'"),
+    ("united", "travel", 0.66, "Matched vendor keyword 'united'"),
+    ("hotel", "travel", 0.60, "Matched keyword 'hotel'"),
+    ("lyft", "travel", 0.58, "Matched vendor keyword 'lyft'"),
+
+    # Marketing
+    ("facebook", "marketing", 0.70, "Matched vendor keyword 'facebook'"),
+    ("meta", "marketing", 0.62, "Matched vendor keyword 'meta'"),
+    ("google ads", "marketing", 0.72, "Matched vendor keyword 'google ads'"),
+    ("adwords", "marketing", 0.70, "Matched vendor keyword 'adwords'"),
+
+    # Bank fees
+    ("bank fee", "bank_fees", 0.72, "Matched keyword 'bank fee'"),
+    ("service fee", "bank_fees", 0.64, "Matched keyword 'service fee'"),
+    ("overdraft", "bank_fees", 0.78, "Matched keyword 'overdraft'"),
+)
+
+
+@dataclass(frozen=True)
+class KeywordHit:
+    keyword: str
+    system_key: str
+    confidence: float
+    reason: str
 
 
 def _norm(s: str) -> str:
     return (s or "").strip().lower()
 
-def _contains(hay: str, *needles: str) -> bool:
-    h = _norm(hay)
-    return any(_norm(n) in h for n in needles)
+
+def _compile() -> Tuple[List[KeywordHit], int, AhoCorasick]:
+    entries: List[KeywordHit] = [
+        KeywordHit(keyword=_norm(kw), system_key=system_key, confidence=conf, reason=reason)
+        for system_key, conf, reason, keywords in GLOBAL_RULE_KEYWORDS
+        for kw in keywords
+    ]
+    vendor_start = len(entries)
+    entries.extend(
+        KeywordHit(keyword=_norm(kw), system_key=system_key, confidence=conf, reason=reason)
+        for kw, system_key, conf, reason in VENDOR_KEYWORDS
+    )
+    return entries, vendor_start, AhoCorasick([e.keyword for e in entries])
+
+
+# entries in precedence order: rule groups first, then vendor keywords
+_ENTRIES, _VENDOR_START, _MATCHER = _compile()
+
+
+def _first_hit(description: str, start: int, stop: int) -> Optional[KeywordHit]:
+    found = _MATCHER.search(_norm(description))
+    idx = min((i for i in found if start <= i < stop), default=None)
+    return None if idx is None else _ENTRIES[idx]
+
+
+def match_global_rule(description: str) -> Optional[KeywordHit]:
+    """
+    First GLOBAL_RULE_KEYWORDS group with a keyword in `description`.
+    """
+    return _first_hit(description, 0, _VENDOR_START)
+
+
+def match_vendor_keyword(description: str) -> Optional[KeywordHit]:
+    """
+    First VENDOR_KEYWORDS entry whose keyword is in `description`.
+    """
+    return _first_hit(description, _VENDOR_START, len(_ENTRIES))
 
 
 def _enrich(
@@ -48,36 +154,14 @@ def categorize_txn(txn: NormalizedTransaction) -> NormalizedTransaction:
     if _norm(txn.category) != "uncategorized":
         return txn
 
-    desc = _norm(txn.description)
-
-    # --- Payroll rules ---
-    if _contains(desc, "gusto", "adp", "payroll", "paychex", "intuit payroll"):
-        return _enrich(
-            txn,
-            category="payroll",
-            source="rule",
-            confidence=0.92,
-            reason="Matched payroll keyword/merchant in description",
-        )
-
-    # --- Hosting rules ---
-    if _contains(desc, "aws", "amazon web services", "digitalocean", "heroku", "render", "vercel", "netlify"):
-        return _enrich(
-            txn,
-            category="hosting",
-            source="rule",
-            confidence=0.88,
-            reason="Matched hosting keyword/merchant in description",
-        )
-
-    # --- Rent rules ---
-    if _contains(desc, "rent", "lease"):
+    hit = match_global_rule(txn.description)
+    if hit:
         return _enrich(
             txn,
-            category="rent",
+            category=hit.system_key,
             source="rule",
-            confidence=0.80,
-            reason="Matched rent/lease keyword in description",
+            confidence=hit.confidence,
+            reason=hit.reason,
         )
 
     # No match: mark reviewed but keep uncategorized
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import os
 from dataclasses import replace
 from pathlib import Path
 
@@ -7,7 +8,8 @@ from backend.app.norma.normalize import NormalizedTransaction, EnrichedTransacti
 from backend.app.norma.merchant import merchant_key
 from backend.app.norma.brain_store import BrainStore
 
-BRAIN_PATH = Path(__file__).resolve().parent / "data" / "brain.json"
+# BRAIN_DB_PATH overrides the default location; the file is created on first use, not on import
+BRAIN_PATH = Path(os.environ.get("BRAIN_DB_PATH") or Path(__file__).resolve().parent / "data" / "brain.db")
 brain = BrainStore(BRAIN_PATH)
 
 
@@ -36,4 +38,28 @@ def categorize_txn_with_brain(txn: NormalizedTransaction, *, business_id: str) -
             ),
         )
 
+    # near miss on the alias ("sysco food svc" vs learned "sysco foods")
+    fuzzy = brain.fuzzy_lookup_label(business_id=business_id, alias_key=mk)
+    if fuzzy:
+        base = _as_enriched(txn)
+        system_key = fuzzy.label.system_key
+        return replace(
+            base,
+            category=system_key,
+            categorization=Categorization(
+                category=system_key,
+                source="memory_fuzzy",
+                confidence=round(fuzzy.label.confidence * fuzzy.similarity, 2),
+                reason=f"Close match to vendor memory '{fuzzy.alias_key}' for this business",
+                candidates=[
+                    {
+                        "merchant_key": mk,
+                        "matched_alias": fuzzy.alias_key,
+                        "similarity": fuzzy.similarity,
+                        "system_key": system_key,
+                    }
+                ],
+            ),
+        )
+
     return txn
@@ -1,15 +1,14 @@
 from __future__ import annotations
 
 from dataclasses import replace
-from typing import Optional, List, Tuple
+from typing import Callable, Dict, Hashable, List, Optional, Sequence
 
-from sqlalchemy import select, and_
-from sqlalchemy.orm import Session
-
-from backend.app.models import CategoryRule, BusinessCategoryMap
 from backend.app.norma.normalize import NormalizedTransaction, EnrichedTransaction, Categorization
-from backend.app.norma.categorize import categorize_txn as heuristic_categorize_txn
+from backend.app.norma.categorize import categorize_txn as heuristic_categorize_txn, match_vendor_keyword
 from backend.app.norma.categorize_brain import categorize_txn_with_brain
+from backend.app.norma.categorization_context import CategorizationContext
+from backend.app.norma.merchant import merchant_keys
+from backend.app.norma import suggestion_cache
 
 
 def _as_enriched(txn: NormalizedTransaction) -> EnrichedTransaction:
@@ -20,78 +19,22 @@ def _is_uncat(val: Optional[str]) -> bool:
     return (val or "").strip().lower() in ("", "uncategorized", "unknown")
 
 
-def _contains(haystack: str, needle: str) -> bool:
-    return needle in haystack
-
-
-def _system_key_for_category_id(db: Session, business_id: str, category_id: str) -> Optional[str]:
-    """
-    Convert category_id -> system_key using BusinessCategoryMap.
-    This keeps your "system_key as lingua franca" approach consistent.
-    """
-    m = db.execute(
-        select(BusinessCategoryMap.system_key).where(
-            and_(
-                BusinessCategoryMap.business_id == business_id,
-                BusinessCategoryMap.category_id == category_id,
-            )
-        )
-    ).scalar_one_or_none()
-    return (m or "").strip().lower() or None
-
-
 def suggest_from_rules(
-    db: Session,
+    ctx: CategorizationContext,
     txn: NormalizedTransaction,
-    *,
-    business_id: str,
 ) -> Optional[EnrichedTransaction]:
     """
     Business-scoped deterministic rules using CategoryRule.
     Returns EnrichedTransaction where `category` == system_key (NOT category name).
 
     Conflict policy: first match wins, ordered by priority (asc), created_at (asc), id (asc).
+    Matching runs on the business's compiled (Aho-Corasick) rule set.
     """
-    desc = (txn.description or "").strip().lower()
-    if not desc:
-        return None
-
-    direction = (txn.direction or "").strip().lower()  # "inflow"/"outflow"
-    account = (txn.account or "").strip().lower()
-
-    # Pull active rules, most specific first (lower priority number = higher rank)
-    rules = db.execute(
-        select(CategoryRule)
-        .where(
-            and_(
-                CategoryRule.business_id == business_id,
-                CategoryRule.active.is_(True),
-            )
-        )
-        .order_by(
-            CategoryRule.priority.asc(),
-            CategoryRule.created_at.asc(),
-            CategoryRule.id.asc(),
-        )
-        .limit(5000)
-    ).scalars().all()
-
-    for r in rules:
-        needle = (r.contains_text or "").strip().lower()
-        if not needle:
-            continue
-
-        if r.direction and (r.direction.strip().lower() != direction):
-            continue
-
-        if r.account and (r.account.strip().lower() != account):
-            continue
-
-        if not _contains(desc, needle):
-            continue
+    for r in ctx.rules.iter_matches(txn.description, txn.direction, txn.account):
+        needle = r.contains_text
 
         # Map category_id -> system_key (what your downstream expects)
-        system_key = _system_key_for_category_id(db, business_id, r.category_id)
+        system_key = ctx.system_key_for_category_id(r.category_id)
         if not system_key or system_key == "uncategorized":
             continue
 
@@ -113,113 +56,122 @@ def suggest_from_rules(
 
 def _vendor_keyword_suggest(description: str) -> Optional[Categorization]:
     """
-    Lightweight global keyword heuristics -> system_key.
-    Deterministic + cheap.
+    Lightweight global keyword heuristics -> system_key (categorize.VENDOR_KEYWORDS).
+    Deterministic + cheap: one scan of the compiled keyword matcher.
     """
-    d = (description or "").strip().lower()
-    if not d:
+    hit = match_vendor_keyword(description)
+    if hit is None:
         return None
+    return Categorization(
+        category=hit.system_key,
+        source="heuristic",
+        confidence=hit.confidence,
+        reason=hit.reason,
+        candidates=None,
+    )
+
+
+_NO_SUGGESTION = Categorization(
+    category="uncategorized",
+    source="none",
+    confidence=0.0,
+    reason="No suggestion available; needs review",
+    candidates=None,
+)
 
-    rules: List[Tuple[str, str, float, str]] = [
-        # Utilities / telecom
-        ("comcast", "utilities", 0.78, "Matched vendor keyword 'comcast'"),
-        ("xfinity", "utilities", 0.78, "Matched vendor keyword 'xfinity'"),
-        ("verizon", "utilities", 0.70, "Matched vendor keyword 'verizon'"),
-        ("at&t", "utilities", 0.70, "Matched vendor keyword 'at&t'"),
-        ("t-mobile", "utilities", 0.70, "Matched vendor keyword 't-mobile'"),
-        ("tmobile", "utilities", 0.70, "Matched vendor keyword 'tmobile'"),
-
-        # Software / subscriptions
-        ("adobe", "software", 0.74, "Matched vendor keyword 'adobe'"),
-        ("google workspace", "software", 0.70, "Matched vendor keyword 'google workspace'"),
-        ("microsoft", "software", 0.68, "Matched vendor keyword 'microsoft'"),
-        ("dropbox", "software", 0.70, "Matched vendor keyword 'dropbox'"),
-        ("slack", "software", 0.70, "Matched vendor keyword 'slack'"),
-        ("github", "software", 0.65, "Matched vendor keyword 'github'"),
-        ("zoom", "software", 0.65, "Matched vendor keyword 'zoom'"),
-
-        # Meals
-        ("doordash", "meals", 0.72, "Matched vendor keyword 'doordash'"),
-        ("uber eats", "meals", 0.72, "Matched vendor keyword 'uber eats'"),
-
-        # Travel
-        ("airbnb", "travel", 0.72, "Matched vendor keyword 'airbnb'"),
-        ("delta", "travel", 0.68, "Matched vendor keyword 'delta'"),
-        ("united", "travel", 0.66, "Matched vendor keyword 'united'"),
-        ("hotel", "travel", 0.60, "Matched keyword 'hotel'"),
-        ("lyft", "travel", 0.58, "Matched vendor keyword 'lyft'"),
-
-        # Marketing
-        ("facebook", "marketing", 0.70, "Matched vendor keyword 'facebook'"),
-        ("meta", "marketing", 0.62, "Matched vendor keyword 'meta'"),
-        ("google ads", "marketing", 0.72, "Matched vendor keyword 'google ads'"),
-        ("adwords", "marketing", 0.70, "Matched vendor keyword 'adwords'"),
-
-        # Bank fees
-        ("bank fee", "bank_fees", 0.72, "Matched keyword 'bank fee'"),
-        ("service fee", "bank_fees", 0.64, "Matched keyword 'service fee'"),
-        ("overdraft", "bank_fees", 0.78, "Matched keyword 'overdraft'"),
-    ]
-
-    for needle, system_key, conf, why in rules:
-        if needle in d:
-            return Categorization(
-                category=system_key,
-                source="heuristic",
-                confidence=conf,
-                reason=why,
-                candidates=None,
-            )
 
+def _accepted(res: Optional[NormalizedTransaction]) -> Optional[Categorization]:
+    if isinstance(res, EnrichedTransaction) and res.categorization and not _is_uncat(res.category):
+        return res.categorization
     return None
 
 
+def _memo(cache: Dict[Hashable, Optional[Categorization]], key: Hashable, fn: Callable[[], Optional[Categorization]]):
+    if key not in cache:
+        cache[key] = fn()
+    return cache[key]
+
+
+def suggest_categories(
+    ctx: CategorizationContext,
+    txns: Sequence[NormalizedTransaction],
+) -> List[NormalizedTransaction]:
+    """
+    Batch form of suggest_category (same order, same results, one output per input).
+
+    Each stage is evaluated once per distinct value of the inputs it reads and
+    the result fanned out to every txn sharing it:
+      1) Brain       -> merchant_key
+      2) Rules       -> description, direction, account
+      3) Heuristics  -> description
+    Review lists repeat the same few suppliers, so most txns hit a memo.
+
+    Results are also kept across requests in the business's suggestion cache
+    (norma/suggestion_cache), which is emptied when rules, brain or mappings change.
+    """
+    cache = suggestion_cache.cache_for(ctx)
+    brain_memo: Dict[Hashable, Optional[Categorization]] = {}
+    rule_memo: Dict[Hashable, Optional[Categorization]] = {}
+    heur_memo: Dict[Hashable, Optional[Categorization]] = {}
+
+    def _heuristics(txn: NormalizedTransaction) -> Optional[Categorization]:
+        heur = _accepted(heuristic_categorize_txn(txn))
+        if heur:
+            return heur
+        kw = _vendor_keyword_suggest(txn.description)
+        return kw if kw and not _is_uncat(kw.category) else None
+
+    out: List[NormalizedTransaction] = []
+    for txn, mk in zip(txns, merchant_keys(t.description for t in txns)):
+        if not _is_uncat(txn.category):
+            out.append(txn)
+            continue
+
+        cat = (txn.category or "").strip().lower()
+        desc = (txn.description or "").strip().lower()
+        direction = (txn.direction or "").strip().lower()
+        account = (txn.account or "").strip().lower()
+
+        cache_key = (desc, cat, direction, account)
+        found = cache.get(cache_key)
+        if found is suggestion_cache.MISS:
+            found = (
+                _memo(
+                    brain_memo,
+                    (mk, cat),
+                    lambda: _accepted(categorize_txn_with_brain(txn, business_id=ctx.business_id)),
+                )
+                or _memo(
+                    rule_memo,
+                    (desc, direction, account),
+                    lambda: _accepted(suggest_from_rules(ctx, txn)),
+                )
+                or _memo(heur_memo, (desc, cat), lambda: _heuristics(txn))
+            )
+            cache.put(cache_key, found)
+
+        base = _as_enriched(txn)
+        if found:
+            out.append(replace(base, category=found.category, categorization=found))
+        else:
+            # IMPORTANT: do NOT invent “uncategorized” as a suggestion
+            out.append(replace(base, categorization=_NO_SUGGESTION))
+
+    return out
+
+
 def suggest_category(
-    db: Session,
+    ctx: CategorizationContext,
     txn: NormalizedTransaction,
-    *,
-    business_id: str,
 ) -> NormalizedTransaction:
     """
     Suggestion order:
       1) Brain (business memory)
       2) Rules (business deterministic / bulk-loadable)
-      3) Heuristics (global)
+      3) Heuristics (global engine, then the keyword list)
       4) No suggestion
+
+    `ctx` holds the request's rules and mappings (CategorizationContext.load); no DB access here.
+    Prefer suggest_categories for lists.
     """
-    if not _is_uncat(txn.category):
-        return txn
-
-    # 1) Brain
-    brain_res = categorize_txn_with_brain(txn, business_id=business_id)
-    if isinstance(brain_res, EnrichedTransaction) and brain_res.categorization and not _is_uncat(brain_res.category):
-        return brain_res
-
-    # 2) Rules
-    rule_res = suggest_from_rules(db, txn, business_id=business_id)
-    if rule_res and not _is_uncat(rule_res.category):
-        return rule_res
-
-    # 3) Heuristics (your existing global heuristic engine)
-    heur = heuristic_categorize_txn(txn)
-    if isinstance(heur, EnrichedTransaction) and heur.categorization and not _is_uncat(heur.category):
-        return heur
-
-    # 3b) Optional: your tiny keyword list (if you want it as a fallback)
-    kw = _vendor_keyword_suggest(txn.description)
-    if kw and not _is_uncat(kw.category):
-        base = _as_enriched(txn)
-        return replace(base, category=kw.category, categorization=kw)
-
-    # 4) No suggestion -> IMPORTANT: do NOT invent “uncategorized” as a suggestion
-    base = _as_enriched(txn)
-    return replace(
-        base,
-        categorization=Categorization(
-            category="uncategorized",
-            source="none",
-            confidence=0.0,
-            reason="No suggestion available; needs review",
-            candidates=None,
-        ),
-    )
+    return suggest_categories(ctx, [txn])[0]
@@ -16,6 +16,8 @@ Design notes:
 - Apply rounding/formatting only when serializing for API/UI.
 - Facts must be deterministic: same inputs -> same outputs.
 - Facts are a contract: changes should be additive and versioned if breaking.
+- incremental_facts.IncrementalFacts keeps the same aggregates as running state;
+  keep the two in step when a fact is added or changed.
 """
 
 from __future__ import annotations
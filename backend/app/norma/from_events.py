@@ -6,6 +6,11 @@ from typing import Any, Dict, Optional, Tuple
 
 from backend.app.norma.normalize import NormalizedTransaction
 
+# Bump whenever raw_event_to_txn output changes: persisted normalized_transactions
+# rows with an older version are re-normalized (lazily on read, or via
+# `python -m backend.app.scripts.renormalize`).
+NORMALIZER_VERSION = 1
+
 
 def _as_utc(dt: datetime) -> datetime:
     if dt.tzinfo is None:
@@ -165,6 +170,25 @@ def _normalize_category(raw: Optional[str], *, direction: Optional[str] = None)
     return "uncategorized"
 
 
+def row_to_txn(row: Any) -> NormalizedTransaction:
+    """
+    NormalizedTransaction from a persisted normalized_transactions row
+    (or any object with the same attributes).
+    """
+    return NormalizedTransaction(
+        id=None,
+        source_event_id=row.source_event_id,
+        occurred_at=_as_utc(row.occurred_at),
+        date=row.date,
+        description=row.description or "",
+        amount=float(row.amount or 0.0),
+        direction=row.direction,  # type: ignore[arg-type]
+        account=row.account or "",
+        category=row.category or "uncategorized",
+        counterparty_hint=row.counterparty_hint,
+    )
+
+
 def raw_event_to_txn(payload: Any, occurred_at: datetime, source_event_id: str) -> NormalizedTransaction:
     payload = _maybe_json(payload)
     if not isinstance(payload, dict):
@@ -0,0 +1,237 @@
+"""
+Norma - incremental facts.
+
+Responsibility:
+- Keep the aggregates behind Facts as running state, so a batch of new
+  normalized transactions is folded in in O(batch) instead of recomputing
+  everything from the full history (compute_facts).
+
+State:
+- current cash, monthly inflow/outflow buckets, per-category signed sums
+- daily inflow/outflow buckets for the rolling windows, pruned to the span
+  the largest window pair can still reach from the newest date
+- the last-N ledger preview (top N by ledger sort order)
+
+Design notes:
+- Transactions may arrive in any order (late-arriving deposits included):
+  every aggregate is order-independent, and sums are exact (Shewchuk
+  partials, rounded once on read), so the state does not drift however many
+  batches it has absorbed.
+- to_facts() returns the same Facts contract as compute_facts over the same
+  transactions: facts_to_dict output is identical.
+"""
+
+from __future__ import annotations
+
+import bisect
+import math
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .facts import (
+    CategoryTotal,
+    Facts,
+    FactsMeta,
+    LedgerPreviewRow,
+    MonthlyCashflow,
+    RollingWindowFacts,
+    WindowPair,
+    month_key,
+)
+from .ledger import _signed_amount, _sort_key
+from .normalize import NormalizedTransaction
+
+
+# ----------------------------
+# Exact running sums
+# ----------------------------
+
+class ExactSum:
+    """
+    Running float sum without rounding error (Shewchuk's non-overlapping
+    partials, as in math.fsum). The value is independent of addition order.
+    """
+    __slots__ = ("partials",)
+
+    def __init__(self) -> None:
+        self.partials: List[float] = []
+
+    def add(self, x: float) -> None:
+        partials = self.partials
+        i = 0
+        for y in partials:
+            if abs(x) < abs(y):
+                x, y = y, x
+            hi = x + y
+            lo = y - (hi - x)
+            if lo:
+                partials[i] = lo
+                i += 1
+            x = hi
+        partials[i:] = [x]
+
+    @property
+    def value(self) -> float:
+        return math.fsum(self.partials)
+
+
+def _fsum(sums: Iterable[ExactSum], extra: Iterable[float] = ()) -> float:
+    return math.fsum([p for s in sums for p in s.partials] + list(extra))
+
+
+# ----------------------------
+# Incremental state
+# ----------------------------
+
+class IncrementalFacts:
+    """
+    Facts aggregates for one business, updated batch by batch.
+
+        state = IncrementalFacts.from_txns(history)
+        state.add(new_batch)
+        facts = state.to_facts()
+    """
+
+    def __init__(
+        self,
+        *,
+        preview_size: int = 10,
+        window_days_list: Tuple[int, ...] = (30, 60, 90),
+    ) -> None:
+        self.preview_size = preview_size
+        self.window_days_list = window_days_list
+
+        self.txn_count = 0
+        self.cash = ExactSum()
+        self.monthly: Dict[str, Tuple[ExactSum, ExactSum]] = {}      # month -> (inflow, outflow)
+        self.categories: Dict[str, ExactSum] = {}                     # first-seen order
+        self.daily: Dict[date, Tuple[ExactSum, ExactSum]] = {}        # txn date -> (inflow, outflow)
+        self.anchor: Optional[date] = None                            # newest txn date
+        self.preview: List[Tuple[tuple, NormalizedTransaction]] = []  # ascending ledger sort key
+
+    @classmethod
+    def from_txns(cls, txns: Iterable[NormalizedTransaction], **kwargs) -> "IncrementalFacts":
+        state = cls(**kwargs)
+        state.add(txns)
+        return state
+
+    # ---- updates
+
+    def add(self, txns: Iterable[NormalizedTransaction]) -> None:
+        """
+        Fold a batch of new transactions into the state, in any order.
+        """
+        for t in txns:
+            self._add_one(t)
+        self._prune_daily()
+
+    def _add_one(self, t: NormalizedTransaction) -> None:
+        self.txn_count += 1
+
+        signed = _signed_amount(t)
+        self.cash.add(signed)
+
+        # monthly rollup follows the ledger: month of occurred_at, bucket by sign
+        inflow, outflow = self.monthly.setdefault(month_key(t.occurred_at.date()), (ExactSum(), ExactSum()))
+        if signed >= 0:
+            inflow.add(signed)
+        else:
+            outflow.add(-signed)
+
+        cat = t.category or "uncategorized"
+        self.categories.setdefault(cat, ExactSum()).add(t.amount if t.direction == "inflow" else -t.amount)
+
+        if self.anchor is None or t.date > self.anchor:
+            self.anchor = t.date
+        if t.date >= self._daily_floor():
+            day_in, day_out = self.daily.setdefault(t.date, (ExactSum(), ExactSum()))
+            (day_in if t.direction == "inflow" else day_out).add(t.amount)
+
+        key = _sort_key(t)
+        if len(self.preview) < self.preview_size or (self.preview and key >= self.preview[0][0]):
+            bisect.insort_right(self.preview, (key, t), key=lambda item: item[0])
+            if len(self.preview) > self.preview_size:
+                self.preview.pop(0)
+
+    def _daily_floor(self) -> date:
+        # oldest day any window pair can reach from the current anchor
+        span = 2 * max(self.window_days_list, default=0)
+        return self.anchor - timedelta(days=span - 1) if self.anchor else date.min
+
+    def _prune_daily(self) -> None:
+        floor = self._daily_floor()
+        for d in [d for d in self.daily if d < floor]:
+            del self.daily[d]
+
+    # ---- reads
+
+    def _window_sums(self, start: date, end: date) -> Tuple[float, float]:
+        days = [self.daily.get(start + timedelta(days=i)) for i in range((end - start).days + 1)]
+        days = [b for b in days if b is not None]
+        return _fsum(b[0] for b in days), _fsum(b[1] for b in days)
+
+    def _window_pair(self, window_days: int) -> WindowPair:
+        anchor = self.anchor
+        last_in, last_out = self._window_sums(anchor - timedelta(days=window_days - 1), anchor)
+        prev_in, prev_out = self._window_sums(
+            anchor - timedelta(days=2 * window_days - 1),
+            anchor - timedelta(days=window_days),
+        )
+        return WindowPair(
+            window_days=window_days,
+            anchor_date=anchor.isoformat(),
+            last_inflow=last_in,
+            last_outflow=last_out,
+            last_net=last_in - last_out,
+            prev_inflow=prev_in,
+            prev_outflow=prev_out,
+            prev_net=prev_in - prev_out,
+        )
+
+    def _preview_rows(self) -> List[LedgerPreviewRow]:
+        # balances walk back from current cash: balance_i = cash - (rows after i)
+        amounts = [_signed_amount(t) for _k, t in self.preview]
+        rows: List[LedgerPreviewRow] = []
+        for i, (_k, t) in enumerate(self.preview):
+            rows.append(
+                LedgerPreviewRow(
+                    occurred_at=t.occurred_at.isoformat(),
+                    source_event_id=t.source_event_id,
+                    date=t.date.isoformat(),
+                    description=t.description,
+                    amount=amounts[i],
+                    category=t.category or "uncategorized",
+                    balance=_fsum([self.cash], (-a for a in amounts[i + 1 :])),
+                )
+            )
+        return rows
+
+    def to_facts(self) -> Facts:
+        """
+        Materialize Facts (same contract as compute_facts over every added txn).
+        """
+        monthly_rows = []
+        for m in sorted(self.monthly):
+            inflow, outflow = self.monthly[m][0].value, self.monthly[m][1].value
+            monthly_rows.append(MonthlyCashflow(month=m, inflow=inflow, outflow=outflow, net=inflow - outflow))
+
+        totals = [(c, s.value) for c, s in self.categories.items()]
+        cat_rows = [CategoryTotal(category=c, total=v) for c, v in sorted(totals, key=lambda kv: abs(kv[1]), reverse=True)]
+
+        preview = self._preview_rows()
+        windows = None
+        if self.txn_count:
+            windows = RollingWindowFacts(windows={d: self._window_pair(d) for d in self.window_days_list})
+
+        return Facts(
+            current_cash=self.cash.value,
+            monthly_inflow_outflow=monthly_rows,
+            totals_by_category=cat_rows,
+            last_10_ledger_rows=preview,
+            meta=FactsMeta(
+                as_of=self.preview[-1][1].date.isoformat() if self.preview else None,
+                txn_count=self.txn_count,
+                months_covered=len(monthly_rows),
+            ),
+            windows=windows,
+        )
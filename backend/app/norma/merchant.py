@@ -1,24 +1,75 @@
+"""
+Merchant keys: the normalized vendor identity used by the brain, bulk apply,
+vendor drilldowns and the health vendor signals.
+
+merchant_key is pure and hot (called several times per transaction on read
+paths, mostly for the same few hundred descriptions), so results are kept in a
+bounded in-process LRU. merchant_key_cache_info() exposes hit/miss counters
+for tuning MERCHANT_KEY_CACHE_SIZE.
+"""
+
+from __future__ import annotations
+
 import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
 
-_STOPWORDS = {
+_STOPWORDS = frozenset({
     "pos","ach","debit","credit","card","purchase","payment","pmt","online","web","www",
     "inc","llc","co","company","corp","corporation","the",
-}
-
-def merchant_key(description: str) -> str:
-    s = (description or "").lower().strip()
-    # drop common prefixes like "sq *", "tst*", etc (tune later)
-    s = re.sub(r"[^a-z0-9\s\*]", " ", s)
-    s = re.sub(r"\d+", " ", s)
-    s = s.replace("*", " ")
-    s = re.sub(r"\s+", " ", s).strip()
-
-    tokens = [t for t in s.split(" ") if t and t not in _STOPWORDS]
-    # keep first N tokens to avoid overfitting to long tails
-    tokens = tokens[:6]
+})
+
+# Lowercased text is reduced to its runs of a-z: punctuation, digits and "*"
+# prefixes ("sq *", "tst*") all act as separators.
+_WORD_RE = re.compile(r"[a-z]+")
+
+# keep first N tokens to avoid overfitting to long tails
+_MAX_TOKENS = 6
+
+MERCHANT_KEY_CACHE_SIZE = 16_384
+
+
+@lru_cache(maxsize=MERCHANT_KEY_CACHE_SIZE)
+def _merchant_key(description: str) -> str:
+    tokens: List[str] = []
+    for t in _WORD_RE.findall(description.lower()):
+        if t in _STOPWORDS:
+            continue
+        tokens.append(t)
+        if len(tokens) == _MAX_TOKENS:
+            break
     return " ".join(tokens)
 
 
+def merchant_key(description: Optional[str]) -> str:
+    return _merchant_key(description or "")
+
+
+def merchant_keys(descriptions: Iterable[Optional[str]]) -> List[str]:
+    """
+    merchant_key for each description (same order); each distinct description
+    is keyed once per call.
+    """
+    seen: Dict[str, str] = {}
+    out: List[str] = []
+    for d in descriptions:
+        d = d or ""
+        key = seen.get(d)
+        if key is None:
+            key = seen[d] = _merchant_key(d)
+        out.append(key)
+    return out
+
+
+def merchant_key_cache_info() -> Dict[str, int]:
+    info = _merchant_key.cache_info()
+    return {"hits": info.hits, "misses": info.misses, "size": info.currsize, "maxsize": info.maxsize or 0}
+
+
+def clear_merchant_key_cache() -> None:
+    _merchant_key.cache_clear()
+
+
 def canonical_merchant_name(description: str) -> str:
     key = merchant_key(description)
     if not key:
@@ -31,7 +31,7 @@ from .ingest import RawTransaction
 Direction = Literal["inflow", "outflow"]
 
 # Where a category decision came from (useful for audit + UI review later)
-CategorySource = Literal["raw", "rule", "memory", "human", "model"]
+CategorySource = Literal["raw", "rule", "memory", "memory_fuzzy", "human", "model"]
 
 
 # -------------------------
@@ -0,0 +1,188 @@
+"""
+Compiled CategoryRule matcher.
+
+All active `contains_text` needles of a business are compiled into one
+Aho-Corasick automaton, so matching a description costs O(len(description) +
+matches) instead of O(rules). Conflict policy is unchanged: among the rules
+whose needle occurs in the description and whose direction/account filters
+pass, the first by (priority, created_at, id) wins.
+
+Compiled matchers are cached in process per business (LRU, _CACHE_SIZE
+businesses) and keyed by Business.rules_version, which every rule write bumps
+(bump_rules_version).
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import and_, select, update
+from sqlalchemy.orm import Session
+
+from backend.app.models import Business, CategoryRule
+from backend.app.norma.aho_corasick import AhoCorasick
+
+
+@dataclass(frozen=True)
+class RuleSpec:
+    id: str
+    category_id: str
+    contains_text: str  # stripped + lowercased
+    direction: Optional[str]  # stripped + lowercased, None = any
+    account: Optional[str]  # stripped + lowercased, None = any
+    priority: int
+    created_at: Optional[datetime]
+
+    @property
+    def order_key(self) -> tuple:
+        return (self.priority, self.created_at, self.id)
+
+    def passes_filters(self, direction: str, account: str) -> bool:
+        if self.direction and self.direction != direction:
+            return False
+        if self.account and self.account != account:
+            return False
+        return True
+
+
+def _norm(s: Optional[str]) -> str:
+    return (s or "").strip().lower()
+
+
+def rule_spec(rule) -> RuleSpec:
+    """
+    RuleSpec from a CategoryRule (or any row with the same attributes).
+    """
+    return RuleSpec(
+        id=rule.id,
+        category_id=rule.category_id,
+        contains_text=_norm(rule.contains_text),
+        direction=_norm(rule.direction) or None,
+        account=_norm(rule.account) or None,
+        priority=rule.priority,
+        created_at=rule.created_at,
+    )
+
+
+class CompiledRules:
+    """
+    Rules in conflict-policy order + one automaton over their distinct needles.
+    """
+
+    def __init__(self, rules: Iterable[RuleSpec]):
+        self.rules: List[RuleSpec] = sorted((r for r in rules if r.contains_text), key=lambda r: r.order_key)
+
+        needles: List[str] = []
+        needle_idx: Dict[str, int] = {}
+        by_needle: List[List[int]] = []
+        for rank, r in enumerate(self.rules):
+            i = needle_idx.get(r.contains_text)
+            if i is None:
+                i = needle_idx[r.contains_text] = len(needles)
+                needles.append(r.contains_text)
+                by_needle.append([])
+            by_needle[i].append(rank)
+
+        self._by_needle = by_needle
+        self._automaton = AhoCorasick(needles)
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def iter_matches(self, description: Optional[str], direction: Optional[str], account: Optional[str]) -> Iterator[RuleSpec]:
+        """
+        Every matching rule, in conflict-policy order.
+        """
+        desc = _norm(description)
+        if not desc or not self.rules:
+            return
+        d, a = _norm(direction), _norm(account)
+        ranks: List[int] = []
+        for i in self._automaton.search(desc):
+            ranks.extend(self._by_needle[i])
+        for rank in sorted(ranks):
+            r = self.rules[rank]
+            if r.passes_filters(d, a):
+                yield r
+
+    def first_match(self, description: Optional[str], direction: Optional[str], account: Optional[str]) -> Optional[RuleSpec]:
+        return next(self.iter_matches(description, direction, account), None)
+
+
+# ----------------------------
+# Per-business cache
+# ----------------------------
+
+_CACHE_SIZE = 256  # businesses
+
+_cache: "OrderedDict[str, Tuple[int, CompiledRules]]" = OrderedDict()
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0}
+
+
+def rules_version(db: Session, business_id: str) -> int:
+    v = db.execute(select(Business.rules_version).where(Business.id == business_id)).scalar_one_or_none()
+    return int(v or 0)
+
+
+def bump_rules_version(db: Session, business_id: str) -> None:
+    """
+    Call on every CategoryRule insert/update/delete (same transaction). Does NOT commit.
+    """
+    db.execute(
+        update(Business)
+        .where(Business.id == business_id)
+        .values(rules_version=Business.rules_version + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _load_active_rule_specs(db: Session, business_id: str) -> List[RuleSpec]:
+    rows = db.execute(
+        select(
+            CategoryRule.id,
+            CategoryRule.category_id,
+            CategoryRule.contains_text,
+            CategoryRule.direction,
+            CategoryRule.account,
+            CategoryRule.priority,
+            CategoryRule.created_at,
+        ).where(and_(CategoryRule.business_id == business_id, CategoryRule.active.is_(True)))
+    ).all()
+    return [rule_spec(r) for r in rows]
+
+
+def get_compiled_rules(db: Session, business_id: str) -> CompiledRules:
+    """
+    Compiled matcher for the business's active rules (cached by rules_version).
+    """
+    version = rules_version(db, business_id)
+    with _lock:
+        hit = _cache.get(business_id)
+        if hit is not None and hit[0] == version:
+            _cache.move_to_end(business_id)
+            _stats["hits"] += 1
+            return hit[1]
+        _stats["misses"] += 1
+
+    compiled = CompiledRules(_load_active_rule_specs(db, business_id))
+    with _lock:
+        _cache[business_id] = (version, compiled)
+        _cache.move_to_end(business_id)
+        if len(_cache) > _CACHE_SIZE:
+            _cache.popitem(last=False)
+    return compiled
+
+
+def cache_info() -> Dict[str, int]:
+    with _lock:
+        return {"hits": _stats["hits"], "misses": _stats["misses"], "size": len(_cache), "maxsize": _CACHE_SIZE}
+
+
+def clear_cache() -> None:
+    with _lock:
+        _cache.clear()
@@ -0,0 +1,116 @@
+"""
+Cross-request cache of suggestion results (category_engine.suggest_categories).
+
+A suggestion is a pure function of the transaction's normalized description,
+category hint, direction and account, plus three per-business inputs:
+  - the compiled rule set (get_compiled_rules replaces it on every
+    Business.rules_version bump)
+  - the business's brain version (BrainStore.business_version, bumped only
+    when this business's labels, or the aliases of merchants it labeled, change)
+  - the BusinessCategoryMap snapshot in the CategorizationContext
+Each business gets a bounded LRU stamped with those three; a request whose
+context differs from the stamp empties that business's LRU first, so a new
+rule, label or mapping shows up on the very next request, and a label in
+one business leaves every other business's LRU warm.
+
+suggestion_cache_info() exposes hit/miss counters and sizes (GET /admin/caches).
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from backend.app.norma.categorization_context import CategorizationContext
+from backend.app.norma.categorize_brain import brain
+from backend.app.norma.normalize import Categorization
+
+SUGGESTION_CACHE_SIZE = 4096        # entries per business
+SUGGESTION_CACHE_BUSINESSES = 256   # businesses kept (least recently used dropped)
+
+MISS: Any = object()
+
+
+class BusinessSuggestionCache:
+    """
+    One business's LRU: (description, category, direction, account) -> Optional[Categorization].
+    """
+
+    def __init__(self, stamp: Tuple[Any, int, Dict[str, str]]):
+        self.stamp = stamp
+        self._entries: "OrderedDict[Hashable, Optional[Categorization]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Any:
+        with _lock:
+            value = self._entries.get(key, MISS)
+            if value is MISS:
+                _stats["misses"] += 1
+            else:
+                _stats["hits"] += 1
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: Optional[Categorization]) -> None:
+        with _lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > SUGGESTION_CACHE_SIZE:
+                self._entries.popitem(last=False)
+
+
+_caches: "OrderedDict[str, BusinessSuggestionCache]" = OrderedDict()
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+
+def _stamp_matches(stamp: Tuple[Any, int, Dict[str, str]], ctx: CategorizationContext, brain_version: int) -> bool:
+    rules, version, mappings = stamp
+    return rules is ctx.rules and version == brain_version and mappings == ctx.system_key_by_category_id
+
+
+def cache_for(ctx: CategorizationContext) -> BusinessSuggestionCache:
+    """
+    The business's cache, emptied first if rules, brain or mappings changed
+    since it was filled.
+    """
+    brain.refresh()  # labels written by other workers count as a change too
+    brain_version = brain.business_version(ctx.business_id)
+    with _lock:
+        cache = _caches.get(ctx.business_id)
+        if cache is not None and _stamp_matches(cache.stamp, ctx, brain_version):
+            _caches.move_to_end(ctx.business_id)
+            return cache
+        if cache is not None:
+            _stats["invalidations"] += 1
+        cache = BusinessSuggestionCache((ctx.rules, brain_version, dict(ctx.system_key_by_category_id)))
+        _caches[ctx.business_id] = cache
+        _caches.move_to_end(ctx.business_id)
+        if len(_caches) > SUGGESTION_CACHE_BUSINESSES:
+            _caches.popitem(last=False)
+        return cache
+
+
+def suggestion_cache_info() -> Dict[str, Any]:
+    with _lock:
+        hits, misses = _stats["hits"], _stats["misses"]
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+            "invalidations": _stats["invalidations"],
+            "businesses": len(_caches),
+            "size": sum(len(c) for c in _caches.values()),
+            "maxsize_per_business": SUGGESTION_CACHE_SIZE,
+            "max_businesses": SUGGESTION_CACHE_BUSINESSES,
+        }
+
+
+def clear_suggestion_cache() -> None:
+    with _lock:
+        _caches.clear()
+        for k in _stats:
+            _stats[k] = 0
@@ -0,0 +1,27 @@
+"""
+Compact the brain store: checkpoint the WAL into brain.db and prune the
+change feed.
+
+save() already does this once BrainStore.compact_every commits have
+accumulated; run this on a schedule (or before backups) to keep the WAL short.
+
+Usage:
+  python -m backend.app.scripts.compact_brain
+"""
+
+from __future__ import annotations
+
+from backend.app.norma.categorize_brain import brain
+
+
+def main() -> None:
+    brain.compact()
+    print(
+        f"checkpointed {brain.path} "
+        f"({len(brain.merchants):,} merchants, {len(brain.aliases):,} aliases, "
+        f"{brain.count_labels():,} labels)"
+    )
+
+
+if __name__ == "__main__":
+    main()
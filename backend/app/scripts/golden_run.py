@@ -21,7 +21,7 @@ from backend.app.domain.contracts import (
     RawEventContract,
     SignalResult,
 )
-from backend.app.models import Business, Organization, RawEvent
+from backend.app.models import Business, NormalizedTxn, Organization, RawEvent
 from backend.app.norma.adapters import (
     categorized_to_contract,
     ledger_row_to_contract,
@@ -34,6 +34,7 @@ from backend.app.norma.from_events import raw_event_to_txn
 from backend.app.norma.ledger import build_cash_ledger
 from backend.app.sim.engine import build_scenario, generate_raw_events_for_scenario
 from backend.app.sim.scenarios import ScenarioContext
+from backend.app.services import normalized_txn_service
 import backend.app.sim.models  # noqa: F401
 
 
@@ -221,6 +222,13 @@ def _persist_raw_events(
     start_at: datetime,
     end_at: datetime,
 ) -> None:
+    db.execute(
+        delete(NormalizedTxn).where(
+            NormalizedTxn.business_id == business_id,
+            NormalizedTxn.occurred_at >= start_at,
+            NormalizedTxn.occurred_at < end_at,
+        )
+    )
     db.execute(
         delete(RawEvent).where(
             RawEvent.business_id == business_id,
@@ -228,6 +236,7 @@ def _persist_raw_events(
             RawEvent.occurred_at < end_at,
         )
     )
+    normalized_txn_service.bump_data_version(db, business_id)
 
     inserts = [
         RawEvent(
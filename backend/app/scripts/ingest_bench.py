@@ -0,0 +1,176 @@
+"""
+Benchmark: POST /raw_events/batch throughput.
+
+Seeds a scratch database with one business (a category, a mapping and a few
+CategoryRules, so the categorization_stats row has real coverage to keep up
+to date), builds its stats row the way the first metrics read does, then
+ingests N synthetic bank events in batches and reports events/sec. A second
+pass re-sends the same events to time the all-duplicates case, and one metrics
+read times the deferred coverage count for the new events.
+
+Runs at the service level (raw_event_service.insert_raw_events) by default;
+--http goes through the FastAPI app with TestClient, JSON included.
+Exits non-zero if any event is lost or double-inserted, or if the first pass is
+slower than --min-rate events/sec.
+
+Usage:
+  python -m backend.app.scripts.ingest_bench
+  python -m backend.app.scripts.ingest_bench --events 20000 --batch 5000 --http --min-rate 5000
+  DATABASE_URL=postgresql+psycopg://.../scratch python -m backend.app.scripts.ingest_bench  (tables are dropped!)
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List
+
+ARTIFACT_DIR = Path("backend/.artifacts/ingest_bench")
+DEFAULT_URL = f"sqlite:///{ARTIFACT_DIR / 'ingest_bench.db'}"
+
+os.environ.setdefault("DATABASE_URL", DEFAULT_URL)
+
+from backend.app.db import Base, SessionLocal, engine  # noqa: E402
+from backend.app.api.core import RawEventIn  # noqa: E402
+from backend.app.models import (  # noqa: E402
+    Account,
+    Business,
+    BusinessCategoryMap,
+    Category,
+    CategoryRule,
+    Organization,
+)
+from backend.app.services import categorize_service, raw_event_service  # noqa: E402
+import backend.app.sim.models  # noqa: E402,F401
+
+MERCHANTS = ("SYSCO #12", "COMCAST CABLE", "SHELL OIL 5521", "STAPLES 0042", "UBER TRIP", "BLUE BOTTLE COFFEE")
+
+
+def _seed() -> str:
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        org = Organization(name="Ingest Bench Org")
+        db.add(org)
+        db.flush()
+        biz = Business(org_id=org.id, name="Ingest Bench Biz")
+        db.add(biz)
+        db.flush()
+        account = Account(business_id=biz.id, name="Supplies", type="expense", subtype="office_supplies")
+        db.add(account)
+        db.flush()
+        category = Category(business_id=biz.id, name="Supplies", account_id=account.id)
+        db.add(category)
+        db.flush()
+        db.add(BusinessCategoryMap(business_id=biz.id, system_key="office_supplies", category_id=category.id))
+        for i, needle in enumerate(("sysco", "staples", "shell")):
+            db.add(CategoryRule(business_id=biz.id, category_id=category.id, contains_text=needle, priority=i, active=True))
+        db.commit()
+        categorize_service.categorization_metrics(db, biz.id)  # builds the stats row
+        return biz.id
+    finally:
+        db.close()
+
+
+def _events(business_id: str, n: int) -> List[Dict[str, Any]]:
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return [
+        {
+            "business_id": business_id,
+            "source": "bank",
+            "source_event_id": f"bench-{i}",
+            "occurred_at": (start + timedelta(minutes=i)).isoformat(),
+            "payload": {
+                "type": "transaction.posted",
+                "transaction": {
+                    "transaction_id": f"bench-{i}",
+                    "amount": -5.0 - (i % 97),
+                    "name": MERCHANTS[i % len(MERCHANTS)],
+                },
+            },
+        }
+        for i in range(n)
+    ]
+
+
+def _ingest_service(parsed: List[RawEventIn], batch: int) -> int:
+    inserted = 0
+    db = SessionLocal()
+    try:
+        for start in range(0, len(parsed), batch):
+            inserted += raw_event_service.insert_raw_events(db, parsed[start : start + batch])["inserted"]
+    finally:
+        db.close()
+    return inserted
+
+
+def _ingest_http(events: List[Dict[str, Any]], batch: int) -> int:
+    from fastapi.testclient import TestClient
+
+    from backend.app.main import app
+
+    client = TestClient(app)
+    inserted = 0
+    for start in range(0, len(events), batch):
+        resp = client.post("/raw_events/batch", json={"events": events[start : start + batch]})
+        resp.raise_for_status()
+        inserted += resp.json()["inserted"]
+    return inserted
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Time POST /raw_events/batch ingest on a scratch DB.")
+    parser.add_argument("--events", type=int, default=20_000)
+    parser.add_argument("--batch", type=int, default=20_000, help="events per request")
+    parser.add_argument("--http", action="store_true", help="go through the FastAPI app (TestClient)")
+    parser.add_argument("--min-rate", type=float, default=0, help="fail below this many events/sec (0: report only)")
+    args = parser.parse_args()
+
+    url = os.environ["DATABASE_URL"]
+    if url.startswith("sqlite:///"):
+        Path(url[len("sqlite:///"):]).parent.mkdir(parents=True, exist_ok=True)
+
+    business_id = _seed()
+    events: List[Any] = _events(business_id, args.events)
+    if args.http:
+        ingest = _ingest_http
+    else:
+        events = [RawEventIn(**e) for e in events]  # request parsing is not timed at the service level
+        ingest = _ingest_service
+
+    t0 = time.perf_counter()
+    inserted = ingest(events, args.batch)
+    first_s = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    again = ingest(events, args.batch)
+    dup_s = time.perf_counter() - t0
+
+    db = SessionLocal()
+    try:
+        t0 = time.perf_counter()
+        metrics = categorize_service.categorization_metrics(db, business_id)
+        metrics_s = time.perf_counter() - t0
+    finally:
+        db.close()
+
+    rate = args.events / first_s
+    print(f"{engine.dialect.name} {'http' if args.http else 'service'} events={args.events:,} batch={args.batch:,}")
+    print(f"new:        {first_s:7.2f} s  {rate:10,.0f} events/s  inserted={inserted:,}")
+    print(f"duplicates: {dup_s:7.2f} s  {args.events / dup_s:10,.0f} events/s  inserted={again:,}")
+    print(
+        f"first metrics read (counts the new events' coverage): {metrics_s:.2f} s  "
+        f"total_events={metrics['total_events']:,} suggestion_coverage={metrics['suggestion_coverage']:,}"
+    )
+    ok = inserted == args.events and again == 0 and metrics["total_events"] == args.events and rate >= args.min_rate
+    if rate < args.min_rate:
+        print(f"below --min-rate {args.min_rate:,.0f} events/s")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
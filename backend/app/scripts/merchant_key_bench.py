@@ -0,0 +1,115 @@
+"""
+Benchmark: cached merchant_key vs the previous uncached regex pipeline.
+
+Pure in-memory (no DB). Generates restaurant_v1 simulator events, takes their
+transaction descriptions and keys them the way the read paths do (several
+times per transaction: health vendor signals, examples, drilldowns, the
+categorize list). Times the old implementation, the cached one from a cold
+cache and warm, and the batch API, and checks all of them agree.
+
+Usage:
+  python -m backend.app.scripts.merchant_key_bench
+  python -m backend.app.scripts.merchant_key_bench --days 730 --passes 5 --noise 0.5
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import time
+from datetime import date, timedelta
+from typing import Callable, List
+
+from backend.app.norma.merchant import (
+    clear_merchant_key_cache,
+    merchant_key,
+    merchant_key_cache_info,
+    merchant_keys,
+)
+from backend.app.sim.generators.restaurant_v1 import generate_restaurant_v1_events
+
+_OLD_STOPWORDS = {
+    "pos","ach","debit","credit","card","purchase","payment","pmt","online","web","www",
+    "inc","llc","co","company","corp","corporation","the",
+}
+_PREFIXES = ["POS DEBIT", "ACH", "SQ *", "TST*", "CHECKCARD", "PURCHASE"]
+
+
+def _old_merchant_key(description: str) -> str:
+    s = (description or "").lower().strip()
+    s = re.sub(r"[^a-z0-9\s\*]", " ", s)
+    s = re.sub(r"\d+", " ", s)
+    s = s.replace("*", " ")
+    s = re.sub(r"\s+", " ", s).strip()
+    tokens = [t for t in s.split(" ") if t and t not in _OLD_STOPWORDS]
+    return " ".join(tokens[:6])
+
+
+def _descriptions(days: int, seed: int, noise: float) -> List[str]:
+    start = date(2024, 1, 1)
+    events = generate_restaurant_v1_events(
+        business_id="bench",
+        start_date=start,
+        end_date=start + timedelta(days=days),
+        seed=seed,
+        mods_by_day={},
+    )
+    rng = random.Random(seed)
+    out: List[str] = []
+    for ev in events:
+        txn = (ev.get("payload") or {}).get("transaction") or {}
+        name = txn.get("name") or txn.get("merchant_name") or ""
+        if not name:
+            continue
+        if rng.random() < noise:
+            # bank-feed decoration: a processor prefix and a store / ref number
+            name = f"{rng.choice(_PREFIXES)} {name} #{rng.randint(1000, 9999)}"
+        out.append(name)
+    return out
+
+
+def _time(fn: Callable[[], List[str]]):
+    t0 = time.perf_counter()
+    out = fn()
+    return out, time.perf_counter() - t0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Cached vs uncached merchant_key benchmark on restaurant_v1 merchants.")
+    parser.add_argument("--days", type=int, default=365, help="simulated history length")
+    parser.add_argument("--passes", type=int, default=5, help="times each description is keyed (read-path fan-out)")
+    parser.add_argument("--noise", type=float, default=0.3, help="share of descriptions with a prefix and store number")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    descriptions = _descriptions(args.days, args.seed, args.noise)
+    workload = descriptions * args.passes
+
+    old, old_s = _time(lambda: [_old_merchant_key(d) for d in workload])
+
+    clear_merchant_key_cache()
+    cold, cold_s = _time(lambda: [merchant_key(d) for d in workload])
+    info = merchant_key_cache_info()
+    warm, warm_s = _time(lambda: [merchant_key(d) for d in workload])
+    batch, batch_s = _time(lambda: merchant_keys(workload))
+
+    mismatches = sum(1 for a, b in zip(old, cold) if a != b)
+    ok = mismatches == 0 and old == warm == batch
+
+    print(
+        f"descriptions={len(descriptions):,} distinct={len(set(descriptions)):,} "
+        f"keys={len(set(old)):,} calls={len(workload):,}"
+    )
+    print(f"uncached:     {old_s * 1000:8.1f} ms")
+    print(f"cached cold:  {cold_s * 1000:8.1f} ms  ({old_s / cold_s:.1f}x)  "
+          f"hits={info['hits']:,} misses={info['misses']:,} size={info['size']:,}/{info['maxsize']:,}")
+    print(f"cached warm:  {warm_s * 1000:8.1f} ms  ({old_s / warm_s:.1f}x)")
+    print(f"batch:        {batch_s * 1000:8.1f} ms  ({old_s / batch_s:.1f}x)")
+    print(f"agreement:    {len(workload) - mismatches}/{len(workload)}")
+    if not ok:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
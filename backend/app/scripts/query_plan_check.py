@@ -0,0 +1,344 @@
+"""
+Query-plan check for the raw_events / normalized_transactions hot paths.
+
+Seeds a scratch database with N raw_events (default 1M) spread across many
+businesses, their normalized_transactions rows and daily cash checkpoints,
+runs ANALYZE, then EXPLAINs the statements used by:
+
+  - categorize    list_txns_to_categorize          (raw_events business_id + ORDER BY occurred_at DESC)
+  - ingest        dedupe lookup                    (business_id, source, source_event_id)
+  - normalize     ensure_normalized watermark      (business_id + ORDER BY created_at DESC)
+  - demo / brief  load_event_txn_pairs             (normalized business_id + ORDER BY occurred_at DESC)
+  - categorize    rule preview/apply chunk         (uncategorized, ORDER BY occurred_at, source_event_id)
+  - metrics       pending coverage fold            (raw_events business_id, created_at > watermark)
+  - vendor reads  merchant_rows / bulk apply       (business_id, merchant_key, occurred_at)
+  - health cache  data_watermark                   (raw_events business_id, created_at)
+  - ledger        TxnCategorization ⨝ normalized   (join on business_id, source_event_id)
+  - cash          closing_balance / daily range    (cash_balance_checkpoints business_id + day)
+
+and fails if any of them full-scans a checked table or needs a sort step for
+the ORDER BY.
+
+Usage:
+  python -m backend.app.scripts.query_plan_check
+  python -m backend.app.scripts.query_plan_check --rows 200000
+  python -m backend.app.scripts.query_plan_check --database-url postgresql+psycopg://...  (scratch DB!)
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import sys
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+ARTIFACT_DIR = Path("backend/.artifacts/query_plan")
+DEFAULT_URL = f"sqlite:///{ARTIFACT_DIR / 'query_plan_check.db'}"
+
+os.environ.setdefault("DATABASE_URL", DEFAULT_URL)
+
+from sqlalchemy import and_, create_engine, exists, func, select, text  # noqa: E402
+from sqlalchemy.engine import Engine  # noqa: E402
+
+from backend.app.db import Base  # noqa: E402
+from backend.app.models import (  # noqa: E402
+    Account,
+    Business,
+    CashBalanceCheckpoint,
+    Category,
+    NormalizedTxn,
+    Organization,
+    RawEvent,
+    TxnCategorization,
+)
+import backend.app.sim.models  # noqa: E402,F401
+
+CHECKED_TABLES = ("raw_events", "txn_categorizations", "normalized_transactions", "cash_balance_checkpoints")
+MERCHANTS = ("sysco", "comcast", "shell", "staples", "uber")
+CHECKPOINT_DAYS = 1000
+
+
+def _seed(engine: Engine, *, rows: int, businesses: int) -> str:
+    """
+    Seeds `rows` raw_events (plus normalized rows) across `businesses`
+    businesses; every other event is categorized, and each business gets
+    CHECKPOINT_DAYS daily checkpoints. Returns the business_id used for the EXPLAINs.
+    """
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    now = datetime(2024, 1, 1)
+    org_id = str(uuid.uuid4())
+    biz_ids = [str(uuid.uuid4()) for _ in range(businesses)]
+
+    with engine.begin() as conn:
+        conn.execute(Organization.__table__.insert(), [{"id": org_id, "name": "Plan Check Org", "created_at": now}])
+        conn.execute(
+            Business.__table__.insert(),
+            [
+                {"id": b, "org_id": org_id, "name": f"Biz {i}", "created_at": now, "sim_enabled": False, "sim_profile": "normal"}
+                for i, b in enumerate(biz_ids)
+            ],
+        )
+        acct_rows = [
+            {"id": str(uuid.uuid4()), "business_id": b, "name": "Supplies", "type": "expense", "active": True, "created_at": now}
+            for b in biz_ids
+        ]
+        conn.execute(Account.__table__.insert(), acct_rows)
+        cat_rows = [
+            {"id": str(uuid.uuid4()), "business_id": a["business_id"], "name": "Supplies", "account_id": a["id"], "created_at": now}
+            for a in acct_rows
+        ]
+        conn.execute(Category.__table__.insert(), cat_rows)
+    cat_by_biz = {c["business_id"]: c["id"] for c in cat_rows}
+
+    chunk = 50_000
+    written = 0
+    while written < rows:
+        n = min(chunk, rows - written)
+        events: List[Dict[str, Any]] = []
+        cats: List[Dict[str, Any]] = []
+        normalized: List[Dict[str, Any]] = []
+        for i in range(written, written + n):
+            biz_id = biz_ids[i % businesses]
+            sid = f"evt_{i}"
+            event_id = str(uuid.uuid4())
+            occurred_at = now + timedelta(minutes=i // businesses)
+            merchant = MERCHANTS[(i // businesses) % len(MERCHANTS)]
+            events.append(
+                {
+                    "id": event_id,
+                    "business_id": biz_id,
+                    "source": "bank",
+                    "source_event_id": sid,
+                    "occurred_at": occurred_at,
+                    "payload": {"type": "transaction.posted", "transaction": {"amount": -12.5, "name": merchant}},
+                    "created_at": now,
+                }
+            )
+            normalized.append(
+                {
+                    "raw_event_id": event_id,
+                    "business_id": biz_id,
+                    "source_event_id": sid,
+                    "occurred_at": occurred_at,
+                    "date": occurred_at.date(),
+                    "amount": 12.5,
+                    "direction": "outflow",
+                    "account": "checking",
+                    "description": merchant,
+                    "merchant_key": merchant,
+                    "normalizer_version": 1,
+                    "updated_at": occurred_at,
+                }
+            )
+            if i % 2 == 0:
+                cats.append(
+                    {
+                        "id": str(uuid.uuid4()),
+                        "business_id": biz_id,
+                        "source_event_id": sid,
+                        "category_id": cat_by_biz[biz_id],
+                        "confidence": 1.0,
+                        "source": "manual",
+                        "created_at": now,
+                    }
+                )
+        with engine.begin() as conn:
+            conn.execute(RawEvent.__table__.insert(), events)
+            conn.execute(NormalizedTxn.__table__.insert(), normalized)
+            conn.execute(TxnCategorization.__table__.insert(), cats)
+        written += n
+        print(f"  seeded {written:,}/{rows:,} raw_events", flush=True)
+
+    with engine.begin() as conn:
+        conn.execute(
+            CashBalanceCheckpoint.__table__.insert(),
+            [
+                {
+                    "business_id": b,
+                    "day": (now + timedelta(days=d)).date(),
+                    "net_change": -12.5,
+                    "closing_balance": -12.5 * (d + 1),
+                    "updated_at": now,
+                }
+                for b in biz_ids
+                for d in range(CHECKPOINT_DAYS)
+            ],
+        )
+
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE"))
+
+    return biz_ids[0]
+
+
+def _hot_statements(business_id: str) -> List[Tuple[str, Any, bool]]:
+    """
+    (name, statement, ordered) — `ordered` means the plan must not need a sort step.
+    """
+    recent_events = (
+        select(RawEvent)
+        .where(RawEvent.business_id == business_id)
+        .order_by(RawEvent.occurred_at.desc())
+        .limit(2000)
+    )
+    dedupe = select(RawEvent.id).where(
+        RawEvent.business_id == business_id,
+        RawEvent.source == "bank",
+        RawEvent.source_event_id == "evt_0",
+    )
+    newest_created = (
+        select(RawEvent.created_at)
+        .where(RawEvent.business_id == business_id)
+        .order_by(RawEvent.created_at.desc())
+        .limit(1)
+    )
+    recent_normalized = (
+        select(NormalizedTxn)
+        .where(NormalizedTxn.business_id == business_id)
+        .order_by(NormalizedTxn.occurred_at.desc())
+        .limit(2000)
+    )
+    posted = exists().where(
+        TxnCategorization.business_id == NormalizedTxn.business_id,
+        TxnCategorization.source_event_id == NormalizedTxn.source_event_id,
+    )
+    uncategorized_chunk = (
+        select(NormalizedTxn)
+        .where(NormalizedTxn.business_id == business_id, NormalizedTxn.skip_reason.is_(None), ~posted)
+        .order_by(NormalizedTxn.occurred_at.asc(), NormalizedTxn.source_event_id.asc())
+        .limit(1000)
+    )
+    pending_coverage = select(NormalizedTxn).where(
+        NormalizedTxn.business_id == business_id,
+        NormalizedTxn.skip_reason.is_(None),
+        ~posted,
+        NormalizedTxn.raw_event_id.in_(
+            select(RawEvent.id).where(RawEvent.business_id == business_id, RawEvent.created_at > datetime(2024, 1, 1))
+        ),
+    )
+    merchant = select(NormalizedTxn).where(
+        NormalizedTxn.business_id == business_id,
+        NormalizedTxn.merchant_key == MERCHANTS[0],
+        NormalizedTxn.skip_reason.is_(None),
+    )
+    watermark = select(func.count(), func.max(RawEvent.created_at)).where(RawEvent.business_id == business_id)
+    ledger_join = (
+        select(TxnCategorization.source_event_id, NormalizedTxn.occurred_at, NormalizedTxn.amount)
+        .join(
+            NormalizedTxn,
+            and_(
+                NormalizedTxn.business_id == TxnCategorization.business_id,
+                NormalizedTxn.source_event_id == TxnCategorization.source_event_id,
+            ),
+        )
+        .where(TxnCategorization.business_id == business_id, NormalizedTxn.skip_reason.is_(None))
+        .order_by(NormalizedTxn.occurred_at.desc(), NormalizedTxn.source_event_id.desc())
+        .limit(2000)
+    )
+    as_of = datetime(2025, 6, 1).date()
+    closing = (
+        select(CashBalanceCheckpoint.closing_balance)
+        .where(CashBalanceCheckpoint.business_id == business_id, CashBalanceCheckpoint.day <= as_of)
+        .order_by(CashBalanceCheckpoint.day.desc())
+        .limit(1)
+    )
+    daily = (
+        select(CashBalanceCheckpoint)
+        .where(
+            CashBalanceCheckpoint.business_id == business_id,
+            CashBalanceCheckpoint.day >= datetime(2024, 3, 1).date(),
+            CashBalanceCheckpoint.day <= as_of,
+        )
+        .order_by(CashBalanceCheckpoint.day.asc())
+    )
+    daily_count = select(func.count()).where(
+        CashBalanceCheckpoint.business_id == business_id,
+        CashBalanceCheckpoint.day >= datetime(2024, 3, 1).date(),
+        CashBalanceCheckpoint.day <= as_of,
+    )
+    return [
+        ("categorize list_txns_to_categorize", recent_events, True),
+        ("ingest dedupe lookup", dedupe, False),
+        ("ensure_normalized watermark seek", newest_created, True),
+        ("demo/brief load_event_txn_pairs", recent_normalized, True),
+        ("categorize rule preview/apply chunk", uncategorized_chunk, True),
+        ("categorization_stats pending coverage fold", pending_coverage, False),
+        ("vendor merchant_rows lookup", merchant, False),
+        ("health pipeline data_watermark", watermark, False),
+        ("ledger_service posted-lines join", ledger_join, True),
+        ("cash closing_balance as-of", closing, True),
+        ("cash daily_checkpoints range", daily, True),
+        ("cash_series LTTB length count", daily_count, False),
+    ]
+
+
+def _explain(engine: Engine, stmt: Any) -> List[str]:
+    compiled = stmt.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True})
+    prefix = "EXPLAIN QUERY PLAN " if engine.dialect.name == "sqlite" else "EXPLAIN "
+    with engine.connect() as conn:
+        rows = conn.execute(text(prefix + str(compiled))).all()
+    if engine.dialect.name == "sqlite":
+        return [str(r[-1]) for r in rows]
+    return [str(r[0]) for r in rows]
+
+
+def _plan_problems(dialect: str, plan: List[str], *, ordered: bool) -> List[str]:
+    problems: List[str] = []
+    for line in plan:
+        for table in CHECKED_TABLES:
+            if dialect == "sqlite":
+                if re.match(rf"^SCAN {table}\b", line.strip()) and "INDEX" not in line:
+                    problems.append(f"full scan: {line.strip()}")
+            elif f"Seq Scan on {table}" in line:
+                problems.append(f"full scan: {line.strip()}")
+        if ordered:
+            if dialect == "sqlite" and "TEMP B-TREE FOR ORDER BY" in line:
+                problems.append(f"sort step: {line.strip()}")
+            if dialect != "sqlite" and line.strip().startswith("Sort"):
+                problems.append(f"sort step: {line.strip()}")
+    return problems
+
+
+def run_check(*, database_url: str, rows: int, businesses: int) -> bool:
+    if database_url.startswith("sqlite:///"):
+        Path(database_url[len("sqlite:///"):]).parent.mkdir(parents=True, exist_ok=True)
+    engine = create_engine(database_url, future=True)
+
+    print(f"Seeding {rows:,} raw_events across {businesses} businesses ({engine.dialect.name})...")
+    business_id = _seed(engine, rows=rows, businesses=businesses)
+
+    ok = True
+    for name, stmt, ordered in _hot_statements(business_id):
+        plan = _explain(engine, stmt)
+        problems = _plan_problems(engine.dialect.name, plan, ordered=ordered)
+        status = "OK " if not problems else "BAD"
+        print(f"\n[{status}] {name}")
+        for line in plan:
+            print(f"    {line}")
+        for p in problems:
+            print(f"    !! {p}")
+        ok = ok and not problems
+
+    print("\n✅ All hot paths use index scans" if ok else "\n❌ Some hot paths do not use an index")
+    return ok
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="EXPLAIN the raw_events / normalized_transactions hot paths on a seeded scratch DB.")
+    parser.add_argument("--database-url", default=DEFAULT_URL, help="Scratch database (tables are dropped!)")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--businesses", type=int, default=50)
+    args = parser.parse_args()
+
+    ok = run_check(database_url=args.database_url, rows=args.rows, businesses=args.businesses)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
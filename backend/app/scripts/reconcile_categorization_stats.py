@@ -0,0 +1,34 @@
+"""
+Reconcile categorization_stats against the source tables.
+
+Brings normalized_transactions up to date, then rebuilds every existing stats
+row from normalized_transactions / txn_categorizations / rules / brain and
+reports counters that had drifted from the incrementally maintained values.
+Meant to run periodically (cron).
+
+Usage:
+  python -m backend.app.scripts.reconcile_categorization_stats
+"""
+
+from __future__ import annotations
+
+from backend.app.db import SessionLocal
+from backend.app.services.categorization_stats_service import reconcile_all
+from backend.app.services.normalized_txn_service import renormalize_stale
+
+
+def main() -> None:
+    db = SessionLocal()
+    try:
+        renormalize_stale(db)  # rebuilds count normalized rows: bring them up to date first
+        drift = reconcile_all(db)
+        print(f"reconciled categorization_stats: {len(drift)} businesses drifted")
+        for business_id, changed in sorted(drift.items()):
+            detail = ", ".join(f"{k} {old}->{new}" for k, (old, new) in sorted(changed.items()))
+            print(f"  {business_id}: {detail}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Refresh business_health_snapshots (the /demo/dashboard cards).
+
+Recomputes every business whose snapshot is missing or stale (its events
+changed since, or PIPELINE_VERSION was bumped). Run once after the migration,
+then on a schedule or as a long-running worker with --loop.
+
+Usage:
+  python -m backend.app.scripts.refresh_health_snapshots
+  python -m backend.app.scripts.refresh_health_snapshots --loop --interval 30
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from backend.app.db import SessionLocal
+from backend.app.services.health_snapshot_service import refresh_stale_snapshots
+
+
+def _refresh_once(batch: int) -> int:
+    db = SessionLocal()
+    try:
+        refreshed = refresh_stale_snapshots(db, limit=batch)
+    finally:
+        db.close()
+    print(f"refreshed {len(refreshed)} health snapshots")
+    return len(refreshed)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Refresh stale dashboard health snapshots.")
+    parser.add_argument("--loop", action="store_true", help="keep running, polling for stale snapshots")
+    parser.add_argument("--interval", type=float, default=30.0, help="seconds between passes with --loop")
+    parser.add_argument("--batch", type=int, default=None, help="max businesses refreshed per pass")
+    args = parser.parse_args()
+
+    if not args.loop:
+        _refresh_once(args.batch)
+        return
+    while True:
+        if not _refresh_once(args.batch):
+            time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
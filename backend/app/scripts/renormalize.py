@@ -0,0 +1,32 @@
+"""
+Bring normalized_transactions up to date for every business.
+
+Backfills rows for raw_events that have none (e.g. right after the migration)
+and re-normalizes rows written by an older NORMALIZER_VERSION. Read paths do
+the same lazily per business; this just does it ahead of traffic.
+
+Usage:
+  python -m backend.app.scripts.renormalize
+"""
+
+from __future__ import annotations
+
+from backend.app.db import SessionLocal
+from backend.app.norma.from_events import NORMALIZER_VERSION
+from backend.app.services.normalized_txn_service import renormalize_stale
+
+
+def main() -> None:
+    db = SessionLocal()
+    try:
+        changed = renormalize_stale(db)
+        total = sum(changed.values())
+        print(f"normalizer_version={NORMALIZER_VERSION}: rewrote {total} rows across {len(changed)} businesses")
+        for business_id, n in sorted(changed.items()):
+            print(f"  {business_id}: {n}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
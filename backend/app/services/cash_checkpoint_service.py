@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+from datetime import date
+from typing import Dict, Iterable, Iterator, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, delete, func, select, update
+from sqlalchemy.orm import Session
+
+from backend.app.db import upsert_add_conflicts
+from backend.app.models import Business, CashBalanceCheckpoint, NormalizedTxn, TxnCategorization, utcnow
+
+_ID_CHUNK = 900  # stay under SQLite's bound-parameter limit
+_STREAM_BATCH = 500
+
+
+def _signed(amount: Optional[float], direction: Optional[str]) -> float:
+    amt = float(amount or 0.0)
+    return amt if direction == "inflow" else -amt
+
+
+def _posted_stmt(business_id: str):
+    return (
+        select(NormalizedTxn.occurred_at, NormalizedTxn.amount, NormalizedTxn.direction)
+        .select_from(TxnCategorization)
+        .join(
+            NormalizedTxn,
+            and_(
+                NormalizedTxn.business_id == TxnCategorization.business_id,
+                NormalizedTxn.source_event_id == TxnCategorization.source_event_id,
+            ),
+        )
+        .where(TxnCategorization.business_id == business_id, NormalizedTxn.skip_reason.is_(None))
+    )
+
+
+def _bucket(rows: Iterable[Tuple]) -> Dict[date, float]:
+    deltas: Dict[date, float] = {}
+    for occurred_at, amount, direction in rows:
+        d = occurred_at.date()
+        deltas[d] = deltas.get(d, 0.0) + _signed(amount, direction)
+    return deltas
+
+
+def _is_built(db: Session, business_id: str) -> bool:
+    # primary-key read; an empty-but-built business (no posted lines) is True too
+    return bool(
+        db.execute(select(Business.cash_checkpoints_built).where(Business.id == business_id)).scalar()
+    )
+
+
+def _mark_built(db: Session, business_id: str, built: bool) -> None:
+    db.execute(
+        update(Business)
+        .where(Business.id == business_id)
+        .values(cash_checkpoints_built=built)
+        .execution_options(synchronize_session=False)
+    )
+
+
+# ----------------------------
+# Maintenance
+# ----------------------------
+
+def invalidate(db: Session, business_id: str) -> None:
+    """
+    Drop all checkpoints for a business and clear Business.cash_checkpoints_built
+    (rebuilt lazily on next read). Use when posted amounts change wholesale (raw
+    events deleted / re-normalized). Does NOT commit.
+    """
+    db.execute(delete(CashBalanceCheckpoint).where(CashBalanceCheckpoint.business_id == business_id))
+    _mark_built(db, business_id, False)
+
+
+def rebuild(db: Session, business_id: str) -> int:
+    """
+    Recompute every checkpoint for a business from posted lines and mark it
+    built (even with no rows). Does NOT commit.
+    """
+    invalidate(db, business_id)
+    deltas = _bucket(db.execute(_posted_stmt(business_id)).all())
+
+    now = utcnow()
+    rows = []
+    closing = 0.0
+    for d in sorted(deltas):
+        closing += deltas[d]
+        rows.append(
+            {
+                "business_id": business_id,
+                "day": d,
+                "net_change": deltas[d],
+                "closing_balance": closing,
+                "updated_at": now,
+            }
+        )
+    if rows:
+        db.connection().execute(CashBalanceCheckpoint.__table__.insert(), rows)
+    _mark_built(db, business_id, True)
+    return len(rows)
+
+
+def ensure_checkpoints(db: Session, business_id: str) -> None:
+    """
+    Lazy backfill: a business not marked built (pre-migration data, or after
+    invalidate) is rebuilt once; afterwards this is a single primary-key read,
+    whether or not the business has posted lines. Commits only if it rebuilt.
+    """
+    if _is_built(db, business_id):
+        return
+    rebuild(db, business_id)
+    db.commit()
+
+
+def _apply_deltas(db: Session, business_id: str, deltas: Dict[date, float]) -> None:
+    now = utcnow()
+    for d in sorted(deltas):
+        delta = deltas[d]
+        if not delta:
+            continue
+        prev_closing = db.execute(
+            select(CashBalanceCheckpoint.closing_balance)
+            .where(CashBalanceCheckpoint.business_id == business_id, CashBalanceCheckpoint.day < d)
+            .order_by(CashBalanceCheckpoint.day.desc())
+            .limit(1)
+        ).scalar_one_or_none()
+        # first post of the day inserts the row; otherwise (including a concurrent
+        # first post that won the insert) both columns move by delta
+        upsert_add_conflicts(
+            db,
+            CashBalanceCheckpoint,
+            [
+                {
+                    "business_id": business_id,
+                    "day": d,
+                    "net_change": delta,
+                    "closing_balance": float(prev_closing or 0.0) + delta,
+                    "updated_at": now,
+                }
+            ],
+            ("business_id", "day"),
+            {"net_change": "net_change", "closing_balance": "net_change"},
+            replace_columns=("updated_at",),
+        )
+        # back-dated change: every later closing balance shifts by the same delta
+        db.execute(
+            update(CashBalanceCheckpoint)
+            .where(CashBalanceCheckpoint.business_id == business_id, CashBalanceCheckpoint.day > d)
+            .values(closing_balance=CashBalanceCheckpoint.closing_balance + delta, updated_at=now)
+        )
+
+
+def record_posted(db: Session, business_id: str, source_event_ids: Sequence[str]) -> None:
+    """
+    Fold newly posted lines (TxnCategorization rows just added, flushed but not
+    committed) into the checkpoints. Does NOT commit.
+    """
+    if not source_event_ids:
+        return
+    db.flush()
+    if not _is_built(db, business_id):
+        # nothing to update incrementally yet; build from scratch (includes these lines)
+        rebuild(db, business_id)
+        return
+
+    ids = list(source_event_ids)
+    deltas: Dict[date, float] = {}
+    for start in range(0, len(ids), _ID_CHUNK):
+        chunk = ids[start : start + _ID_CHUNK]
+        rows = db.execute(
+            _posted_stmt(business_id).where(TxnCategorization.source_event_id.in_(chunk))
+        ).all()
+        for d, v in _bucket(rows).items():
+            deltas[d] = deltas.get(d, 0.0) + v
+    _apply_deltas(db, business_id, deltas)
+
+
+# ----------------------------
+# Reads
+# ----------------------------
+
+def closing_balance(db: Session, business_id: str, as_of: date) -> float:
+    """
+    Cumulative posted cash through `as_of` (inclusive): one indexed lookup.
+    """
+    ensure_checkpoints(db, business_id)
+    value = db.execute(
+        select(CashBalanceCheckpoint.closing_balance)
+        .where(CashBalanceCheckpoint.business_id == business_id, CashBalanceCheckpoint.day <= as_of)
+        .order_by(CashBalanceCheckpoint.day.desc())
+        .limit(1)
+    ).scalar_one_or_none()
+    return float(value or 0.0)
+
+
+def _range_cond(business_id: str, start: Optional[date], end: Optional[date]) -> list:
+    cond = [CashBalanceCheckpoint.business_id == business_id]
+    if start:
+        cond.append(CashBalanceCheckpoint.day >= start)
+    if end:
+        cond.append(CashBalanceCheckpoint.day <= end)
+    return cond
+
+
+def count_checkpoints(db: Session, business_id: str, start: Optional[date], end: Optional[date]) -> int:
+    """
+    Number of checkpoints daily_checkpoints(start, end) would yield: an
+    index-only COUNT, so a consumer that needs the series length up front
+    (LTTB) can still stream it. Count before the scan: a day posted in between
+    then only makes the stream longer.
+    """
+    ensure_checkpoints(db, business_id)
+    return db.execute(select(func.count()).where(*_range_cond(business_id, start, end))).scalar_one()
+
+
+def daily_checkpoints(
+    db: Session,
+    business_id: str,
+    start: Optional[date],
+    end: Optional[date],
+) -> Tuple[float, Iterator[CashBalanceCheckpoint]]:
+    """
+    (closing balance before `start`, checkpoints in [start, end] ascending).
+    Checkpoints are streamed in batches rather than loaded all at once.
+    """
+    ensure_checkpoints(db, business_id)
+
+    opening = 0.0
+    if start:
+        prev = db.execute(
+            select(CashBalanceCheckpoint.closing_balance)
+            .where(CashBalanceCheckpoint.business_id == business_id, CashBalanceCheckpoint.day < start)
+            .order_by(CashBalanceCheckpoint.day.desc())
+            .limit(1)
+        ).scalar_one_or_none()
+        opening = float(prev or 0.0)
+
+    rows = db.execute(
+        select(CashBalanceCheckpoint)
+        .where(*_range_cond(business_id, start, end))
+        .order_by(CashBalanceCheckpoint.day.asc())
+        .execution_options(yield_per=_STREAM_BATCH)
+    ).scalars()
+    return opening, iter(rows)
@@ -0,0 +1,394 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from sqlalchemy import and_, delete, exists, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from backend.app.models import Business, CategorizationStats, NormalizedTxn, RawEvent, TxnCategorization, utcnow
+from backend.app.norma.brain_store import fuzzy_reach_prefixes
+from backend.app.norma.categorization_context import CategorizationContext
+from backend.app.norma.categorize_brain import brain
+from backend.app.norma.category_engine import suggest_categories
+from backend.app.norma.from_events import row_to_txn
+
+_ID_CHUNK = 900  # stay under SQLite's bound-parameter limit
+
+
+# ----------------------------
+# Coverage
+# ----------------------------
+
+def _covered(ctx: CategorizationContext, rows: Iterable[NormalizedTxn]) -> int:
+    """
+    How many of `rows` get a suggestion that resolves to a real Category.
+    """
+    txns = [row_to_txn(r) for r in rows if r.skip_reason is None]
+    n = 0
+    for suggested in suggest_categories(ctx, txns):
+        cat_obj = getattr(suggested, "categorization", None)
+        if not cat_obj:
+            continue
+        candidate = (cat_obj.category or "").strip().lower()
+        if candidate and candidate != "uncategorized" and ctx.resolve_system_key(candidate):
+            n += 1
+    return n
+
+
+def _uncategorized_rows(db: Session, business_id: str, *where) -> Sequence[NormalizedTxn]:
+    posted = exists().where(
+        TxnCategorization.business_id == NormalizedTxn.business_id,
+        TxnCategorization.source_event_id == NormalizedTxn.source_event_id,
+    )
+    return (
+        db.execute(
+            select(NormalizedTxn).where(
+                NormalizedTxn.business_id == business_id,
+                NormalizedTxn.skip_reason.is_(None),
+                ~posted,
+                *where,
+            )
+        )
+        .scalars()
+        .all()
+    )
+
+
+def _brain_reach(alias_keys: Iterable[str]):
+    """
+    WHERE clause for the rows a brain label on `alias_keys` can change the
+    suggestion of: those merchant_keys, plus the keys a fuzzy lookup could
+    match them from (range scans on the business + merchant_key index).
+    """
+    keys = sorted(set(alias_keys))
+    prefixes = sorted({p for k in keys for p in fuzzy_reach_prefixes(k)})
+    ranges = [
+        and_(NormalizedTxn.merchant_key >= p, NormalizedTxn.merchant_key < p[:-1] + chr(ord(p[-1]) + 1))
+        for p in prefixes
+    ]
+    return or_(NormalizedTxn.merchant_key.in_(keys), *ranges)
+
+
+def _rows_for(db: Session, business_id: str, source_event_ids: Sequence[str], *where) -> List[NormalizedTxn]:
+    ids = list(source_event_ids)
+    rows: List[NormalizedTxn] = []
+    for start in range(0, len(ids), _ID_CHUNK):
+        rows.extend(
+            db.execute(
+                select(NormalizedTxn).where(
+                    NormalizedTxn.business_id == business_id,
+                    NormalizedTxn.source_event_id.in_(ids[start : start + _ID_CHUNK]),
+                    *where,
+                )
+            )
+            .scalars()
+            .all()
+        )
+    return rows
+
+
+def _newest_created(business_id: str):
+    # LIMIT 1 seek on ix_raw_events_business_created
+    return (
+        select(RawEvent.created_at)
+        .where(RawEvent.business_id == business_id)
+        .order_by(RawEvent.created_at.desc())
+        .limit(1)
+    )
+
+
+def _created(business_id: str, *, after: Optional[datetime] = None, through: Optional[datetime] = None):
+    """
+    WHERE clause for normalized rows whose raw event was created after / at or
+    before a coverage_through watermark.
+    """
+    cond = [RawEvent.business_id == business_id]
+    if after is not None:
+        cond.append(RawEvent.created_at > after)
+    if through is not None:
+        cond.append(RawEvent.created_at <= through)
+    return NormalizedTxn.raw_event_id.in_(select(RawEvent.id).where(*cond))
+
+
+def _versions(db: Session, business_id: str):
+    return db.execute(
+        select(Business.rules_version, Business.mapping_version).where(Business.id == business_id)
+    ).one_or_none()
+
+
+def _coverage_fresh(row: CategorizationStats, rules_version: int, mapping_version: int) -> bool:
+    return (
+        not row.coverage_stale
+        and row.rules_version == rules_version
+        and row.mapping_version == mapping_version
+    )
+
+
+def _refresh_coverage(
+    db: Session,
+    row: CategorizationStats,
+    versions,
+    ctx: Optional[CategorizationContext],
+) -> None:
+    ctx = ctx or CategorizationContext.load(db, row.business_id)
+    newest = db.execute(_newest_created(row.business_id)).scalar_one_or_none()
+    row.suggestion_coverage = _covered(ctx, _uncategorized_rows(db, row.business_id))
+    row.brain_coverage = brain.count_learned_merchants(row.business_id)
+    row.coverage_stale = False
+    row.coverage_through = newest
+    row.rules_version, row.mapping_version = versions
+    row.updated_at = utcnow()
+
+
+def _fold_pending_coverage(
+    db: Session,
+    row: CategorizationStats,
+    newest: datetime,
+    ctx: Optional[CategorizationContext],
+) -> None:
+    """
+    Count the uncategorized rows ingested since coverage_through into
+    suggestion_coverage and advance the watermark to `newest`. Guarded on the
+    old watermark, so two concurrent reads cannot fold the same rows twice.
+    """
+    through = row.coverage_through
+    where = [] if through is None else [_created(row.business_id, after=through)]
+    ctx = ctx or CategorizationContext.load(db, row.business_id)
+    delta = _covered(ctx, _uncategorized_rows(db, row.business_id, *where))
+    db.execute(
+        update(CategorizationStats)
+        .where(
+            CategorizationStats.business_id == row.business_id,
+            CategorizationStats.coverage_through.is_(None)
+            if through is None
+            else CategorizationStats.coverage_through == through,
+        )
+        .values(
+            suggestion_coverage=CategorizationStats.suggestion_coverage + delta,
+            coverage_through=newest,
+            updated_at=utcnow(),
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+# ----------------------------
+# Maintenance
+# ----------------------------
+
+def invalidate(db: Session, business_id: str) -> None:
+    """
+    Drop the stats row (rebuilt on next read). Use when events are deleted or
+    re-normalized wholesale. Does NOT commit.
+    """
+    db.execute(delete(CategorizationStats).where(CategorizationStats.business_id == business_id))
+
+
+def rebuild(
+    db: Session,
+    business_id: str,
+    ctx: Optional[CategorizationContext] = None,
+) -> Optional[CategorizationStats]:
+    """
+    Recompute every counter from scratch (also the reconciliation path).
+    Callers run normalized_txn_service.ensure_normalized first.
+    Does NOT commit.
+    """
+    versions = _versions(db, business_id)
+    if versions is None:
+        return None
+
+    total = db.execute(
+        select(func.count()).select_from(NormalizedTxn).where(NormalizedTxn.business_id == business_id)
+    ).scalar_one()
+    posted = db.execute(
+        select(func.count()).select_from(TxnCategorization).where(TxnCategorization.business_id == business_id)
+    ).scalar_one()
+
+    row = db.get(CategorizationStats, business_id)
+    if row is None:
+        row = CategorizationStats(business_id=business_id)
+        db.add(row)
+    row.total_events = int(total)
+    row.posted = int(posted)
+    row.uncategorized = max(0, int(total) - int(posted))
+    _refresh_coverage(db, row, versions, ctx)
+    row.reconciled_at = row.updated_at
+    db.flush()
+    return row
+
+
+def record_ingested(db: Session, business_id: str, source_event_ids: Sequence[str]) -> None:
+    """
+    Fold newly ingested events (normalized rows already written, not committed)
+    into the counters: one UPDATE, no suggestion work. Their share of
+    suggestion_coverage is counted on the next read (coverage_through).
+    No-op until the business has a stats row. Does NOT commit.
+    """
+    if not source_event_ids:
+        return
+    n = len(source_event_ids)
+    db.execute(
+        update(CategorizationStats)
+        .where(CategorizationStats.business_id == business_id)
+        .values(
+            total_events=CategorizationStats.total_events + n,
+            uncategorized=CategorizationStats.uncategorized + n,
+            updated_at=utcnow(),
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def record_posted(db: Session, business_id: str, source_event_ids: Sequence[str]) -> None:
+    """
+    Fold newly posted events (TxnCategorization rows just added) into the
+    counters: they leave the uncategorized pool, and suggestion_coverage drops
+    by those of them it already counted (rows past coverage_through were never
+    counted, and now never will be). Does NOT commit.
+    """
+    if not source_event_ids:
+        return
+    row = db.get(CategorizationStats, business_id)
+    if row is None:
+        return
+
+    n = len(source_event_ids)
+    db.execute(
+        update(CategorizationStats)
+        .where(CategorizationStats.business_id == business_id)
+        .values(
+            posted=CategorizationStats.posted + n,
+            uncategorized=CategorizationStats.uncategorized - n,
+            updated_at=utcnow(),
+        )
+    )
+
+    versions = _versions(db, business_id)
+    if versions is None or not _coverage_fresh(row, *versions) or row.coverage_through is None:
+        return  # recomputed in full on next read, or nothing counted yet
+    counted = _rows_for(db, business_id, source_event_ids, _created(business_id, through=row.coverage_through))
+    delta = _covered(CategorizationContext.load(db, business_id), counted)
+    if delta:
+        db.execute(
+            update(CategorizationStats)
+            .where(CategorizationStats.business_id == business_id)
+            .values(suggestion_coverage=CategorizationStats.suggestion_coverage - delta)
+        )
+
+
+@contextmanager
+def brain_change(db: Session, business_id: str, alias_key: str) -> Iterator[None]:
+    """
+    Wrap a brain label change for `alias_key` (apply_label / forget_label):
+
+        with categorization_stats_service.brain_change(db, business_id, mk):
+            brain.apply_label(...)
+
+    suggestion_coverage moves by the change in coverage over just the
+    uncategorized rows that label can reach (_brain_reach over every alias of
+    the merchant, since labels are per merchant) and that it already counts
+    (up to coverage_through), measured before and after; brain_coverage is
+    re-counted. Does NOT commit.
+    """
+    row = db.get(CategorizationStats, business_id)
+    versions = _versions(db, business_id)
+    fresh = row is not None and versions is not None and _coverage_fresh(row, *versions)
+    if fresh:
+        merchant_id = brain.resolve_merchant_id(alias_key)
+        keys = [alias_key, *(brain.alias_keys_for(merchant_id) if merchant_id else ())]
+        ctx = CategorizationContext.load(db, business_id)
+        rows = (
+            _uncategorized_rows(
+                db, business_id, _brain_reach(keys), _created(business_id, through=row.coverage_through)
+            )
+            if row.coverage_through is not None
+            else []
+        )
+        before = _covered(ctx, rows)
+
+    yield
+
+    if row is None:
+        return
+    values: Dict[str, Any] = {
+        "brain_coverage": brain.count_learned_merchants(business_id),
+        "updated_at": utcnow(),
+    }
+    if fresh:
+        delta = _covered(ctx, rows) - before
+        if delta:
+            values["suggestion_coverage"] = CategorizationStats.suggestion_coverage + delta
+    db.execute(update(CategorizationStats).where(CategorizationStats.business_id == business_id).values(**values))
+
+
+def reconcile_all(db: Session) -> Dict[str, Dict[str, Any]]:
+    """
+    Periodic job: rebuild every existing stats row and report drift.
+    Callers bring normalized rows up to date first (renormalize_stale).
+    Returns {business_id: {counter: (stored, actual)}} for rows that drifted.
+    """
+    drift: Dict[str, Dict[str, Any]] = {}
+    business_ids = db.execute(select(CategorizationStats.business_id)).scalars().all()
+    for business_id in business_ids:
+        before = _out(db.get(CategorizationStats, business_id))
+        row = rebuild(db, business_id)
+        db.commit()
+        after = _out(row) if row is not None else {}
+        changed = {k: (before[k], after.get(k)) for k in before if before[k] != after.get(k)}
+        if changed:
+            drift[business_id] = changed
+    return drift
+
+
+# ----------------------------
+# Reads
+# ----------------------------
+
+def _out(row: CategorizationStats) -> Dict[str, Any]:
+    return {
+        "total_events": int(row.total_events),
+        "posted": int(row.posted),
+        "uncategorized": max(0, int(row.uncategorized)),
+        "suggestion_coverage": max(0, int(row.suggestion_coverage)),
+        "brain_coverage": int(row.brain_coverage),
+    }
+
+
+def get_stats(
+    db: Session,
+    business_id: str,
+    ctx: Optional[CategorizationContext] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Metrics for a business. Usually one primary-key read (stats row joined to
+    the business's version watermarks and its newest raw_events.created_at);
+    commits only if coverage had to be recomputed, or events ingested since
+    coverage_through had to be counted into it. None if the business has no
+    stats row yet: the caller runs normalized_txn_service.ensure_normalized,
+    then rebuild.
+    """
+    hit = db.execute(
+        select(
+            CategorizationStats,
+            Business.rules_version,
+            Business.mapping_version,
+            _newest_created(business_id).scalar_subquery(),
+        )
+        .join(Business, Business.id == CategorizationStats.business_id)
+        .where(CategorizationStats.business_id == business_id)
+    ).one_or_none()
+
+    if hit is None:
+        return None
+
+    row, rules_version, mapping_version, newest = hit
+    if not _coverage_fresh(row, rules_version, mapping_version):
+        _refresh_coverage(db, row, (rules_version, mapping_version), ctx)
+        db.commit()
+    elif newest is not None and (row.coverage_through is None or newest > row.coverage_through):
+        _fold_pending_coverage(db, row, newest, ctx)
+        db.commit()
+    return _out(row)
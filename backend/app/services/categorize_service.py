@@ -1,27 +1,45 @@
 from __future__ import annotations
 
-from datetime import datetime
-from typing import List, Optional, Dict, Any
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterator, List, Optional
 
 from fastapi import HTTPException
-from sqlalchemy import select, and_, inspect
+from sqlalchemy import select, and_, exists, inspect, or_, update
 from sqlalchemy.orm import Session, load_only
 
+from backend.app.db import SessionLocal, insert_ignore_conflicts
 from backend.app.models import (
     Business,
     RawEvent,
+    NormalizedTxn,
     Category,
     TxnCategorization,
     BusinessCategoryMap,
     CategoryRule,
+    CategoryRuleApplyJob,
     utcnow,
+    uuid_str,
 )
 from backend.app.norma.from_events import raw_event_to_txn
-from backend.app.norma.category_engine import suggest_category
+from backend.app.norma.category_engine import suggest_categories
+from backend.app.norma.categorization_context import CategorizationContext
 from backend.app.norma.merchant import merchant_key, canonical_merchant_name
 from backend.app.norma.categorize_brain import brain
+from backend.app.norma.rule_matcher import (
+    CompiledRules,
+    RuleSpec,
+    bump_rules_version,
+    get_compiled_rules,
+    rule_spec,
+)
 from backend.app.services.category_seed import seed_coa_and_categories_and_mappings
 from backend.app.services.category_resolver import resolve_system_key
+from backend.app.services import cash_checkpoint_service, categorization_stats_service, normalized_txn_service
+
+_APPLY_CHUNK = 1000  # rows matched / inserted / committed per rule-apply chunk
+_APPLY_ACTIVE = ("queued", "running")
+# an active job with no progress for this long lost its worker (restart, crash)
+_APPLY_STALE_AFTER = timedelta(minutes=10)
 
 
 def require_business(db: Session, business_id: str) -> Business:
@@ -94,12 +112,6 @@ def _category_rule_load_columns(
     return attrs, column_names
 
 
-def _brain_alias_keys_for_merchant(merchant_id: str) -> List[str]:
-    return sorted(
-        [alias.alias_key for alias in brain.aliases.values() if alias.merchant_id == merchant_id]
-    )
-
-
 def _brain_vendor_out(
     *,
     merchant_id: str,
@@ -115,7 +127,7 @@ def _brain_vendor_out(
         "confidence": label.confidence,
         "evidence_count": label.evidence_count,
         "updated_at": label.updated_at,
-        "alias_keys": _brain_alias_keys_for_merchant(merchant_id),
+        "alias_keys": brain.alias_keys_for(merchant_id),
         "merchant_key": merchant_key_value,
     }
 
@@ -142,14 +154,16 @@ def label_vendor(db: Session, business_id: str, req) -> Dict[str, Any]:
 
     canon = canonical_merchant_name(req.canonical_name or txn.description or "Unknown")
 
-    lbl = brain.apply_label(
-        business_id=business_id,
-        alias_key=mk,
-        canonical_name=canon,
-        system_key=system_key,
-        confidence=req.confidence,
-    )
-    brain.save()
+    with categorization_stats_service.brain_change(db, business_id, mk):
+        lbl = brain.apply_label(
+            business_id=business_id,
+            alias_key=mk,
+            canonical_name=canon,
+            system_key=system_key,
+            confidence=req.confidence,
+        )
+        brain.save()
+    db.commit()
 
     resolved = resolve_system_key(db, business_id, system_key)
 
@@ -164,19 +178,22 @@ def label_vendor(db: Session, business_id: str, req) -> Dict[str, Any]:
     }
 
 
-def list_brain_vendors(db: Session, business_id: str) -> List[Dict[str, Any]]:
+def list_brain_vendors(
+    db: Session,
+    business_id: str,
+    *,
+    q: Optional[str] = None,
+    limit: Optional[int] = None,
+    offset: int = 0,
+) -> List[Dict[str, Any]]:
+    """
+    Labeled vendors ordered by canonical name; `q` is a name prefix. Served from
+    the brain's per-business sorted name index, so cost follows the page size.
+    """
     require_business(db, business_id)
 
-    labels = brain.labels.get(business_id, {})
-    vendors: List[Dict[str, Any]] = []
-    for merchant_id, label in labels.items():
-        system_key = (label.system_key or "").strip().lower()
-        if not system_key or system_key == "uncategorized":
-            continue
-        vendors.append(_brain_vendor_out(merchant_id=merchant_id, label=label))
-
-    vendors.sort(key=lambda v: (v.get("canonical_name") or "").lower())
-    return vendors
+    labels = brain.list_vendor_labels(business_id, prefix=q, offset=offset, limit=limit)
+    return [_brain_vendor_out(merchant_id=label.merchant_id, label=label) for label in labels]
 
 
 def get_brain_vendor(db: Session, business_id: str, merchant_key_value: str) -> Dict[str, Any]:
@@ -191,7 +208,7 @@ def get_brain_vendor(db: Session, business_id: str, merchant_key_value: str) ->
     if not merchant_id:
         raise HTTPException(404, "vendor not found")
 
-    label = brain.labels.get(business_id, {}).get(merchant_id)
+    label = brain.get_label(business_id, merchant_id)
     if not label or (label.system_key or "").strip().lower() == "uncategorized":
         raise HTTPException(404, "vendor not found")
 
@@ -218,14 +235,16 @@ def set_brain_vendor(db: Session, business_id: str, req) -> Dict[str, Any]:
     canonical = canonical_merchant_name(req.canonical_name or alias_key or "Unknown")
     confidence = 0.92
 
-    label = brain.apply_label(
-        business_id=business_id,
-        alias_key=alias_key,
-        canonical_name=canonical,
-        system_key=system_key,
-        confidence=confidence,
-    )
-    brain.save()
+    with categorization_stats_service.brain_change(db, business_id, alias_key):
+        label = brain.apply_label(
+            business_id=business_id,
+            alias_key=alias_key,
+            canonical_name=canonical,
+            system_key=system_key,
+            confidence=confidence,
+        )
+        brain.save()
+    db.commit()
 
     return _brain_vendor_out(
         merchant_id=label.merchant_id,
@@ -245,13 +264,12 @@ def forget_brain_vendor(db: Session, business_id: str, req) -> Dict[str, Any]:
     if not merchant_id:
         return {"status": "ok", "deleted": False}
 
-    per = brain.labels.get(business_id)
-    if not per:
-        return {"status": "ok", "deleted": False}
-
-    deleted = per.pop(merchant_id, None) is not None
+    with categorization_stats_service.brain_change(db, business_id, alias_key):
+        deleted = brain.forget_label(business_id, merchant_id)
+        if deleted:
+            brain.save()
     if deleted:
-        brain.save()
+        db.commit()
 
     return {"status": "ok", "deleted": deleted}
 
@@ -261,14 +279,17 @@ def list_txns_to_categorize(
     business_id: str,
     limit: int,
     only_uncategorized: bool,
+    ctx: Optional[CategorizationContext] = None,
 ) -> List[Dict[str, Any]]:
     require_business(db, business_id)
     seed_coa_and_categories_and_mappings(db, business_id)
+    ctx = ctx or CategorizationContext.load(db, business_id)
 
+    normalized_txn_service.ensure_normalized(db, business_id)
     rows = db.execute(
-        select(RawEvent)
-        .where(RawEvent.business_id == business_id)
-        .order_by(RawEvent.occurred_at.desc())
+        select(NormalizedTxn)
+        .where(NormalizedTxn.business_id == business_id)
+        .order_by(NormalizedTxn.occurred_at.desc())
         .limit(500)
     ).scalars().all()
 
@@ -277,18 +298,20 @@ def list_txns_to_categorize(
     ).scalars().all()
     existing_set = set(existing)
 
-    out: List[Dict[str, Any]] = []
+    picked = [
+        ev
+        for ev in rows
+        if ev.skip_reason is None and not (only_uncategorized and ev.source_event_id in existing_set)
+    ][: max(0, limit)]
+    txns = [normalized_txn_service.row_to_txn(ev) for ev in picked]
+    suggestions = suggest_categories(ctx, txns)
 
-    for ev in rows:
-        if only_uncategorized and ev.source_event_id in existing_set:
-            continue
-
-        txn = raw_event_to_txn(ev.payload, ev.occurred_at, ev.source_event_id)
-        suggested = suggest_category(db, txn, business_id=business_id)
+    out: List[Dict[str, Any]] = []
 
+    for ev, txn, suggested in zip(picked, txns, suggestions):
         cat_obj = getattr(suggested, "categorization", None)
 
-        mk = merchant_key(txn.description)
+        mk = ev.merchant_key or ""
 
         system_key: Optional[str] = None
         suggestion_source: Optional[str] = None
@@ -302,7 +325,7 @@ def list_txns_to_categorize(
 
             # ✅ never suggest uncategorized
             if candidate and candidate != "uncategorized":
-                resolved = resolve_system_key(db, business_id, candidate)
+                resolved = ctx.resolve_system_key(candidate)
 
                 # ✅ only suggest if it maps to a real Category in the dropdown
                 if resolved:
@@ -333,9 +356,6 @@ def list_txns_to_categorize(
             }
         )
 
-        if len(out) >= limit:
-            break
-
     return out
 
 
@@ -378,56 +398,24 @@ def _category_rule_out(rule: CategoryRule, column_names: set[str]) -> Dict[str,
     }
 
 
-def _rule_order_key(rule: CategoryRule) -> tuple:
-    return (rule.priority, rule.created_at, rule.id)
-
-
-def _ordered_active_rules(db: Session, business_id: str) -> List[CategoryRule]:
-    load_columns, _column_names = _category_rule_load_columns(db)
-    return (
-        db.execute(
-            select(CategoryRule)
-            .options(load_only(*load_columns))
-            .where(
-                and_(
-                    CategoryRule.business_id == business_id,
-                    CategoryRule.active.is_(True),
-                )
-            )
-            .order_by(
-                CategoryRule.priority.asc(),
-                CategoryRule.created_at.asc(),
-                CategoryRule.id.asc(),
-            )
-        )
-        .scalars()
-        .all()
-    )
-
-
-def _rule_matches(rule: CategoryRule, txn) -> bool:
-    desc = (txn.description or "").strip().lower()
-    if not desc:
-        return False
-    needle = (rule.contains_text or "").strip().lower()
-    if not needle:
-        return False
-    if needle not in desc:
-        return False
-    direction = (txn.direction or "").strip().lower()
-    account = (txn.account or "").strip().lower()
-    if rule.direction and rule.direction.strip().lower() != direction:
-        return False
-    if rule.account and rule.account.strip().lower() != account:
-        return False
-    return True
+def _rule_winner(compiled: CompiledRules, target: Optional[CompiledRules], txn) -> Optional[RuleSpec]:
+    """
+    First matching rule under the (priority, created_at, id) policy across the
+    active rules plus `target` (a one-rule set for a rule that is not active).
+    """
+    winner = compiled.first_match(txn.description, txn.direction, txn.account)
+    if target is not None:
+        extra = target.first_match(txn.description, txn.direction, txn.account)
+        if extra and (winner is None or extra.order_key < winner.order_key):
+            return extra
+    return winner
 
 
-def _first_matching_rule(rules: List[CategoryRule], txn) -> Optional[CategoryRule]:
-    for rule in rules:
-        if _rule_matches(rule, txn):
-            return rule
-    return None
+def _compiled_with_target(db: Session, business_id: str, rule: CategoryRule) -> tuple[CompiledRules, Optional[CompiledRules]]:
+    compiled = get_compiled_rules(db, business_id)
+    if any(r.id == rule.id for r in compiled.rules):
+        return compiled, None
+    return compiled, CompiledRules([rule_spec(rule)])
 
 
 def list_category_rules(
@@ -490,6 +478,7 @@ def create_category_rule(db: Session, business_id: str, req) -> Dict[str, Any]:
         active=active,
     )
     db.add(rule)
+    bump_rules_version(db, business_id)
     db.commit()
     db.refresh(rule)
 
@@ -535,6 +524,7 @@ def update_category_rule(db: Session, business_id: str, rule_id: str, req) -> Di
         rule.active = bool(req.active)
 
     db.add(rule)
+    bump_rules_version(db, business_id)
     db.commit()
     db.refresh(rule)
 
@@ -553,11 +543,23 @@ def delete_category_rule(db: Session, business_id: str, rule_id: str) -> Dict[st
         raise HTTPException(404, "rule not found")
 
     db.delete(rule)
+    bump_rules_version(db, business_id)
     db.commit()
 
     return {"deleted": True}
 
 
+def _preview_sample(txn) -> Dict[str, Any]:
+    return {
+        "source_event_id": txn.source_event_id,
+        "occurred_at": txn.occurred_at,
+        "description": txn.description,
+        "amount": txn.amount,
+        "direction": txn.direction,
+        "account": txn.account,
+    }
+
+
 def preview_category_rule(
     db: Session,
     business_id: str,
@@ -571,6 +573,8 @@ def preview_category_rule(
     Only uncategorized transactions are considered.
     """
     require_business(db, business_id)
+    # before loading the rule: a lazy sync commits, which would expire it
+    normalized_txn_service.ensure_normalized(db, business_id)
 
     load_columns, _column_names = _category_rule_load_columns(db)
     rule = db.execute(
@@ -581,10 +585,7 @@ def preview_category_rule(
     if not rule:
         raise HTTPException(404, "rule not found")
 
-    rules = _ordered_active_rules(db, business_id)
-    if not any(r.id == rule.id for r in rules):
-        rules.append(rule)
-        rules.sort(key=_rule_order_key)
+    compiled, target = _compiled_with_target(db, business_id, rule)
 
     existing_ids = set(
         db.execute(
@@ -594,9 +595,9 @@ def preview_category_rule(
 
     rows = (
         db.execute(
-            select(RawEvent)
-            .where(RawEvent.business_id == business_id)
-            .order_by(RawEvent.occurred_at.desc(), RawEvent.source_event_id.desc())
+            select(NormalizedTxn)
+            .where(NormalizedTxn.business_id == business_id, NormalizedTxn.skip_reason.is_(None))
+            .order_by(NormalizedTxn.occurred_at.desc(), NormalizedTxn.source_event_id.desc())
             .limit(max_events)
         )
         .scalars()
@@ -609,33 +610,87 @@ def preview_category_rule(
     for ev in rows:
         if ev.source_event_id in existing_ids:
             continue
-        txn = raw_event_to_txn(ev.payload, ev.occurred_at, ev.source_event_id)
-        winner = _first_matching_rule(rules, txn)
+        txn = normalized_txn_service.row_to_txn(ev)
+        winner = _rule_winner(compiled, target, txn)
         if not winner or winner.id != rule.id:
             continue
         matched += 1
         if len(samples) < sample_limit:
-            samples.append(
-                {
-                    "source_event_id": txn.source_event_id,
-                    "occurred_at": txn.occurred_at,
-                    "description": txn.description,
-                    "amount": txn.amount,
-                    "direction": txn.direction,
-                    "account": txn.account,
-                }
-            )
+            samples.append(_preview_sample(txn))
 
     return {"rule_id": rule.id, "matched": matched, "samples": samples}
 
 
-def apply_category_rule(db: Session, business_id: str, rule_id: str) -> Dict[str, Any]:
+def preview_all_category_rules(
+    db: Session,
+    business_id: str,
+    *,
+    sample_limit: int = 3,
+) -> Dict[str, Any]:
     """
-    Apply a single rule to uncategorized transactions only.
+    Preview every active rule in one pass over the uncategorized history.
+
+    Each event is evaluated once against the compiled rule set: the first match
+    under the conflict policy wins it, every later match is recorded as shadowed
+    by the winner. Rules that match events but never win are reported as
+    shadowed (with the rules that beat them).
     """
     require_business(db, business_id)
+    compiled = get_compiled_rules(db, business_id)
+    normalized_txn_service.ensure_normalized(db, business_id)
+
+    wins: Dict[str, int] = {r.id: 0 for r in compiled.rules}
+    hits: Dict[str, int] = {r.id: 0 for r in compiled.rules}
+    beaten_by: Dict[str, Dict[str, int]] = {r.id: {} for r in compiled.rules}
+    samples: Dict[str, List[Dict[str, Any]]] = {r.id: [] for r in compiled.rules}
+
+    scanned = matched = 0
+    if compiled.rules:
+        for chunk in _uncategorized_chunks(db, business_id, _APPLY_CHUNK):
+            for ev in chunk:
+                scanned += 1
+                txn = normalized_txn_service.row_to_txn(ev)
+                winner: Optional[RuleSpec] = None
+                for r in compiled.iter_matches(txn.description, txn.direction, txn.account):
+                    hits[r.id] += 1
+                    if winner is None:
+                        winner = r
+                        continue
+                    beaten_by[r.id][winner.id] = beaten_by[r.id].get(winner.id, 0) + 1
+                if winner is None:
+                    continue
+                matched += 1
+                wins[winner.id] += 1
+                if len(samples[winner.id]) < sample_limit:
+                    samples[winner.id].append(_preview_sample(txn))
+
+    rules_out: List[Dict[str, Any]] = []
+    for r in compiled.rules:
+        rules_out.append(
+            {
+                "rule_id": r.id,
+                "category_id": r.category_id,
+                "contains_text": r.contains_text,
+                "priority": r.priority,
+                "matched": wins[r.id],
+                "candidates": hits[r.id],
+                "shadowed": hits[r.id] > 0 and wins[r.id] == 0,
+                "shadowed_by": sorted(beaten_by[r.id], key=lambda k: (-beaten_by[r.id][k], k)),
+                "samples": samples[r.id],
+            }
+        )
 
-    load_columns, column_names = _category_rule_load_columns(db, include_optional=True)
+    return {
+        "business_id": business_id,
+        "scanned": scanned,
+        "matched": matched,
+        "rules": rules_out,
+        "shadowed_rule_ids": [o["rule_id"] for o in rules_out if o["shadowed"]],
+    }
+
+
+def _load_rule(db: Session, business_id: str, rule_id: str) -> tuple[CategoryRule, set[str]]:
+    load_columns, column_names = _category_rule_load_columns(db)
     rule = db.execute(
         select(CategoryRule)
         .options(load_only(*load_columns))
@@ -643,59 +698,248 @@ def apply_category_rule(db: Session, business_id: str, rule_id: str) -> Dict[str
     ).scalar_one_or_none()
     if not rule:
         raise HTTPException(404, "rule not found")
+    return rule, column_names
 
-    rules = _ordered_active_rules(db, business_id)
-    if not any(r.id == rule.id for r in rules):
-        rules.append(rule)
-        rules.sort(key=_rule_order_key)
 
-    existing_ids = set(
-        db.execute(
-            select(TxnCategorization.source_event_id).where(TxnCategorization.business_id == business_id)
-        ).scalars().all()
+def _uncategorized_chunks(db: Session, business_id: str, chunk_size: int) -> Iterator[List[NormalizedTxn]]:
+    """
+    Walk the business's uncategorized, non-skipped rows oldest-first in
+    keyset-paginated chunks on (occurred_at, source_event_id), which rides
+    ix_normtxn_business_occurred_source. Safe to write categorizations between
+    chunks: the cursor only moves forward.
+    """
+    posted = exists().where(
+        TxnCategorization.business_id == NormalizedTxn.business_id,
+        TxnCategorization.source_event_id == NormalizedTxn.source_event_id,
     )
-
-    rows = (
-        db.execute(
-            select(RawEvent)
-            .where(RawEvent.business_id == business_id)
-            .order_by(RawEvent.occurred_at.desc(), RawEvent.source_event_id.desc())
-            .limit(5000)
+    after: Optional[tuple[datetime, str]] = None
+    while True:
+        stmt = select(NormalizedTxn).where(
+            NormalizedTxn.business_id == business_id,
+            NormalizedTxn.skip_reason.is_(None),
+            ~posted,
         )
-        .scalars()
-        .all()
-    )
+        if after is not None:
+            stmt = stmt.where(
+                or_(
+                    NormalizedTxn.occurred_at > after[0],
+                    and_(NormalizedTxn.occurred_at == after[0], NormalizedTxn.source_event_id > after[1]),
+                )
+            )
+        rows = (
+            db.execute(
+                stmt.order_by(NormalizedTxn.occurred_at.asc(), NormalizedTxn.source_event_id.asc()).limit(chunk_size)
+            )
+            .scalars()
+            .all()
+        )
+        if not rows:
+            return
+        yield list(rows)
+        if len(rows) < chunk_size:
+            return
+        after = (rows[-1].occurred_at, rows[-1].source_event_id)
 
-    matched_ids: List[str] = []
-    for ev in rows:
-        if ev.source_event_id in existing_ids:
-            continue
-        txn = raw_event_to_txn(ev.payload, ev.occurred_at, ev.source_event_id)
-        winner = _first_matching_rule(rules, txn)
-        if winner and winner.id == rule.id:
-            matched_ids.append(ev.source_event_id)
 
-    updated = 0
-    for source_event_id in matched_ids:
-        row = TxnCategorization(
-            business_id=business_id,
-            source_event_id=source_event_id,
-            category_id=rule.category_id,
-            source="rule",
-            confidence=0.92,
-            note=None,
+def _run_rule_apply(
+    db: Session,
+    business_id: str,
+    rule: CategoryRule,
+    column_names: set[str],
+    *,
+    job: Optional[CategoryRuleApplyJob] = None,
+    chunk_size: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Apply `rule` to every uncategorized transaction in the business's history.
+
+    Each chunk is matched with the engine's conflict policy, inserted with
+    ON CONFLICT (business_id, source_event_id) DO NOTHING, folded into the
+    checkpoint / stats counters and committed, together with `job` progress.
+    Finishes by stamping last_run_at / last_run_updated_count (full total).
+    """
+    rule_id, category_id = rule.id, rule.category_id
+    compiled, target = _compiled_with_target(db, business_id, rule)
+    normalized_txn_service.ensure_normalized(db, business_id)
+
+    scanned = matched = updated = 0
+    for chunk in _uncategorized_chunks(db, business_id, chunk_size or _APPLY_CHUNK):
+        now = utcnow()
+        rows: List[Dict[str, Any]] = []
+        for ev in chunk:
+            winner = _rule_winner(compiled, target, normalized_txn_service.row_to_txn(ev))
+            if winner and winner.id == rule_id:
+                rows.append(
+                    {
+                        "id": uuid_str(),
+                        "business_id": business_id,
+                        "source_event_id": ev.source_event_id,
+                        "category_id": category_id,
+                        "source": "rule",
+                        "confidence": 0.92,
+                        "note": None,
+                        "created_at": now,
+                    }
+                )
+
+        # a concurrent write may have claimed some events first; those are skipped
+        landed = insert_ignore_conflicts(
+            db, TxnCategorization, rows, ("business_id", "source_event_id"), returning="source_event_id"
         )
-        db.add(row)
-        updated += 1
+        inserted = len(landed)
+        if inserted:
+            cash_checkpoint_service.record_posted(db, business_id, landed)
+            categorization_stats_service.record_posted(db, business_id, landed)
+
+        scanned += len(chunk)
+        matched += len(rows)
+        updated += inserted
+        if job is not None:
+            job.scanned, job.matched, job.updated = scanned, matched, updated
+            job.updated_at = utcnow()
+        db.commit()
 
+    run_values: Dict[str, Any] = {}
     if "last_run_at" in column_names:
-        rule.last_run_at = utcnow()
+        run_values["last_run_at"] = utcnow()
     if "last_run_updated_count" in column_names:
-        rule.last_run_updated_count = updated
-    db.add(rule)
+        run_values["last_run_updated_count"] = updated
+    if run_values:
+        db.execute(update(CategoryRule).where(CategoryRule.id == rule_id).values(**run_values))
     db.commit()
 
-    return {"rule_id": rule.id, "matched": len(matched_ids), "updated": updated}
+    return {"rule_id": rule_id, "matched": matched, "updated": updated}
+
+
+def _rule_apply_job_out(job: CategoryRuleApplyJob) -> Dict[str, Any]:
+    return {
+        "job_id": job.id,
+        "business_id": job.business_id,
+        "rule_id": job.rule_id,
+        "status": job.status,
+        "scanned": job.scanned,
+        "matched": job.matched,
+        "updated": job.updated,
+        "error": job.error,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+    }
+
+
+def fail_stale_rule_apply_jobs(
+    db: Session,
+    *,
+    stale_after: timedelta = _APPLY_STALE_AFTER,
+    business_id: Optional[str] = None,
+    rule_id: Optional[str] = None,
+) -> int:
+    """
+    Mark queued/running apply jobs that made no progress for `stale_after` as
+    failed: BackgroundTasks die with their process, so nothing else would
+    finish them. Runs at startup, and before a job is read or started so a
+    dead job neither polls forever nor blocks its rule. The age check (not
+    "every active job") keeps a restarting worker from failing jobs another
+    live worker is still running.
+    Re-running the rule is safe: apply only inserts missing categorizations.
+    Commits; returns the number of jobs failed.
+    """
+    now = utcnow()
+    cond = [
+        CategoryRuleApplyJob.status.in_(_APPLY_ACTIVE),
+        CategoryRuleApplyJob.updated_at < now - stale_after,
+    ]
+    if business_id is not None:
+        cond.append(CategoryRuleApplyJob.business_id == business_id)
+    if rule_id is not None:
+        cond.append(CategoryRuleApplyJob.rule_id == rule_id)
+    failed = db.execute(
+        update(CategoryRuleApplyJob)
+        .where(*cond)
+        .values(status="failed", error="interrupted: worker stopped", finished_at=now, updated_at=now)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    db.commit()
+    return failed
+
+
+def start_rule_apply_job(db: Session, business_id: str, rule_id: str) -> Dict[str, Any]:
+    """
+    Queue a full-history apply of one rule (to uncategorized transactions
+    only). This is the only apply entry point: the work is unbounded, so it
+    never runs inside a request. The caller schedules run_rule_apply_job(job_id)
+    (e.g. FastAPI BackgroundTasks).
+
+    If the rule already has a queued/running job, that job is returned instead
+    of a second one (scheduling it again is a no-op: run_rule_apply_job only
+    claims queued jobs, once).
+    """
+    require_business(db, business_id)
+    _load_rule(db, business_id, rule_id)
+    fail_stale_rule_apply_jobs(db, business_id=business_id, rule_id=rule_id)
+
+    job = db.execute(
+        select(CategoryRuleApplyJob)
+        .where(
+            CategoryRuleApplyJob.business_id == business_id,
+            CategoryRuleApplyJob.rule_id == rule_id,
+            CategoryRuleApplyJob.status.in_(_APPLY_ACTIVE),
+        )
+        .order_by(CategoryRuleApplyJob.created_at.desc())
+        .limit(1)
+    ).scalar_one_or_none()
+    if job is None:
+        job = CategoryRuleApplyJob(business_id=business_id, rule_id=rule_id, status="queued")
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+    return _rule_apply_job_out(job)
+
+
+def get_rule_apply_job(db: Session, business_id: str, job_id: str) -> Dict[str, Any]:
+    job = db.get(CategoryRuleApplyJob, job_id)
+    if not job or job.business_id != business_id:
+        raise HTTPException(404, "job not found")
+    if job.status in _APPLY_ACTIVE:
+        fail_stale_rule_apply_jobs(db, business_id=business_id, rule_id=job.rule_id)
+        db.refresh(job)
+    return _rule_apply_job_out(job)
+
+
+def run_rule_apply_job(job_id: str, session_factory: Callable[[], Session] = SessionLocal) -> None:
+    """
+    Background entry point: claims a queued job (queued -> running in one
+    UPDATE, so a job scheduled twice runs once) and runs it in its own
+    session, committing progress per chunk and recording success or the
+    failure reason.
+    """
+    db = session_factory()
+    try:
+        now = utcnow()
+        claimed = db.execute(
+            update(CategoryRuleApplyJob)
+            .where(CategoryRuleApplyJob.id == job_id, CategoryRuleApplyJob.status == "queued")
+            .values(status="running", started_at=now, updated_at=now)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.commit()
+        if not claimed:
+            return
+        job = db.get(CategoryRuleApplyJob, job_id)
+
+        try:
+            rule, column_names = _load_rule(db, job.business_id, job.rule_id)
+            _run_rule_apply(db, job.business_id, rule, column_names, job=job)
+            job.status = "succeeded"
+        except Exception as exc:
+            db.rollback()
+            job = db.get(CategoryRuleApplyJob, job_id)
+            job.status = "failed"
+            job.error = str(getattr(exc, "detail", None) or exc) or exc.__class__.__name__
+        job.finished_at = job.updated_at = utcnow()
+        db.commit()
+    finally:
+        db.close()
 
 
 def upsert_categorization(db: Session, business_id: str, req) -> Dict[str, Any]:
@@ -730,6 +974,8 @@ def upsert_categorization(db: Session, business_id: str, req) -> Dict[str, Any]:
             note=req.note,
         )
         db.add(row)
+        cash_checkpoint_service.record_posted(db, business_id, [req.source_event_id])
+        categorization_stats_service.record_posted(db, business_id, [req.source_event_id])
         db.commit()
         updated = False
 
@@ -749,14 +995,16 @@ def upsert_categorization(db: Session, business_id: str, req) -> Dict[str, Any]:
 
         if system_key and system_key != "uncategorized":
             canon = canonical_merchant_name(txn.description or "Unknown")
-            brain.apply_label(
-                business_id=business_id,
-                alias_key=mk,
-                canonical_name=canon,
-                system_key=system_key,
-                confidence=min(1.0, float(req.confidence or 1.0)),
-            )
-            brain.save()
+            with categorization_stats_service.brain_change(db, business_id, mk):
+                brain.apply_label(
+                    business_id=business_id,
+                    alias_key=mk,
+                    canonical_name=canon,
+                    system_key=system_key,
+                    confidence=min(1.0, float(req.confidence or 1.0)),
+                )
+                brain.save()
+            db.commit()
             learned = True
             learned_system_key = system_key
 
@@ -781,18 +1029,26 @@ def bulk_apply_categorization(db: Session, business_id: str, req) -> Dict[str, A
     if not target_key:
         raise HTTPException(400, "merchant_key required")
 
+    # one indexed lookup (ix_normtxn_business_merchant_occurred) over the whole
+    # history, already knowing which events are posted
+    normalized_txn_service.ensure_normalized(db, business_id)
     rows = db.execute(
-        select(RawEvent)
-        .where(RawEvent.business_id == business_id)
-        .order_by(RawEvent.occurred_at.desc())
-        .limit(5000)
-    ).scalars().all()
+        select(NormalizedTxn.source_event_id, TxnCategorization.id)
+        .outerjoin(
+            TxnCategorization,
+            and_(
+                TxnCategorization.business_id == NormalizedTxn.business_id,
+                TxnCategorization.source_event_id == NormalizedTxn.source_event_id,
+            ),
+        )
+        .where(
+            NormalizedTxn.business_id == business_id,
+            NormalizedTxn.merchant_key == target_key,
+            NormalizedTxn.skip_reason.is_(None),
+        )
+    ).all()
 
-    matching_ids: List[str] = []
-    for ev in rows:
-        txn = raw_event_to_txn(ev.payload, ev.occurred_at, ev.source_event_id)
-        if merchant_key(txn.description) == target_key:
-            matching_ids.append(ev.source_event_id)
+    matching_ids: List[str] = [sid for sid, _cat_id in rows]
 
     if not matching_ids:
         return {
@@ -802,83 +1058,54 @@ def bulk_apply_categorization(db: Session, business_id: str, req) -> Dict[str, A
             "updated": 0,
         }
 
-    existing = db.execute(
-        select(TxnCategorization).where(
-            and_(
-                TxnCategorization.business_id == business_id,
-                TxnCategorization.source_event_id.in_(matching_ids),
-            )
-        )
-    ).scalars().all()
-    existing_map = {row.source_event_id: row for row in existing}
-
-    created = 0
-    updated = 0
-    for source_event_id in matching_ids:
-        row = existing_map.get(source_event_id)
-        if row:
-            continue
-        else:
-            row = TxnCategorization(
-                business_id=business_id,
-                source_event_id=source_event_id,
-                category_id=req.category_id,
-                source=req.source,
-                confidence=req.confidence,
-                note=req.note,
-            )
-            db.add(row)
-            created += 1
+    now = utcnow()
+    new_rows = [
+        {
+            "id": uuid_str(),
+            "business_id": business_id,
+            "source_event_id": sid,
+            "category_id": req.category_id,
+            "source": req.source,
+            "confidence": req.confidence,
+            "note": req.note,
+            "created_at": now,
+        }
+        for sid, cat_id in rows
+        if cat_id is None
+    ]
+    created_ids = insert_ignore_conflicts(
+        db, TxnCategorization, new_rows, ("business_id", "source_event_id"), returning="source_event_id"
+    )
+    created = len(created_ids)
 
+    cash_checkpoint_service.record_posted(db, business_id, created_ids)
+    categorization_stats_service.record_posted(db, business_id, created_ids)
     db.commit()
 
     return {
         "status": "ok",
         "matched_events": len(matching_ids),
         "created": created,
-        "updated": updated,
+        "updated": 0,
     }
 
 
-def categorization_metrics(db: Session, business_id: str) -> Dict[str, Any]:
+def categorization_metrics(
+    db: Session,
+    business_id: str,
+    ctx: Optional[CategorizationContext] = None,
+) -> Dict[str, Any]:
+    """
+    Served from the categorization_stats row (categorization_stats_service);
+    `ctx` is only used if coverage has to be recomputed.
+    """
     require_business(db, business_id)
     seed_coa_and_categories_and_mappings(db, business_id)
-
-    total_events = db.execute(
-        select(RawEvent).where(RawEvent.business_id == business_id)
-    ).scalars().all()
-    total_count = len(total_events)
-
-    categorized_ids = set(
-        db.execute(
-            select(TxnCategorization.source_event_id).where(TxnCategorization.business_id == business_id)
-        ).scalars().all()
-    )
-
-    posted = len(categorized_ids)
-    uncategorized = max(0, total_count - posted)
-
-    suggestion_coverage = 0
-    for ev in total_events:
-        if ev.source_event_id in categorized_ids:
-            continue
-        txn = raw_event_to_txn(ev.payload, ev.occurred_at, ev.source_event_id)
-        suggested = suggest_category(db, txn, business_id=business_id)
-        cat_obj = getattr(suggested, "categorization", None)
-        if not cat_obj:
-            continue
-        candidate = (cat_obj.category or "").strip().lower()
-        if not candidate or candidate == "uncategorized":
-            continue
-        if resolve_system_key(db, business_id, candidate):
-            suggestion_coverage += 1
-
-    brain_coverage = brain.count_learned_merchants(business_id)
-
-    return {
-        "total_events": total_count,
-        "posted": posted,
-        "uncategorized": uncategorized,
-        "suggestion_coverage": suggestion_coverage,
-        "brain_coverage": brain_coverage,
-    }
+    stats = categorization_stats_service.get_stats(db, business_id, ctx)
+    if stats is None:
+        # first read (or invalidated): counters are rebuilt from normalized rows
+        normalized_txn_service.ensure_normalized(db, business_id)
+        categorization_stats_service.rebuild(db, business_id, ctx)
+        db.commit()
+        stats = categorization_stats_service.get_stats(db, business_id, ctx) or {}
+    return stats
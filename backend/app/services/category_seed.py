@@ -5,10 +5,10 @@ import uuid
 from datetime import datetime, timezone
 from typing import Dict, Tuple, Optional, List
 
-from sqlalchemy import select, and_
+from sqlalchemy import select, and_, update
 from sqlalchemy.orm import Session
 
-from backend.app.models import Account, Category, BusinessCategoryMap
+from backend.app.models import Account, Business, Category, BusinessCategoryMap
 from backend.app.coa_templates import DEFAULT_COA
 
 
@@ -234,10 +234,52 @@ def _ensure_single_mapping_for_category(
     return changed
 
 
-def seed_coa_and_categories_and_mappings(db: Session, business_id: str) -> None:
+# -------------------------
+# Seeded-state fingerprint
+# -------------------------
+
+def _fingerprint(coa_version: int, mapping_version: int) -> str:
+    return f"coa:{coa_version}/map:{mapping_version}"
+
+
+def bump_coa_version(db: Session, business_id: str) -> None:
+    """
+    Call on every Account / Category write outside the seeder (same transaction):
+    the next seed call re-runs in full. Does NOT commit.
+    """
+    db.execute(
+        update(Business)
+        .where(Business.id == business_id)
+        .values(coa_version=Business.coa_version + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def seed_is_current(db: Session, business_id: str) -> bool:
+    """
+    One primary-key lookup: True if nothing COA-related changed since the last full seed.
+    """
+    row = db.execute(
+        select(Business.coa_version, Business.mapping_version, Business.seed_fingerprint).where(
+            Business.id == business_id
+        )
+    ).one_or_none()
+    return row is not None and row.seed_fingerprint == _fingerprint(row.coa_version, row.mapping_version)
+
+
+def seed_coa_and_categories_and_mappings(db: Session, business_id: str, *, force: bool = False) -> None:
     """
     Canonical seeder.
 
+    Read paths call this on every request; unless `force` is set it returns
+    after seed_is_current() when the business's COA/mapping versions match the
+    fingerprint recorded by the last full run. Full runs happen after COA
+    mutations (bump_coa_version), on onboarding, and via the admin repair endpoint.
+
+    Commits only when a full run wrote seed rows. A run that finds nothing to
+    change leaves the caller's transaction uncommitted; a stale fingerprint is
+    staged there and lands with the caller's next commit.
+
     Guarantees:
       - Accounts exist (DEFAULT_COA) if none exist
       - There is ALWAYS an 'Uncategorized' expense account + category + mapping
@@ -246,6 +288,14 @@ def seed_coa_and_categories_and_mappings(db: Session, business_id: str) -> None:
           * canonical system_key when subtype/name indicates (utilities/software/etc)
           * otherwise stable fallback acct_<account_id>
     """
+    if not force and seed_is_current(db, business_id):
+        return
+
+    versions = db.execute(
+        select(Business.coa_version, Business.mapping_version, Business.seed_fingerprint).where(
+            Business.id == business_id
+        )
+    ).one_or_none()
 
     changed = False
 
@@ -325,5 +375,20 @@ def seed_coa_and_categories_and_mappings(db: Session, business_id: str) -> None:
         ):
             changed = True
 
+    if versions is not None:
+        coa_version, mapping_version, seed_fingerprint = versions
+        if changed:
+            mapping_version += 1
+        fingerprint = _fingerprint(coa_version, mapping_version)
+        if changed or seed_fingerprint != fingerprint:
+            db.execute(
+                update(Business)
+                .where(Business.id == business_id)
+                .values(
+                    mapping_version=Business.mapping_version + (1 if changed else 0),
+                    seed_fingerprint=fingerprint,
+                )
+                .execution_options(synchronize_session=False)
+            )
     if changed:
         db.commit()
@@ -0,0 +1,175 @@
+"""
+Cached health pipeline: normalized txns -> ledger -> facts -> signals -> score.
+
+/demo/health, /demo/dashboard, /demo/analytics/monthly-trends and /brief all
+ran the whole chain on every request. The inputs are the business's newest
+`limit_events` normalized_transactions rows, so results are cached in process
+per (business_id, limit_events) and stamped with:
+
+  - the event watermark: (row count, max created_at) of the business's
+    raw_events. Every ingest adds an event with a newer created_at and every
+    delete changes the count. One index-only query on
+    ix_raw_events_business_created; unlike a stamp over normalized rows, a
+    lazy re-normalization does not move it.
+  - NORMALIZER_VERSION: a version bump rewrites the normalized rows without
+    touching raw_events.
+  - PIPELINE_VERSION: bump when ledger / facts / signals / scoring code
+    changes output.
+
+There is no categorization-version component: the pipeline reads only the
+normalizer's category hint (NormalizedTxn.category), never TxnCategorization,
+so posting, rules and brain labels cannot change its output.
+
+A stale stamp recomputes; everything else is a dict lookup. Results are shared
+between requests: treat them as read-only.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from backend.app.clarity.scoring import compute_business_score
+from backend.app.clarity.signals import compute_signals
+from backend.app.models import RawEvent
+from backend.app.norma.facts import compute_facts, facts_to_dict
+from backend.app.norma.from_events import NORMALIZER_VERSION
+from backend.app.norma.ledger import build_cash_ledger
+from backend.app.norma.normalize import NormalizedTransaction
+from backend.app.services import normalized_txn_service
+
+PIPELINE_VERSION = 1
+_CACHE_SIZE = 256  # (business_id, limit_events) entries
+
+
+@dataclass(frozen=True)
+class HealthPipeline:
+    txns: List[NormalizedTransaction]
+    merchant_keys: Dict[str, str]  # source_event_id -> persisted merchant_key
+    last_event_occurred_at: Optional[datetime]
+    ledger: List[Any]
+    ledger_rows: List[Dict[str, Any]]
+    facts_obj: Any
+    facts_json: Dict[str, Any]
+    scoring_input: Dict[str, Any]
+    signals: List[Any]
+    signals_dicts: List[Dict[str, Any]]
+    breakdown: Any
+
+
+_cache: "OrderedDict[Tuple[str, int], Tuple[Tuple[Any, ...], HealthPipeline]]" = OrderedDict()
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0}
+
+
+def compute_health_pipeline(
+    txns: List[NormalizedTransaction],
+    *,
+    merchant_keys: Optional[Dict[str, str]] = None,
+    last_event_occurred_at: Optional[datetime] = None,
+) -> HealthPipeline:
+    """
+    Deterministic pipeline (uncached): txns -> ledger -> facts -> signals -> score.
+    """
+    ledger = build_cash_ledger(txns, opening_balance=0.0)
+
+    facts_obj = compute_facts(txns, ledger)
+    facts_json = facts_to_dict(facts_obj)
+
+    scoring_input = {
+        "current_cash": facts_json["current_cash"],
+        "monthly_inflow_outflow": facts_json["monthly_inflow_outflow"],
+        "totals_by_category": facts_json["totals_by_category"],
+    }
+
+    signals = compute_signals(facts_obj)               # List[Signal dataclass]
+    signals_dicts = [asdict(s) for s in signals]       # score expects dict-ish inputs
+    breakdown = compute_business_score(scoring_input, signals_dicts)
+
+    ledger_rows = [
+        {
+            "occurred_at": r.occurred_at.isoformat(),
+            "date": r.date.isoformat(),
+            "amount": float(r.amount),
+            "balance": float(r.balance),
+            "source_event_id": r.source_event_id,
+        }
+        for r in ledger
+    ]
+
+    return HealthPipeline(
+        txns=txns,
+        merchant_keys=merchant_keys or {},
+        last_event_occurred_at=last_event_occurred_at,
+        ledger=ledger,
+        ledger_rows=ledger_rows,
+        facts_obj=facts_obj,
+        facts_json=facts_json,
+        scoring_input=scoring_input,
+        signals=signals,
+        signals_dicts=signals_dicts,
+        breakdown=breakdown,
+    )
+
+
+def data_watermark(db: Session, business_id: str) -> Tuple[int, Optional[datetime]]:
+    """
+    (row count, newest created_at) of the business's raw_events.
+    """
+    count, newest = db.execute(
+        select(func.count(), func.max(RawEvent.created_at)).where(RawEvent.business_id == business_id)
+    ).one()
+    return int(count or 0), newest
+
+
+def get_health_pipeline(db: Session, business_id: str, *, limit_events: int = 2000) -> HealthPipeline:
+    """
+    Pipeline over the newest `limit_events` events, from the cache when the
+    business's data has not changed since it was computed.
+    """
+    normalized_txn_service.ensure_normalized(db, business_id)
+    stamp = (PIPELINE_VERSION, NORMALIZER_VERSION, *data_watermark(db, business_id))
+    key = (business_id, limit_events)
+
+    with _lock:
+        hit = _cache.get(key)
+        if hit is not None and hit[0] == stamp:
+            _cache.move_to_end(key)
+            _stats["hits"] += 1
+            return hit[1]
+        _stats["misses"] += 1
+
+    pairs, last_event_occurred_at = normalized_txn_service.load_event_txn_pairs(
+        db,
+        business_id,
+        limit_events=limit_events,
+        chronological=True,
+    )
+    result = compute_health_pipeline(
+        [t for _e, t in pairs],
+        merchant_keys={e.source_event_id: e.merchant_key for e, _t in pairs},
+        last_event_occurred_at=last_event_occurred_at,
+    )
+
+    with _lock:
+        _cache[key] = (stamp, result)
+        _cache.move_to_end(key)
+        if len(_cache) > _CACHE_SIZE:
+            _cache.popitem(last=False)
+    return result
+
+
+def cache_info() -> Dict[str, int]:
+    with _lock:
+        return {"hits": _stats["hits"], "misses": _stats["misses"], "size": len(_cache), "maxsize": _CACHE_SIZE}
+
+
+def clear_cache() -> None:
+    with _lock:
+        _cache.clear()
@@ -0,0 +1,237 @@
+"""
+Dashboard health snapshots (business_health_snapshots).
+
+GET /demo/dashboard used to run the health pipeline for every business inside
+the request. It now reads one row per business from business_health_snapshots
+in a single paginated query; the pipeline runs out of band:
+
+  - refresh_snapshot: recompute one business (pipeline over its newest
+    DASHBOARD_EVENTS events) and upsert its row.
+  - refresh_stale_snapshots: the worker pass (scripts/refresh_health_snapshots.py),
+    refreshes every business whose row is missing or stale.
+  - run_refresh: BackgroundTasks entry point; the dashboard schedules it for
+    the stale cards of the page it served.
+
+A row is stale when Business.data_version (bumped by every write or delete
+of the business's normalized rows) differs from the source_data_version
+stored with it, or when it was computed by an older PIPELINE_VERSION. The
+check is a plain column comparison on the joined rows.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Literal, Optional, Set
+
+from sqlalchemy import case, func, or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from backend.app.db import SessionLocal
+from backend.app.models import Business, BusinessHealthSnapshot, utcnow
+from backend.app.services import health_pipeline_service, normalized_txn_service
+
+DASHBOARD_EVENTS = 1000   # events per business behind a dashboard card
+HIGHLIGHTS = 3            # signal titles kept per card
+
+SortKey = Literal["created_at", "name", "health_score", "risk"]
+SortOrder = Literal["asc", "desc"]
+
+_inflight: Set[str] = set()   # business ids with a background refresh queued or running
+_lock = threading.Lock()
+
+
+# ----------------------------
+# Staleness
+# ----------------------------
+
+def _stale_expr():
+    """
+    SQL boolean: the Business row has no snapshot, or its snapshot is stale.
+    Use in a query that outer-joins BusinessHealthSnapshot onto Business.
+    """
+    snap = BusinessHealthSnapshot
+    return or_(
+        snap.business_id.is_(None),
+        snap.pipeline_version != health_pipeline_service.PIPELINE_VERSION,
+        snap.source_data_version != Business.data_version,
+    )
+
+
+def _with_snapshot(*columns):
+    return select(*columns).select_from(Business).outerjoin(
+        BusinessHealthSnapshot, BusinessHealthSnapshot.business_id == Business.id
+    )
+
+
+def stale_business_ids(
+    db: Session,
+    *,
+    among: Optional[List[str]] = None,
+    limit: Optional[int] = None,
+) -> List[str]:
+    """
+    Businesses (optionally only those in `among`) whose snapshot is missing or
+    stale, never-computed first, then oldest snapshot first.
+    """
+    stmt = (
+        _with_snapshot(Business.id)
+        .where(_stale_expr())
+        .order_by(BusinessHealthSnapshot.computed_at.is_not(None), BusinessHealthSnapshot.computed_at, Business.id)
+    )
+    if among is not None:
+        stmt = stmt.where(Business.id.in_(among))
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return list(db.execute(stmt).scalars().all())
+
+
+# ----------------------------
+# Refresh
+# ----------------------------
+
+def _upsert(db: Session, business_id: str, values: Dict[str, Any]) -> BusinessHealthSnapshot:
+    row = db.get(BusinessHealthSnapshot, business_id)
+    if row is None:
+        row = BusinessHealthSnapshot(business_id=business_id, **values)
+        db.add(row)
+        try:
+            db.flush()
+            return row
+        except IntegrityError:
+            # another worker inserted it first; overwrite theirs
+            db.rollback()
+            row = db.get(BusinessHealthSnapshot, business_id)
+    for k, v in values.items():
+        setattr(row, k, v)
+    return row
+
+
+def refresh_snapshot(db: Session, business_id: str) -> BusinessHealthSnapshot:
+    """
+    Recompute and store one business's snapshot. Commits.
+
+    data_version is read before the pipeline runs, so events landing in
+    between leave the row stale (refreshed again) rather than falsely fresh.
+    """
+    normalized_txn_service.ensure_normalized(db, business_id)
+    data_version = db.execute(select(Business.data_version).where(Business.id == business_id)).scalar_one()
+    pipeline = health_pipeline_service.get_health_pipeline(db, business_id, limit_events=DASHBOARD_EVENTS)
+
+    row = _upsert(
+        db,
+        business_id,
+        {
+            "health_score": float(pipeline.breakdown.overall),
+            "risk": pipeline.breakdown.risk,
+            "highlights": [s.title for s in pipeline.signals[:HIGHLIGHTS]],
+            "source_data_version": data_version,
+            "pipeline_version": health_pipeline_service.PIPELINE_VERSION,
+            "computed_at": utcnow(),
+        },
+    )
+    db.commit()
+    return row
+
+
+def refresh_stale_snapshots(db: Session, *, limit: Optional[int] = None) -> List[str]:
+    """
+    Worker pass: refresh every missing/stale snapshot (at most `limit`).
+    Returns the refreshed business ids.
+    """
+    refreshed: List[str] = []
+    for business_id in stale_business_ids(db, limit=limit):
+        refresh_snapshot(db, business_id)
+        refreshed.append(business_id)
+    return refreshed
+
+
+def claim_refresh(business_ids: Iterable[str]) -> List[str]:
+    """
+    The ids not already queued for a background refresh in this process,
+    marked as queued. Pass the result to run_refresh.
+    """
+    with _lock:
+        claimed = [bid for bid in dict.fromkeys(business_ids) if bid not in _inflight]
+        _inflight.update(claimed)
+    return claimed
+
+
+def run_refresh(business_ids: List[str], session_factory: Callable[[], Session] = SessionLocal) -> None:
+    """
+    Background entry point: refresh the given businesses (those still stale)
+    in a session of its own, then release their claim_refresh marks.
+    """
+    db = session_factory()
+    try:
+        for business_id in stale_business_ids(db, among=business_ids):
+            refresh_snapshot(db, business_id)
+    finally:
+        db.close()
+        with _lock:
+            _inflight.difference_update(business_ids)
+
+
+# ----------------------------
+# Dashboard read
+# ----------------------------
+
+def _order_by(sort: SortKey, order: SortOrder):
+    snap = BusinessHealthSnapshot
+    if sort == "name":
+        col = Business.name
+    elif sort == "health_score":
+        col = snap.health_score
+    elif sort == "risk":
+        col = case((snap.risk == "red", 2), (snap.risk == "yellow", 1), else_=0)
+    else:
+        col = Business.created_at
+    keys = [col.desc() if order == "desc" else col.asc(), Business.id]
+    if sort in ("health_score", "risk"):
+        keys.insert(0, snap.business_id.is_(None))  # businesses without a snapshot last
+    return keys
+
+
+def list_dashboard_cards(
+    db: Session,
+    *,
+    sort: SortKey = "created_at",
+    order: SortOrder = "desc",
+    limit: int = 100,
+    offset: int = 0,
+) -> Dict[str, Any]:
+    """
+    One page of dashboard cards straight from the snapshot table. Cards for
+    businesses never computed have health_score / risk None; every card
+    carries `stale`.
+    """
+    snap = BusinessHealthSnapshot
+    total = db.execute(select(func.count()).select_from(Business)).scalar_one()
+    rows = db.execute(
+        _with_snapshot(
+            Business.id,
+            Business.name,
+            snap.health_score,
+            snap.risk,
+            snap.highlights,
+            snap.computed_at,
+            case((_stale_expr(), True), else_=False).label("stale"),
+        )
+        .order_by(*_order_by(sort, order))
+        .limit(limit)
+        .offset(offset)
+    ).all()
+
+    cards = [
+        {
+            "business_id": str(r.id),
+            "name": r.name,
+            "risk": r.risk,
+            "health_score": r.health_score,
+            "highlights": list(r.highlights or []),
+            "computed_at": r.computed_at.isoformat() if r.computed_at else None,
+            "stale": bool(r.stale),
+        }
+        for r in rows
+    ]
+    return {"cards": cards, "total": int(total), "limit": limit, "offset": offset, "sort": sort, "order": order}
@@ -1,15 +1,18 @@
 from __future__ import annotations
 
-from datetime import date, datetime
+from datetime import date, datetime, time, timedelta, timezone
 import logging
 from typing import List, Optional, Literal, Dict, Iterable, Any
 
 from fastapi import HTTPException
-from sqlalchemy import select, and_
+from sqlalchemy import and_, case, func, select
+from sqlalchemy.sql import Select
 from sqlalchemy.orm import Session
 
-from backend.app.models import Business, RawEvent, TxnCategorization, Category, Account
-from backend.app.norma.from_events import raw_event_to_txn
+from backend.app.analytics.downsample import Granularity, bucket_points, lttb
+from backend.app.models import Business, NormalizedTxn, TxnCategorization, Category, Account
+from backend.app.services import cash_checkpoint_service
+from backend.app.services.normalized_txn_service import ensure_normalized, row_to_txn
 
 Direction = Literal["inflow", "outflow"]
 
@@ -23,15 +26,6 @@ def require_business(db: Session, business_id: str) -> Business:
     return biz
 
 
-def _date_range_filter(occurred_at: datetime, start: Optional[date], end: Optional[date]) -> bool:
-    d = occurred_at.date()
-    if start and d < start:
-        return False
-    if end and d > end:
-        return False
-    return True
-
-
 def is_inflow(direction: str) -> bool:
     return direction == "inflow"
 
@@ -55,6 +49,132 @@ def _build_cash_series(
     return out
 
 
+def _occurred_range(start: Optional[date], end: Optional[date]) -> List[Any]:
+    """
+    WHERE clauses for an inclusive [start, end] date range on occurred_at
+    (half-open on the datetime so the (business_id, occurred_at, ...) index applies).
+    """
+    cond: List[Any] = []
+    if start:
+        cond.append(NormalizedTxn.occurred_at >= datetime.combine(start, time.min))
+    if end:
+        cond.append(NormalizedTxn.occurred_at < datetime.combine(end + timedelta(days=1), time.min))
+    return cond
+
+
+def _posted(stmt: Select, business_id: str, start: Optional[date], end: Optional[date]) -> Select:
+    """
+    Posted lines = TxnCategorization ⨝ normalized_transactions, restricted to
+    the business and date range.
+    """
+    return stmt.select_from(TxnCategorization).join(
+        NormalizedTxn,
+        and_(
+            NormalizedTxn.business_id == TxnCategorization.business_id,
+            NormalizedTxn.source_event_id == TxnCategorization.source_event_id,
+        ),
+    ).where(
+        TxnCategorization.business_id == business_id,
+        NormalizedTxn.skip_reason.is_(None),
+        *_occurred_range(start, end),
+    )
+
+
+# signed amount in SQL (amount is absolute; direction carries sign) — mirrors signed_amount()
+_SIGNED_AMOUNT = case((NormalizedTxn.direction == "inflow", NormalizedTxn.amount), else_=-NormalizedTxn.amount)
+
+
+def _line_out(ev: NormalizedTxn, cat: Category, acct: Account) -> Dict[str, Any]:
+    txn = row_to_txn(ev)
+
+    direction: Direction = txn.direction
+
+    return {
+        "occurred_at": ev.occurred_at,
+        "source_event_id": ev.source_event_id,
+        "description": txn.description,
+        "direction": direction,
+        "signed_amount": signed_amount(txn.amount or 0.0, direction),
+        "display_amount": float(txn.amount or 0.0),
+        "category_id": cat.id,
+        "category_name": cat.name,
+        "account_id": acct.id,
+        "account_name": acct.name,
+        "account_type": (acct.type or "").lower(),
+        "account_subtype": (acct.subtype or None),
+    }
+
+
+class _IncomeStatementAcc:
+    """
+    Revenue / expense accumulator shared by income_statement and ledger_bundle.
+    """
+
+    def __init__(self) -> None:
+        self.rev_by_name: Dict[str, float] = {}
+        self.exp_by_name: Dict[str, float] = {}
+        self.rev_total = 0.0
+        self.exp_total = 0.0
+
+    def add(self, cat_name: str, acct_type: Optional[str], acct_subtype: Optional[str], amt: float) -> None:
+        t = (acct_type or "").strip().lower()
+        st = (acct_subtype or "").strip().lower()
+
+        if t == "revenue":
+            # revenue should be positive; if negative (refund), it reduces revenue
+            self.rev_total += amt
+            self.rev_by_name[cat_name] = self.rev_by_name.get(cat_name, 0.0) + amt
+        elif t == "expense" or st == "cogs":
+            # expenses we report as positive numbers; rebates reduce expense
+            exp = -amt
+            self.exp_total += exp
+            self.exp_by_name[cat_name] = self.exp_by_name.get(cat_name, 0.0) + exp
+
+    def out(self, start_date: date, end_date: date) -> Dict[str, Any]:
+        revenue_lines = [
+            {"name": k, "amount": round(v, 2)} for k, v in sorted(self.rev_by_name.items())
+        ]
+        expense_lines = [
+            {"name": k, "amount": round(v, 2)} for k, v in sorted(self.exp_by_name.items())
+        ]
+
+        net_income = self.rev_total - self.exp_total
+
+        return {
+            "start_date": start_date,
+            "end_date": end_date,
+            "revenue_total": round(self.rev_total, 2),
+            "expense_total": round(self.exp_total, 2),
+            "net_income": round(net_income, 2),
+            "revenue": revenue_lines,
+            "expenses": expense_lines,
+        }
+
+
+def _cash_flow_out(start_date: date, end_date: date, cash_in: float, cash_out: float) -> Dict[str, Any]:
+    return {
+        "start_date": start_date,
+        "end_date": end_date,
+        "cash_in": round(cash_in, 2),
+        "cash_out": round(cash_out, 2),
+        "net_cash_flow": round(cash_in - cash_out, 2),
+    }
+
+
+def _balance_sheet_out(as_of: date, cash: float) -> Dict[str, Any]:
+    assets = cash
+    liabilities = 0.0
+    equity = assets - liabilities
+
+    return {
+        "as_of": as_of,
+        "cash": round(cash, 2),
+        "assets_total": round(assets, 2),
+        "liabilities_total": round(liabilities, 2),
+        "equity_total": round(equity, 2),
+    }
+
+
 def ledger_lines(
     db: Session,
     business_id: str,
@@ -66,50 +186,20 @@ def ledger_lines(
     Posted ledger lines only (i.e., events with TxnCategorization).
     """
     require_business(db, business_id)
+    ensure_normalized(db, business_id)
 
     # join: categorizations -> events -> category -> account
     stmt = (
-        select(TxnCategorization, RawEvent, Category, Account)
-        .join(RawEvent, and_(
-            RawEvent.business_id == TxnCategorization.business_id,
-            RawEvent.source_event_id == TxnCategorization.source_event_id,
-        ))
+        _posted(select(TxnCategorization, NormalizedTxn, Category, Account), business_id, start_date, end_date)
         .join(Category, Category.id == TxnCategorization.category_id)
         .join(Account, Account.id == Category.account_id)
-        .where(TxnCategorization.business_id == business_id)
-        .order_by(RawEvent.occurred_at.desc(), RawEvent.source_event_id.desc())
+        .order_by(NormalizedTxn.occurred_at.desc(), NormalizedTxn.source_event_id.desc())
         .limit(limit)
     )
 
     rows = db.execute(stmt).all()
 
-    out: List[Dict[str, Any]] = []
-    for txncat, ev, cat, acct in rows:
-        if not _date_range_filter(ev.occurred_at, start_date, end_date):
-            continue
-
-        txn = raw_event_to_txn(ev.payload, ev.occurred_at, ev.source_event_id)
-
-        direction: Direction = txn.direction
-
-        out.append(
-            {
-                "occurred_at": ev.occurred_at,
-                "source_event_id": ev.source_event_id,
-                "description": txn.description,
-                "direction": direction,
-                "signed_amount": signed_amount(txn.amount or 0.0, direction),
-                "display_amount": float(txn.amount or 0.0),
-                "category_id": cat.id,
-                "category_name": cat.name,
-                "account_id": acct.id,
-                "account_name": acct.name,
-                "account_type": (acct.type or "").lower(),
-                "account_subtype": (acct.subtype or None),
-            }
-        )
-
-    return out
+    return [_line_out(ev, cat, acct) for _txncat, ev, cat, acct in rows]
 
 
 def income_statement(
@@ -124,65 +214,26 @@ def income_statement(
     - expenses = sum absolute value of amounts where account.type == 'expense' OR acct.subtype == 'cogs'
     """
     require_business(db, business_id)
+    ensure_normalized(db, business_id)
 
-    # pull posted lines for range (we reuse same join but no limit)
+    # one aggregate row per (category, account type/subtype) in range
     stmt = (
-        select(TxnCategorization, RawEvent, Category, Account)
-        .join(RawEvent, and_(
-            RawEvent.business_id == TxnCategorization.business_id,
-            RawEvent.source_event_id == TxnCategorization.source_event_id,
-        ))
+        _posted(
+            select(Category.name, Account.type, Account.subtype, func.sum(_SIGNED_AMOUNT)),
+            business_id,
+            start_date,
+            end_date,
+        )
         .join(Category, Category.id == TxnCategorization.category_id)
         .join(Account, Account.id == Category.account_id)
-        .where(TxnCategorization.business_id == business_id)
-        .order_by(RawEvent.occurred_at.asc(), RawEvent.source_event_id.asc())
+        .group_by(Category.name, Account.type, Account.subtype)
     )
 
-    rows = db.execute(stmt).all()
-
-    rev_by_name: Dict[str, float] = {}
-    exp_by_name: Dict[str, float] = {}
+    acc = _IncomeStatementAcc()
+    for cat_name, acct_type, acct_subtype, total in db.execute(stmt).all():
+        acc.add(cat_name, acct_type, acct_subtype, float(total or 0.0))
 
-    rev_total = 0.0
-    exp_total = 0.0
-
-    for _, ev, cat, acct in rows:
-        if not _date_range_filter(ev.occurred_at, start_date, end_date):
-            continue
-
-        txn = raw_event_to_txn(ev.payload, ev.occurred_at, ev.source_event_id)
-        amt = signed_amount(txn.amount or 0.0, txn.direction)
-        t = (acct.type or "").strip().lower()
-        st = (acct.subtype or "").strip().lower()
-
-        if t == "revenue":
-            # revenue should be positive; if negative (refund), it reduces revenue
-            rev_total += amt
-            rev_by_name[cat.name] = rev_by_name.get(cat.name, 0.0) + amt
-        elif t == "expense" or st == "cogs":
-            # expenses we report as positive numbers; rebates reduce expense
-            exp = -amt
-            exp_total += exp
-            exp_by_name[cat.name] = exp_by_name.get(cat.name, 0.0) + exp
-
-    revenue_lines = [
-        {"name": k, "amount": round(v, 2)} for k, v in sorted(rev_by_name.items())
-    ]
-    expense_lines = [
-        {"name": k, "amount": round(v, 2)} for k, v in sorted(exp_by_name.items())
-    ]
-
-    net_income = rev_total - exp_total
-
-    return {
-        "start_date": start_date,
-        "end_date": end_date,
-        "revenue_total": round(rev_total, 2),
-        "expense_total": round(exp_total, 2),
-        "net_income": round(net_income, 2),
-        "revenue": revenue_lines,
-        "expenses": expense_lines,
-    }
+    return acc.out(start_date, end_date)
 
 
 def cash_flow(
@@ -197,39 +248,25 @@ def cash_flow(
     cash_out = sum of outflow amounts across posted lines in range
     """
     require_business(db, business_id)
-
-    # reuse ledger_lines join; compute totals
-    stmt = (
-        select(TxnCategorization, RawEvent)
-        .join(RawEvent, and_(
-            RawEvent.business_id == TxnCategorization.business_id,
-            RawEvent.source_event_id == TxnCategorization.source_event_id,
-        ))
-        .where(TxnCategorization.business_id == business_id)
-        .order_by(RawEvent.occurred_at.asc(), RawEvent.source_event_id.asc())
+    ensure_normalized(db, business_id)
+
+    is_in = NormalizedTxn.direction == "inflow"
+    stmt = _posted(
+        select(
+            func.sum(case((is_in, func.abs(NormalizedTxn.amount)), else_=0.0)),
+            func.sum(case((is_in, 0.0), else_=func.abs(NormalizedTxn.amount))),
+        ),
+        business_id,
+        start_date,
+        end_date,
     )
-    rows = db.execute(stmt).all()
+    total_in, total_out = db.execute(stmt).one()
 
-    cash_in = 0.0
-    cash_out = 0.0
+    return _cash_flow_out(start_date, end_date, float(total_in or 0.0), float(total_out or 0.0))
 
-    for _, ev in rows:
-        if not _date_range_filter(ev.occurred_at, start_date, end_date):
-            continue
-        txn = raw_event_to_txn(ev.payload, ev.occurred_at, ev.source_event_id)
-        signed = signed_amount(txn.amount or 0.0, txn.direction)
-        if is_inflow(txn.direction):
-            cash_in += abs(signed)
-        else:
-            cash_out += abs(signed)
 
-    return {
-        "start_date": start_date,
-        "end_date": end_date,
-        "cash_in": round(cash_in, 2),
-        "cash_out": round(cash_out, 2),
-        "net_cash_flow": round(cash_in - cash_out, 2),
-    }
+def _day_ts(d: date) -> datetime:
+    return datetime.combine(d, time.min, tzinfo=timezone.utc)
 
 
 def cash_series(
@@ -238,34 +275,43 @@ def cash_series(
     start_date: Optional[date],
     end_date: Optional[date],
     starting_cash: float,
+    granularity: Optional[Granularity] = None,
+    max_points: Optional[int] = None,
 ) -> List[Dict[str, Any]]:
     """
     Running cash balance series (for signals / bollinger bands).
-    MVP = cumulative sum of posted signed amounts.
+    MVP = cumulative sum of posted signed amounts, one point per day with posted
+    activity (the day's closing balance), read from cash_balance_checkpoints.
+
+    granularity=day|week|month buckets the series (closing balance + min/max of
+    the daily closes per bucket, stamped at bucket start); max_points applies
+    LTTB downsampling on top. Both run over a streamed checkpoint scan: the
+    daily series is fed to LTTB with its length from an index-only COUNT, so
+    only two LTTB buckets are held at a time; week/month buckets are collected
+    first (one point per week/month with activity).
 
     NOTE: This assumes your posted lines represent cash-impacting events.
     """
     require_business(db, business_id)
-
-    stmt = (
-        select(TxnCategorization, RawEvent)
-        .join(RawEvent, and_(
-            RawEvent.business_id == TxnCategorization.business_id,
-            RawEvent.source_event_id == TxnCategorization.source_event_id,
-        ))
-        .where(TxnCategorization.business_id == business_id)
-        .order_by(RawEvent.occurred_at.asc(), RawEvent.source_event_id.asc())
+    ensure_normalized(db, business_id)
+
+    # the daily series streams into LTTB, which needs its length up front
+    n = None
+    if max_points and granularity in (None, "day"):
+        n = cash_checkpoint_service.count_checkpoints(db, business_id, start_date, end_date)
+    opening, checkpoints = cash_checkpoint_service.daily_checkpoints(db, business_id, start_date, end_date)
+
+    # balance starts at starting_cash at the start of the range (history before it is not carried in)
+    base = float(starting_cash or 0.0) - opening
+    points: Iterable[Dict[str, Any]] = (
+        {"occurred_at": _day_ts(cp.day), "balance": round(base + cp.closing_balance, 2)}
+        for cp in checkpoints
     )
-    rows = db.execute(stmt).all()
-
-    txns = []
-
-    for _, ev in rows:
-        if not _date_range_filter(ev.occurred_at, start_date, end_date):
-            continue
-        txns.append(raw_event_to_txn(ev.payload, ev.occurred_at, ev.source_event_id))
-
-    return _build_cash_series(txns, starting_cash)
+    if granularity:
+        points = bucket_points(points, granularity, make_ts=_day_ts)
+    if max_points:
+        return lttb(points, max_points, n=n)
+    return list(points)
 
 
 def balance_sheet_v1(
@@ -282,32 +328,65 @@ def balance_sheet_v1(
       equity_total = assets - liabilities
     """
     require_business(db, business_id)
+    ensure_normalized(db, business_id)
+
+    posted_total = cash_checkpoint_service.closing_balance(db, business_id, as_of)
+
+    return _balance_sheet_out(as_of, float(starting_cash or 0.0) + posted_total)
+
+
+def ledger_bundle(
+    db: Session,
+    business_id: str,
+    start_date: date,
+    end_date: date,
+    limit: int,
+    starting_cash: float,
+) -> Dict[str, Any]:
+    """
+    Everything the Ledger page needs from one scan of the posted lines in range:
+    lines (newest first, up to `limit`), income statement, cash flow and the
+    balance sheet as of end_date.
+
+    Closing cash comes from the daily checkpoint for end_date, same as
+    balance_sheet_v1(as_of=end_date).
+    """
+    require_business(db, business_id)
+    ensure_normalized(db, business_id)
 
     stmt = (
-        select(TxnCategorization, RawEvent)
-        .join(RawEvent, and_(
-            RawEvent.business_id == TxnCategorization.business_id,
-            RawEvent.source_event_id == TxnCategorization.source_event_id,
-        ))
-        .where(TxnCategorization.business_id == business_id)
-        .order_by(RawEvent.occurred_at.asc())
+        _posted(select(NormalizedTxn, Category, Account), business_id, start_date, end_date)
+        .outerjoin(Category, Category.id == TxnCategorization.category_id)
+        .outerjoin(Account, Account.id == Category.account_id)
+        .order_by(NormalizedTxn.occurred_at.desc(), NormalizedTxn.source_event_id.desc())
     )
-    rows = db.execute(stmt).all()
 
-    bal = float(starting_cash or 0.0)
-    for _, ev in rows:
-        if ev.occurred_at.date() <= as_of:
-            txn = raw_event_to_txn(ev.payload, ev.occurred_at, ev.source_event_id)
-            bal += signed_amount(txn.amount or 0.0, txn.direction)
+    lines: List[Dict[str, Any]] = []
+    income = _IncomeStatementAcc()
+    cash_in = 0.0
+    cash_out = 0.0
 
-    assets = bal
-    liabilities = 0.0
-    equity = assets - liabilities
+    for ev, cat, acct in db.execute(stmt).all():
+        amt = signed_amount(ev.amount or 0.0, ev.direction)
+        if is_inflow(ev.direction):
+            cash_in += abs(amt)
+        else:
+            cash_out += abs(amt)
+
+        # lines / income statement need the category -> account anchor (inner join semantics)
+        if cat is None or acct is None:
+            continue
+        income.add(cat.name, acct.type, acct.subtype, amt)
+        if len(lines) < limit:
+            lines.append(_line_out(ev, cat, acct))
+
+    closing_cash = float(starting_cash or 0.0) + cash_checkpoint_service.closing_balance(db, business_id, end_date)
 
     return {
-        "as_of": as_of,
-        "cash": round(bal, 2),
-        "assets_total": round(assets, 2),
-        "liabilities_total": round(liabilities, 2),
-        "equity_total": round(equity, 2),
+        "start_date": start_date,
+        "end_date": end_date,
+        "lines": lines,
+        "income_statement": income.out(start_date, end_date),
+        "cash_flow": _cash_flow_out(start_date, end_date, cash_in, cash_out),
+        "balance_sheet": _balance_sheet_out(end_date, closing_cash),
     }
@@ -0,0 +1,339 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, delete, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from backend.app.models import Business, NormalizedTxn, RawEvent, utcnow
+from backend.app.norma.from_events import NORMALIZER_VERSION, raw_event_to_txn, row_to_txn
+from backend.app.norma.merchant import merchant_key
+from backend.app.norma.normalize import NormalizedTransaction
+from backend.app.services import cash_checkpoint_service, categorization_stats_service
+
+_WRITE_CHUNK = 1000
+
+
+# ----------------------------
+# Write path (ingest / refresh)
+# ----------------------------
+
+def bump_data_version(db: Session, *business_ids: str) -> None:
+    """
+    Call whenever a business's normalized rows are written or deleted (same
+    transaction); keys health snapshot staleness. Does NOT commit.
+    """
+    if not business_ids:
+        return
+    db.execute(
+        update(Business)
+        .where(Business.id.in_(sorted(set(business_ids))))
+        .values(data_version=Business.data_version + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def normalized_row(
+    *,
+    raw_event_id: str,
+    business_id: str,
+    source_event_id: str,
+    occurred_at: datetime,
+    payload: Any,
+) -> Dict[str, Any]:
+    """
+    One normalized_transactions row for a RawEvent. Normalization failures are
+    recorded (skip_reason) instead of raised, mirroring the read paths that skip them.
+    """
+    row: Dict[str, Any] = {
+        "raw_event_id": raw_event_id,
+        "business_id": business_id,
+        "source_event_id": source_event_id,
+        "occurred_at": occurred_at,
+        "date": None,
+        "amount": None,
+        "direction": None,
+        "account": None,
+        "description": None,
+        "category": None,
+        "counterparty_hint": None,
+        "merchant_key": None,
+        "normalizer_version": NORMALIZER_VERSION,
+        "skip_reason": None,
+        "updated_at": utcnow(),
+    }
+    try:
+        txn = raw_event_to_txn(payload, occurred_at, source_event_id)
+    except Exception as exc:
+        row["skip_reason"] = (str(exc) or exc.__class__.__name__)[:200]
+        return row
+
+    row.update(
+        {
+            "date": txn.date,
+            "amount": float(txn.amount),
+            "direction": txn.direction,
+            "account": txn.account,
+            "description": txn.description,
+            "category": txn.category,
+            "counterparty_hint": None if txn.counterparty_hint is None else str(txn.counterparty_hint)[:200],
+            "merchant_key": merchant_key(txn.description),
+        }
+    )
+    return row
+
+
+def write_normalized_rows(db: Session, events: Iterable[Mapping[str, Any]], *, replace: bool = True) -> int:
+    """
+    (Re)write normalized rows for raw_events rows given as mappings (id,
+    business_id, source_event_id, occurred_at, payload). Existing rows for the
+    same events are replaced and the businesses' data_version is bumped.
+    Ingest passes replace=False: events that just landed have no rows yet, so
+    the delete is skipped. Does NOT commit.
+    """
+    rows = [
+        normalized_row(
+            raw_event_id=e["id"],
+            business_id=e["business_id"],
+            source_event_id=e["source_event_id"],
+            occurred_at=e["occurred_at"],
+            payload=e["payload"],
+        )
+        for e in events
+    ]
+    if not rows:
+        return 0
+
+    conn = db.connection()
+    for start in range(0, len(rows), _WRITE_CHUNK):
+        chunk = rows[start : start + _WRITE_CHUNK]
+        if replace:
+            conn.execute(
+                delete(NormalizedTxn).where(NormalizedTxn.raw_event_id.in_([r["raw_event_id"] for r in chunk]))
+            )
+        conn.execute(NormalizedTxn.__table__.insert(), chunk)
+    bump_data_version(db, *{r["business_id"] for r in rows})
+    return len(rows)
+
+
+def _stale_events_query(business_id: str, *, since: Optional[datetime] = None):
+    stmt = (
+        select(
+            RawEvent.id,
+            RawEvent.business_id,
+            RawEvent.source_event_id,
+            RawEvent.occurred_at,
+            RawEvent.payload,
+        )
+        .outerjoin(NormalizedTxn, NormalizedTxn.raw_event_id == RawEvent.id)
+        .where(
+            RawEvent.business_id == business_id,
+            or_(
+                NormalizedTxn.raw_event_id.is_(None),
+                NormalizedTxn.normalizer_version != NORMALIZER_VERSION,
+            ),
+        )
+    )
+    if since is not None:
+        # >=: events sharing the watermark's timestamp are rechecked, not missed
+        stmt = stmt.where(RawEvent.created_at >= since)
+    return stmt
+
+
+def _newest_created_at(db: Session, business_id: str) -> Optional[datetime]:
+    # LIMIT 1 seek on ix_raw_events_business_created
+    return db.execute(
+        select(RawEvent.created_at)
+        .where(RawEvent.business_id == business_id)
+        .order_by(RawEvent.created_at.desc())
+        .limit(1)
+    ).scalar_one_or_none()
+
+
+def _sync(db: Session, business_id: str, *, since: Optional[datetime], newest: Optional[datetime]) -> int:
+    """
+    Normalize the business's missing/stale events (only those created at or
+    after `since`, if given), advance its watermark to `newest` and commit.
+    """
+    written = 0
+    stale = db.execute(_stale_events_query(business_id, since=since)).all()
+    for start in range(0, len(stale), _WRITE_CHUNK):
+        written += write_normalized_rows(db, [r._mapping for r in stale[start : start + _WRITE_CHUNK]])
+
+    if written:
+        # posted amounts / event counts may have moved; both rebuild on next read
+        cash_checkpoint_service.invalidate(db, business_id)
+        categorization_stats_service.invalidate(db, business_id)
+    db.execute(
+        update(Business)
+        .where(Business.id == business_id)
+        .values(normalized_version=NORMALIZER_VERSION, normalized_through=newest)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return written
+
+
+def ensure_normalized(db: Session, business_id: str) -> int:
+    """
+    Lazy refresh before reading normalized rows for a business.
+
+    Fast path compares the business's watermark (Business.normalized_version /
+    normalized_through) with its newest raw_events.created_at: a primary-key
+    read plus one LIMIT 1 index seek, independent of history size. If only
+    newer events arrived, just those are checked; a NORMALIZER_VERSION change
+    (or a business never synced) rechecks the whole history.
+
+    Commit policy: the lazy write runs on its own session (same engine) and
+    commits there, so read paths keep the work while the caller's session, and
+    anything pending in it, is left alone. Call it before making changes of
+    your own (on SQLite a caller holding a write transaction would block it).
+    Returns the number of rows (re)written.
+
+    Ingest paths normalize in their own transaction; the watermark only exists
+    to catch events written around them (and a version bump).
+    renormalize_stale rechecks every business's full history.
+    """
+    version, through = db.execute(
+        select(Business.normalized_version, Business.normalized_through).where(Business.id == business_id)
+    ).one_or_none() or (None, None)
+    newest = _newest_created_at(db, business_id)
+    if version == NORMALIZER_VERSION and (newest is None or (through is not None and newest <= through)):
+        return 0
+
+    since = through if version == NORMALIZER_VERSION else None
+    with Session(bind=db.get_bind()) as writer:
+        return _sync(writer, business_id, since=since, newest=newest)
+
+
+def _drop_orphans(db: Session, business_id: str) -> int:
+    # normalized rows whose raw event was deleted without the cascade
+    orphans = db.connection().execute(
+        delete(NormalizedTxn).where(
+            NormalizedTxn.business_id == business_id,
+            NormalizedTxn.raw_event_id.not_in(
+                select(RawEvent.id).where(RawEvent.business_id == business_id)
+            ),
+        )
+    ).rowcount
+    if orphans:
+        bump_data_version(db, business_id)
+        cash_checkpoint_service.invalidate(db, business_id)
+        categorization_stats_service.invalidate(db, business_id)
+    return orphans
+
+
+def renormalize_stale(db: Session) -> Dict[str, int]:
+    """
+    Full pass (backfill ahead of traffic, deploy step after a NORMALIZER_VERSION
+    bump, repair): recheck every business's whole history regardless of its
+    watermark, drop orphaned rows and re-stamp the watermark, committing per
+    business.
+    Returns {business_id: rows_rewritten_or_dropped} for businesses that changed.
+    """
+    out: Dict[str, int] = {}
+    business_ids = db.execute(select(Business.id)).scalars().all()
+    for business_id in business_ids:
+        newest = _newest_created_at(db, business_id)
+        n = _drop_orphans(db, business_id) + _sync(db, business_id, since=None, newest=newest)
+        if n:
+            out[business_id] = n
+    return out
+
+
+def delete_normalized_rows(db: Session, business_id: str, *, occurred_from: Optional[datetime] = None) -> None:
+    """
+    Explicit delete for code paths that delete RawEvents in bulk (SQLite does not
+    enforce the FK cascade). Cash checkpoints and categorization stats are
+    dropped only if rows were actually deleted. Does NOT commit.
+    """
+    cond = [NormalizedTxn.business_id == business_id]
+    if occurred_from is not None:
+        cond.append(NormalizedTxn.occurred_at >= occurred_from)
+    res = db.execute(delete(NormalizedTxn).where(and_(*cond)))
+    if res.rowcount:
+        bump_data_version(db, business_id)
+        cash_checkpoint_service.invalidate(db, business_id)
+        categorization_stats_service.invalidate(db, business_id)
+
+
+# ----------------------------
+# Read path
+# ----------------------------
+
+def load_event_txn_pairs(
+    db: Session,
+    business_id: str,
+    *,
+    limit_events: int = 2000,
+    chronological: bool = True,
+) -> Tuple[List[Tuple[NormalizedTxn, NormalizedTransaction]], Optional[datetime]]:
+    """
+    Returns [(NormalizedTxn row, NormalizedTransaction), ...] for the newest
+    `limit_events` events, plus the newest occurred_at (if any).
+
+    Same semantics as the old payload-parsing loaders: the limit counts every
+    event, and events the normalizer rejects are skipped.
+    """
+    ensure_normalized(db, business_id)
+
+    rows: Sequence[NormalizedTxn] = (
+        db.execute(
+            select(NormalizedTxn)
+            .where(NormalizedTxn.business_id == business_id)
+            .order_by(NormalizedTxn.occurred_at.desc())
+            .limit(limit_events)
+        )
+        .scalars()
+        .all()
+    )
+
+    iterable = reversed(rows) if chronological else rows
+    pairs = [(r, row_to_txn(r)) for r in iterable if r.skip_reason is None]
+
+    last_event_occurred_at = rows[0].occurred_at if rows else None
+    return pairs, last_event_occurred_at
+
+
+def merchant_rows(
+    db: Session,
+    business_id: str,
+    merchant_key_value: str,
+    *,
+    occurred_from: Optional[datetime] = None,
+) -> Sequence[NormalizedTxn]:
+    """
+    Every non-skipped row for one merchant_key over the whole history (oldest
+    first), via ix_normtxn_business_merchant_occurred. `merchant_key_value`
+    must already be a merchant_key(...) output.
+
+    The persisted key is written by normalized_row at ingest; a change to
+    merchant_key() needs a NORMALIZER_VERSION bump to rewrite it. Callers run
+    ensure_normalized first.
+    """
+    stmt = select(NormalizedTxn).where(
+        NormalizedTxn.business_id == business_id,
+        NormalizedTxn.merchant_key == merchant_key_value,
+        NormalizedTxn.skip_reason.is_(None),
+    )
+    if occurred_from is not None:
+        stmt = stmt.where(NormalizedTxn.occurred_at >= occurred_from)
+    return (
+        db.execute(stmt.order_by(NormalizedTxn.occurred_at.asc(), NormalizedTxn.source_event_id.asc()))
+        .scalars()
+        .all()
+    )
+
+
+def latest_occurred_at(db: Session, business_id: str) -> Optional[datetime]:
+    """
+    Newest occurred_at among the business's non-skipped rows (window anchor).
+    Callers run ensure_normalized first.
+    """
+    return db.execute(
+        select(func.max(NormalizedTxn.occurred_at)).where(
+            NormalizedTxn.business_id == business_id,
+            NormalizedTxn.skip_reason.is_(None),
+        )
+    ).scalar_one_or_none()
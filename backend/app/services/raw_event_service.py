@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Dict, List, Sequence
+
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from backend.app.db import insert_ignore_conflicts
+from backend.app.models import Business, RawEvent, utcnow, uuid_str
+from backend.app.services import categorization_stats_service, normalized_txn_service
+
+# dedupe key (matches uq_raw_events_business_source_event)
+RAW_EVENT_DEDUPE_COLUMNS = ("business_id", "source", "source_event_id")
+
+
+def _require_businesses(db: Session, business_ids: set[str]) -> None:
+    found = set(
+        db.execute(select(Business.id).where(Business.id.in_(business_ids))).scalars().all()
+    )
+    missing = sorted(business_ids - found)
+    if missing:
+        raise HTTPException(status_code=404, detail=f"business not found: {missing[0]}")
+
+
+def insert_raw_events(db: Session, events: Sequence[Any]) -> Dict[str, Any]:
+    """
+    Batch ingest of RawEvents (set-based dedupe, single commit).
+
+    `events` are RawEventIn-like objects (business_id, source, source_event_id,
+    occurred_at, payload). Duplicates — against existing rows or within the
+    batch itself — are skipped by the (business_id, source, source_event_id)
+    unique key instead of a SELECT per event. Normalized rows for the inserted
+    events are written in the same transaction.
+    """
+    if not events:
+        return {"status": "ok", "received": 0, "inserted": 0, "duplicates": 0}
+
+    _require_businesses(db, {e.business_id for e in events})
+
+    now = utcnow()
+    rows: List[Dict[str, Any]] = []
+    for e in events:
+        occurred_at: datetime = e.occurred_at
+        rows.append(
+            {
+                "id": uuid_str(),
+                "business_id": e.business_id,
+                "source": e.source,
+                "source_event_id": e.source_event_id,
+                "occurred_at": occurred_at,
+                "payload": e.payload,
+                "created_at": now,
+            }
+        )
+
+    landed_ids = set(insert_ignore_conflicts(db, RawEvent, rows, RAW_EVENT_DEDUPE_COLUMNS))
+    inserted = len(landed_ids)
+    if inserted:
+        landed = [r for r in rows if r["id"] in landed_ids]
+        normalized_txn_service.write_normalized_rows(db, landed, replace=False)
+        by_business: Dict[str, List[str]] = {}
+        for r in landed:
+            by_business.setdefault(r["business_id"], []).append(r["source_event_id"])
+        for business_id, source_event_ids in by_business.items():
+            categorization_stats_service.record_ingested(db, business_id, source_event_ids)
+    db.commit()
+
+    return {
+        "status": "ok",
+        "received": len(rows),
+        "inserted": inserted,
+        "duplicates": len(rows) - inserted,
+    }
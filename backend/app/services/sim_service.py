@@ -10,6 +10,7 @@ from sqlalchemy import select, delete
 from sqlalchemy.orm import Session
 
 from backend.app.models import Business, RawEvent, BusinessIntegrationProfile
+from backend.app.services import categorization_stats_service, normalized_txn_service
 from backend.app.sim.models import SimulatorConfig
 from backend.app.sim.profiles import PROFILES
 from backend.app.sim.generators.plaid import make_plaid_transaction_event
@@ -320,7 +321,7 @@ def _apply_random_shocks(
     return {"revenue_mult": 1.0, "expense_mult": 1.0, "deposit_delay_days": r.choice([2, 3, 5]), "refund_rate": None, "deposit_delay_pct": 1.0}
 
 
-def _insert_raw_event(db: Session, business_id: str, ev: dict) -> int:
+def _insert_raw_event(db: Session, business_id: str, ev: dict, landed: List[RawEvent]) -> int:
     exists = db.execute(
         select(RawEvent.id).where(
             RawEvent.business_id == business_id,
@@ -331,18 +332,43 @@ def _insert_raw_event(db: Session, business_id: str, ev: dict) -> int:
     if exists:
         return 0
 
-    db.add(
-        RawEvent(
-            business_id=business_id,
-            source=ev["source"],
-            source_event_id=ev["source_event_id"],
-            occurred_at=ev["occurred_at"],
-            payload=ev["payload"],
-        )
+    raw = RawEvent(
+        business_id=business_id,
+        source=ev["source"],
+        source_event_id=ev["source_event_id"],
+        occurred_at=ev["occurred_at"],
+        payload=ev["payload"],
     )
+    db.add(raw)
+    landed.append(raw)
     return 1
 
 
+def _record_landed(db: Session, business_id: str, landed: List[RawEvent]) -> None:
+    """
+    Normalize a generated batch and fold it into the categorization counters
+    in one pass (same as raw_event_service.insert_raw_events). Does NOT commit.
+    """
+    if not landed:
+        return
+    db.flush()
+    normalized_txn_service.write_normalized_rows(
+        db,
+        [
+            {
+                "id": e.id,
+                "business_id": e.business_id,
+                "source_event_id": e.source_event_id,
+                "occurred_at": e.occurred_at,
+                "payload": e.payload,
+            }
+            for e in landed
+        ],
+        replace=False,
+    )
+    categorization_stats_service.record_ingested(db, business_id, [e.source_event_id for e in landed])
+
+
 # ============================================================
 # Interventions: compute modifiers by day / datetime
 # ============================================================
@@ -746,6 +772,7 @@ def generate_history(db: Session, business_id: str, req) -> Dict[str, Any]:
 
     deleted_count = 0
     if req.mode == "replace_from_start":
+        normalized_txn_service.delete_normalized_rows(db, business_id, occurred_from=start_at)
         res = db.execute(
             delete(RawEvent).where(
                 RawEvent.business_id == business_id,
@@ -795,8 +822,10 @@ def generate_history(db: Session, business_id: str, req) -> Dict[str, Any]:
         )
 
         inserted = 0
+        landed: List[RawEvent] = []
         for ev in events:
-            inserted += _insert_raw_event(db, business_id, ev)
+            inserted += _insert_raw_event(db, business_id, ev, landed)
+        _record_landed(db, business_id, landed)
 
         sim.setdefault("truth_events", [])
         sim["truth_events"] = truth_events
@@ -823,6 +852,7 @@ def generate_history(db: Session, business_id: str, req) -> Dict[str, Any]:
     shock_end = min(gen_end, shock_start + timedelta(days=req.shock_days))
 
     inserted = 0
+    landed: List[RawEvent] = []
 
     # def _mods_for_day(ivs_list: List[Any], day: date) -> Dict[str, Any]:
     #     """
@@ -955,7 +985,7 @@ def generate_history(db: Session, business_id: str, req) -> Dict[str, Any]:
         if "payroll" in enabled_streams and (d % int(cfg.payroll_every_n_days or 14)) == 0:
             occurred_at_payroll = _occurred_at_for_stream("payroll", day_start)
             ev = make_payroll_run_event(business_id=business_id, occurred_at=occurred_at_payroll)
-            inserted += _insert_raw_event(db, business_id, ev)
+            inserted += _insert_raw_event(db, business_id, ev, landed)
 
         # Truth markers: which interventions are active + their computed mods
         active_iv = []
@@ -1021,7 +1051,7 @@ def generate_history(db: Session, business_id: str, req) -> Dict[str, Any]:
 
                 if stream == "bank":
                     ev = make_plaid_transaction_event(business_id=business_id, occurred_at=occurred_at, cfg=shim)
-                    inserted += _insert_raw_event(db, business_id, ev)
+                    inserted += _insert_raw_event(db, business_id, ev, landed)
 
                 elif stream == "card_processor":
                     delay_days = int(ev_mods.get("deposit_delay_days", 0))
@@ -1030,28 +1060,28 @@ def generate_history(db: Session, business_id: str, req) -> Dict[str, Any]:
                     dt2 = occurred_at + timedelta(days=delay_days) if delayed else occurred_at
 
                     ev = make_stripe_payout_event(business_id=business_id, occurred_at=dt2, cfg=cfg)
-                    inserted += _insert_raw_event(db, business_id, ev)
+                    inserted += _insert_raw_event(db, business_id, ev, landed)
 
                     if i % 3 == 0:
                         inserted += _insert_raw_event(
-                            db, business_id, make_stripe_fee_event(business_id=business_id, occurred_at=dt2)
+                            db, business_id, make_stripe_fee_event(business_id=business_id, occurred_at=dt2), landed
                         )
 
                 elif stream == "ecommerce":
                     ev = make_shopify_order_paid_event(business_id=business_id, occurred_at=occurred_at)
-                    inserted += _insert_raw_event(db, business_id, ev)
+                    inserted += _insert_raw_event(db, business_id, ev, landed)
 
                     rr = ev_mods.get("refund_rate")
                     if rr is None:
                         # baseline: occasional refunds
                         if i % 10 == 0:
                             inserted += _insert_raw_event(
-                                db, business_id, make_shopify_refund_event(business_id=business_id, occurred_at=occurred_at)
+                                db, business_id, make_shopify_refund_event(business_id=business_id, occurred_at=occurred_at), landed
                             )
                     else:
                         if r.random() < float(rr):
                             inserted += _insert_raw_event(
-                                db, business_id, make_shopify_refund_event(business_id=business_id, occurred_at=occurred_at)
+                                db, business_id, make_shopify_refund_event(business_id=business_id, occurred_at=occurred_at), landed
                             )
 
                 elif stream == "invoicing":
@@ -1064,7 +1094,7 @@ def generate_history(db: Session, business_id: str, req) -> Dict[str, Any]:
                             ev["payload"]["invoice"]["amount"] = round(amt * rm, 2)
                         except Exception:
                             pass
-                    inserted += _insert_raw_event(db, business_id, ev)
+                    inserted += _insert_raw_event(db, business_id, ev, landed)
 
     # Store “truth” for debugging/UI (temporary but useful)
     sim.setdefault("truth_events", [])
@@ -1080,6 +1110,8 @@ def generate_history(db: Session, business_id: str, req) -> Dict[str, Any]:
             }
         )
 
+    _record_landed(db, business_id, landed)
+
     prof.simulation_params["simulator"] = sim  # type: ignore[index]
     db.add(prof)
     db.commit()
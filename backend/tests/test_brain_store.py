@@ -0,0 +1,276 @@
+import json
+import threading
+
+from backend.app.norma import brain_store
+from backend.app.norma.brain_store import BrainStore
+
+
+def _label(store, business_id, alias_key, system_key="meals"):
+    return store.apply_label(
+        business_id=business_id,
+        alias_key=alias_key,
+        canonical_name=alias_key.title(),
+        system_key=system_key,
+    )
+
+
+def test_labels_persist_in_the_shared_database(tmp_path):
+    store = BrainStore(tmp_path / "brain.db", compact_every=2)
+    _label(store, "biz-1", "blue bottle")
+    store.save()
+    _label(store, "biz-1", "sysco", system_key="supplies")
+    store.save()  # crosses compact_every: WAL checkpointed into brain.db
+    assert not (tmp_path / "brain.db-wal").exists() or (tmp_path / "brain.db-wal").stat().st_size == 0
+
+    _label(store, "biz-2", "sysco", system_key="inventory")
+    merchant_id = store.resolve_merchant_id("blue bottle")
+    assert store.forget_label("biz-1", merchant_id)
+
+    reloaded = BrainStore(tmp_path / "brain.db")
+    assert reloaded.lookup_label(business_id="biz-1", alias_key="blue bottle") is None
+    assert reloaded.lookup_label(business_id="biz-1", alias_key="sysco").system_key == "supplies"
+    assert reloaded.lookup_label(business_id="biz-2", alias_key="sysco").system_key == "inventory"
+    assert sorted(reloaded.merchants) == sorted(store.merchants)
+    assert dict(reloaded.aliases) == dict(store.aliases)
+
+
+def test_legacy_json_brain_is_imported_once(tmp_path):
+    legacy = tmp_path / "brain.json"
+    legacy.write_text(
+        json.dumps(
+            {
+                "merchants": [
+                    {"merchant_id": "m-1", "canonical_name": "Blue Bottle"},
+                    {"merchant_id": "m-2", "canonical_name": "Sysco", "default_category": "Supplies"},
+                ],
+                "aliases": [
+                    {"alias_key": "blue bottle", "merchant_id": "m-1"},
+                    {"alias_key": "sysco", "merchant_id": "m-2"},
+                ],
+                "labels": {"biz-1": {"m-1": {"system_key": "meals"}}},
+            }
+        )
+    )
+
+    store = BrainStore(tmp_path / "brain.db")
+    assert store.lookup_label(business_id="biz-1", alias_key="blue bottle").system_key == "meals"
+    assert store.lookup_label(business_id="biz-2", alias_key="blue bottle") is None
+    assert store.lookup_label(business_id="__legacy__", alias_key="sysco").system_key == "supplies"
+
+    assert store.forget_label("biz-1", "m-1")
+    again = BrainStore(tmp_path / "brain.db")  # not re-imported over newer writes
+    assert again.lookup_label(business_id="biz-1", alias_key="blue bottle") is None
+
+
+def test_reverse_alias_index_and_reassignment(tmp_path):
+    store = BrainStore(tmp_path / "brain.db")
+    _label(store, "biz-1", "blue bottle")
+    _label(store, "biz-1", "blue bottle")  # existing alias: same merchant, no new entry
+    _label(store, "biz-1", "sysco")
+    blue_id = store.resolve_merchant_id("blue bottle")
+    sysco_id = store.resolve_merchant_id("sysco")
+    assert store.alias_keys_for(blue_id) == ["blue bottle"]
+    assert store.alias_keys_for(sysco_id) == ["sysco"]
+    assert store.aliases["blue bottle"].evidence_count == 2
+
+    store.aliases = {}
+    assert store.alias_keys_for(blue_id) == []
+    assert store.lookup_label(business_id="biz-1", alias_key="blue bottle") is None
+
+
+def test_vendor_listing_pages_and_prefix_search(tmp_path):
+    store = BrainStore(tmp_path / "brain.db")
+    for name in ["sysco", "blue bottle", "bluebird farms", "acme", "us foods"]:
+        _label(store, "biz-1", name)
+    _label(store, "biz-1", "mystery", system_key="uncategorized")
+    _label(store, "biz-2", "blue apron")
+
+    def names(labels):
+        return [store.get_merchant(lbl.merchant_id).canonical_name for lbl in labels]
+
+    assert names(store.list_vendor_labels("biz-1")) == ["Acme", "Blue Bottle", "Bluebird Farms", "Sysco", "Us Foods"]
+    assert names(store.list_vendor_labels("biz-1", offset=1, limit=2)) == ["Blue Bottle", "Bluebird Farms"]
+    assert names(store.list_vendor_labels("biz-1", prefix="BLUE")) == ["Blue Bottle", "Bluebird Farms"]
+    assert names(store.list_vendor_labels("biz-1", prefix="blue", offset=1)) == ["Bluebird Farms"]
+    assert store.list_vendor_labels("biz-1", prefix="zzz") == []
+
+    # a rename (org-wide merchant) and a new label both show up in the listing
+    store.apply_label(business_id="biz-3", alias_key="acme", canonical_name="Zeta Acme", system_key="meals")
+    _label(store, "biz-1", "costco")
+    assert names(store.list_vendor_labels("biz-1")) == [
+        "Blue Bottle", "Bluebird Farms", "Costco", "Sysco", "Us Foods", "Zeta Acme",
+    ]
+    assert store.forget_label("biz-1", store.resolve_merchant_id("sysco"))
+    assert "Sysco" not in names(store.list_vendor_labels("biz-1"))
+
+
+def test_workers_sharing_the_database_refresh_only_changed_businesses(tmp_path):
+    path = tmp_path / "brain.db"
+    a = BrainStore(path)
+    b = BrainStore(path)
+    assert not b.refresh()  # opens the database on first use
+
+    _label(a, "biz-2", "sysco")
+    assert b.refresh()
+    assert b.lookup_label(business_id="biz-1", alias_key="blue bottle") is None  # cached miss
+    assert b.lookup_label(business_id="biz-2", alias_key="sysco").system_key == "meals"
+    _label(a, "biz-1", "blue bottle")
+    assert b.lookup_label(business_id="biz-1", alias_key="blue bottle") is None  # within refresh_interval
+
+    generation, untouched = b.generation, b.business_version("biz-2")
+    assert b.refresh()
+    assert b.generation > generation
+    assert b.business_version("biz-2") == untouched  # biz-2's cached entries stay warm
+    assert b.lookup_label(business_id="biz-1", alias_key="blue bottle").system_key == "meals"
+    assert not b.refresh()
+
+    # writes read the current row under the database write lock: no lost evidence
+    assert _label(b, "biz-1", "blue bottle", system_key="supplies").evidence_count == 2
+    assert _label(a, "biz-1", "blue bottle", system_key="supplies").evidence_count == 3
+    assert b.forget_label("biz-1", b.resolve_merchant_id("blue bottle"))
+    a.refresh()
+    assert a.lookup_label(business_id="biz-1", alias_key="blue bottle") is None
+    assert a.count_learned_merchants("biz-1") == 0
+
+
+def test_pruned_change_feed_invalidates_everything(tmp_path):
+    path = tmp_path / "brain.db"
+    a = BrainStore(path, compact_every=2)
+    b = BrainStore(path)
+    assert b.lookup_label(business_id="biz-1", alias_key="blue bottle") is None
+    for name in ["blue bottle", "sysco", "acme", "costco"]:
+        _label(a, "biz-1", name)
+    a.compact()  # keeps the last 2 changes: b's position is gone
+
+    assert b.refresh()
+    assert b.lookup_label(business_id="biz-1", alias_key="blue bottle").system_key == "meals"
+
+
+def test_labels_are_never_mutated_in_place(tmp_path):
+    store = BrainStore(tmp_path / "brain.db")
+    first = _label(store, "biz-1", "blue bottle")
+    cached = store.lookup_label(business_id="biz-1", alias_key="blue bottle")
+    second = _label(store, "biz-1", "blue bottle", system_key="supplies")
+
+    assert (first.system_key, first.evidence_count) == ("meals", 1)
+    assert cached == first
+    assert (second.system_key, second.evidence_count) == ("supplies", 2)
+    assert store.lookup_label(business_id="biz-1", alias_key="blue bottle") == second
+
+
+def test_readers_see_whole_labels_while_another_thread_writes(tmp_path):
+    store = BrainStore(tmp_path / "brain.db", refresh_interval=0.0)
+    _label(store, "biz-1", "blue bottle", system_key="supplies")
+    stop = threading.Event()
+    seen = []
+
+    def read():
+        while not stop.is_set():
+            lbl = store.lookup_label(business_id="biz-1", alias_key="blue bottle")
+            seen.append((lbl.system_key, lbl.evidence_count))
+
+    reader = threading.Thread(target=read)
+    reader.start()
+    for i in range(20):
+        _label(store, "biz-1", "blue bottle", system_key="supplies" if i % 2 else "meals")
+    stop.set()
+    reader.join()
+    # every observed label is a committed row: system key and count move together
+    assert seen and all(key == ("supplies" if count % 2 else "meals") for key, count in seen)
+
+
+def test_hot_alias_cache_is_bounded(tmp_path, monkeypatch):
+    monkeypatch.setattr(brain_store, "HOT_ALIAS_CACHE_SIZE", 8)
+    store = BrainStore(tmp_path / "brain.db")
+    _label(store, "biz-1", "blue bottle")
+    for i in range(50):
+        store.lookup_label(business_id="biz-1", alias_key=f"vendor {i}")
+    assert store.lookup_label(business_id="biz-1", alias_key="blue bottle").system_key == "meals"
+    assert store.lookup_label(business_id="biz-1", alias_key="blue bottle").system_key == "meals"
+
+    info = store.cache_info()
+    assert info["size"] == 8
+    assert info["hits"] == 1
+
+
+def _label_many(path, worker, count):
+    store = BrainStore(path)
+    for i in range(count):
+        _label(store, "biz-1", f"vendor {worker} {i}")
+        _label(store, "biz-1", "shared vendor")
+        store.save()
+
+
+def test_concurrent_writes_from_processes(tmp_path):
+    import multiprocessing
+
+    import pytest
+
+    try:
+        ctx = multiprocessing.get_context("fork")
+    except ValueError:
+        pytest.skip("needs fork")
+    path = tmp_path / "brain.db"
+    procs = [ctx.Process(target=_label_many, args=(path, w, 25)) for w in range(4)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join(60)
+        assert p.exitcode == 0
+
+    store = BrainStore(path)
+    assert store.count_learned_merchants("biz-1") == 101
+    assert store.lookup_label(business_id="biz-1", alias_key="shared vendor").evidence_count == 100
+
+
+def test_fuzzy_lookup_finds_close_alias_and_tracks_new_aliases(tmp_path):
+    store = BrainStore(tmp_path / "brain.db")
+    _label(store, "biz-1", "sysco foods", system_key="supplies")
+    _label(store, "biz-1", "us foods", system_key="inventory")
+    _label(store, "biz-2", "sysco food svc", system_key="meals")
+
+    match = store.fuzzy_lookup_label(business_id="biz-1", alias_key="sysco food svc")
+    assert (match.alias_key, match.label.system_key) == ("sysco foods", "supplies")
+    assert 0.65 <= match.similarity < 1.0
+    assert store.fuzzy_lookup_label(business_id="biz-1", alias_key="blue bottle") is None
+    assert store.fuzzy_lookup_label(business_id="biz-1", alias_key="sus foods") is None  # start must agree
+    assert store.fuzzy_lookup_label(business_id="biz-1", alias_key="sysco food svc", threshold=0.9) is None
+
+    # aliases learned after the index was built are found too
+    _label(store, "biz-1", "blue bottle coffee")
+    match = store.fuzzy_lookup_label(business_id="biz-1", alias_key="blue bottle cofee")
+    assert match.alias_key == "blue bottle coffee"
+    assert store.forget_label("biz-1", match.label.merchant_id)
+    assert store.fuzzy_lookup_label(business_id="biz-1", alias_key="blue bottle cofee") is None
+
+
+def test_fuzzy_lookup_ignores_other_businesses_aliases(tmp_path):
+    store = BrainStore(tmp_path / "brain.db")
+    _label(store, "biz-a", "sysco foods", system_key="supplies")
+    before = store.fuzzy_lookup_label(business_id="biz-a", alias_key="sysco foods svc")
+    assert before.alias_key == "sysco foods"
+    postings = store._fuzzy["biz-a"]
+
+    # the org-wide alias space fills with closer variants labeled by other businesses
+    for i in range(100):
+        _label(store, f"biz-{i}", f"sysco foods svc {i:02d}")
+    after = store.fuzzy_lookup_label(business_id="biz-a", alias_key="sysco foods svc")
+    assert after == before
+    assert store._fuzzy["biz-a"] is postings  # other businesses' writes leave biz-a's postings alone
+    assert len(postings.sizes) == 1  # postings hold biz-a's aliases only
+
+
+def test_store_opens_lazily_and_reopens_elsewhere(tmp_path):
+    first, second = tmp_path / "first" / "brain.db", tmp_path / "second" / "brain.db"
+    store = BrainStore(first)
+    assert not first.parent.exists()  # constructing touches no files
+
+    _label(store, "biz-1", "sysco")
+    assert first.exists()
+    assert store.reopen(second) == first
+    assert store.lookup_label(business_id="biz-1", alias_key="sysco") is None  # cached hit dropped
+    _label(store, "biz-1", "blue bottle")
+
+    assert store.reopen(first) == second
+    assert store.lookup_label(business_id="biz-1", alias_key="sysco").system_key == "meals"
+    assert store.lookup_label(business_id="biz-1", alias_key="blue bottle") is None
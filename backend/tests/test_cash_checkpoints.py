@@ -0,0 +1,174 @@
+from datetime import date, datetime, timedelta, timezone
+import os
+from pathlib import Path
+import sys
+
+import pytest
+from sqlalchemy import select
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_cash_checkpoints.db")
+
+from backend.app.db import Base, SessionLocal, engine
+from backend.app.sim import models as sim_models  # noqa: F401
+from backend.app.models import Business, CashBalanceCheckpoint, Category, Organization
+from backend.app.api.categorize import BulkCategorizationIn, CategorizationUpsertIn
+from backend.app.norma.categorize_brain import brain
+from backend.app.services import (
+    cash_checkpoint_service,
+    categorize_service,
+    ledger_service,
+    raw_event_service,
+)
+from backend.app.services.category_seed import seed_coa_and_categories_and_mappings
+
+
+@pytest.fixture()
+def db_session():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture()
+def brain_store(tmp_path):
+    previous = brain.reopen(tmp_path / "brain.db")
+    yield brain
+    brain.reopen(previous)
+
+
+class _Event:
+    def __init__(self, business_id: str, sid: str, occurred_at: datetime, amount: float, name: str):
+        self.business_id = business_id
+        self.source = "bank"
+        self.source_event_id = sid
+        self.occurred_at = occurred_at
+        self.payload = {"type": "transaction.posted", "transaction": {"amount": amount, "name": name}}
+
+
+def _setup(db_session):
+    org = Organization(name="Cash Org")
+    db_session.add(org)
+    db_session.flush()
+    biz = Business(org_id=org.id, name="Cash Biz")
+    db_session.add(biz)
+    db_session.commit()
+    seed_coa_and_categories_and_mappings(db_session, biz.id)
+
+    base = datetime(2024, 3, 1, 9, 0, tzinfo=timezone.utc)
+    raw_event_service.insert_raw_events(
+        db_session,
+        [
+            _Event(biz.id, "evt-1", base, 100.0, "Customer Deposit"),
+            _Event(biz.id, "evt-2", base + timedelta(days=2), -30.0, "Sysco"),
+            _Event(biz.id, "evt-3", base + timedelta(days=2, hours=3), -5.0, "Sysco"),
+            _Event(biz.id, "evt-4", base + timedelta(days=5), -20.0, "Office Depot"),
+        ],
+    )
+    category_id = db_session.execute(select(Category.id).where(Category.business_id == biz.id)).scalars().first()
+    return biz, category_id
+
+
+def _checkpoints(db_session, business_id):
+    db_session.expire_all()
+    rows = db_session.execute(
+        select(CashBalanceCheckpoint)
+        .where(CashBalanceCheckpoint.business_id == business_id)
+        .order_by(CashBalanceCheckpoint.day)
+    ).scalars().all()
+    return [(r.day, round(r.net_change, 2), round(r.closing_balance, 2)) for r in rows]
+
+
+def _rebuilt(db_session, business_id):
+    cash_checkpoint_service.rebuild(db_session, business_id)
+    db_session.commit()
+    return _checkpoints(db_session, business_id)
+
+
+def test_incremental_updates_match_rebuild(db_session, brain_store):
+    biz, category_id = _setup(db_session)
+
+    categorize_service.upsert_categorization(
+        db_session, biz.id, CategorizationUpsertIn(source_event_id="evt-4", category_id=category_id)
+    )
+    assert _checkpoints(db_session, biz.id) == [(date(2024, 3, 6), -20.0, -20.0)]
+
+    # back-dated post shifts every later closing balance
+    categorize_service.upsert_categorization(
+        db_session, biz.id, CategorizationUpsertIn(source_event_id="evt-1", category_id=category_id)
+    )
+    categorize_service.bulk_apply_categorization(
+        db_session, biz.id, BulkCategorizationIn(merchant_key="sysco", category_id=category_id)
+    )
+    incremental = _checkpoints(db_session, biz.id)
+    assert incremental == [
+        (date(2024, 3, 1), 100.0, 100.0),
+        (date(2024, 3, 3), -35.0, 65.0),
+        (date(2024, 3, 6), -20.0, 45.0),
+    ]
+    assert _rebuilt(db_session, biz.id) == incremental
+
+
+def test_first_post_of_a_day_folds_into_a_concurrently_inserted_row(db_session, brain_store):
+    biz, category_id = _setup(db_session)
+    categorize_service.upsert_categorization(
+        db_session, biz.id, CategorizationUpsertIn(source_event_id="evt-1", category_id=category_id)
+    )
+
+    # two writers that each saw no 2024-03-03 row: the second hits the key and adds instead of failing
+    cash_checkpoint_service._apply_deltas(db_session, biz.id, {date(2024, 3, 3): -15.0})
+    cash_checkpoint_service._apply_deltas(db_session, biz.id, {date(2024, 3, 3): -20.0})
+    db_session.commit()
+    assert _checkpoints(db_session, biz.id) == [
+        (date(2024, 3, 1), 100.0, 100.0),
+        (date(2024, 3, 3), -35.0, 65.0),
+    ]
+
+
+def test_balance_sheet_and_cash_series_read_checkpoints(db_session, brain_store):
+    biz, category_id = _setup(db_session)
+    for sid in ("evt-1", "evt-2", "evt-3", "evt-4"):
+        categorize_service.upsert_categorization(
+            db_session, biz.id, CategorizationUpsertIn(source_event_id=sid, category_id=category_id)
+        )
+
+    sheet = ledger_service.balance_sheet_v1(db_session, biz.id, date(2024, 3, 4), starting_cash=10.0)
+    assert sheet["cash"] == pytest.approx(75.0)
+    assert ledger_service.balance_sheet_v1(db_session, biz.id, date(2024, 2, 1), 0.0)["cash"] == 0.0
+
+    series = ledger_service.cash_series(db_session, biz.id, date(2024, 3, 2), None, starting_cash=0.0)
+    assert [(p["occurred_at"].date(), p["balance"]) for p in series] == [
+        (date(2024, 3, 3), -35.0),
+        (date(2024, 3, 6), -55.0),
+    ]
+
+
+def test_business_without_posted_lines_rebuilds_once(db_session, brain_store, monkeypatch):
+    biz, category_id = _setup(db_session)  # events, but nothing posted yet
+
+    assert cash_checkpoint_service.closing_balance(db_session, biz.id, date(2024, 3, 31)) == 0.0
+    db_session.expire_all()
+    assert db_session.get(Business, biz.id).cash_checkpoints_built
+    assert _checkpoints(db_session, biz.id) == []
+
+    def _no_rebuild(*args, **kwargs):
+        raise AssertionError("empty checkpoints rebuilt again")
+
+    with monkeypatch.context() as m:
+        m.setattr(cash_checkpoint_service, "rebuild", _no_rebuild)
+        assert cash_checkpoint_service.closing_balance(db_session, biz.id, date(2024, 3, 31)) == 0.0
+        # the first post folds into the (empty, built) checkpoints incrementally
+        categorize_service.upsert_categorization(
+            db_session, biz.id, CategorizationUpsertIn(source_event_id="evt-2", category_id=category_id)
+        )
+    assert _checkpoints(db_session, biz.id) == [(date(2024, 3, 3), -30.0, -30.0)]
+
+    cash_checkpoint_service.invalidate(db_session, biz.id)
+    db_session.commit()
+    assert not db_session.get(Business, biz.id).cash_checkpoints_built
+    assert cash_checkpoint_service.closing_balance(db_session, biz.id, date(2024, 3, 31)) == -30.0
@@ -4,6 +4,7 @@ import sys
 from pathlib import Path
 
 import pytest
+from sqlalchemy import event, text
 
 sys.path.append(str(Path(__file__).resolve().parents[2]))
 os.environ.setdefault("DATABASE_URL", "sqlite:///./test_categorization.db")
@@ -28,13 +29,16 @@ from backend.app.api.categorize import (
     get_brain_vendor,
     set_brain_vendor,
     forget_brain_vendor,
+    list_brain_vendors,
     BulkCategorizationIn,
     CategorizationUpsertIn,
     CategoryRuleIn,
     BrainVendorSetIn,
     BrainVendorForgetIn,
 )
+from backend.app.api.routes.demo import demo_drilldown_vendor
 from backend.app.norma.categorize_brain import brain
+from backend.app.services import categorize_service
 from backend.app.norma.merchant import merchant_key, canonical_merchant_name
 
 
@@ -52,21 +56,9 @@ def db_session():
 
 @pytest.fixture()
 def brain_store(tmp_path):
-    original_path = brain.path
-    original_merchants = brain.merchants
-    original_aliases = brain.aliases
-    original_labels = brain.labels
-
-    brain.path = tmp_path / "brain.json"
-    brain.merchants = {}
-    brain.aliases = {}
-    brain.labels = {}
+    previous = brain.reopen(tmp_path / "brain.db")
     yield brain
-
-    brain.path = original_path
-    brain.merchants = original_merchants
-    brain.aliases = original_aliases
-    brain.labels = original_labels
+    brain.reopen(previous)
 
 
 def _create_business(db_session):
@@ -270,3 +262,105 @@ def test_create_category_rule_returns_rule(db_session):
     row = db_session.query(CategoryRule).filter(CategoryRule.id == res.id).one()
     assert row.business_id == biz.id
     assert row.contains_text == "acme software"
+
+
+def _count_statements(fn):
+    statements = []
+
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _before)
+    try:
+        result = fn()
+    finally:
+        event.remove(engine, "before_cursor_execute", _before)
+    return result, len(statements)
+
+
+def test_list_txns_to_categorize_query_count_is_constant(db_session, brain_store):
+    biz = _create_business(db_session)
+    software = _create_category(db_session, biz.id, "Software", "software")
+    meals = _create_category(db_session, biz.id, "Meals", "meals")
+    db_session.add_all(
+        [
+            CategoryRule(business_id=biz.id, category_id=software.id, contains_text="acme", priority=10, active=True),
+            CategoryRule(business_id=biz.id, category_id=meals.id, contains_text="diner", priority=20, active=True),
+        ]
+    )
+    db_session.add_all([_make_event(biz.id, f"evt_a{i}", f"ACME {i}") for i in range(3)])
+    db_session.commit()
+
+    def _list():
+        return categorize_service.list_txns_to_categorize(db_session, biz.id, limit=500, only_uncategorized=True)
+
+    _list()  # warm: seeding + normalization
+    db_session.commit()  # request boundary: the next call starts from an empty identity map
+    small, small_count = _count_statements(_list)
+
+    db_session.add_all([_make_event(biz.id, f"evt_b{i}", f"DINER {i}") for i in range(40)])
+    db_session.commit()
+    _list()
+    db_session.commit()
+    large, large_count = _count_statements(_list)
+
+    assert len(small) == 3 and len(large) == 43
+    assert {r["suggested_category_id"] for r in large} == {software.id, meals.id}
+    assert large_count == small_count
+
+
+def test_bulk_apply_uses_merchant_index_over_full_history(db_session, brain_store):
+    biz = _create_business(db_session)
+    meals = _create_category(db_session, biz.id, "Meals", "meals")
+
+    old = _make_event(biz.id, "evt_old", "Acme Coffee #1")
+    old.occurred_at = datetime(2019, 3, 1, 12, 0, tzinfo=timezone.utc)
+    db_session.add(old)
+    db_session.add_all([_make_event(biz.id, f"evt_{i}", f"Vendor {i}") for i in range(30)])
+    db_session.add(_make_event(biz.id, "evt_new", "ACME COFFEE 2"))
+    db_session.commit()
+
+    res = bulk_apply_categorization(biz.id, BulkCategorizationIn(merchant_key="acme coffee", category_id=meals.id), db_session)
+    assert (res["matched_events"], res["created"]) == (2, 2)
+    posted = {r.source_event_id for r in db_session.query(TxnCategorization).filter(TxnCategorization.business_id == biz.id)}
+    assert posted == {"evt_old", "evt_new"}
+
+    plan = db_session.execute(
+        text(
+            "EXPLAIN QUERY PLAN SELECT source_event_id FROM normalized_transactions "
+            "WHERE business_id = :b AND merchant_key = :k AND skip_reason IS NULL"
+        ),
+        {"b": biz.id, "k": merchant_key("acme coffee")},
+    ).all()
+    assert any("ix_normtxn_business_merchant_occurred" in str(row[-1]) for row in plan)
+
+
+def test_vendor_drilldown_reads_merchant_rows_in_window(db_session):
+    biz = _create_business(db_session)
+    for i, day in enumerate([1, 20, 28]):
+        ev = _make_event(biz.id, f"evt_acme_{i}", f"Acme Coffee #{i}")
+        ev.occurred_at = datetime(2024, 1, day, 12, 0, tzinfo=timezone.utc)
+        db_session.add(ev)
+    anchor = _make_event(biz.id, "evt_anchor", "Other Vendor")
+    anchor.occurred_at = datetime(2024, 1, 30, 12, 0, tzinfo=timezone.utc)
+    db_session.add(anchor)
+    db_session.commit()
+
+    res = demo_drilldown_vendor(biz.id, "ACME COFFEE", window_days=14, limit=50, offset=0, db=db_session)
+    assert res.total == 2
+    assert [r.source_event_id for r in res.rows] == ["evt_acme_1", "evt_acme_2"]
+    assert {r.merchant_key for r in res.rows} == {merchant_key("acme coffee")}
+
+
+def test_list_brain_vendors_paginates_and_filters(db_session, brain_store):
+    biz = _create_business(db_session)
+    category = _create_category(db_session, biz.id, "Software", "software")
+    for name in ["Zoom", "Adobe", "Asana", "Github"]:
+        set_brain_vendor(biz.id, BrainVendorSetIn(merchant_key=name, category_id=category.id, canonical_name=name), db_session)
+
+    everything = list_brain_vendors(biz.id, q=None, limit=None, offset=0, db=db_session)
+    assert [v.canonical_name for v in everything] == ["Adobe", "Asana", "Github", "Zoom"]
+    assert everything[0].alias_keys == [merchant_key("Adobe")]
+
+    page = list_brain_vendors(biz.id, q="a", limit=1, offset=1, db=db_session)
+    assert [v.canonical_name for v in page] == ["Asana"]
@@ -47,21 +47,9 @@ def db_session():
 
 @pytest.fixture()
 def brain_store(tmp_path):
-    original_path = brain.path
-    original_merchants = brain.merchants
-    original_aliases = brain.aliases
-    original_labels = brain.labels
-
-    brain.path = tmp_path / "brain.json"
-    brain.merchants = {}
-    brain.aliases = {}
-    brain.labels = {}
+    previous = brain.reopen(tmp_path / "brain.db")
     yield brain
-
-    brain.path = original_path
-    brain.merchants = original_merchants
-    brain.aliases = original_aliases
-    brain.labels = original_labels
+    brain.reopen(previous)
 
 
 def _create_business(db_session):
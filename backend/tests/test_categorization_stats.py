@@ -0,0 +1,255 @@
+from datetime import datetime, timezone
+import os
+from pathlib import Path
+import sys
+
+import pytest
+from sqlalchemy import event
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_categorization_stats.db")
+
+from backend.app.db import Base, SessionLocal, engine
+from backend.app.sim import models as sim_models  # noqa: F401
+from backend.app.models import Account, Business, BusinessCategoryMap, Category, CategoryRule, Organization, RawEvent
+from backend.app.api.core import RawEventIn
+from backend.app.api.categorize import (
+    BrainVendorForgetIn,
+    BrainVendorSetIn,
+    BulkCategorizationIn,
+    bulk_apply_categorization,
+    forget_brain_vendor,
+    set_brain_vendor,
+)
+from backend.app.norma.categorize_brain import brain
+from backend.app.services import categorization_stats_service, categorize_service, raw_event_service
+
+
+@pytest.fixture()
+def db_session():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture()
+def brain_store(tmp_path):
+    previous = brain.reopen(tmp_path / "brain.db")
+    yield brain
+    brain.reopen(previous)
+
+
+def _setup(db_session):
+    org = Organization(name="Stats Org")
+    db_session.add(org)
+    db_session.flush()
+    biz = Business(org_id=org.id, name="Stats Biz")
+    db_session.add(biz)
+    db_session.flush()
+    account = Account(business_id=biz.id, name="Supplies", type="expense", subtype="office_supplies")
+    db_session.add(account)
+    db_session.flush()
+    category = Category(business_id=biz.id, name="Supplies", account_id=account.id)
+    db_session.add(category)
+    db_session.flush()
+    db_session.add(BusinessCategoryMap(business_id=biz.id, system_key="office_supplies", category_id=category.id))
+    db_session.add(
+        CategoryRule(business_id=biz.id, category_id=category.id, contains_text="sysco", priority=1, active=True)
+    )
+    db_session.commit()
+    return biz, category
+
+
+def _events(business_id: str, prefix: str, descriptions):
+    return [
+        RawEventIn(
+            business_id=business_id,
+            source="bank",
+            source_event_id=f"{prefix}-{i}",
+            occurred_at=datetime(2024, 2, 1 + i, 12, 0, tzinfo=timezone.utc),
+            payload={
+                "type": "transaction.posted",
+                "transaction": {"transaction_id": f"{prefix}-{i}", "amount": -20.0, "name": d, "merchant_name": d},
+            },
+        )
+        for i, d in enumerate(descriptions)
+    ]
+
+
+def _count_statements(fn):
+    statements = []
+
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _before)
+    try:
+        result = fn()
+    finally:
+        event.remove(engine, "before_cursor_execute", _before)
+    return result, len(statements)
+
+
+def _metrics(db_session, business_id):
+    return categorize_service.categorization_metrics(db_session, business_id)
+
+
+def _rebuilt(db_session, business_id):
+    categorization_stats_service.invalidate(db_session, business_id)
+    db_session.commit()
+    return _metrics(db_session, business_id)
+
+
+def test_metrics_served_from_stats_row(db_session, brain_store):
+    biz, _category = _setup(db_session)
+    raw_event_service.insert_raw_events(db_session, _events(biz.id, "a", ["SYSCO 1", "SYSCO 2", "MYSTERY CO"]))
+
+    first = _metrics(db_session, biz.id)
+    assert first == {
+        "total_events": 3,
+        "posted": 0,
+        "uncategorized": 3,
+        "suggestion_coverage": 2,
+        "brain_coverage": 0,
+    }
+
+    again, statements = _count_statements(lambda: _metrics(db_session, biz.id))
+    assert again == first
+    assert statements <= 3  # business lookup, seed fingerprint, stats row
+
+
+def test_incremental_counters_match_rebuild(db_session, brain_store, monkeypatch):
+    biz, category = _setup(db_session)
+    raw_event_service.insert_raw_events(db_session, _events(biz.id, "a", ["SYSCO 1", "MYSTERY CO"]))
+    _metrics(db_session, biz.id)  # builds the row
+
+    # ingest: +3 events, 2 of them covered by the sysco rule
+    raw_event_service.insert_raw_events(db_session, _events(biz.id, "b", ["SYSCO 3", "SYSCO 4", "OTHER LLC"]))
+    after_ingest = _metrics(db_session, biz.id)
+    assert after_ingest["total_events"] == 5
+    assert after_ingest["suggestion_coverage"] == 3
+
+    # posting: every sysco event leaves the uncategorized pool
+    bulk_apply_categorization(biz.id, BulkCategorizationIn(merchant_key="SYSCO", category_id=category.id), db_session)
+    after_post = _metrics(db_session, biz.id)
+    assert after_post["posted"] == 3
+    assert after_post["uncategorized"] == 2
+    assert after_post["suggestion_coverage"] == 0
+    assert after_post == _rebuilt(db_session, biz.id)
+
+    # brain label change: coverage adjusted in place, no full recompute on read
+    set_brain_vendor(
+        biz.id,
+        BrainVendorSetIn(merchant_key="MYSTERY CO", category_id=category.id, canonical_name="Mystery"),
+        db_session,
+    )
+    with monkeypatch.context() as m:
+        m.setattr(categorization_stats_service, "_refresh_coverage", None)
+        after_brain = _metrics(db_session, biz.id)
+    assert after_brain["brain_coverage"] == 1
+    assert after_brain["suggestion_coverage"] == 1
+    assert after_brain == _rebuilt(db_session, biz.id)
+
+    # rule write bumps rules_version: coverage recomputed on next read
+    db_session.add(
+        CategoryRule(business_id=biz.id, category_id=category.id, contains_text="other", priority=5, active=True)
+    )
+    categorize_service.bump_rules_version(db_session, biz.id)
+    db_session.commit()
+    assert _metrics(db_session, biz.id)["suggestion_coverage"] == 2
+
+    assert categorization_stats_service.reconcile_all(db_session) == {}
+
+
+def test_ingest_defers_coverage_to_the_next_read(db_session, brain_store, monkeypatch):
+    biz, category = _setup(db_session)
+    raw_event_service.insert_raw_events(db_session, _events(biz.id, "a", ["SYSCO 1", "MYSTERY CO"]))
+    assert _metrics(db_session, biz.id)["suggestion_coverage"] == 1
+
+    def _no_suggestions(*args, **kwargs):
+        raise AssertionError("ingest ran suggestions")
+
+    with monkeypatch.context() as m:
+        m.setattr(categorization_stats_service, "_covered", _no_suggestions)
+        raw_event_service.insert_raw_events(
+            db_session, _events(biz.id, "b", ["SYSCO 3", "SYSCO 4", "BLUE BOTTLE COFFEE"])
+        )
+
+    # pending (not yet counted) rows are posted and labeled before any read
+    bulk_apply_categorization(biz.id, BulkCategorizationIn(merchant_key="SYSCO", category_id=category.id), db_session)
+    set_brain_vendor(biz.id, BrainVendorSetIn(merchant_key="BLUE BOTTLE COFFEE", category_id=category.id), db_session)
+
+    folded = _metrics(db_session, biz.id)
+    assert folded["total_events"] == 5
+    assert folded["posted"] == 3
+    assert folded["suggestion_coverage"] == 1  # only the brain-labeled pending row
+    assert folded == _rebuilt(db_session, biz.id)
+
+
+def test_rebuild_leaves_the_callers_transaction_open(db_session, brain_store):
+    biz, _category = _setup(db_session)
+    raw_event_service.insert_raw_events(db_session, _events(biz.id, "a", ["SYSCO 1", "MYSTERY CO"]))
+    assert _metrics(db_session, biz.id)["total_events"] == 2
+
+    # pending caller changes, with the normalized projection out of sync
+    biz.name = "Renamed, not committed"
+    db_session.add(
+        RawEvent(
+            business_id=biz.id,
+            source="bank",
+            source_event_id="late-1",
+            occurred_at=datetime(2024, 3, 1, 12, 0, tzinfo=timezone.utc),
+            payload={"type": "transaction.posted", "transaction": {"transaction_id": "late-1", "amount": -5.0, "name": "X"}},
+        )
+    )
+    db_session.flush()
+    row = categorization_stats_service.rebuild(db_session, biz.id)
+    assert row.total_events == 2  # counts normalized rows; normalizing is the caller's job
+    db_session.rollback()
+    assert db_session.get(Business, biz.id).name != "Renamed, not committed"
+    assert _metrics(db_session, biz.id)["total_events"] == 2
+
+
+def test_brain_change_adjusts_coverage_for_fuzzy_matches(db_session, brain_store, monkeypatch):
+    biz, category = _setup(db_session)
+    raw_event_service.insert_raw_events(
+        db_session, _events(biz.id, "a", ["BLUE BOTTLE COFEE", "BLUE BOTTLE COFFEE", "ACME LLC", "SYSCO 1"])
+    )
+    assert _metrics(db_session, biz.id)["suggestion_coverage"] == 1
+
+    def _full_scan(*args, **kwargs):
+        raise AssertionError("brain change forced a full coverage recompute")
+
+    monkeypatch.setattr(categorization_stats_service, "_refresh_coverage", _full_scan)
+    set_brain_vendor(biz.id, BrainVendorSetIn(merchant_key="BLUE BOTTLE COFFEE", category_id=category.id), db_session)
+    assert _metrics(db_session, biz.id)["suggestion_coverage"] == 3  # exact + fuzzy
+
+    forget_brain_vendor(biz.id, BrainVendorForgetIn(merchant_key="BLUE BOTTLE COFFEE"), db_session)
+    forgotten = _metrics(db_session, biz.id)
+    assert forgotten["suggestion_coverage"] == 1
+    assert forgotten["brain_coverage"] == 0
+
+    monkeypatch.undo()
+    set_brain_vendor(biz.id, BrainVendorSetIn(merchant_key="BLUE BOTTLE COFFEE", category_id=category.id), db_session)
+    assert _metrics(db_session, biz.id) == _rebuilt(db_session, biz.id)
+
+
+def test_sim_history_folds_into_the_stats_row(db_session, brain_store):
+    from backend.app.api.routes.sim import GenerateIn
+    from backend.app.services import sim_service
+
+    biz, _category = _setup(db_session)
+    raw_event_service.insert_raw_events(db_session, _events(biz.id, "a", ["SYSCO 1", "MYSTERY CO"]))
+    _metrics(db_session, biz.id)
+
+    out = sim_service.generate_history(db_session, biz.id, GenerateIn(start_date="2024-03-01", days=5, events_per_day=4))
+    assert out["inserted"] > 0
+    row = db_session.get(categorization_stats_service.CategorizationStats, biz.id)
+    assert row is not None  # counted in place, not dropped for a rebuild
+    assert row.total_events == 2 + out["inserted"]
+    assert _metrics(db_session, biz.id) == _rebuilt(db_session, biz.id)
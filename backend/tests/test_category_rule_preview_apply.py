@@ -3,6 +3,7 @@ import os
 import sys
 from pathlib import Path
 
+from fastapi import BackgroundTasks
 import pytest
 
 sys.path.append(str(Path(__file__).resolve().parents[2]))
@@ -17,10 +18,18 @@ from backend.app.models import (
     Category,
     BusinessCategoryMap,
     CategoryRule,
+    CategoryRuleApplyJob,
     RawEvent,
     TxnCategorization,
+    utcnow,
 )
-from backend.app.services.categorize_service import preview_category_rule, apply_category_rule
+from backend.app.api.routes.categorize import (
+    apply_category_rule,
+    get_category_rule_apply_job,
+    preview_all_category_rules,
+)
+from backend.app.services import categorize_service
+from backend.app.services.categorize_service import preview_category_rule
 
 
 @pytest.fixture()
@@ -90,6 +99,15 @@ def _make_event(business_id: str, source_event_id: str, description: str):
     )
 
 
+def _apply_via_job(db_session, business_id: str, rule_id: str):
+    job = categorize_service.start_rule_apply_job(db_session, business_id, rule_id)
+    categorize_service.run_rule_apply_job(job["job_id"])
+    db_session.expire_all()
+    out = categorize_service.get_rule_apply_job(db_session, business_id, job["job_id"])
+    assert out["status"] == "succeeded", out["error"]
+    return out
+
+
 def test_preview_category_rule_returns_samples_and_count(db_session):
     biz = _create_business(db_session)
     category = _create_category(db_session, biz.id, "Utilities", "utilities")
@@ -195,7 +213,7 @@ def test_apply_rule_skips_existing_categorizations_and_updates_run_metadata(db_s
     )
     db_session.commit()
 
-    res = apply_category_rule(db_session, biz.id, rule.id)
+    res = _apply_via_job(db_session, biz.id, rule.id)
     assert res["matched"] == 1
     assert res["updated"] == 1
 
@@ -213,3 +231,194 @@ def test_apply_rule_skips_existing_categorizations_and_updates_run_metadata(db_s
     )
     assert updated.last_run_at is not None
     assert updated.last_run_updated_count == 1
+
+
+def _make_history(db_session, business_id: str, n: int, description: str):
+    start = datetime(2021, 1, 1, 12, 0, tzinfo=timezone.utc)
+    for i in range(n):
+        ev = _make_event(business_id, f"evt_hist_{i:04d}", description)
+        ev.occurred_at = start + timedelta(days=i)
+        db_session.add(ev)
+
+
+def test_apply_rule_covers_full_history_in_chunks(db_session, monkeypatch):
+    biz = _create_business(db_session)
+    category = _create_category(db_session, biz.id, "Meals", "meals")
+    rule = CategoryRule(business_id=biz.id, category_id=category.id, contains_text="taco", priority=1, active=True)
+    db_session.add(rule)
+    _make_history(db_session, biz.id, 23, "Taco Spot")
+    db_session.add(_make_event(biz.id, "evt_other", "Hardware Store"))
+    db_session.commit()
+
+    monkeypatch.setattr(categorize_service, "_APPLY_CHUNK", 5)
+
+    res = _apply_via_job(db_session, biz.id, rule.id)
+    assert (res["rule_id"], res["matched"], res["updated"]) == (rule.id, 23, 23)
+    assert db_session.query(TxnCategorization).filter(TxnCategorization.business_id == biz.id).count() == 23
+
+    # re-run: everything already categorized
+    again = _apply_via_job(db_session, biz.id, rule.id)
+    assert again["updated"] == 0
+    db_session.expire_all()
+    assert db_session.get(CategoryRule, rule.id).last_run_updated_count == 0
+
+
+def test_apply_rule_job_reports_progress_and_total(db_session):
+    biz = _create_business(db_session)
+    category = _create_category(db_session, biz.id, "Meals", "meals")
+    rule = CategoryRule(business_id=biz.id, category_id=category.id, contains_text="taco", priority=1, active=True)
+    db_session.add(rule)
+    _make_history(db_session, biz.id, 12, "Taco Spot")
+    db_session.commit()
+
+    tasks = BackgroundTasks()
+    job = apply_category_rule(biz.id, rule.id, tasks, db=db_session)
+    assert job.status == "queued"
+    assert len(tasks.tasks) == 1
+
+    categorize_service.run_rule_apply_job(job.job_id)
+
+    db_session.expire_all()
+    done = get_category_rule_apply_job(biz.id, job.job_id, db=db_session)
+    assert done.status == "succeeded"
+    assert (done.scanned, done.matched, done.updated) == (12, 12, 12)
+    assert done.started_at is not None and done.finished_at is not None
+    assert db_session.get(CategoryRule, rule.id).last_run_updated_count == 12
+
+
+def test_apply_rule_job_records_failure(db_session, monkeypatch):
+    biz = _create_business(db_session)
+    category = _create_category(db_session, biz.id, "Meals", "meals")
+    rule = CategoryRule(business_id=biz.id, category_id=category.id, contains_text="taco", priority=1, active=True)
+    db_session.add(rule)
+    db_session.commit()
+
+    def _boom(*args, **kwargs):
+        raise RuntimeError("db went away")
+
+    monkeypatch.setattr(categorize_service, "_run_rule_apply", _boom)
+    job = categorize_service.start_rule_apply_job(db_session, biz.id, rule.id)
+    categorize_service.run_rule_apply_job(job["job_id"])
+
+    db_session.expire_all()
+    out = categorize_service.get_rule_apply_job(db_session, biz.id, job["job_id"])
+    assert out["status"] == "failed"
+    assert out["error"] == "db went away"
+
+
+def test_preview_all_rules_single_pass_reports_shadowed(db_session, monkeypatch):
+    biz = _create_business(db_session)
+    meals = _create_category(db_session, biz.id, "Meals", "meals")
+    travel = _create_category(db_session, biz.id, "Travel", "travel")
+
+    taco = CategoryRule(business_id=biz.id, category_id=meals.id, contains_text="taco", priority=1, active=True)
+    taco_truck = CategoryRule(
+        business_id=biz.id, category_id=travel.id, contains_text="taco truck", priority=5, active=True
+    )
+    hotel = CategoryRule(business_id=biz.id, category_id=travel.id, contains_text="hotel", priority=2, active=True)
+    unused = CategoryRule(business_id=biz.id, category_id=travel.id, contains_text="airline", priority=3, active=True)
+    db_session.add_all([taco, taco_truck, hotel, unused])
+    db_session.add(_make_event(biz.id, "evt_1", "Taco Truck 12"))
+    db_session.add(_make_event(biz.id, "evt_2", "Taco Spot"))
+    db_session.add(_make_event(biz.id, "evt_3", "Grand Hotel"))
+    db_session.add(_make_event(biz.id, "evt_4", "Hardware Store"))
+    db_session.add(_make_event(biz.id, "evt_5", "Taco Truck 7"))
+    db_session.add(
+        TxnCategorization(
+            business_id=biz.id,
+            source_event_id="evt_5",
+            category_id=travel.id,
+            source="manual",
+            confidence=1.0,
+            note=None,
+        )
+    )
+    db_session.commit()
+
+    expected = {r.id: preview_category_rule(db_session, biz.id, r.id)["matched"] for r in (taco, taco_truck, hotel, unused)}
+
+    evaluated = []
+    real_iter = categorize_service.CompiledRules.iter_matches
+
+    def _iter(self, description, direction, account):
+        evaluated.append(description)
+        return real_iter(self, description, direction, account)
+
+    monkeypatch.setattr(categorize_service.CompiledRules, "iter_matches", _iter)
+    res = preview_all_category_rules(biz.id, sample_limit=1, db=db_session)
+
+    assert sorted(evaluated) == sorted(["Taco Truck 12", "Taco Spot", "Grand Hotel", "Hardware Store"])
+    assert (res.scanned, res.matched) == (4, 3)
+
+    by_id = {r.rule_id: r for r in res.rules}
+    assert {rid: r.matched for rid, r in by_id.items()} == expected
+    assert [r.rule_id for r in res.rules] == [taco.id, hotel.id, unused.id, taco_truck.id]
+    assert len(by_id[taco.id].samples) == 1
+
+    assert res.shadowed_rule_ids == [taco_truck.id]
+    assert by_id[taco_truck.id].candidates == 1
+    assert by_id[taco_truck.id].shadowed_by == [taco.id]
+    assert not by_id[unused.id].shadowed
+
+
+def test_apply_rule_returns_the_rules_active_job(db_session):
+    biz = _create_business(db_session)
+    category = _create_category(db_session, biz.id, "Meals", "meals")
+    rule = CategoryRule(business_id=biz.id, category_id=category.id, contains_text="taco", priority=1, active=True)
+    db_session.add(rule)
+    _make_history(db_session, biz.id, 3, "Taco Spot")
+    db_session.commit()
+
+    tasks = BackgroundTasks()
+    first = apply_category_rule(biz.id, rule.id, tasks, db=db_session)
+    second = apply_category_rule(biz.id, rule.id, tasks, db=db_session)
+    assert second.job_id == first.job_id
+
+    # both scheduled runs race for the same job; only the first claims it
+    for task in tasks.tasks:
+        task.func(*task.args, **task.kwargs)
+    db_session.expire_all()
+    done = categorize_service.get_rule_apply_job(db_session, biz.id, first.job_id)
+    assert done["status"] == "succeeded"
+    assert done["updated"] == 3
+
+    # a finished job is not reused
+    third = categorize_service.start_rule_apply_job(db_session, biz.id, rule.id)
+    assert third["job_id"] != first.job_id
+    assert third["status"] == "queued"
+
+
+def test_interrupted_apply_jobs_are_failed_not_left_running(db_session):
+    biz = _create_business(db_session)
+    category = _create_category(db_session, biz.id, "Meals", "meals")
+    rule = CategoryRule(business_id=biz.id, category_id=category.id, contains_text="taco", priority=1, active=True)
+    db_session.add(rule)
+    _make_history(db_session, biz.id, 3, "Taco Spot")
+    db_session.commit()
+
+    long_ago = utcnow() - timedelta(hours=1)
+    dead = CategoryRuleApplyJob(
+        business_id=biz.id, rule_id=rule.id, status="running", started_at=long_ago, updated_at=long_ago
+    )
+    live = CategoryRuleApplyJob(business_id=biz.id, rule_id=rule.id, status="running", started_at=utcnow())
+    db_session.add_all([dead, live])
+    db_session.commit()
+
+    # startup sweep: only the job that stopped making progress is failed
+    assert categorize_service.fail_stale_rule_apply_jobs(db_session) == 1
+    db_session.expire_all()
+    assert db_session.get(CategoryRuleApplyJob, dead.id).status == "failed"
+    assert db_session.get(CategoryRuleApplyJob, live.id).status == "running"
+
+    # a poll sees the failure too, and a dead job no longer blocks a new run
+    db_session.get(CategoryRuleApplyJob, live.id).updated_at = long_ago
+    db_session.commit()
+    polled = categorize_service.get_rule_apply_job(db_session, biz.id, live.id)
+    assert polled["status"] == "failed"
+    assert polled["error"] == "interrupted: worker stopped"
+
+    fresh = categorize_service.start_rule_apply_job(db_session, biz.id, rule.id)
+    assert fresh["job_id"] not in (dead.id, live.id)
+    categorize_service.run_rule_apply_job(fresh["job_id"])
+    db_session.expire_all()
+    assert categorize_service.get_rule_apply_job(db_session, biz.id, fresh["job_id"])["updated"] == 3
@@ -0,0 +1,122 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import delete, event, select
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_category_seed.db")
+
+from backend.app.db import Base, SessionLocal, engine
+from backend.app.sim import models as sim_models  # noqa: F401
+from backend.app.models import Business, BusinessCategoryMap, Category, Organization
+from backend.app.api.routes.admin import repair_business_seed
+from backend.app.api.routes.coa import AccountCreateIn, create_account
+from backend.app.services.category_seed import seed_coa_and_categories_and_mappings, seed_is_current
+
+
+@pytest.fixture()
+def db_session():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+def _create_business(db_session):
+    org = Organization(name="Seed Org")
+    db_session.add(org)
+    db_session.flush()
+    biz = Business(org_id=org.id, name="Seed Biz")
+    db_session.add(biz)
+    db_session.commit()
+    return biz
+
+
+def _count_statements(fn):
+    statements = []
+
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _before)
+    try:
+        fn()
+    finally:
+        event.remove(engine, "before_cursor_execute", _before)
+    return len(statements)
+
+
+def _mapping_count(db_session, business_id):
+    return len(
+        db_session.execute(
+            select(BusinessCategoryMap.id).where(BusinessCategoryMap.business_id == business_id)
+        ).all()
+    )
+
+
+def test_seeded_business_skips_full_seed(db_session):
+    biz = _create_business(db_session)
+    assert not seed_is_current(db_session, biz.id)
+
+    seed_coa_and_categories_and_mappings(db_session, biz.id)
+    assert seed_is_current(db_session, biz.id)
+    assert _mapping_count(db_session, biz.id) > 0
+
+    n = _count_statements(lambda: seed_coa_and_categories_and_mappings(db_session, biz.id))
+    assert n == 1
+
+
+def test_unchanged_full_seed_leaves_caller_transaction_alone(db_session):
+    biz = _create_business(db_session)
+    seed_coa_and_categories_and_mappings(db_session, biz.id)
+
+    db_session.add(Organization(name="Pending Org"))
+    db_session.flush()
+    seed_coa_and_categories_and_mappings(db_session, biz.id, force=True)
+    db_session.rollback()
+
+    names = db_session.execute(select(Organization.name)).scalars().all()
+    assert "Pending Org" not in names
+    assert seed_is_current(db_session, biz.id)
+
+
+def test_coa_mutation_triggers_reseed(db_session):
+    biz = _create_business(db_session)
+    seed_coa_and_categories_and_mappings(db_session, biz.id)
+    before = _mapping_count(db_session, biz.id)
+
+    create_account(
+        biz.id,
+        AccountCreateIn(code="6999", name="Equipment Rental", type="expense"),
+        db=db_session,
+    )
+    assert not seed_is_current(db_session, biz.id)
+
+    seed_coa_and_categories_and_mappings(db_session, biz.id)
+    assert seed_is_current(db_session, biz.id)
+    assert _mapping_count(db_session, biz.id) == before + 1
+    names = db_session.execute(select(Category.name).where(Category.business_id == biz.id)).scalars().all()
+    assert "Equipment Rental" in names
+
+
+def test_repair_endpoint_restores_out_of_band_deletes(db_session):
+    biz = _create_business(db_session)
+    seed_coa_and_categories_and_mappings(db_session, biz.id)
+    before = _mapping_count(db_session, biz.id)
+
+    # direct DB edit: the fingerprint cannot see it, so the fast path skips
+    db_session.execute(delete(BusinessCategoryMap).where(BusinessCategoryMap.business_id == biz.id))
+    db_session.commit()
+    seed_coa_and_categories_and_mappings(db_session, biz.id)
+    assert _mapping_count(db_session, biz.id) == 0
+
+    res = repair_business_seed(biz.id, db=db_session)
+    assert res["status"] == "ok"
+    assert _mapping_count(db_session, biz.id) == before
+    assert seed_is_current(db_session, biz.id)
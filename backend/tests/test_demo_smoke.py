@@ -21,6 +21,7 @@ from backend.app.models import (
     BusinessCategoryMap,
     CategoryRule,
 )
+from backend.app.norma.categorize_brain import brain
 
 
 @pytest.fixture()
@@ -35,6 +36,14 @@ def db_session():
         Base.metadata.drop_all(bind=engine)
 
 
+@pytest.fixture(autouse=True)
+def brain_store(tmp_path):
+    # demo reads suggest categories through the brain: keep it out of the source tree
+    previous = brain.reopen(tmp_path / "brain.db")
+    yield brain
+    brain.reopen(previous)
+
+
 @pytest.fixture()
 def client(db_session):
     return TestClient(app)
@@ -188,16 +197,20 @@ def test_rule_preview_apply_handles_missing_last_run_columns(client, db_session)
     biz = _create_business(db_session)
     db_session.add(_make_event(biz.id, "evt-1", "Coffee Shop", -12.34))
     rule = _create_category_rule(db_session, biz.id)
+    biz_id, rule_id = biz.id, rule.id  # the ORM rows can't be refreshed once the columns are gone
     db_session.commit()
 
     _drop_rule_run_columns(db_session)
 
-    preview = client.get(f"/categorize/{biz.id}/rules/{rule.id}/preview")
+    preview = client.get(f"/categorize/{biz_id}/rules/{rule_id}/preview")
     assert preview.status_code == 200
     assert "matched" in preview.json()
 
-    applied = client.post(f"/categorize/{biz.id}/rules/{rule.id}/apply")
-    assert applied.status_code == 200
+    applied = client.post(f"/categorize/{biz_id}/rules/{rule_id}/apply")
+    assert applied.status_code == 202
+    job = client.get(f"/categorize/{biz_id}/rules/apply_jobs/{applied.json()['job_id']}").json()
+    assert job["status"] == "succeeded", job["error"]
+    assert job["updated"] == 1
 
 
 def test_demo_dashboard_payload_ordering(client, db_session):
@@ -229,3 +242,115 @@ def test_demo_dashboard_payload_ordering(client, db_session):
     assert signals
     sorted_signals = sorted(signals, key=lambda s: (-int(s["priority"]), str(s["key"])))
     assert signals == sorted_signals
+
+
+def test_health_pipeline_cached_until_new_events(client, db_session):
+    from backend.app.services import health_pipeline_service
+
+    biz = _create_business(db_session)
+    db_session.add(_make_event(biz.id, "evt-1", "Coffee Shop", -120.0))
+    db_session.add(_make_event(biz.id, "evt-2", "Client Payment", 500.0))
+    db_session.commit()
+
+    def strip_clock(payload):
+        # as_of and the signal states' last_seen_at move on every request
+        out = {k: v for k, v in payload.items() if k not in ("as_of", "health_signals")}
+        out["health_signals"] = [(s["id"], s["severity"], s.get("evidence")) for s in payload["health_signals"]]
+        return out
+
+    first = client.get(f"/demo/health/{biz.id}").json()
+    before = health_pipeline_service.cache_info()
+    second = client.get(f"/demo/health/{biz.id}").json()
+    assert strip_clock(second) == strip_clock(first)  # cached results are not mutated by readers
+    assert client.get(f"/brief/business/{biz.id}").status_code == 200  # same (business, limit) entry
+    after = health_pipeline_service.cache_info()
+    assert (after["hits"] - before["hits"], after["misses"] - before["misses"]) == (2, 0)
+
+    # one new event: the very next request recomputes
+    db_session.add(_make_event(biz.id, "evt-3", "Client Payment", 1000.0))
+    db_session.commit()
+    third = client.get(f"/demo/health/{biz.id}").json()
+    assert health_pipeline_service.cache_info()["misses"] == after["misses"] + 1
+    assert third["facts"]["current_cash"] == first["facts"]["current_cash"] + 1000.0
+
+
+def test_health_pipeline_recomputes_once_after_normalizer_bump(client, db_session, monkeypatch):
+    from backend.app.services import health_pipeline_service, normalized_txn_service
+
+    biz = _create_business(db_session)
+    db_session.add(_make_event(biz.id, "evt-1", "Coffee Shop", -120.0))
+    db_session.add(_make_event(biz.id, "evt-2", "Client Payment", 500.0))
+    db_session.commit()
+    assert client.get(f"/demo/health/{biz.id}").status_code == 200
+
+    bumped = normalized_txn_service.NORMALIZER_VERSION + 1
+    monkeypatch.setattr(normalized_txn_service, "NORMALIZER_VERSION", bumped)
+    monkeypatch.setattr(health_pipeline_service, "NORMALIZER_VERSION", bumped)
+
+    # the re-normalization is committed and does not move the event watermark
+    before = health_pipeline_service.cache_info()
+    client.get(f"/demo/health/{biz.id}")
+    client.get(f"/demo/health/{biz.id}")
+    after = health_pipeline_service.cache_info()
+    assert (after["hits"] - before["hits"], after["misses"] - before["misses"]) == (1, 1)
+
+
+def test_dashboard_reads_snapshots_and_flags_stale(client, db_session):
+    biz = _create_business(db_session)
+    db_session.add(_make_event(biz.id, "evt-1", "Coffee Shop", -120.0))
+    db_session.add(_make_event(biz.id, "evt-2", "Client Payment", 500.0))
+    db_session.commit()
+
+    # no snapshot yet: flagged, and refreshed by the response's background task
+    first = client.get("/demo/dashboard").json()
+    assert first["total"] == 1
+    assert first["cards"][0]["stale"] is True
+    assert first["cards"][0]["health_score"] is None
+
+    second = client.get("/demo/dashboard").json()
+    card = second["cards"][0]
+    assert card["stale"] is False
+    assert card["risk"] in ("green", "yellow", "red")
+    assert card["computed_at"]
+    health = client.get(f"/demo/health/{biz.id}").json()
+    assert (card["health_score"], card["risk"]) == (health["health_score"], health["risk"])
+
+    # ingest bumps the business's data_version: the card is flagged stale
+    ev = _make_event(biz.id, "evt-3", "Client Payment", 1000.0)
+    resp = client.post(
+        "/raw_events",
+        json={
+            "business_id": biz.id,
+            "source": ev.source,
+            "source_event_id": ev.source_event_id,
+            "occurred_at": ev.occurred_at.isoformat(),
+            "payload": ev.payload,
+        },
+    )
+    assert resp.json()["status"] == "ok"
+    assert client.get("/demo/dashboard").json()["cards"][0]["stale"] is True
+    assert client.get("/demo/dashboard").json()["cards"][0]["stale"] is False
+
+
+def test_dashboard_pagination_and_sort(client, db_session):
+    from backend.app.services import health_snapshot_service
+
+    ids = []
+    for i, name in enumerate(["Bravo", "Alpha", "Charlie"]):
+        biz = _create_business(db_session)
+        biz.name = name
+        db_session.add(_make_event(biz.id, f"evt-{i}", "Client Payment", 100.0 * (i + 1)))
+        ids.append(biz.id)
+    db_session.commit()
+    assert sorted(health_snapshot_service.refresh_stale_snapshots(db_session)) == sorted(ids)
+    assert health_snapshot_service.stale_business_ids(db_session) == []
+
+    page = client.get("/demo/dashboard", params={"sort": "name", "order": "asc", "limit": 2}).json()
+    assert [c["name"] for c in page["cards"]] == ["Alpha", "Bravo"]
+    assert page["total"] == 3
+    page = client.get("/demo/dashboard", params={"sort": "name", "order": "asc", "limit": 2, "offset": 2}).json()
+    assert [c["name"] for c in page["cards"]] == ["Charlie"]
+
+    scores = [c["health_score"] for c in client.get("/demo/dashboard", params={"sort": "health_score"}).json()["cards"]]
+    assert scores == sorted(scores, reverse=True)
+    assert client.get("/demo/dashboard", params={"sort": "bogus"}).status_code == 422
@@ -0,0 +1,96 @@
+from datetime import date, datetime, timedelta, timezone
+import math
+
+import pytest
+
+from backend.app.analytics.downsample import bucket_points, lttb
+
+
+def _ts(d: date) -> datetime:
+    return datetime(d.year, d.month, d.day, tzinfo=timezone.utc)
+
+
+def _series(values, start=date(2024, 1, 1)):
+    return [{"occurred_at": _ts(start + timedelta(days=i)), "balance": float(v)} for i, v in enumerate(values)]
+
+
+def test_bucket_points_month_close_min_max():
+    points = _series([10, 5, 20, 15], start=date(2024, 1, 30))  # Jan 30, Jan 31, Feb 1, Feb 2
+    out = list(bucket_points(points, "month", make_ts=_ts))
+    assert out == [
+        {"occurred_at": _ts(date(2024, 1, 1)), "balance": 5.0, "min_balance": 5.0, "max_balance": 10.0},
+        {"occurred_at": _ts(date(2024, 2, 1)), "balance": 15.0, "min_balance": 15.0, "max_balance": 20.0},
+    ]
+
+
+def test_bucket_points_week_starts_monday():
+    points = _series([1, 2, 3], start=date(2024, 1, 7))  # Sun, Mon, Tue
+    out = list(bucket_points(points, "week", make_ts=_ts))
+    assert [p["occurred_at"].date() for p in out] == [date(2024, 1, 1), date(2024, 1, 8)]
+    assert [p["balance"] for p in out] == [1.0, 3.0]
+
+
+def test_lttb_bounds_size_and_keeps_endpoints_and_spike():
+    values = [math.sin(i / 10.0) * 100 for i in range(1000)]
+    values[500] = 5000.0
+    points = _series(values)
+
+    out = lttb(points, 50)
+
+    assert len(out) == 50
+    assert out[0] is points[0]
+    assert out[-1] is points[-1]
+    assert any(p["balance"] == 5000.0 for p in out)
+    assert [p["occurred_at"] for p in out] == sorted(p["occurred_at"] for p in out)
+
+
+class _Live(dict):
+    """Point that counts how many instances are alive at once."""
+
+    live = peak = 0
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        _Live.live += 1
+        _Live.peak = max(_Live.peak, _Live.live)
+
+    def __del__(self):
+        _Live.live -= 1
+
+
+def test_lttb_streams_with_bounded_memory():
+    n, max_points = 20_000, 50
+    values = [math.sin(i / 50.0) * 100 for i in range(n)]
+    values[12_345] = -5000.0
+    start = _ts(date(2000, 1, 1))
+
+    def stream():
+        for i, v in enumerate(values):
+            yield _Live(occurred_at=start + timedelta(days=i), balance=v)
+
+    _Live.live = _Live.peak = 0
+    out = lttb(stream(), max_points, n=n)
+
+    # two buckets of ~n/max_points points plus the output, never the whole series
+    assert _Live.peak <= 2 * n / (max_points - 2) + max_points + 4
+    assert [(p["occurred_at"], p["balance"]) for p in out] == [
+        (p["occurred_at"], p["balance"]) for p in lttb(list(stream()), max_points)
+    ]
+    assert any(p["balance"] == -5000.0 for p in out)
+
+
+def test_lttb_stream_length_mismatch():
+    points = _series(range(100))
+    assert lttb(iter(points + _series([7], start=date(2024, 6, 1))), 10, n=100)[-1]["balance"] == 7.0
+    with pytest.raises(ValueError):
+        lttb(iter(points[:50]), 10, n=100)
+
+
+def test_lttb_passthrough_when_small():
+    points = _series([1, 2, 3])
+    assert lttb(points, 10) == points
+
+
+def test_lttb_rejects_fewer_than_three_points():
+    with pytest.raises(ValueError):
+        lttb(_series(range(10)), 2)
@@ -1,8 +1,10 @@
 from datetime import date, datetime, timezone
 
+from backend.app.clarity import health_v1
 from backend.app.clarity.health_v1 import build_health_v1_signals
 from backend.app.norma.facts import compute_facts, facts_to_dict
 from backend.app.norma.ledger import build_cash_ledger
+from backend.app.norma.merchant import merchant_key
 from backend.app.norma.normalize import NormalizedTransaction
 
 
@@ -168,3 +170,24 @@ def test_health_v1_signal_ordering_unchanged():
         "rule_coverage_low",
         "overdraft_pattern",
     ]
+
+
+def test_health_v1_persisted_merchant_keys_match_computed(monkeypatch):
+    txns, ledger_rows, facts_json, metrics, is_known_vendor = _build_inputs()
+    kwargs = dict(
+        facts_json=facts_json,
+        ledger_rows=ledger_rows,
+        txns=txns,
+        updated_at=date(2024, 2, 20).isoformat(),
+        categorization_metrics=metrics,
+        rule_count=1,
+        is_known_vendor=is_known_vendor,
+    )
+    computed = build_health_v1_signals(**kwargs)
+    persisted = {t.source_event_id: merchant_key(t.description) for t in txns}
+
+    def _no_recompute(_description):
+        raise AssertionError("merchant_key recomputed despite persisted keys")
+
+    monkeypatch.setattr(health_v1, "merchant_key", _no_recompute)
+    assert build_health_v1_signals(**kwargs, merchant_keys=persisted) == computed
@@ -0,0 +1,112 @@
+from datetime import datetime, timezone
+import os
+from pathlib import Path
+import sys
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_heuristic_keywords.db")
+
+from backend.app.norma.categorize import categorize_txn
+from backend.app.norma.category_engine import _vendor_keyword_suggest
+from backend.app.norma.normalize import NormalizedTransaction
+
+_RULE_REASONS = {
+    "payroll": "Matched payroll keyword/merchant in description",
+    "hosting": "Matched hosting keyword/merchant in description",
+    "rent": "Matched rent/lease keyword in description",
+    "uncategorized": "No rule match; needs review",
+}
+
+# Outputs of the hand-written keyword chains, pinned before they became a table:
+# (description, categorize_txn (category, confidence), _vendor_keyword_suggest (category, confidence, reason))
+PINNED = [
+    ('GUSTO PAYROLL 1234', ('payroll', 0.92), None),
+    ('ADP WAGE PAY', ('payroll', 0.92), None),
+    ('Paychex Inc', ('payroll', 0.92), None),
+    ('INTUIT PAYROLL SVCS', ('payroll', 0.92), None),
+    ('AWS EMEA', ('hosting', 0.88), None),
+    ('Amazon Web Services', ('hosting', 0.88), None),
+    ('DigitalOcean.com', ('hosting', 0.88), None),
+    ('HEROKU*BILLING', ('hosting', 0.88), None),
+    ('RENDER.COM', ('hosting', 0.88), None),
+    ('Vercel Inc', ('hosting', 0.88), None),
+    ('NETLIFY', ('hosting', 0.88), None),
+    ('Monthly Rent - Suite 200', ('rent', 0.8), None),
+    ('Equipment LEASE', ('rent', 0.8), None),
+    ('Current Account Transfer', ('rent', 0.8), None),
+    ('Gusto rent', ('payroll', 0.92), None),
+    ('rent aws', ('hosting', 0.88), None),
+    ('COMCAST CABLE', ('uncategorized', 0.4), ('utilities', 0.78, "Matched vendor keyword 'comcast'")),
+    ('XFINITY MOBILE', ('uncategorized', 0.4), ('utilities', 0.78, "Matched vendor keyword 'xfinity'")),
+    ('VERIZON WRLS', ('uncategorized', 0.4), ('utilities', 0.7, "Matched vendor keyword 'verizon'")),
+    ('AT&T*BILL', ('uncategorized', 0.4), ('utilities', 0.7, "Matched vendor keyword 'at&t'")),
+    ('T-MOBILE', ('uncategorized', 0.4), ('utilities', 0.7, "Matched vendor keyword 't-mobile'")),
+    ('TMOBILE*AUTOPAY', ('uncategorized', 0.4), ('utilities', 0.7, "Matched vendor keyword 'tmobile'")),
+    ('ADOBE *CREATIVE', ('uncategorized', 0.4), ('software', 0.74, "Matched vendor keyword 'adobe'")),
+    ('Google Workspace', ('uncategorized', 0.4), ('software', 0.7, "Matched vendor keyword 'google workspace'")),
+    ('MICROSOFT*365', ('uncategorized', 0.4), ('software', 0.68, "Matched vendor keyword 'microsoft'")),
+    ('Dropbox', ('uncategorized', 0.4), ('software', 0.7, "Matched vendor keyword 'dropbox'")),
+    ('SLACK T0123', ('uncategorized', 0.4), ('software', 0.7, "Matched vendor keyword 'slack'")),
+    ('GITHUB INC', ('uncategorized', 0.4), ('software', 0.65, "Matched vendor keyword 'github'")),
+    ('ZOOM.US', ('uncategorized', 0.4), ('software', 0.65, "Matched vendor keyword 'zoom'")),
+    ('DOORDASH*DASHPASS', ('uncategorized', 0.4), ('meals', 0.72, "Matched vendor keyword 'doordash'")),
+    ('UBER EATS', ('uncategorized', 0.4), ('meals', 0.72, "Matched vendor keyword 'uber eats'")),
+    ('AIRBNB HMG', ('uncategorized', 0.4), ('travel', 0.72, "Matched vendor keyword 'airbnb'")),
+    ('DELTA AIR 006', ('uncategorized', 0.4), ('travel', 0.68, "Matched vendor keyword 'delta'")),
+    ('UNITED 016', ('uncategorized', 0.4), ('travel', 0.66, "Matched vendor keyword 'united'")),
+    ('Hilton Hotel', ('uncategorized', 0.4), ('travel', 0.6, "Matched keyword 'hotel'")),
+    ('LYFT RIDE', ('uncategorized', 0.4), ('travel', 0.58, "Matched vendor keyword 'lyft'")),
+    ('FACEBOOK ADS', ('uncategorized', 0.4), ('marketing', 0.7, "Matched vendor keyword 'facebook'")),
+    ('META PLATFORMS', ('uncategorized', 0.4), ('marketing', 0.62, "Matched vendor keyword 'meta'")),
+    ('GOOGLE ADS 123', ('uncategorized', 0.4), ('marketing', 0.72, "Matched vendor keyword 'google ads'")),
+    ('ADWORDS', ('uncategorized', 0.4), ('marketing', 0.7, "Matched vendor keyword 'adwords'")),
+    ('BANK FEE', ('uncategorized', 0.4), ('bank_fees', 0.72, "Matched keyword 'bank fee'")),
+    ('Monthly Service Fee', ('uncategorized', 0.4), ('bank_fees', 0.64, "Matched keyword 'service fee'")),
+    ('OVERDRAFT CHARGE', ('uncategorized', 0.4), ('bank_fees', 0.78, "Matched keyword 'overdraft'")),
+    ('united delta', ('uncategorized', 0.4), ('travel', 0.68, "Matched vendor keyword 'delta'")),
+    ('hotel airbnb', ('uncategorized', 0.4), ('travel', 0.72, "Matched vendor keyword 'airbnb'")),
+    ('metallica tickets', ('uncategorized', 0.4), ('marketing', 0.62, "Matched vendor keyword 'meta'")),
+    ('adobe and microsoft', ('uncategorized', 0.4), ('software', 0.74, "Matched vendor keyword 'adobe'")),
+    ('  ', ('uncategorized', 0.4), None),
+    ('', ('uncategorized', 0.4), None),
+    ('Blue Bottle Coffee', ('uncategorized', 0.4), None),
+    ('SYSCO FOODS', ('uncategorized', 0.4), None),
+    ('slack and comcast', ('uncategorized', 0.4), ('utilities', 0.78, "Matched vendor keyword 'comcast'")),
+    ('Facebook meta', ('uncategorized', 0.4), ('marketing', 0.7, "Matched vendor keyword 'facebook'")),
+]
+
+
+def _txn(description: str, category: str = "uncategorized") -> NormalizedTransaction:
+    ts = datetime(2024, 3, 1, 12, 0, tzinfo=timezone.utc)
+    return NormalizedTransaction(
+        id=None,
+        source_event_id="evt-1",
+        occurred_at=ts,
+        date=ts.date(),
+        description=description,
+        amount=25.0,
+        direction="outflow",
+        account="bank",
+        category=category,
+    )
+
+
+@pytest.mark.parametrize("description,rule,keyword", PINNED)
+def test_global_heuristics_match_pinned_outputs(description, rule, keyword):
+    cat = categorize_txn(_txn(description)).categorization
+    assert (cat.category, cat.confidence) == rule
+    assert (cat.source, cat.reason) == ("rule", _RULE_REASONS[cat.category])
+
+    kw = _vendor_keyword_suggest(description)
+    if keyword is None:
+        assert kw is None
+    else:
+        assert (kw.category, kw.confidence, kw.reason) == keyword
+        assert kw.source == "heuristic"
+
+
+def test_categorized_txn_passes_through():
+    txn = _txn("GUSTO PAYROLL", category="rent")
+    assert categorize_txn(txn) is txn
@@ -0,0 +1,101 @@
+from datetime import date, datetime, time, timedelta, timezone
+import math
+from pathlib import Path
+import random
+import sys
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from backend.app.norma.facts import compute_facts, facts_to_dict
+from backend.app.norma.incremental_facts import ExactSum, IncrementalFacts
+from backend.app.norma.ledger import build_cash_ledger
+from backend.app.norma.normalize import NormalizedTransaction
+
+_CATEGORIES = ["revenue", "payroll", "rent", "software", "meals", "uncategorized", ""]
+_DESCRIPTIONS = ["Client Payment", "Gusto Payroll", "Office Rent", "Adobe", "Doordash", "Deposit"]
+
+
+def _txn(i: int, day: date, amount: float, direction: str, *, category: str = "revenue", description: str = "Deposit"):
+    occurred_at = datetime.combine(day, time(hour=i % 24, minute=i % 60), tzinfo=timezone.utc)
+    return NormalizedTransaction(
+        id=None,
+        source_event_id=f"evt-{i}",
+        occurred_at=occurred_at,
+        date=day,
+        description=description,
+        amount=amount,
+        direction=direction,
+        account="checking",
+        category=category,
+    )
+
+
+def _random_txns(rng: random.Random, n: int):
+    start = date(2024, 1, 1)
+    return [
+        _txn(
+            i,
+            start + timedelta(days=rng.randrange(400)),
+            round(rng.uniform(0, 5000), 2),
+            rng.choice(["inflow", "outflow"]),
+            category=rng.choice(_CATEGORIES),
+            description=rng.choice(_DESCRIPTIONS),
+        )
+        for i in range(n)
+    ]
+
+
+def _batch_facts(txns):
+    return facts_to_dict(compute_facts(txns, build_cash_ledger(txns, opening_balance=0.0)))
+
+
+@pytest.mark.parametrize("seed", range(25))
+def test_incremental_matches_batch_compute_facts(seed):
+    rng = random.Random(seed)
+    txns = _random_txns(rng, rng.randrange(1, 300))
+    rng.shuffle(txns)  # arrival order != date order: late deposits land behind the anchor
+
+    state = IncrementalFacts()
+    seen = []
+    while len(seen) < len(txns):
+        batch = txns[len(seen) : len(seen) + rng.randrange(1, 40)]
+        state.add(batch)
+        seen.extend(batch)
+        assert facts_to_dict(state.to_facts()) == _batch_facts(seen)
+
+
+def test_empty_state_matches_batch():
+    assert facts_to_dict(IncrementalFacts().to_facts()) == _batch_facts([])
+
+
+def test_late_deposit_updates_months_windows_and_preview_balances():
+    anchor = date(2024, 6, 30)
+    history = [_txn(i, anchor - timedelta(days=i * 3), 100.0, "outflow") for i in range(40)]
+    state = IncrementalFacts.from_txns(history)
+
+    late = _txn(99, anchor - timedelta(days=45), 2500.0, "inflow")  # inside the 60d window, older than the preview
+    state.add([late])
+    facts = state.to_facts()
+    expected = _batch_facts(history + [late])
+    assert facts_to_dict(facts) == expected
+    assert facts.windows.windows[60].last_inflow == 2500.0
+    assert facts.current_cash == 2500.0 - 40 * 100.0
+    assert facts.last_10_ledger_rows[-1].balance == facts.current_cash
+
+    # far older than any window: folded into cash / months / categories only
+    ancient = _txn(100, date(2020, 1, 1), 10.0, "inflow")
+    state.add([ancient])
+    assert min(state.daily) >= anchor - timedelta(days=179)
+    assert facts_to_dict(state.to_facts()) == _batch_facts(history + [late, ancient])
+
+
+def test_exact_sum_is_order_independent():
+    values = [0.1] * 10 + [1e16, -1e16, 0.3, -0.2]
+    forward, backward = ExactSum(), ExactSum()
+    for v in values:
+        forward.add(v)
+    for v in reversed(values):
+        backward.add(v)
+    assert forward.value == backward.value == math.fsum(values)
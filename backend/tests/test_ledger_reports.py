@@ -0,0 +1,177 @@
+from datetime import date, datetime, timezone
+import os
+from pathlib import Path
+import sys
+
+import pytest
+from fastapi.testclient import TestClient
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_ledger_reports.db")
+
+from backend.app.db import Base, SessionLocal, engine
+from backend.app.main import app
+from backend.app.analytics.downsample import lttb
+from backend.app.models import Account, Business, Category, Organization, TxnCategorization
+from backend.app.services import ledger_service
+
+
+@pytest.fixture()
+def db_session():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture()
+def client(db_session):
+    return TestClient(app)
+
+
+# (source_event_id, occurred_at, signed amount, category)
+EVENTS = [
+    ("evt-jan-sale", datetime(2024, 1, 31, 23, 59, tzinfo=timezone.utc), 500.0, "sales"),
+    ("evt-feb-sale", datetime(2024, 2, 1, 0, 0, tzinfo=timezone.utc), 300.0, "sales"),
+    ("evt-feb-refund", datetime(2024, 2, 10, 9, 0, tzinfo=timezone.utc), -20.0, "sales"),
+    ("evt-feb-supplies", datetime(2024, 2, 15, 9, 0, tzinfo=timezone.utc), -80.0, "supplies"),
+    ("evt-feb-cogs", datetime(2024, 2, 29, 23, 59, tzinfo=timezone.utc), -50.0, "food"),
+    ("evt-mar-supplies", datetime(2024, 3, 1, 0, 0, tzinfo=timezone.utc), -999.0, "supplies"),
+]
+
+
+def _seed(client, db_session):
+    org = Organization(name="Ledger Org")
+    db_session.add(org)
+    db_session.flush()
+    biz = Business(org_id=org.id, name="Ledger Biz")
+    db_session.add(biz)
+    db_session.flush()
+
+    accounts = {
+        "sales": Account(business_id=biz.id, name="Revenue", type="revenue"),
+        "supplies": Account(business_id=biz.id, name="Supplies", type="expense"),
+        "food": Account(business_id=biz.id, name="COGS", type="expense", subtype="cogs"),
+    }
+    db_session.add_all(accounts.values())
+    db_session.flush()
+    categories = {
+        key: Category(business_id=biz.id, name=key.title(), account_id=acct.id) for key, acct in accounts.items()
+    }
+    db_session.add_all(categories.values())
+    db_session.commit()
+
+    events = [
+        {
+            "business_id": biz.id,
+            "source": "bank",
+            "source_event_id": sid,
+            "occurred_at": occurred_at.isoformat(),
+            "payload": {"type": "transaction.posted", "transaction": {"amount": amount, "name": sid}},
+        }
+        for sid, occurred_at, amount, _cat in EVENTS
+    ]
+    assert client.post("/raw_events/batch", json={"events": events}).json()["inserted"] == len(EVENTS)
+
+    db_session.add_all(
+        [
+            TxnCategorization(
+                business_id=biz.id,
+                source_event_id=sid,
+                category_id=categories[cat].id,
+                source="manual",
+                confidence=1.0,
+            )
+            for sid, _occurred_at, _amount, cat in EVENTS
+        ]
+    )
+    db_session.commit()
+    return biz
+
+
+def test_reports_only_count_rows_in_date_range(client, db_session):
+    biz = _seed(client, db_session)
+    params = {"start_date": "2024-02-01", "end_date": "2024-02-29"}
+
+    income = client.get(f"/ledger/business/{biz.id}/income_statement", params=params).json()
+    assert income["revenue_total"] == pytest.approx(280.0)
+    assert income["expense_total"] == pytest.approx(130.0)
+    assert income["net_income"] == pytest.approx(150.0)
+    assert income["revenue"] == [{"name": "Sales", "amount": 280.0}]
+    assert income["expenses"] == [{"name": "Food", "amount": 50.0}, {"name": "Supplies", "amount": 80.0}]
+
+    flow = client.get(f"/ledger/business/{biz.id}/cash_flow", params=params).json()
+    assert flow["cash_in"] == pytest.approx(300.0)
+    assert flow["cash_out"] == pytest.approx(150.0)
+    assert flow["net_cash_flow"] == pytest.approx(150.0)
+
+    lines = client.get(f"/ledger/business/{biz.id}/lines", params={**params, "limit": 2}).json()
+    assert [line["source_event_id"] for line in lines] == ["evt-feb-cogs", "evt-feb-supplies"]
+
+    series = client.get(f"/ledger/business/{biz.id}/cash_series", params={**params, "starting_cash": 100}).json()
+    assert [point["balance"] for point in series] == [400.0, 380.0, 300.0, 250.0]
+
+
+def test_balance_sheet_includes_as_of_day(client, db_session):
+    biz = _seed(client, db_session)
+
+    sheet = client.get(
+        f"/ledger/business/{biz.id}/balance_sheet_v1",
+        params={"as_of": date(2024, 2, 29).isoformat(), "starting_cash": 1000},
+    ).json()
+    assert sheet["cash"] == pytest.approx(1650.0)
+    assert sheet["equity_total"] == pytest.approx(1650.0)
+
+
+def test_bundle_matches_individual_reports(client, db_session):
+    biz = _seed(client, db_session)
+    params = {"start_date": "2024-02-01", "end_date": "2024-02-29"}
+
+    bundle = client.get(
+        f"/ledger/business/{biz.id}/bundle", params={**params, "limit": 3, "starting_cash": 1000}
+    ).json()
+
+    base = f"/ledger/business/{biz.id}"
+    assert bundle["lines"] == client.get(f"{base}/lines", params={**params, "limit": 3}).json()
+    assert bundle["income_statement"] == client.get(f"{base}/income_statement", params=params).json()
+    assert bundle["cash_flow"] == client.get(f"{base}/cash_flow", params=params).json()
+    assert bundle["balance_sheet"] == client.get(
+        f"{base}/balance_sheet_v1", params={"as_of": "2024-02-29", "starting_cash": 1000}
+    ).json()
+
+
+def test_cash_series_granularity_and_max_points(client, db_session):
+    biz = _seed(client, db_session)
+    base = f"/ledger/business/{biz.id}/cash_series"
+
+    monthly = client.get(base, params={"granularity": "month"}).json()
+    assert [(p["occurred_at"][:10], p["balance"], p["min_balance"], p["max_balance"]) for p in monthly] == [
+        ("2024-01-01", 500.0, 500.0, 500.0),
+        ("2024-02-01", 650.0, 650.0, 800.0),
+        ("2024-03-01", -349.0, -349.0, -349.0),
+    ]
+
+    capped = client.get(base, params={"max_points": 3}).json()
+    assert len(capped) == 3
+    assert capped[0]["balance"] == 500.0
+    assert capped[-1]["balance"] == -349.0
+
+
+def test_cash_series_streams_daily_points_into_lttb(client, db_session, monkeypatch):
+    biz = _seed(client, db_session)
+    seen = []
+
+    def _spy(points, max_points, *, n=None):
+        seen.append((type(points), n))
+        return lttb(points, max_points, n=n)
+
+    monkeypatch.setattr(ledger_service, "lttb", _spy)
+    capped = client.get(f"/ledger/business/{biz.id}/cash_series", params={"max_points": 3}).json()
+    assert [p["balance"] for p in capped][::2] == [500.0, -349.0]
+    points_type, n = seen[0]
+    assert points_type is not list  # the checkpoint scan itself, never collected
+    assert n == len(client.get(f"/ledger/business/{biz.id}/cash_series").json())
@@ -0,0 +1,60 @@
+import re
+
+from backend.app.norma.merchant import (
+    canonical_merchant_name,
+    clear_merchant_key_cache,
+    merchant_key,
+    merchant_key_cache_info,
+    merchant_keys,
+)
+
+_OLD_STOPWORDS = {
+    "pos", "ach", "debit", "credit", "card", "purchase", "payment", "pmt", "online", "web", "www",
+    "inc", "llc", "co", "company", "corp", "corporation", "the",
+}
+
+
+def _old_merchant_key(description):
+    s = (description or "").lower().strip()
+    s = re.sub(r"[^a-z0-9\s\*]", " ", s)
+    s = re.sub(r"\d+", " ", s)
+    s = s.replace("*", " ")
+    s = re.sub(r"\s+", " ", s).strip()
+    tokens = [t for t in s.split(" ") if t and t not in _OLD_STOPWORDS]
+    return " ".join(tokens[:6])
+
+
+DESCRIPTIONS = [
+    "SQ *BLUE BOTTLE COFFEE #123",
+    "TST* Joe's Diner 4567",
+    "POS DEBIT Sysco Foods Inc.",
+    "ACH PMT Gusto Payroll",
+    "Amazon.com*2K4LM9 AMZN.COM/BILL WA",
+    "Café Crème\tParis\n42",
+    "the company inc llc",
+    "one two three four five six seven eight",
+    "",
+    None,
+    "   ",
+    "Gordon Food Service 1234-5678",
+]
+
+
+def test_merchant_key_matches_previous_implementation():
+    for d in DESCRIPTIONS:
+        assert merchant_key(d) == _old_merchant_key(d), d
+    assert merchant_keys(DESCRIPTIONS) == [_old_merchant_key(d) for d in DESCRIPTIONS]
+    assert canonical_merchant_name("SQ *BLUE BOTTLE COFFEE #123") == "Sq Blue Bottle Coffee"
+
+
+def test_merchant_key_cache_counters():
+    clear_merchant_key_cache()
+    merchant_key("Sysco Foods #1")
+    merchant_key("Sysco Foods #1")
+    merchant_keys(["US Foods", "US Foods", "Sysco Foods #1"])
+
+    info = merchant_key_cache_info()
+    assert info["misses"] == 2
+    assert info["hits"] == 2  # batch keys each distinct description once
+    assert info["size"] == 2
+    assert info["maxsize"] > 0
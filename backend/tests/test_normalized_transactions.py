@@ -0,0 +1,212 @@
+from datetime import datetime, timedelta, timezone
+import os
+from pathlib import Path
+import sys
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event, select
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_normalized_transactions.db")
+
+from backend.app.db import Base, SessionLocal, engine
+from backend.app.main import app
+from backend.app.models import Organization, Business, NormalizedTxn, RawEvent
+from backend.app.services import normalized_txn_service
+
+
+@pytest.fixture()
+def db_session():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture()
+def client(db_session):
+    return TestClient(app)
+
+
+def _create_business(db_session):
+    org = Organization(name="Normalized Org")
+    db_session.add(org)
+    db_session.flush()
+    biz = Business(org_id=org.id, name="Normalized Biz")
+    db_session.add(biz)
+    db_session.commit()
+    return biz
+
+
+def _payload(idx: int):
+    return {
+        "type": "transaction.posted",
+        "transaction": {"transaction_id": f"evt-{idx}", "amount": -10.0 - idx, "name": "Sysco #12"},
+    }
+
+
+def _event(business_id: str, idx: int):
+    occurred_at = datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc) + timedelta(minutes=idx)
+    return {
+        "business_id": business_id,
+        "source": "bank",
+        "source_event_id": f"evt-{idx}",
+        "occurred_at": occurred_at.isoformat(),
+        "payload": _payload(idx),
+    }
+
+
+def _normalized(db_session, business_id: str):
+    db_session.expire_all()
+    return db_session.execute(
+        select(NormalizedTxn)
+        .where(NormalizedTxn.business_id == business_id)
+        .order_by(NormalizedTxn.source_event_id)
+    ).scalars().all()
+
+
+def test_ingest_writes_normalized_rows(client, db_session):
+    biz = _create_business(db_session)
+
+    resp = client.post("/raw_events/batch", json={"events": [_event(biz.id, i) for i in range(3)]})
+    assert resp.status_code == 200
+    resp = client.post("/raw_events/batch", json={"events": [_event(biz.id, i) for i in range(2, 5)]})
+    assert resp.json()["inserted"] == 2
+    resp = client.post("/raw_events", json=_event(biz.id, 5))
+    assert resp.json()["status"] == "ok"
+
+    rows = _normalized(db_session, biz.id)
+    assert [r.source_event_id for r in rows] == [f"evt-{i}" for i in range(6)]
+
+    raw_ids = set(db_session.execute(select(RawEvent.id)).scalars().all())
+    assert {r.raw_event_id for r in rows} == raw_ids
+
+    first = rows[0]
+    assert first.skip_reason is None
+    assert first.direction == "outflow"
+    assert first.amount == pytest.approx(10.0)
+    assert first.merchant_key == "sysco"
+    assert first.normalizer_version == normalized_txn_service.NORMALIZER_VERSION
+
+
+def test_lazy_backfill_and_skip_reason(db_session):
+    biz = _create_business(db_session)
+    base = datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc)
+    db_session.add_all(
+        [
+            RawEvent(business_id=biz.id, source="bank", source_event_id="evt-1", occurred_at=base, payload=_payload(1)),
+            RawEvent(
+                business_id=biz.id,
+                source="invoicing",
+                source_event_id="inv-1",
+                occurred_at=base + timedelta(minutes=1),
+                payload={"type": "invoice_issued", "invoice": {"amount": 100}},
+            ),
+        ]
+    )
+    db_session.commit()
+    assert _normalized(db_session, biz.id) == []
+
+    assert normalized_txn_service.ensure_normalized(db_session, biz.id) == 2
+    rows = {r.source_event_id: r for r in _normalized(db_session, biz.id)}
+    assert rows["evt-1"].skip_reason is None
+    assert rows["inv-1"].skip_reason is not None
+    assert rows["inv-1"].amount is None
+
+    # in sync -> no rewrite
+    assert normalized_txn_service.ensure_normalized(db_session, biz.id) == 0
+
+    pairs, last = normalized_txn_service.load_event_txn_pairs(db_session, biz.id)
+    assert [t.source_event_id for _row, t in pairs] == ["evt-1"]
+    assert last == rows["inv-1"].occurred_at
+
+
+def test_ensure_normalized_fast_path_reads_watermark_and_commits_lazy_writes(client, db_session):
+    biz = _create_business(db_session)
+    client.post("/raw_events/batch", json={"events": [_event(biz.id, i) for i in range(3)]})
+    assert normalized_txn_service.ensure_normalized(db_session, biz.id) == 0  # stamps the watermark
+    biz_id = biz.id
+
+    statements = []
+
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _before)
+    try:
+        assert normalized_txn_service.ensure_normalized(db_session, biz_id) == 0
+    finally:
+        event.remove(engine, "before_cursor_execute", _before)
+    assert len(statements) == 2
+    assert all("count(" not in s.lower() and "normalized_transactions" not in s for s in statements)
+
+    db_session.add(
+        RawEvent(
+            business_id=biz.id,
+            source="bank",
+            source_event_id="late",
+            occurred_at=datetime(2024, 2, 1, tzinfo=timezone.utc),
+            payload=_payload(9),
+        )
+    )
+    db_session.commit()
+    assert normalized_txn_service.ensure_normalized(db_session, biz.id) == 1
+    db_session.rollback()  # lazy writes were committed by ensure_normalized itself
+    assert len(_normalized(db_session, biz.id)) == 4
+    assert normalized_txn_service.ensure_normalized(db_session, biz.id) == 0
+
+
+def test_ensure_normalized_leaves_the_callers_session_alone(db_session):
+    biz = _create_business(db_session)
+    db_session.add(
+        RawEvent(
+            business_id=biz.id,
+            source="bank",
+            source_event_id="evt-1",
+            occurred_at=datetime(2024, 1, 1, tzinfo=timezone.utc),
+            payload=_payload(1),
+        )
+    )
+    db_session.commit()
+    biz_id = biz.id
+
+    biz.name = "Renamed, not committed"
+    assert normalized_txn_service.ensure_normalized(db_session, biz_id) == 1
+    db_session.rollback()
+    assert db_session.get(Business, biz_id).name == "Normalized Biz"
+    assert len(_normalized(db_session, biz_id)) == 1  # the lazy write was kept
+
+
+def test_renormalize_stale_repairs_events_behind_the_watermark(client, db_session):
+    biz = _create_business(db_session)
+    client.post("/raw_events/batch", json={"events": [_event(biz.id, i) for i in range(3)]})
+    normalized_txn_service.ensure_normalized(db_session, biz.id)
+
+    # a row lost behind the watermark is invisible to the fast path, not to the full pass
+    db_session.execute(
+        NormalizedTxn.__table__.delete().where(NormalizedTxn.source_event_id == "evt-0")
+    )
+    db_session.commit()
+    assert normalized_txn_service.ensure_normalized(db_session, biz.id) == 0
+    assert normalized_txn_service.renormalize_stale(db_session) == {biz.id: 1}
+    assert len(_normalized(db_session, biz.id)) == 3
+
+
+def test_version_bump_renormalizes(client, db_session, monkeypatch):
+    biz = _create_business(db_session)
+    client.post("/raw_events/batch", json={"events": [_event(biz.id, i) for i in range(3)]})
+    assert {r.normalizer_version for r in _normalized(db_session, biz.id)} == {
+        normalized_txn_service.NORMALIZER_VERSION
+    }
+
+    bumped = normalized_txn_service.NORMALIZER_VERSION + 1
+    monkeypatch.setattr(normalized_txn_service, "NORMALIZER_VERSION", bumped)
+
+    changed = normalized_txn_service.renormalize_stale(db_session)
+    assert changed == {biz.id: 3}
+    assert {r.normalizer_version for r in _normalized(db_session, biz.id)} == {bumped}
@@ -0,0 +1,103 @@
+from datetime import datetime, timedelta, timezone
+import os
+from pathlib import Path
+import sys
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_raw_event_batch_ingest.db")
+
+from backend.app.db import Base, SessionLocal, engine
+from backend.app.main import app
+from backend.app.models import Organization, Business, RawEvent
+
+
+@pytest.fixture()
+def db_session():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture()
+def client(db_session):
+    return TestClient(app)
+
+
+def _create_business(db_session):
+    org = Organization(name="Ingest Org")
+    db_session.add(org)
+    db_session.flush()
+    biz = Business(org_id=org.id, name="Ingest Biz")
+    db_session.add(biz)
+    db_session.commit()
+    return biz
+
+
+def _event(business_id: str, idx: int, source: str = "bank"):
+    occurred_at = datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc) + timedelta(minutes=idx)
+    return {
+        "business_id": business_id,
+        "source": source,
+        "source_event_id": f"evt-{idx}",
+        "occurred_at": occurred_at.isoformat(),
+        "payload": {
+            "type": "transaction.posted",
+            "transaction": {"transaction_id": f"evt-{idx}", "amount": -10.0 - idx, "name": "Sysco"},
+        },
+    }
+
+
+def _count(db_session, business_id: str) -> int:
+    return db_session.execute(
+        select(func.count()).select_from(RawEvent).where(RawEvent.business_id == business_id)
+    ).scalar_one()
+
+
+def test_batch_ingest_reports_inserted_and_duplicates(client, db_session):
+    biz = _create_business(db_session)
+    first = [_event(biz.id, i) for i in range(1200)]
+
+    resp = client.post("/raw_events/batch", json={"events": first})
+    assert resp.status_code == 200
+    assert resp.json() == {"status": "ok", "received": 1200, "inserted": 1200, "duplicates": 0}
+
+    # overlap with the previous batch + an in-batch repeat + same id from another source
+    second = [_event(biz.id, i) for i in range(1100, 1300)]
+    second.append(_event(biz.id, 1250))
+    second.append(_event(biz.id, 5, source="stripe"))
+
+    resp = client.post("/raw_events/batch", json={"events": second})
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["received"] == 202
+    assert body["inserted"] == 101
+    assert body["duplicates"] == 101
+    assert _count(db_session, biz.id) == 1301
+
+
+def test_batch_ingest_single_endpoint_still_dedupes_against_batch(client, db_session):
+    biz = _create_business(db_session)
+    client.post("/raw_events/batch", json={"events": [_event(biz.id, 1)]})
+
+    resp = client.post("/raw_events", json=_event(biz.id, 1))
+    assert resp.status_code == 200
+    assert resp.json() == {"status": "duplicate"}
+
+
+def test_batch_ingest_unknown_business_rejected(client, db_session):
+    biz = _create_business(db_session)
+    resp = client.post(
+        "/raw_events/batch",
+        json={"events": [_event(biz.id, 1), _event("missing-business", 2)]},
+    )
+    assert resp.status_code == 404
+    assert _count(db_session, biz.id) == 0
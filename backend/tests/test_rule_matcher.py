@@ -0,0 +1,154 @@
+from datetime import datetime, timedelta, timezone
+import os
+from pathlib import Path
+import random
+import sys
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_rule_matcher.db")
+
+from backend.app.db import Base, SessionLocal, engine
+from backend.app.sim import models as sim_models  # noqa: F401
+from backend.app.models import Account, Business, BusinessCategoryMap, Category, CategoryRule, Organization
+from backend.app.api.categorize import CategoryRulePatch, update_category_rule
+from backend.app.norma.normalize import NormalizedTransaction
+from backend.app.norma.category_engine import suggest_from_rules
+from backend.app.norma.categorization_context import CategorizationContext
+from backend.app.norma import rule_matcher
+from backend.app.norma.rule_matcher import AhoCorasick, CompiledRules, RuleSpec, get_compiled_rules
+
+
+@pytest.fixture()
+def db_session():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+BASE_TIME = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _spec(rid: str, needle: str, priority: int = 100, minutes: int = 0, direction=None, account=None) -> RuleSpec:
+    return RuleSpec(
+        id=rid,
+        category_id=f"cat-{rid}",
+        contains_text=needle,
+        direction=direction,
+        account=account,
+        priority=priority,
+        created_at=BASE_TIME + timedelta(minutes=minutes),
+    )
+
+
+def _naive_first(rules, desc, direction, account):
+    desc = desc.strip().lower()
+    for r in sorted(rules, key=lambda r: r.order_key):
+        if r.contains_text and r.contains_text in desc and r.passes_filters(direction, account):
+            return r
+    return None
+
+
+def test_aho_corasick_matches_substring_search():
+    rng = random.Random(7)
+    alphabet = "abcd "
+    patterns = sorted({"".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4))) for _ in range(60)})
+    automaton = AhoCorasick(patterns)
+    for _ in range(300):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 30)))
+        assert automaton.search(text) == {i for i, p in enumerate(patterns) if p in text}
+
+
+def test_compiled_rules_keep_conflict_policy_and_filters():
+    rules = [
+        _spec("late", "sysco", priority=10, minutes=5),
+        _spec("early", "sysco food", priority=10, minutes=1),
+        _spec("low", "sys", priority=50),
+        _spec("inflow_only", "sysco", priority=1, direction="inflow"),
+        _spec("card_only", "food", priority=2, account="card"),
+    ]
+    compiled = CompiledRules(rules)
+
+    cases = [
+        ("SYSCO FOOD #12", "outflow", "bank"),
+        ("sysco food", "inflow", "bank"),
+        ("sysco food", "outflow", "card"),
+        ("Sysco", "outflow", "bank"),
+        ("system", "outflow", "bank"),
+        ("nothing here", "outflow", "bank"),
+        ("", "outflow", "bank"),
+    ]
+    for desc, direction, account in cases:
+        expected = _naive_first(rules, desc, direction, account)
+        assert compiled.first_match(desc, direction, account) == expected, desc
+
+    assert [r.id for r in compiled.iter_matches("sysco food", "outflow", "card")] == ["card_only", "early", "late", "low"]
+
+
+def test_cached_matcher_invalidated_by_rule_update(db_session):
+    org = Organization(name="Rules Org")
+    db_session.add(org)
+    db_session.flush()
+    biz = Business(org_id=org.id, name="Rules Biz")
+    db_session.add(biz)
+    db_session.flush()
+    account = Account(business_id=biz.id, name="Supplies", type="expense")
+    db_session.add(account)
+    db_session.flush()
+    category = Category(business_id=biz.id, name="Supplies", account_id=account.id)
+    db_session.add(category)
+    db_session.flush()
+    db_session.add(BusinessCategoryMap(business_id=biz.id, system_key="supplies", category_id=category.id))
+    rule = CategoryRule(business_id=biz.id, category_id=category.id, contains_text="sysco", priority=1, active=True)
+    db_session.add(rule)
+    db_session.commit()
+
+    txn = NormalizedTransaction(
+        id=None,
+        source_event_id="evt-1",
+        occurred_at=BASE_TIME,
+        date=BASE_TIME.date(),
+        description="SYSCO #1",
+        amount=10.0,
+        direction="outflow",
+        account="bank",
+        category="uncategorized",
+    )
+    first = get_compiled_rules(db_session, biz.id)
+    assert get_compiled_rules(db_session, biz.id) is first
+    assert suggest_from_rules(CategorizationContext.load(db_session, biz.id), txn).category == "supplies"
+
+    update_category_rule(biz.id, rule.id, CategoryRulePatch(contains_text="costco"), db=db_session)
+
+    assert get_compiled_rules(db_session, biz.id) is not first
+    assert suggest_from_rules(CategorizationContext.load(db_session, biz.id), txn) is None
+
+
+def test_compiled_rules_cache_is_bounded_lru(db_session, monkeypatch):
+    monkeypatch.setattr(rule_matcher, "_CACHE_SIZE", 2)
+    rule_matcher.clear_cache()
+    org = Organization(name="Rules Org")
+    db_session.add(org)
+    db_session.flush()
+    businesses = [Business(org_id=org.id, name=f"Rules Biz {i}") for i in range(3)]
+    db_session.add_all(businesses)
+    db_session.commit()
+    a, b, c = (biz.id for biz in businesses)
+    before = rule_matcher.cache_info()
+
+    first = get_compiled_rules(db_session, a)
+    get_compiled_rules(db_session, b)
+    assert get_compiled_rules(db_session, a) is first  # a is now most recently used
+    get_compiled_rules(db_session, c)  # evicts b
+
+    info = rule_matcher.cache_info()
+    assert (info["size"], info["maxsize"], info["hits"] - before["hits"]) == (2, 2, 1)
+    assert get_compiled_rules(db_session, a) is first
+    get_compiled_rules(db_session, b)
+    assert rule_matcher.cache_info()["misses"] - before["misses"] == 4
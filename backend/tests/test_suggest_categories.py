@@ -0,0 +1,193 @@
+from datetime import datetime, timezone
+import os
+from pathlib import Path
+import sys
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_suggest_categories.db")
+
+from backend.app.db import Base, SessionLocal, engine
+from backend.app.sim import models as sim_models  # noqa: F401
+from backend.app.models import Account, Business, BusinessCategoryMap, Category, CategoryRule, Organization
+from backend.app.norma import category_engine
+from backend.app.norma.categorization_context import CategorizationContext
+from backend.app.norma.categorize_brain import brain
+from backend.app.norma.category_engine import suggest_categories, suggest_category
+from backend.app.norma.merchant import canonical_merchant_name, merchant_key
+from backend.app.norma.normalize import NormalizedTransaction
+
+
+@pytest.fixture()
+def db_session():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture()
+def brain_store(tmp_path):
+    previous = brain.reopen(tmp_path / "brain.db")
+    yield brain
+    brain.reopen(previous)
+
+
+def _txn(i: int, description: str, direction: str = "outflow", category: str = "uncategorized") -> NormalizedTransaction:
+    ts = datetime(2024, 3, 1, 12, 0, tzinfo=timezone.utc)
+    return NormalizedTransaction(
+        id=None,
+        source_event_id=f"evt-{i}",
+        occurred_at=ts,
+        date=ts.date(),
+        description=description,
+        amount=25.0,
+        direction=direction,  # type: ignore[arg-type]
+        account="bank",
+        category=category,
+    )
+
+
+def _setup(db_session):
+    org = Organization(name="Batch Org")
+    db_session.add(org)
+    db_session.flush()
+    biz = Business(org_id=org.id, name="Batch Biz")
+    db_session.add(biz)
+    db_session.flush()
+    account = Account(business_id=biz.id, name="Supplies", type="expense")
+    db_session.add(account)
+    db_session.flush()
+    category = Category(business_id=biz.id, name="Supplies", account_id=account.id)
+    db_session.add(category)
+    db_session.flush()
+    db_session.add(BusinessCategoryMap(business_id=biz.id, system_key="office_supplies", category_id=category.id))
+    db_session.add(
+        CategoryRule(business_id=biz.id, category_id=category.id, contains_text="sysco", priority=1, active=True)
+    )
+    db_session.commit()
+
+    brain.apply_label(
+        business_id=biz.id,
+        alias_key=merchant_key("Blue Bottle Coffee"),
+        canonical_name=canonical_merchant_name("Blue Bottle Coffee"),
+        system_key="meals",
+        confidence=0.9,
+    )
+    return biz
+
+
+def test_batch_matches_single_and_evaluates_each_key_once(db_session, brain_store, monkeypatch):
+    biz = _setup(db_session)
+    ctx = CategorizationContext.load(db_session, biz.id)
+
+    vendors = ["Blue Bottle Coffee", "SYSCO FOODS", "GUSTO PAYROLL", "Mystery Vendor", "Adobe Creative"]
+    txns = [_txn(i, vendors[i % len(vendors)]) for i in range(200)]
+    txns.append(_txn(999, "SYSCO FOODS", category="rent"))  # already categorized: passed through
+
+    calls = {"rules": 0, "heuristics": 0}
+    real_rules = category_engine.suggest_from_rules
+    real_heur = category_engine.heuristic_categorize_txn
+
+    def _count_rules(*args, **kwargs):
+        calls["rules"] += 1
+        return real_rules(*args, **kwargs)
+
+    def _count_heur(*args, **kwargs):
+        calls["heuristics"] += 1
+        return real_heur(*args, **kwargs)
+
+    monkeypatch.setattr(category_engine, "suggest_from_rules", _count_rules)
+    monkeypatch.setattr(category_engine, "heuristic_categorize_txn", _count_heur)
+
+    batch = suggest_categories(ctx, txns)
+
+    # brain hit (1 vendor) never reaches rules; rule hit (1 vendor) never reaches heuristics
+    assert calls["rules"] == len(vendors) - 1
+    assert calls["heuristics"] == len(vendors) - 2
+
+    assert len(batch) == len(txns)
+    assert [t.source_event_id for t in batch] == [t.source_event_id for t in txns]
+    assert batch[-1] is txns[-1]
+    assert batch == [suggest_category(ctx, t) for t in txns]
+
+    by_vendor = {t.description: s.categorization for t, s in zip(txns[:-1], batch)}
+    assert by_vendor["Blue Bottle Coffee"].source == "memory"
+    assert (by_vendor["SYSCO FOODS"].source, by_vendor["SYSCO FOODS"].category) == ("rule", "office_supplies")
+    assert by_vendor["GUSTO PAYROLL"].category == "payroll"
+    assert by_vendor["Adobe Creative"].source == "heuristic"
+    assert by_vendor["Mystery Vendor"].source == "none"
+    assert batch[3].category == "uncategorized"
+
+
+def test_near_miss_vendor_uses_fuzzy_memory(db_session, brain_store):
+    biz = _setup(db_session)
+    ctx = CategorizationContext.load(db_session, biz.id)
+
+    exact, near, unrelated = suggest_categories(
+        ctx,
+        [_txn(1, "Blue Bottle Coffee"), _txn(2, "BLUE BOTTLE COFFE #12"), _txn(3, "Bottle Shop")],
+    )
+
+    assert exact.categorization.source == "memory"
+    assert near.categorization.source == "memory_fuzzy"
+    assert near.category == "meals"
+    assert near.categorization.candidates[0]["matched_alias"] == "blue bottle coffee"
+    assert near.categorization.confidence == round(0.9 * near.categorization.candidates[0]["similarity"], 2)
+    assert near.categorization.confidence < exact.categorization.confidence
+    assert unrelated.categorization.source == "none"
+
+    # memory is business-scoped: another business gets no fuzzy hit
+    assert brain.fuzzy_lookup_label(business_id="other-biz", alias_key="blue bottle coffe") is None
+
+
+def test_suggestions_are_cached_across_requests_and_invalidated_exactly(db_session, brain_store):
+    from backend.app.norma import suggestion_cache
+    from backend.app.norma.rule_matcher import bump_rules_version
+
+    biz = _setup(db_session)
+    txns = [_txn(1, "GUSTO PAYROLL"), _txn(2, "Mystery Vendor"), _txn(3, "Blue Bottle Coffee")]
+
+    def suggest():
+        return [s.categorization for s in suggest_categories(CategorizationContext.load(db_session, biz.id), txns)]
+
+    first = suggest()
+    before = suggestion_cache.suggestion_cache_info()
+    assert suggest() == first
+    after = suggestion_cache.suggestion_cache_info()
+    assert after["hits"] - before["hits"] == len(txns)
+    assert after["misses"] == before["misses"]
+    assert after["size"] >= len(txns) and 0 < after["hit_rate"] <= 1
+
+    # new rule: rules_version bump -> new compiled rules -> next request recomputes
+    category_id = db_session.query(Category.id).filter(Category.business_id == biz.id).scalar()
+    db_session.add(CategoryRule(business_id=biz.id, category_id=category_id, contains_text="mystery", priority=1, active=True))
+    bump_rules_version(db_session, biz.id)
+    db_session.commit()
+    assert suggest()[1].source == "rule"
+
+    # a label in another business leaves this business's cache warm
+    brain.apply_label(business_id="other-biz", alias_key="mystery vendor", canonical_name="Mystery", system_key="meals")
+    hits = suggestion_cache.suggestion_cache_info()["hits"]
+    assert suggest()[1].source == "rule"
+    assert suggestion_cache.suggestion_cache_info()["hits"] - hits == len(txns)
+
+    # new brain label
+    brain.apply_label(
+        business_id=biz.id,
+        alias_key=merchant_key("GUSTO PAYROLL"),
+        canonical_name="Gusto",
+        system_key="office_supplies",
+    )
+    assert (suggest()[0].source, suggest()[0].category) == ("memory", "office_supplies")
+
+    # mapping change (even without a mapping_version bump)
+    db_session.query(BusinessCategoryMap).filter(BusinessCategoryMap.business_id == biz.id).delete()
+    db_session.commit()
+    assert suggest()[1].source == "none"
+    assert suggestion_cache.suggestion_cache_info()["invalidations"] - after["invalidations"] == 3
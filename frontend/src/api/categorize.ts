@@ -99,10 +99,38 @@ export type CategoryRulePreviewOut = {
   samples: CategoryRulePreviewSample[];
 };
 
-export type CategoryRuleApplyOut = {
+export type CategoryRulePreviewAllRule = {
   rule_id: string;
+  category_id: string;
+  contains_text: string;
+  priority: number;
+  matched: number;
+  candidates: number;
+  shadowed: boolean;
+  shadowed_by: string[];
+  samples: CategoryRulePreviewSample[];
+};
+
+export type CategoryRulePreviewAllOut = {
+  business_id: string;
+  scanned: number;
+  matched: number;
+  rules: CategoryRulePreviewAllRule[];
+  shadowed_rule_ids: string[];
+};
+
+export type CategoryRuleApplyJobOut = {
+  job_id: string;
+  business_id: string;
+  rule_id: string;
+  status: "queued" | "running" | "succeeded" | "failed";
+  scanned: number;
   matched: number;
   updated: number;
+  error?: string | null;
+  created_at: string;
+  started_at?: string | null;
+  finished_at?: string | null;
 };
 
 export function labelVendor(
@@ -112,8 +140,23 @@ export function labelVendor(
   return apiPost<any>(`/categorize/business/${businessId}/label_vendor`, payload);
 }
 
-export function getBrainVendors(businessId: string) {
-  return apiGet<BrainVendor[]>(`/categorize/business/${businessId}/brain/vendors`);
+export function getBrainVendors(
+  businessId: string,
+  params?: { q?: string; limit?: number; offset?: number }
+) {
+  const query = new URLSearchParams();
+  if (params?.q) {
+    query.set("q", params.q);
+  }
+  if (params?.limit !== undefined) {
+    query.set("limit", String(params.limit));
+  }
+  if (params?.offset !== undefined) {
+    query.set("offset", String(params.offset));
+  }
+  const queryString = query.toString();
+  const suffix = queryString ? `?${queryString}` : "";
+  return apiGet<BrainVendor[]>(`/categorize/business/${businessId}/brain/vendors${suffix}`);
 }
 
 export function getBrainVendor(businessId: string, merchantKey: string) {
@@ -212,6 +255,28 @@ export function previewCategoryRule(businessId: string, ruleId: string) {
   return apiGet<CategoryRulePreviewOut>(`/categorize/${businessId}/rules/${ruleId}/preview`);
 }
 
+export function previewAllCategoryRules(businessId: string) {
+  return apiGet<CategoryRulePreviewAllOut>(`/categorize/${businessId}/rules/preview_all`);
+}
+
+// Starts a full-history apply in the background (202); poll getCategoryRuleApplyJob for progress.
 export function applyCategoryRule(businessId: string, ruleId: string) {
-  return apiPost<CategoryRuleApplyOut>(`/categorize/${businessId}/rules/${ruleId}/apply`, {});
+  return apiPost<CategoryRuleApplyJobOut>(`/categorize/${businessId}/rules/${ruleId}/apply`, {});
+}
+
+export function getCategoryRuleApplyJob(businessId: string, jobId: string) {
+  return apiGet<CategoryRuleApplyJobOut>(`/categorize/${businessId}/rules/apply_jobs/${jobId}`);
+}
+
+export async function waitForCategoryRuleApplyJob(
+  businessId: string,
+  job: CategoryRuleApplyJobOut,
+  intervalMs = 1000
+): Promise<CategoryRuleApplyJobOut> {
+  let current = job;
+  while (current.status === "queued" || current.status === "running") {
+    await new Promise((resolve) => setTimeout(resolve, intervalMs));
+    current = await getCategoryRuleApplyJob(businessId, current.job_id);
+  }
+  return current;
 }
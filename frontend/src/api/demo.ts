@@ -2,8 +2,8 @@
 import type {
   BusinessDetail,
   BrainLabelRequest,
-  DashboardCard,
   DashboardDetail,
+  DashboardPage,
   DrilldownResponse,
 } from "../types";
 import { apiGet, apiPost } from "./client";
@@ -19,7 +19,7 @@ export function fetchDemoHealth(signal?: AbortSignal) {
 
 
 export function fetchDashboard(signal?: AbortSignal) {
-  return apiGet<{ cards: DashboardCard[] }>("/demo/dashboard", { signal });
+  return apiGet<DashboardPage>("/demo/dashboard", { signal });
 }
 
 export function fetchBusinessHealth(businessId: string, signal?: AbortSignal) {
@@ -28,12 +28,14 @@ export default function DashboardGrid({
               <div className={styles.name}>{c.name}</div>
               <div className={styles.id}>{c.business_id}</div>
             </div>
-            <RiskPill risk={c.risk} />
+            {c.risk && <RiskPill risk={c.risk} />}
           </div>
 
           <div className={styles.cardBody}>
-            <div />
-            <ScoreRing value={c.health_score} label="Financial Health" size={92} stroke={10} />
+            <div className={styles.id}>{c.stale ? "Updating…" : null}</div>
+            {c.health_score !== null && (
+              <ScoreRing value={c.health_score} label="Financial Health" size={92} stroke={10} />
+            )}
           </div>
         </div>
       ))}
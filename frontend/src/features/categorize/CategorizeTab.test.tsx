@@ -49,8 +49,22 @@ const listCategoryRules = vi.fn().mockResolvedValue([
     last_run_updated_count: null,
   },
 ]);
-const applyCategoryRule = vi.fn().mockResolvedValue({
+const applyJob = {
+  job_id: "job-1",
+  business_id: "biz-1",
   rule_id: "rule-1",
+  status: "queued",
+  scanned: 0,
+  matched: 0,
+  updated: 0,
+  error: null,
+  created_at: new Date().toISOString(),
+};
+const applyCategoryRule = vi.fn().mockResolvedValue(applyJob);
+const getCategoryRuleApplyJob = vi.fn().mockResolvedValue({
+  ...applyJob,
+  status: "succeeded",
+  scanned: 1,
   matched: 1,
   updated: 1,
 });
@@ -61,11 +75,14 @@ vi.mock("../../api/categorize", () => ({
   deleteCategoryRule: vi.fn(),
   getCategories: (...args: unknown[]) => getCategories(...args),
   getCategorizeMetrics: (...args: unknown[]) => getCategorizeMetrics(...args),
+  getCategoryRuleApplyJob: (...args: unknown[]) => getCategoryRuleApplyJob(...args),
   getTxnsToCategorize: (...args: unknown[]) => getTxnsToCategorize(...args),
   listCategoryRules: (...args: unknown[]) => listCategoryRules(...args),
   previewCategoryRule: vi.fn(),
   saveCategorization: vi.fn(),
   updateCategoryRule: vi.fn(),
+  waitForCategoryRuleApplyJob: async (businessId: string, job: { job_id: string }) =>
+    getCategoryRuleApplyJob(businessId, job.job_id),
 }));
 
 describe("CategorizeTab", () => {
@@ -75,6 +92,7 @@ describe("CategorizeTab", () => {
     getCategorizeMetrics.mockClear();
     listCategoryRules.mockClear();
     applyCategoryRule.mockClear();
+    getCategoryRuleApplyJob.mockClear();
   });
 
   it("applies a rule and refreshes data", async () => {
@@ -93,6 +111,7 @@ describe("CategorizeTab", () => {
     await user.click(applyButton);
 
     await waitFor(() => expect(applyCategoryRule).toHaveBeenCalledWith("biz-1", "rule-1"));
+    await waitFor(() => expect(getCategoryRuleApplyJob).toHaveBeenCalledWith("biz-1", "job-1"));
     await waitFor(() => expect(getTxnsToCategorize).toHaveBeenCalledTimes(2));
     await waitFor(() => expect(getCategories).toHaveBeenCalledTimes(2));
     await waitFor(() => expect(getCategorizeMetrics).toHaveBeenCalledTimes(2));
@@ -10,6 +10,7 @@ import {
   previewCategoryRule,
   saveCategorization,
   updateCategoryRule,
+  waitForCategoryRuleApplyJob,
   type CategoryRuleOut,
   type CategoryRulePreviewOut,
   type CategoryOut,
@@ -486,7 +487,11 @@ export default function CategorizeTab({
       setRulesErr(null);
       setRulesMsg(null);
       try {
-        const res = await applyCategoryRule(businessId, rule.id);
+        const job = await applyCategoryRule(businessId, rule.id);
+        const res = await waitForCategoryRuleApplyJob(businessId, job);
+        if (res.status === "failed") {
+          throw new Error(res.error ?? "Failed to apply rule");
+        }
         setRulesMsg(`Applied rule to ${res.updated} transactions (matched ${res.matched}).`);
         setRules((prev) =>
           prev.map((item) =>
@@ -46,6 +46,15 @@ export type BalanceSheetV1 = {
   equity_total: number;
 };
 
+export type LedgerBundle = {
+  start_date: string;
+  end_date: string;
+  lines: LedgerLine[];
+  income_statement: IncomeStatement;
+  cash_flow: CashFlow;
+  balance_sheet: BalanceSheetV1;
+};
+
 function qs(params: Record<string, string | number | undefined | null>) {
   const sp = new URLSearchParams();
   Object.entries(params).forEach(([k, v]) => {
@@ -97,42 +106,19 @@ export function useLedger(businessId: string, opts?: { days?: number; limit?: nu
 
     try {
       logRefresh("ledger", "refresh");
-      const linesUrl =
-        `${API_BASE}/ledger/business/${businessId}/lines` +
-        qs({ start_date, end_date, limit });
-
-      const isUrl =
-        `${API_BASE}/ledger/business/${businessId}/income_statement` +
-        qs({ start_date, end_date });
-
-      const cfUrl =
-        `${API_BASE}/ledger/business/${businessId}/cash_flow` +
-        qs({ start_date, end_date });
-
-      const bsUrl =
-        `${API_BASE}/ledger/business/${businessId}/balance_sheet_v1` +
-        qs({ as_of, starting_cash: 0 });
-
-      const [linesRes, isRes, cfRes, bsRes] = await Promise.all([
-        fetch(linesUrl),
-        fetch(isUrl),
-        fetch(cfUrl),
-        fetch(bsUrl),
-      ]);
-
-      // lines is the most important; if that fails, show error.
-      if (!linesRes.ok) throw new Error(`Ledger lines failed (${linesRes.status})`);
-      const linesJson = (await linesRes.json()) as LedgerLine[];
-
-      // the statements can fail if backend not wired yet; handle gracefully
-      const isJson = isRes.ok ? ((await isRes.json()) as IncomeStatement) : null;
-      const cfJson = cfRes.ok ? ((await cfRes.json()) as CashFlow) : null;
-      const bsJson = bsRes.ok ? ((await bsRes.json()) as BalanceSheetV1) : null;
-
-      setLines(linesJson);
-      setIS(isJson);
-      setCF(cfJson);
-      setBS(bsJson);
+      // one scan server-side: lines + income statement + cash flow + balance sheet (as of end_date)
+      const bundleUrl =
+        `${API_BASE}/ledger/business/${businessId}/bundle` +
+        qs({ start_date, end_date, limit, starting_cash: 0 });
+
+      const res = await fetch(bundleUrl);
+      if (!res.ok) throw new Error(`Ledger failed (${res.status})`);
+      const bundle = (await res.json()) as LedgerBundle;
+
+      setLines(bundle.lines);
+      setIS(bundle.income_statement);
+      setCF(bundle.cash_flow);
+      setBS(bundle.balance_sheet);
     } catch (e: any) {
       setErr(e?.message ?? "Failed to load ledger");
     } finally {
@@ -5,9 +5,20 @@ export type Dimension = "liquidity" | "stability" | "discipline" | "spend" | "re
 export type DashboardCard = {
   business_id: string;
   name: string;
-  risk: Risk;
-  health_score: number;
+  risk: Risk | null; // null until the first snapshot is computed
+  health_score: number | null;
   highlights: string[];
+  computed_at: string | null;
+  stale: boolean;
+};
+
+export type DashboardPage = {
+  cards: DashboardCard[];
+  total: number;
+  limit: number;
+  offset: number;
+  sort: "created_at" | "name" | "health_score" | "risk";
+  order: "asc" | "desc";
 };
 
 export type DashboardKpis = {